@@ -5,6 +5,7 @@
 from .domain import (
     DistanceData,
     WallFeatures,
+    PoseEstimate,
     Command,
     DriveMode,
     ActuationCalibration,
@@ -14,6 +15,7 @@ from .domain import (
 
 # Interfaces (プロトコル)
 from .interfaces import (
+    Clock,
     CameraModule,
     DistanceSensorModule,
     Perception,
@@ -28,12 +30,14 @@ __all__ = [
     # Domain models
     "DistanceData",
     "WallFeatures",
+    "PoseEstimate",
     "Command",
     "DriveMode",
     "ActuationCalibration",
     "Telemetry",
     "ActuationStatus",
     # Interfaces
+    "Clock",
     "CameraModule",
     "DistanceSensorModule",
     "Perception",
@@ -1,9 +1,15 @@
 # actuation パッケージ
 # コマンドを物理信号（PWM等）に変換・出力する駆動モジュールの実装
 
-# pwm.pyをインポート（ラズベリーパイ環境専用）
+# pwm.pyをインポート（ハードウェアモジュールは初期化時に遅延インポート）
 from .pwm import PWMActuation
+from .fake import FakePCA9685, PCA9685RegisterBus, RecordingChannel
+from .worker import ActuationWorker
 
 __all__ = [
     "PWMActuation",
+    "ActuationWorker",
+    "FakePCA9685",
+    "PCA9685RegisterBus",
+    "RecordingChannel",
 ]
@@ -0,0 +1,128 @@
+# --------------------------------
+# actuation/fake.py
+# 実機なしで PWMActuation を動かすための PCA9685 互換オブジェクト
+# --------------------------------
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+from ..interfaces.fake_bus import FakeRegisterBus
+from .pwm import LED0_ON_L, LED_REGISTER_STRIDE, duty_to_registers, registers_to_duty
+
+
+class RecordingChannel:
+    """
+    duty_cycle への書き込みを記録する PWMChannel 互換オブジェクト
+
+    バスを渡した場合は、adafruit_pca9685 と同じようにチャンネルの4バイトのレジスタを1回で書き込み、
+    記録はバスがレジスタから読み戻した値（12bitを16bitに戻した値）で行う。
+    """
+
+    def __init__(self, index: int, bus: Optional[PCA9685RegisterBus] = None):
+        """
+        初期化
+
+        Args:
+            index: チャンネル番号
+            bus: レジスタを書き込むバス（Noneの場合は値をそのまま記録する）
+        """
+        self.index = index
+        self.bus = bus
+        self.writes: List[int] = []  # 書き込まれた duty_cycle の履歴
+        self._duty_cycle = 0
+
+    @property
+    def duty_cycle(self) -> int:
+        return self._duty_cycle
+
+    @duty_cycle.setter
+    def duty_cycle(self, value: int) -> None:
+        if not 0 <= value <= 0xFFFF:
+            raise ValueError(f"Out of range: duty_cycle={value}")
+        if self.bus is None:
+            self.record(value)
+            return
+        buf = bytearray(1 + LED_REGISTER_STRIDE)
+        buf[0] = LED0_ON_L + LED_REGISTER_STRIDE * self.index
+        duty_to_registers(value, buf, 1)
+        self.bus.write(buf)
+
+    def record(self, value: int) -> None:
+        """
+        書き込まれた値を記録
+
+        Args:
+            value: duty_cycle値
+        """
+        self._duty_cycle = value
+        self.writes.append(value)
+
+    def clear(self) -> None:
+        """書き込み履歴を消去"""
+        self.writes.clear()
+
+
+class PCA9685RegisterBus(FakeRegisterBus):
+    """
+    PCA9685 の LEDn_ON_L〜OFF_H レジスタを模擬する FakeRegisterBus
+
+    チャンネルの最後のレジスタ（OFF_H）が書かれたら、そのチャンネルの書き込みとして記録する
+    （自動インクリメントで複数チャンネルを1回で書いた場合もチャンネルごとに記録される）。
+    """
+
+    def __init__(self, channels: Tuple[RecordingChannel, ...] = ()):
+        """
+        初期化
+
+        Args:
+            channels: 書き込みを記録するチャンネル（チャンネル番号順）
+        """
+        super().__init__()
+        self.channels = channels
+
+    def write_register(self, address: int, value: int) -> None:
+        super().write_register(address, value)
+        offset = address - LED0_ON_L
+        if offset < 0 or offset % LED_REGISTER_STRIDE != LED_REGISTER_STRIDE - 1:
+            return
+        index = offset // LED_REGISTER_STRIDE
+        if index >= len(self.channels):
+            return
+        self.channels[index].record(registers_to_duty(self.registers, LED0_ON_L + LED_REGISTER_STRIDE * index))
+
+
+class FakePCA9685:
+    """
+    PCA9685 互換オブジェクト（channels[i].duty_cycle、frequency、i2c_device）
+
+    PWMActuation(pca=FakePCA9685()) のように渡すと、I2Cなしで apply() の経路を実行できる。
+    i2c_device はレジスタへの書き込みをチャンネルの書き込みとして記録し、トランザクション数を数える。
+    """
+
+    def __init__(self, num_channels: int = 16):
+        """
+        初期化
+
+        Args:
+            num_channels: チャンネル数
+        """
+        self.i2c_device = PCA9685RegisterBus()
+        self.channels: Tuple[RecordingChannel, ...] = tuple(
+            RecordingChannel(i, self.i2c_device) for i in range(num_channels)
+        )
+        self.i2c_device.channels = self.channels
+        self.frequency = 0
+
+    @property
+    def write_count(self) -> int:
+        """全チャンネルへの書き込み回数の合計"""
+        return sum(len(ch.writes) for ch in self.channels)
+
+    def clear(self) -> None:
+        """全チャンネルの書き込み履歴とバスの計数を消去"""
+        for ch in self.channels:
+            ch.clear()
+        self.i2c_device.reset_counters()
+
+    def deinit(self) -> None:
+        """PCA9685.deinit() 互換（何もしない）"""
@@ -4,59 +4,158 @@
 # --------------------------------
 from __future__ import annotations
 
-import time
-from typing import Optional
-
-# ハードウェアモジュールのインポート（ラズベリーパイ環境専用）
-import board
-import busio
-from adafruit_pca9685 import PCA9685
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 from ..domain.command import Command, DriveMode
 from ..domain.actuation import ActuationCalibration, Telemetry, ActuationStatus
-from ..interfaces.protocols import Actuation
+from ..interfaces.protocols import Actuation, Clock
+from ..clock import system_clock
+
+if TYPE_CHECKING:
+    from adafruit_pca9685 import PCA9685
 
 # config から定数と関数をインポート
-from ..config import hardware, set_us, timing
+from ..config import hardware, timing, us_to_duty
 
 # 定数をローカル変数として定義（後方互換性のため）
 PCA9685_FREQUENCY = hardware.pca9685.FREQUENCY
 CH_ESC = hardware.pca9685.CH_ESC
 CH_SERVO = hardware.pca9685.CH_SERVO
 
+# PCA9685 のチャンネルごとのレジスタ（LEDn_ON_L, ON_H, OFF_L, OFF_H の4バイト）
+# MODE1 の自動インクリメント（adafruit_pca9685 は frequency 設定時に有効にする）で連続したチャンネルを1回で書ける
+LED0_ON_L = 0x06
+LED_REGISTER_STRIDE = 4
+# ON/OFF のカウント値（12bit）の bit12（ON_H/OFF_H の bit4）。ON側は常時ON、OFF側は常時OFF（OFF側が優先）
+LED_FULL = 0x1000
+
+
+def duty_to_registers(duty: int, out: bytearray, offset: int = 0) -> None:
+    """
+    duty_cycle値（16bit）をチャンネルの4バイトのレジスタ値にする（adafruit_pca9685 3.4 の duty_cycle と同じ換算）
+
+    0xFFFF は常時ON（ON=0x1000, OFF=0）、0x0010 未満は常時OFF（ON=0, OFF=0x1000）、
+    それ以外は ON=0, OFF=duty >> 4（下位4bitを切り捨てて12bitにする）。
+
+    Args:
+        duty: duty_cycle値（0〜0xFFFF）
+        out: 書き込み先のバッファ
+        offset: 書き込み先の位置
+    """
+    if duty == 0xFFFF:
+        on, off = LED_FULL, 0
+    elif duty < 0x0010:
+        on, off = 0, LED_FULL
+    else:
+        on, off = 0, duty >> 4
+    out[offset] = on & 0xFF
+    out[offset + 1] = on >> 8
+    out[offset + 2] = off & 0xFF
+    out[offset + 3] = off >> 8
+
+
+def registers_to_duty(registers, offset: int = 0) -> int:
+    """
+    チャンネルの4バイトのレジスタ値をduty_cycle値（16bit）に戻す（adafruit_pca9685 の duty_cycle の読み出しと同じ換算）
+
+    Args:
+        registers: レジスタ値のバッファ
+        offset: チャンネルの LEDn_ON_L の位置
+
+    Returns:
+        int: duty_cycle値（常時ONは0xFFFF、常時OFFは0、それ以外は OFF << 4）
+    """
+    on = registers[offset] | (registers[offset + 1] << 8)
+    off = registers[offset + 2] | (registers[offset + 3] << 8)
+    if on & LED_FULL:
+        return 0xFFFF
+    if off & LED_FULL:
+        return 0
+    return off << 4
+
 
 class PWMActuation:
     """
     PCA9685を使用したPWM制御によるActuation実装。
-    func_explain.md の set_us() 関数を利用。
+    func_explain.md の set_us() と同じ換算でμs値をduty_cycle値にする。
+
+    チャンネルごとに最後に書いたduty_cycle値を覚えておき、同じ値の書き込みは省く。
+    ESCとサーボの両方が変わった場合は、隣り合うチャンネルのレジスタを1回のI2Cトランザクションでまとめて書く
+    （PCA9685 が i2c_device を持つ場合。持たない場合はチャンネルごとに duty_cycle を設定する）。
+    writes_issued / writes_skipped / burst_writes / transactions で、ToFセンサーに空けたバス時間を計測できる。
+
+    キャリブレーションは configure() で変換表（1/lut_steps 刻みのステアリング・スロットル → μs値・duty_cycle値・
+    レジスタ値）にしておき、apply() は値を丸めて表を引くだけにする。キャリブレーションが変わると表を作り直す。
     """
     
-    def __init__(self, i2c_address: int = hardware.pca9685.I2C_ADDRESS):
+    def __init__(
+        self,
+        i2c_address: int = hardware.pca9685.I2C_ADDRESS,
+        pca: Optional["PCA9685"] = None,
+        clock: Clock = system_clock,
+        lut_steps: int = hardware.pca9685.LUT_STEPS,
+    ):
         """
         初期化
         
         Args:
             i2c_address: PCA9685のI2Cアドレス。デフォルトは設定ファイルの値（0x40）
+            pca: 初期化済みのPCA9685（またはchannels属性を持つ互換オブジェクト）。
+                 Noneの場合は初回の configure()/apply() でI2Cから生成する
+            clock: 時計（configure() 後のESCニュートラル待機に使う）。デフォルトは実時間の単調時計
+            lut_steps: 変換表の1.0あたりの刻み数。デフォルトは設定ファイルの値
         """
         self.i2c_address = i2c_address
+        self.clock = clock
         self._calib: Optional[ActuationCalibration] = None
-        self._pca: Optional[PCA9685] = None
+        self._pca: Optional["PCA9685"] = pca
         self._esc_channel = None
         self._servo_channel = None
         self._is_initialized = False
-        
+        # I2Cデバイス（レジスタの直接書き込み用）と、チャンネルごとに最後に書いたduty_cycle値
+        self._device = None
+        self._last_duty: Dict[int, int] = {}
+        self._single_buffer = bytearray(1 + LED_REGISTER_STRIDE)
+        self._burst_buffer = bytearray(1 + 2 * LED_REGISTER_STRIDE)
+        self.writes_issued = 0   # 書き込んだチャンネル数
+        self.writes_skipped = 0  # 前回と同じ値で省いたチャンネル数
+        self.burst_writes = 0    # 2チャンネルをまとめて書いた回数
+        self.transactions = 0    # 書き込みのI2Cトランザクション数（duty_cycle の設定は1回と数える）
+        # PWMフレームの先頭の基準時刻（周波数の設定で発振器を再起動した時刻、秒）。初期化前は None
+        self.frame_origin_sec: Optional[float] = None
+        # 変換表（添字 i はステアリング (i - lut_steps) / lut_steps、スロットル i / lut_steps）
+        self.lut_steps = lut_steps
+        self._table_calib: Optional[ActuationCalibration] = None
+        self._steer_us: List[int] = []
+        self._steer_duty: List[int] = []
+        self._steer_regs: List[bytes] = []
+        self._throttle_us: List[int] = []
+        self._throttle_duty: List[int] = []
+        self._throttle_regs: List[bytes] = []
+
     def _initialize_hardware(self) -> None:
         """ハードウェアを初期化"""
         if self._is_initialized:
             return
         
         try:
-            i2c = busio.I2C(board.SCL, board.SDA)
-            self._pca = PCA9685(i2c, address=self.i2c_address)
+            if self._pca is None:
+                # ハードウェアモジュールのインポート（ラズベリーパイ環境専用）
+                # PCA9685を外から渡す場合（ベンチマーク等）は実機なしで使えるよう、ここで遅延インポートする
+                import board
+                import busio
+                from adafruit_pca9685 import PCA9685
+
+                i2c = busio.I2C(board.SCL, board.SDA)
+                self._pca = PCA9685(i2c, address=self.i2c_address)
             self._pca.frequency = PCA9685_FREQUENCY
+            # 周波数の設定は発振器を再起動するので、PWMのカウンターはここから数え直す
+            self.frame_origin_sec = self.clock.now()
             
             self._esc_channel = self._pca.channels[CH_ESC]
             self._servo_channel = self._pca.channels[CH_SERVO]
+            self._device = getattr(self._pca, "i2c_device", None)
+            self._last_duty.clear()
             
             self._is_initialized = True
         except Exception as e:
@@ -74,12 +173,12 @@ class PWMActuation:
         
         # 初期状態でニュートラル位置に設定
         if self._calib:
-            set_us(self._esc_channel, self._calib.throttle_stop_us)
-            set_us(self._servo_channel, self._calib.steer_center_us)
+            self._build_tables()
+            self._write_neutral()
             
             # ESCニュートラル設定後の待機（drive_test.pyと同様の処理）
             print("ESC: Neutral (停止)")
-            time.sleep(timing.test.MOVE_WAIT)
+            self.clock.sleep(timing.test.MOVE_WAIT)
     
     def _steer_to_us(self, steer: float) -> int:
         """
@@ -161,22 +260,29 @@ class PWMActuation:
                 )
         
         try:
-            # STOPモードの場合は停止
+            if self._table_calib is not self._calib:
+                self._build_tables()
+            steps = self.lut_steps
+
+            # STOPモードの場合は停止（表の先頭が throttle=0.0、つまり throttle_stop_us）
             if command.mode == DriveMode.STOP:
-                throttle_us = self._calib.throttle_stop_us
+                ti = 0
                 applied_throttle = 0.0
             else:
-                # スロットル値を変換
-                throttle_us = self._throttle_to_us(command.throttle)
+                # スロットル値を変換（刻みに丸めて表を引く。リミットは表に織り込み済み）
+                ti = min(max(int(command.throttle * steps + 0.5), 0), steps)
                 applied_throttle = command.throttle
             
             # ステアリング値を変換
-            steer_us = self._steer_to_us(command.steer)
+            si = min(max(int((command.steer + 1.0) * steps + 0.5), 0), 2 * steps)
             applied_steer = command.steer
+            throttle_us = self._throttle_us[ti]
+            steer_us = self._steer_us[si]
             
-            # PWM信号を設定（func_explain.md の set_us() 関数を使用）
-            set_us(self._esc_channel, throttle_us)
-            set_us(self._servo_channel, steer_us)
+            # PWM信号を設定（前回と同じ値は書かない）
+            self._write_duty(
+                self._throttle_duty[ti], self._throttle_regs[ti], self._steer_duty[si], self._steer_regs[si]
+            )
             
             return Telemetry(
                 frame_id=command.frame_id,
@@ -215,9 +321,8 @@ class PWMActuation:
             )
         
         try:
-            # ニュートラル位置に設定
-            set_us(self._esc_channel, self._calib.throttle_stop_us)
-            set_us(self._servo_channel, self._calib.steer_center_us)
+            # ニュートラル位置に設定（停止は前回の値に関係なく必ず書く）
+            self._write_neutral()
             
             return Telemetry(
                 frame_id=0,
@@ -244,8 +349,7 @@ class PWMActuation:
             # 停止状態に設定
             try:
                 if self._calib:
-                    set_us(self._esc_channel, self._calib.throttle_stop_us)
-                    set_us(self._servo_channel, self._calib.steer_center_us)
+                    self._write_neutral()
             except Exception:
                 pass  # エラーは無視
             
@@ -253,3 +357,120 @@ class PWMActuation:
             self._pca = None
             self._esc_channel = None
             self._servo_channel = None
+            self._device = None
+            self._last_duty.clear()
+
+    def invalidate_cache(self) -> None:
+        """最後に書いたduty_cycle値を忘れる（他のプロセスがPCA9685に書いた後、次の apply() で両チャンネルを書き直す）"""
+        self._last_duty.clear()
+
+    def reset_write_counters(self) -> None:
+        """書き込みの統計をリセット"""
+        self.writes_issued = 0
+        self.writes_skipped = 0
+        self.burst_writes = 0
+        self.transactions = 0
+
+    def _build_tables(self) -> None:
+        """キャリブレーションから変換表を作る（μs値は _steer_to_us / _throttle_to_us と同じ換算）"""
+        steps = self.lut_steps
+        if steps <= 0:
+            raise ValueError(f"lut_steps must be positive: {steps}")
+        self._steer_us = [self._steer_to_us((i - steps) / steps) for i in range(2 * steps + 1)]
+        self._throttle_us = [self._throttle_to_us(i / steps) for i in range(steps + 1)]
+        self._steer_duty = [us_to_duty(us) for us in self._steer_us]
+        self._throttle_duty = [us_to_duty(us) for us in self._throttle_us]
+        self._steer_regs = [self._registers(duty) for duty in self._steer_duty]
+        self._throttle_regs = [self._registers(duty) for duty in self._throttle_duty]
+        self._table_calib = self._calib
+
+    @staticmethod
+    def _registers(duty: int) -> bytes:
+        """duty_cycle値のチャンネルの4バイトのレジスタ値"""
+        regs = bytearray(LED_REGISTER_STRIDE)
+        duty_to_registers(duty, regs)
+        return bytes(regs)
+
+    def _write_neutral(self) -> None:
+        """ESCを停止・サーボを中央にする（前回の値に関係なく両方書く）"""
+        if self._table_calib is not self._calib:
+            self._build_tables()
+        center = self.lut_steps
+        self._write_duty(
+            self._throttle_duty[0], self._throttle_regs[0],
+            self._steer_duty[center], self._steer_regs[center],
+            force=True,
+        )
+
+    def _write_duty(
+        self,
+        esc_duty: int,
+        esc_regs: bytes,
+        servo_duty: int,
+        servo_regs: bytes,
+        force: bool = False,
+    ) -> None:
+        """
+        ESCとサーボのduty_cycle値を書き込む（前回と同じ値のチャンネルは省く）
+
+        Args:
+            esc_duty: ESCのduty_cycle値
+            esc_regs: ESCのレジスタ値（4バイト）
+            servo_duty: サーボのduty_cycle値
+            servo_regs: サーボのレジスタ値（4バイト）
+            force: 前回の値に関係なく両方書くか
+
+        Raises:
+            Exception: I2Cの書き込みに失敗した場合（前回の値は不明として忘れる）
+        """
+        last = self._last_duty
+        esc_changed = force or last.get(CH_ESC) != esc_duty
+        servo_changed = force or last.get(CH_SERVO) != servo_duty
+        self.writes_skipped += (not esc_changed) + (not servo_changed)
+        if not (esc_changed or servo_changed):
+            return
+
+        try:
+            if esc_changed and servo_changed and self._device is not None and abs(CH_ESC - CH_SERVO) == 1:
+                # 隣り合う2チャンネルのレジスタを1回で書く（アドレスの小さいチャンネルから）
+                low_channel = min(CH_ESC, CH_SERVO)
+                buf = self._burst_buffer
+                buf[0] = LED0_ON_L + LED_REGISTER_STRIDE * low_channel
+                first, second = (esc_regs, servo_regs) if CH_ESC == low_channel else (servo_regs, esc_regs)
+                buf[1:1 + LED_REGISTER_STRIDE] = first
+                buf[1 + LED_REGISTER_STRIDE:] = second
+                with self._device as i2c:
+                    i2c.write(buf)
+                self.burst_writes += 1
+                self.transactions += 1
+            else:
+                if esc_changed:
+                    self._write_channel(CH_ESC, self._esc_channel, esc_duty, esc_regs)
+                if servo_changed:
+                    self._write_channel(CH_SERVO, self._servo_channel, servo_duty, servo_regs)
+        except Exception:
+            last.clear()
+            raise
+        last[CH_ESC] = esc_duty
+        last[CH_SERVO] = servo_duty
+        self.writes_issued += esc_changed + servo_changed
+
+    def _write_channel(self, channel: int, channel_obj, duty: int, regs: bytes) -> None:
+        """
+        1チャンネルのduty_cycle値を書き込む（1トランザクション）
+
+        Args:
+            channel: チャンネル番号
+            channel_obj: PCA9685のチャンネルオブジェクト（I2Cデバイスがない場合に使う）
+            duty: duty_cycle値
+            regs: レジスタ値（4バイト、I2Cデバイスに直接書く場合に使う）
+        """
+        if self._device is None:
+            channel_obj.duty_cycle = duty
+        else:
+            buf = self._single_buffer
+            buf[0] = LED0_ON_L + LED_REGISTER_STRIDE * channel
+            buf[1:] = regs
+            with self._device as i2c:
+                i2c.write(buf)
+        self.transactions += 1
@@ -0,0 +1,253 @@
+# --------------------------------
+# actuation/worker.py
+# 駆動モジュールを専用スレッドで動かし、最新のコマンドだけを書き込むラッパー
+# --------------------------------
+from __future__ import annotations
+
+import sys
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, List, Optional
+
+from ..domain.command import Command
+from ..domain.actuation import ActuationCalibration, ActuationStatus, Telemetry
+from ..interfaces.protocols import Actuation, Clock
+from ..clock import system_clock
+from ..config import orchestrator
+
+# 書き込み完了の通知先（テレメトリ, 書き込み開始時刻, 書き込み完了時刻）。駆動スレッドから呼ばれる
+TelemetryListener = Callable[[Telemetry, float, float], None]
+
+
+class _Request:
+    """駆動スレッドで実行して結果を待つ要求（configure / stop / close）"""
+
+    def __init__(self, fn: Callable[[], Any]):
+        self.fn = fn
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class ActuationWorker:
+    """
+    駆動モジュール（PWMActuation など）を専用スレッドで動かすActuation実装
+
+    PCA9685 への書き込みは全て駆動スレッドが行う。apply() はコマンドを1件だけの郵便受けに入れてすぐ戻り
+    （まだ書いていないコマンドがあれば新しいコマンドで置き換えて superseded に数える）、
+    駆動スレッドは郵便受けの最新のコマンドだけを書き込む。I2Cの書き込みが遅れても制御ループは待たない。
+
+    書き込み結果のテレメトリは add_listener() で登録した関数に駆動スレッドから渡す（last_telemetry でも参照できる）。
+    apply() の戻り値は受け付けたことを示す QUEUED のテレメトリ。
+
+    stop() は郵便受けのコマンドを捨て、書き込み中のコマンドが終わりしだい他のコマンドより先に停止を書き込んで、
+    その結果を返す（駆動スレッドが応答しない場合は stop_timeout_sec で諦めて DRIVER_ERROR を返す）。
+    configure() と close() も駆動スレッドで実行し、完了を待つ。
+    """
+
+    def __init__(
+        self,
+        actuation: Actuation,
+        clock: Clock = system_clock,
+        stop_timeout_sec: float = orchestrator.ACTUATION_STOP_TIMEOUT_SEC,
+    ):
+        """
+        初期化（スレッドは初回の configure()/apply()/stop() で起動する）
+
+        Args:
+            actuation: 駆動スレッドで動かす駆動モジュール（以降は駆動スレッド以外から触らないこと）
+            clock: 時計（書き込みの開始・完了時刻に使う）。デフォルトは実時間の単調時計
+            stop_timeout_sec: stop() が停止の書き込み完了を待つ時間（秒）。デフォルトは設定ファイルの値
+        """
+        self.actuation = actuation
+        self.clock = clock
+        self.stop_timeout_sec = stop_timeout_sec
+        self._cond = threading.Condition()
+        self._command: Optional[Command] = None  # 郵便受け（最新のコマンド1件）
+        self._requests: Deque[_Request] = deque()  # コマンドより先に実行する要求
+        self._invalidate = False  # 次の書き込みの前に駆動モジュールの書き込み済みの値を忘れさせるか
+        self._listeners: List[TelemetryListener] = []
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self.last_telemetry: Optional[Telemetry] = None
+        self.submitted = 0   # apply() で受け付けたコマンド数
+        self.superseded = 0  # 書き込む前に新しいコマンドで置き換えた（または停止で捨てた）数
+        self.applied = 0     # 書き込んだコマンド数
+        self.errors = 0      # 書き込みで例外が出た回数
+
+    def add_listener(self, listener: TelemetryListener) -> None:
+        """
+        書き込み完了の通知先を登録（駆動スレッドから呼ばれるので、重い処理はしないこと）
+
+        Args:
+            listener: (テレメトリ, 書き込み開始時刻, 書き込み完了時刻) を受け取る関数
+        """
+        self._listeners.append(listener)
+
+    def start(self) -> None:
+        """駆動スレッドを起動（起動済みなら何もしない）"""
+        with self._cond:
+            if self._thread is not None:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name="actuation-worker", daemon=True)
+            self._thread.start()
+
+    def configure(self, calib: ActuationCalibration) -> None:
+        """
+        キャリブレーションを設定（駆動スレッドで実行して完了を待つ）
+
+        Args:
+            calib: キャリブレーションパラメータ
+        """
+        self._call(lambda: self.actuation.configure(calib), timeout_sec=None)
+
+    def apply(self, command: Command) -> Telemetry:
+        """
+        コマンドを郵便受けに入れる（書き込みは駆動スレッドが行う）
+
+        Args:
+            command: 制御コマンド
+
+        Returns:
+            Telemetry: 受け付けたことを示すテレメトリ（status=QUEUED）
+        """
+        self.start()
+        with self._cond:
+            if self._command is not None:
+                self.superseded += 1
+            self._command = command
+            self.submitted += 1
+            self._cond.notify()
+        return Telemetry(
+            frame_id=command.frame_id,
+            t_capture_sec=command.t_capture_sec,
+            status=ActuationStatus.QUEUED,
+        )
+
+    def stop(self, reason: str = "emergency") -> Telemetry:
+        """
+        停止（郵便受けのコマンドを捨て、他のコマンドより先に駆動スレッドで停止を書き込む）
+
+        Args:
+            reason: 停止理由
+
+        Returns:
+            Telemetry: 停止処理の結果。駆動スレッドが stop_timeout_sec 以内に応答しない場合は DRIVER_ERROR
+        """
+        try:
+            return self._call(lambda: self.actuation.stop(reason), self.stop_timeout_sec, preempt=True)
+        except TimeoutError as e:
+            return Telemetry(
+                frame_id=0,
+                t_capture_sec=0.0,
+                status=ActuationStatus.DRIVER_ERROR,
+                message=f"Stop timed out: {e}",
+            )
+
+    def close(self) -> None:
+        """郵便受けのコマンドを捨てて駆動モジュールを閉じ、駆動スレッドを終了"""
+        if self._thread is not None:
+            try:
+                self._call(self.actuation.close, self.stop_timeout_sec, preempt=True)
+            except TimeoutError:
+                pass  # 応答しない駆動スレッドはデーモンなので待たない
+            with self._cond:
+                self._running = False
+                self._cond.notify()
+            self._thread.join(self.stop_timeout_sec)
+            self._thread = None
+        else:
+            self.actuation.close()
+
+    def invalidate_cache(self) -> None:
+        """次の書き込みの前に、駆動モジュールが覚えている書き込み済みの値を忘れさせる（待たない）"""
+        with self._cond:
+            self._invalidate = True
+
+    @property
+    def pending(self) -> bool:
+        """まだ書き込んでいないコマンドがあるか"""
+        with self._cond:
+            return self._command is not None
+
+    def _call(self, fn: Callable[[], Any], timeout_sec: Optional[float], preempt: bool = False) -> Any:
+        """
+        駆動スレッドで fn を実行して結果を返す
+
+        Args:
+            fn: 実行する関数
+            timeout_sec: 完了を待つ時間（秒、Noneで無制限）
+            preempt: 郵便受けのコマンドを捨てるか
+
+        Returns:
+            fn の戻り値
+
+        Raises:
+            TimeoutError: timeout_sec 以内に完了しなかった場合
+        """
+        if threading.current_thread() is self._thread:
+            return fn()
+        self.start()
+        request = _Request(fn)
+        with self._cond:
+            if preempt and self._command is not None:
+                self._command = None
+                self.superseded += 1
+            self._requests.append(request)
+            self._cond.notify()
+        if not request.done.wait(timeout_sec):
+            raise TimeoutError(f"actuation worker did not respond within {timeout_sec}s")
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _run(self) -> None:
+        """駆動スレッド（要求を優先し、なければ最新のコマンドを書き込む）"""
+        while True:
+            with self._cond:
+                while self._running and not self._requests and self._command is None:
+                    self._cond.wait()
+                if self._requests:
+                    request: Optional[_Request] = self._requests.popleft()
+                    command = None
+                elif self._command is not None:
+                    request = None
+                    command, self._command = self._command, None
+                    invalidate, self._invalidate = self._invalidate, False
+                else:
+                    return
+
+            if request is not None:
+                try:
+                    request.result = request.fn()
+                except BaseException as e:
+                    request.error = e
+                request.done.set()
+                continue
+
+            started = self.clock.now()
+            try:
+                if invalidate:
+                    invalidate_cache = getattr(self.actuation, "invalidate_cache", None)
+                    if invalidate_cache is not None:
+                        invalidate_cache()
+                telemetry = self.actuation.apply(command)
+            except Exception as e:
+                self.errors += 1
+                telemetry = Telemetry(
+                    frame_id=command.frame_id,
+                    t_capture_sec=command.t_capture_sec,
+                    status=ActuationStatus.DRIVER_ERROR,
+                    message=f"Actuation worker error: {e}",
+                )
+            done = self.clock.now()
+            self.applied += 1
+            self.last_telemetry = telemetry
+            for listener in self._listeners:
+                try:
+                    listener(telemetry, started, done)
+                except Exception as e:
+                    # 通知先の例外で駆動スレッドを止めない
+                    self.errors += 1
+                    print(f"[Actuation] listener error: {e}", file=sys.stderr)
@@ -0,0 +1,19 @@
+# bench パッケージ
+# 制御パイプラインの各ステージのレイテンシ・メモリ確保量のベンチマーク
+
+from .measure import BenchResult, measure
+from .cases import BenchCase, BenchInputs, build_cases, sample_inputs
+from .baseline import Regression, compare, load_baseline, save_baseline
+
+__all__ = [
+    "BenchResult",
+    "measure",
+    "BenchCase",
+    "BenchInputs",
+    "build_cases",
+    "sample_inputs",
+    "Regression",
+    "compare",
+    "load_baseline",
+    "save_baseline",
+]
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+制御パイプラインのベンチマークを実行するスクリプト
+
+使用例:
+    python -m prototype.bench --save                 # 結果をベースラインとして保存
+    python -m prototype.bench --compare              # ベースラインと比較（退行があれば終了コード1、ベースラインがなければ3）
+    python -m prototype.bench --only decision --iterations 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+
+from ..config import bench
+from .baseline import compare, load_baseline, save_baseline
+from .cases import build_cases
+from .measure import measure
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="制御パイプラインのベンチマーク")
+    parser.add_argument("--iterations", type=int, default=bench.ITERATIONS, help="計測する呼び出し回数")
+    parser.add_argument("--warmup", type=int, default=bench.WARMUP_ITERATIONS, help="計測前に捨てる呼び出し回数")
+    parser.add_argument("--only", help="名前にこの文字列を含むケースだけ実行")
+    parser.add_argument("--baseline", default=bench.BASELINE_PATH, help="ベースラインのパス")
+    parser.add_argument("--save", action="store_true", help="結果をベースラインとして保存")
+    parser.add_argument("--compare", action="store_true", help="ベースラインと比較")
+    parser.add_argument("--threshold", type=float, default=bench.REGRESSION_THRESHOLD, help="退行とみなす悪化の割合")
+    args = parser.parse_args()
+
+    all_cases = build_cases()
+    try:
+        cases = [c for c in all_cases if args.only is None or args.only in c.name]
+        if not cases:
+            print(f"[BENCH] no case matches '{args.only}'", file=sys.stderr)
+            return 2
+
+        print("CASE                     | P50(us) | P99(us) | MAX(us) | MEAN(us) | ALLOC(B/call) | RETAINED(B/call)")
+        results = []
+        for case in cases:
+            result = measure(
+                case.name,
+                case.fn,
+                after=case.after,
+                iterations=args.iterations,
+                warmup_iterations=args.warmup,
+            )
+            results.append(result)
+            print(
+                f"{result.name:<24} | {result.p50_us:7.2f} | {result.p99_us:7.2f} | {result.max_us:7.1f} | "
+                f"{result.mean_us:8.2f} | {result.alloc_bytes_per_call:13.0f} | {result.retained_bytes_per_call:16.1f}"
+            )
+
+        for case in cases:
+            if case.counters is not None:
+                values = " ".join(f"{k}={v:.2f}" for k, v in case.counters().items())
+                print(f"[BENCH] {case.name}: {values}")
+    finally:
+        # 計測しなかったケースの分も、作ったスレッドを終わらせる
+        for case in all_cases:
+            if case.close is not None:
+                case.close()
+
+    exit_code = 0
+    if args.compare:
+        try:
+            baseline = load_baseline(args.baseline)
+        except FileNotFoundError:
+            baseline = None
+        if baseline is None:
+            if args.save:
+                print(f"[BENCH] no baseline at {args.baseline}; saving the current results as the baseline")
+            else:
+                print(f"[BENCH] no baseline at {args.baseline}; run with --save to create one", file=sys.stderr)
+                exit_code = 3
+        else:
+            regressions = compare(results, baseline, threshold=args.threshold)
+            if regressions:
+                print(f"[BENCH] {len(regressions)} regression(s) against {args.baseline}:")
+                for r in regressions:
+                    print(f"[BENCH]   {r.summary()}")
+                exit_code = 1
+            else:
+                print(f"[BENCH] no regressions against {args.baseline}")
+
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f"[BENCH] saved baseline to {args.baseline}")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+# --------------------------------
+# bench/baseline.py
+# ベンチマーク結果のJSON保存とベースラインとの比較
+# --------------------------------
+from __future__ import annotations
+
+import json
+import os
+import platform
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+from ..config import bench
+from .measure import BenchResult
+
+BASELINE_VERSION: int = 1
+
+# 退行判定に使う指標と、その指標で無視する絶対差
+_TIME_METRICS = ("p50_us", "p99_us")
+_ALLOC_METRICS = ("alloc_bytes_per_call",)
+
+
+@dataclass(frozen=True)
+class Regression:
+    """ベースラインからの悪化"""
+
+    name: str
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline > 0 else float("inf")
+
+    def summary(self) -> str:
+        return f"{self.name} {self.metric}: {self.baseline:.2f} -> {self.current:.2f} (x{self.ratio:.2f})"
+
+
+def save_baseline(results: Sequence[BenchResult], path: str = bench.BASELINE_PATH) -> None:
+    """
+    ベンチマーク結果をベースラインとしてJSONに保存
+
+    Args:
+        results: ベンチマーク結果
+        path: 保存先のパス
+    """
+    log_dir = os.path.dirname(path)
+    if log_dir and not os.path.exists(log_dir):
+        os.makedirs(log_dir, exist_ok=True)
+    data = {
+        "version": BASELINE_VERSION,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": {r.name: r.to_dict() for r in results},
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def load_baseline(path: str = bench.BASELINE_PATH) -> Dict[str, BenchResult]:
+    """
+    ベースラインを読み込む
+
+    Args:
+        path: ベースラインのパス
+
+    Returns:
+        {ケース名: BenchResult}
+
+    Raises:
+        FileNotFoundError: ベースラインがない場合（--save で保存していない）
+        ValueError: 形式のバージョンが一致しない場合
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("version") != BASELINE_VERSION:
+        raise ValueError(f"Unsupported baseline version: {data.get('version')}")
+    return {name: BenchResult.from_dict(r) for name, r in data["results"].items()}
+
+
+def compare(
+    results: Sequence[BenchResult],
+    baseline: Dict[str, BenchResult],
+    threshold: float = bench.REGRESSION_THRESHOLD,
+    min_delta_us: float = bench.MIN_REGRESSION_DELTA_US,
+    min_delta_bytes: float = bench.MIN_REGRESSION_DELTA_BYTES,
+) -> List[Regression]:
+    """
+    ベースラインと比較して退行を抽出
+
+    ベースライン比で threshold を超えて悪化し、かつ絶対差が min_delta_* 以上のものを退行とする。
+    ベースラインにないケースは比較しない。
+
+    Args:
+        results: 今回のベンチマーク結果
+        baseline: load_baseline() の結果
+        threshold: 悪化とみなす割合（0.25 = 25%悪化）
+        min_delta_us: 無視するレイテンシの絶対差（μs）
+        min_delta_bytes: 無視するメモリ確保量の絶対差（バイト/呼び出し）
+
+    Returns:
+        List[Regression]: 退行のリスト（なければ空）
+    """
+    regressions: List[Regression] = []
+    for result in results:
+        base = baseline.get(result.name)
+        if base is None:
+            continue
+        for metrics, min_delta in ((_TIME_METRICS, min_delta_us), (_ALLOC_METRICS, min_delta_bytes)):
+            for metric in metrics:
+                old = getattr(base, metric)
+                new = getattr(result, metric)
+                if new > old * (1.0 + threshold) and new - old >= min_delta:
+                    regressions.append(Regression(result.name, metric, old, new))
+    return regressions
@@ -0,0 +1,294 @@
+# --------------------------------
+# bench/cases.py
+# 制御パイプラインの各ステージのベンチマークケース
+# --------------------------------
+from __future__ import annotations
+
+import itertools
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from ..domain.distance import DistanceData
+from ..domain.features import WallFeatures
+from ..domain.command import Command
+from ..perception import (
+    CorridorPerception,
+    DistanceFilterStage,
+    HampelFilter,
+    KalmanFilter1D,
+    MedianFilter,
+    ParticleFilterLocalizer,
+)
+from ..decision import CorridorDecision, DifferentialController
+from ..actuation import ActuationWorker, PWMActuation, FakePCA9685
+from ..orchestrator import LatencyTracer
+from ..sensors import FastVL53L0X, FakeVL53L0XBus
+from ..clock import VirtualClock
+from ..config import bench, decision, orchestrator
+from ..sim import build_simulation, default_calibration, default_course
+from ..maps import TrackMap, build_ray_table
+
+
+@dataclass(frozen=True)
+class BenchCase:
+    """ベンチマークケース"""
+
+    name: str
+    fn: Callable[[], object]                  # 計測対象
+    after: Optional[Callable[[], None]] = None  # 毎回の後処理（計測に含めない）
+    counters: Optional[Callable[[], Dict[str, float]]] = None  # 1呼び出しあたりの追加指標（I2Cトランザクション数など）
+    close: Optional[Callable[[], None]] = None  # 計測後の後片付け（スレッドの終了など）
+
+
+@dataclass(frozen=True)
+class BenchInputs:
+    """シミュレーター走行で得た各ステージの入力列"""
+
+    distance_data: List[DistanceData]
+    features: List[WallFeatures]
+    commands: List[Command]
+
+
+class _CapturingPerception:
+    """知覚の入出力を横取りして記録するラッパー"""
+
+    def __init__(self, perception: CorridorPerception, inputs: BenchInputs):
+        self._perception = perception
+        self._inputs = inputs
+
+    def analyze(self, data: DistanceData) -> WallFeatures:
+        features = self._perception.analyze(data)
+        self._inputs.distance_data.append(data)
+        self._inputs.features.append(features)
+        return features
+
+
+class _CapturingDecision:
+    """判断の出力を横取りして記録するラッパー"""
+
+    def __init__(self, decision: CorridorDecision, inputs: BenchInputs):
+        self._decision = decision
+        self._inputs = inputs
+
+    def decide(self, features: WallFeatures) -> Command:
+        command = self._decision.decide(features)
+        self._inputs.commands.append(command)
+        return command
+
+
+def sample_inputs(frames: int = bench.INPUT_FRAMES) -> BenchInputs:
+    """
+    シミュレーターで走らせて、実走行に近い入力列を作る（直線とカーブの両方の分岐を通るように）
+
+    Args:
+        frames: 走らせるフレーム数
+
+    Returns:
+        BenchInputs: 入力列
+    """
+    inputs = BenchInputs(distance_data=[], features=[], commands=[])
+    clock = VirtualClock()
+    world, orch, _ = build_simulation(
+        course=default_course(with_fork=False),
+        perception=_CapturingPerception(CorridorPerception(), inputs),
+        decision=_CapturingDecision(CorridorDecision(clock=clock), inputs),
+        clock=clock,
+    )
+    for _ in range(frames):
+        orch.run_once()
+        world.advance(orchestrator.LOOP_INTERVAL_SEC)
+    return inputs
+
+
+def build_cases(inputs: Optional[BenchInputs] = None) -> List[BenchCase]:
+    """
+    全ベンチマークケースを作る
+
+    Args:
+        inputs: 入力列（Noneの場合は sample_inputs() で作る）
+
+    Returns:
+        List[BenchCase]: ケースのリスト
+    """
+    if inputs is None:
+        inputs = sample_inputs()
+    period = orchestrator.LOOP_INTERVAL_SEC
+
+    # 知覚
+    perception = CorridorPerception()
+    distance_iter = itertools.cycle(inputs.distance_data)
+
+    def perception_analyze() -> object:
+        return perception.analyze(next(distance_iter))
+
+    # 距離フィルタ単体（前方センサーの値を制御周期ごとの時刻で1サンプルずつ入れる）
+    front_values = [d.front_mm for d in inputs.distance_data]
+
+    def filter_update(f) -> Callable[[], object]:
+        index = [0]
+
+        def update() -> object:
+            i = index[0]
+            index[0] = i + 1
+            return f.update(front_values[i % len(front_values)], i * period)
+
+        return update
+
+    # 距離フィルタ段（3チャンネル、Hampel）。毎回すべてのチャンネルが更新されるよう計測時刻を振り直す
+    filter_stage = DistanceFilterStage(HampelFilter)
+    stage_inputs = [
+        DistanceData(
+            front_mm=d.front_mm,
+            right_front_mm=d.right_front_mm,
+            left_front_mm=d.left_front_mm,
+            timestamp=i * period,
+        )
+        for i, d in enumerate(inputs.distance_data)
+    ]
+    stage_iter = itertools.cycle(stage_inputs)
+
+    def filter_stage_apply() -> object:
+        return filter_stage.apply(next(stage_iter))
+
+    # 判断（D制御の時間差分が一定になるよう仮想時計を制御周期ずつ進める）
+    decision_clock = VirtualClock()
+    corridor_decision = CorridorDecision(clock=decision_clock)
+    features_iter = itertools.cycle(inputs.features)
+
+    def decision_decide() -> object:
+        decision_clock.advance(period)
+        return corridor_decision.decide(next(features_iter))
+
+    # D制御器単体
+    controller = DifferentialController(
+        kd=decision.corridor.KD,
+        smoothing_factor=decision.corridor.DIFFERENTIAL_SMOOTHING_FACTOR,
+        clock=VirtualClock(),
+    )
+    errors = [f.left_right_error for f in inputs.features]
+    error_index = [0]
+
+    def differential_update() -> object:
+        i = error_index[0]
+        error_index[0] = i + 1
+        # 入力列を周回しても時刻が単調増加になるよう、呼び出し回数から時刻を作る
+        return controller.update(errors[i % len(errors)], i * period)
+
+    # 駆動（I2Cの代わりに書き込みを記録する PCA9685 互換オブジェクト）
+    pca = FakePCA9685()
+    actuation = PWMActuation(pca=pca, clock=VirtualClock())
+    actuation.configure(default_calibration())
+    actuation.reset_write_counters()
+    commands_iter = itertools.cycle(inputs.commands)
+
+    def actuation_apply() -> object:
+        return actuation.apply(next(commands_iter))
+
+    def actuation_counters() -> Dict[str, float]:
+        calls = max(actuation.writes_issued + actuation.writes_skipped, 1) / 2
+        return {
+            "i2c_transactions_per_call": actuation.transactions / calls,
+            "writes_skipped_per_call": actuation.writes_skipped / calls,
+        }
+
+    # 駆動スレッドへの受け渡し。制御ループと同じく1回ずつ書き込みを待ってから次を渡すので、
+    # 郵便受けは毎回空（置き換えにならない）で、駆動スレッドは待機から起こされる
+    worker = ActuationWorker(PWMActuation(pca=FakePCA9685(), clock=VirtualClock()))
+    worker.configure(default_calibration())
+    worker_commands = itertools.cycle(inputs.commands)
+    worker_written = threading.Event()
+    worker.add_listener(lambda telemetry, started, done: worker_written.set())
+
+    def wait_worker_written() -> None:
+        if not worker_written.wait(worker.stop_timeout_sec):
+            raise RuntimeError("actuation worker did not write the command")
+        worker_written.clear()
+
+    def worker_apply() -> object:
+        # 制御ループ側の apply() の負担（書き込みは計測の外で待つ）
+        return worker.apply(next(worker_commands))
+
+    def worker_handoff() -> object:
+        # 郵便受けに入れてから駆動スレッドが書き込みを終えるまで（スレッドの起床と書き込みを含む）
+        telemetry = worker.apply(next(worker_commands))
+        wait_worker_written()
+        return telemetry
+
+    def worker_counters() -> Dict[str, float]:
+        calls = max(worker.submitted, 1)
+        return {"superseded_per_call": worker.superseded / calls}
+
+    # センサー読み出し（FastVL53L0X、3台とも計測完了した状態からの poll 相当）
+    buses = [FakeVL53L0XBus() for _ in range(3)]
+    devices = [FastVL53L0X(bus) for bus in buses]
+    distances = [(int(d.front_mm), int(d.right_front_mm), int(d.left_front_mm)) for d in inputs.distance_data]
+    distance_index = [0]
+    poll_calls = [0]
+
+    def fast_poll() -> object:
+        poll_calls[0] += 1
+        return [device.range if device.data_ready else None for device in devices]
+
+    def complete_measurements() -> None:
+        values = distances[distance_index[0] % len(distances)]
+        distance_index[0] += 1
+        for bus, value in zip(buses, values):
+            bus.complete_measurement(value)
+
+    def fast_poll_counters() -> Dict[str, float]:
+        calls = max(poll_calls[0], 1)
+        return {
+            "i2c_transactions_per_call": sum(b.transactions for b in buses) / calls,
+            "i2c_bytes_per_call": sum(b.bytes_read + b.bytes_written for b in buses) / calls,
+        }
+
+    complete_measurements()
+
+    # 自己位置推定（シミュレーターのコースから作ったレイキャスト表。記録した指令値を同じ順に与える）
+    localizer = ParticleFilterLocalizer(build_ray_table(TrackMap.from_course(default_course(with_fork=False))))
+    localizer_index = [0]
+
+    def localizer_update() -> object:
+        i = localizer_index[0]
+        localizer.observe_command(inputs.commands[i])
+        return localizer.update(inputs.distance_data[i])
+
+    def localizer_next() -> None:
+        # 入力列の先頭に戻るときは、時刻が巻き戻るのでスタート位置からやり直す
+        localizer_index[0] = (localizer_index[0] + 1) % len(inputs.distance_data)
+        if localizer_index[0] == 0:
+            localizer.reset()
+
+    # 遅延トレース（1フレーム分の時刻の集計。区間は数百µs〜数ms）
+    tracer = LatencyTracer()
+    frame_ids = itertools.count(1)
+
+    def latency_record() -> object:
+        frame_id = next(frame_ids)
+        t = frame_id * period
+        tracer.record(frame_id, t, t + 0.004, t + 0.0045, t + 0.0047, t + 0.0052)
+        return tracer
+
+    # 1サイクル全体（シミュレーターのセンサー・駆動）
+    world, orch, _ = build_simulation(course=default_course(with_fork=False))
+
+    def advance_world() -> None:
+        world.advance(period)
+
+    return [
+        BenchCase("perception.analyze", perception_analyze),
+        BenchCase("filter.median.update", filter_update(MedianFilter())),
+        BenchCase("filter.hampel.update", filter_update(HampelFilter())),
+        BenchCase("filter.kalman.update", filter_update(KalmanFilter1D())),
+        BenchCase("filter_stage.apply", filter_stage_apply),
+        BenchCase("decision.decide", decision_decide),
+        BenchCase("differential.update", differential_update),
+        BenchCase("localizer.update", localizer_update, after=localizer_next),
+        BenchCase("vl53l0x_fast.poll", fast_poll, after=complete_measurements, counters=fast_poll_counters),
+        BenchCase("pwm_actuation.apply", actuation_apply, after=pca.clear, counters=actuation_counters),
+        BenchCase("actuation_worker.apply", worker_apply, after=wait_worker_written),
+        BenchCase("actuation_worker.handoff", worker_handoff, counters=worker_counters, close=worker.close),
+        BenchCase("latency.record", latency_record),
+        BenchCase("orchestrator.run_once", orch.run_once, after=advance_world),
+    ]
@@ -0,0 +1,120 @@
+# --------------------------------
+# bench/measure.py
+# 1呼び出しごとのレイテンシとメモリ確保量の計測
+# --------------------------------
+from __future__ import annotations
+
+import gc
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional
+
+from ..config import bench
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    """1ケース分のベンチマーク結果"""
+
+    name: str
+    iterations: int
+    p50_us: float
+    p99_us: float
+    max_us: float
+    mean_us: float
+    alloc_bytes_per_call: float     # 1呼び出し中に確保されたメモリのピーク（バイト、平均）
+    retained_bytes_per_call: float  # 呼び出し後も解放されずに残ったメモリ（バイト、平均）
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> BenchResult:
+        return cls(**data)
+
+
+def _percentile(sorted_samples: list, q: float) -> float:
+    """最近傍順位法による分位点（sorted_samples は昇順）"""
+    index = min(len(sorted_samples) - 1, max(0, int(round(q * (len(sorted_samples) - 1)))))
+    return sorted_samples[index]
+
+
+def measure(
+    name: str,
+    fn: Callable[[], object],
+    after: Optional[Callable[[], None]] = None,
+    iterations: int = bench.ITERATIONS,
+    warmup_iterations: int = bench.WARMUP_ITERATIONS,
+    allocation_iterations: int = bench.ALLOCATION_ITERATIONS,
+) -> BenchResult:
+    """
+    fn を繰り返し呼び出してレイテンシ分布とメモリ確保量を計測
+
+    レイテンシは perf_counter_ns で1呼び出しずつ測り、GCは計測中だけ止める。
+    メモリ確保量は tracemalloc を有効にした別パスで測る（tracemalloc はレイテンシを歪めるため）。
+
+    Args:
+        name: ケース名
+        fn: 計測対象（引数なしで呼び出せること）
+        after: 毎回 fn の後に呼ぶ後処理（計測に含めない）。シミュレーターの時間を進める等
+        iterations: 計測する呼び出し回数
+        warmup_iterations: 計測前に捨てる呼び出し回数
+        allocation_iterations: メモリ確保量を測る呼び出し回数
+
+    Returns:
+        BenchResult: 計測結果
+    """
+    if iterations <= 0:
+        raise ValueError(f"iterations must be positive, got {iterations}")
+
+    for _ in range(warmup_iterations):
+        fn()
+        if after is not None:
+            after()
+
+    perf_counter_ns = time.perf_counter_ns
+    samples = [0] * iterations
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for i in range(iterations):
+            t0 = perf_counter_ns()
+            fn()
+            samples[i] = perf_counter_ns() - t0
+            if after is not None:
+                after()
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    alloc_total = 0
+    retained = 0
+    if allocation_iterations > 0:
+        tracemalloc.start()
+        try:
+            start_current, _ = tracemalloc.get_traced_memory()
+            for _ in range(allocation_iterations):
+                before, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                fn()
+                _, peak = tracemalloc.get_traced_memory()
+                alloc_total += peak - before
+                if after is not None:
+                    after()
+            end_current, _ = tracemalloc.get_traced_memory()
+            retained = end_current - start_current
+        finally:
+            tracemalloc.stop()
+
+    samples.sort()
+    return BenchResult(
+        name=name,
+        iterations=iterations,
+        p50_us=_percentile(samples, 0.50) / 1e3,
+        p99_us=_percentile(samples, 0.99) / 1e3,
+        max_us=samples[-1] / 1e3,
+        mean_us=sum(samples) / iterations / 1e3,
+        alloc_bytes_per_call=alloc_total / allocation_iterations if allocation_iterations > 0 else 0.0,
+        retained_bytes_per_call=max(0, retained) / allocation_iterations if allocation_iterations > 0 else 0.0,
+    )
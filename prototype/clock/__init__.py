@@ -0,0 +1,14 @@
+# clock パッケージ
+# 時刻の取得と待機を抽象化する時計（実時間 / 仮想時間）
+
+from .monotonic import MonotonicClock
+from .virtual import VirtualClock
+
+# 実時間の既定インスタンス（各モジュールの clock 引数のデフォルト）
+system_clock = MonotonicClock()
+
+__all__ = [
+    "MonotonicClock",
+    "VirtualClock",
+    "system_clock",
+]
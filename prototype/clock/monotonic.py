@@ -0,0 +1,68 @@
+# --------------------------------
+# clock/monotonic.py
+# 実時間の単調時計（Clock実装）
+# --------------------------------
+from __future__ import annotations
+
+import os
+import time
+
+from ..config import orchestrator
+
+
+class MonotonicClock:
+    """
+    OSの単調時計（CLOCK_MONOTONIC）に基づく実時間のClock実装
+
+    壁時計（time.time()）と違い、NTP補正などで巻き戻らない。
+    プロセス間でも同じ時間軸を共有する。
+    """
+
+    def __init__(self, spin_threshold_sec: float = orchestrator.SPIN_THRESHOLD_SEC):
+        """
+        初期化
+
+        Args:
+            spin_threshold_sec: sleep_until_ns() でデッドライン直前にビジーウェイトする時間（秒）
+        """
+        self.spin_threshold_sec = spin_threshold_sec
+        self._spin_ns = int(spin_threshold_sec * 1e9)
+
+    def now_ns(self) -> int:
+        """現在時刻（ナノ秒）"""
+        return time.monotonic_ns()
+
+    def now(self) -> float:
+        """現在時刻（秒）"""
+        return time.monotonic_ns() / 1e9
+
+    def sleep(self, duration_sec: float) -> None:
+        """
+        指定時間待機
+
+        Args:
+            duration_sec: 待機時間（秒）
+        """
+        if duration_sec > 0.0:
+            time.sleep(duration_sec)
+
+    def sleep_until_ns(self, deadline_ns: int) -> int:
+        """
+        絶対時刻まで待機（大半を sleep で待ち、最後の spin_threshold_sec はビジーウェイト）
+
+        Args:
+            deadline_ns: 待機を終える時刻（ナノ秒）
+
+        Returns:
+            int: 待機を終えた時刻（ナノ秒）
+        """
+        now = time.monotonic_ns()
+        sleep_ns = deadline_ns - now - self._spin_ns
+        if sleep_ns > 0:
+            time.sleep(sleep_ns / 1e9)
+            now = time.monotonic_ns()
+        # ビジーウェイト中もGILを手放す（駆動スレッドなど他のスレッドを待たせない）
+        while now < deadline_ns:
+            os.sched_yield()
+            now = time.monotonic_ns()
+        return now
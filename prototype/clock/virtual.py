@@ -0,0 +1,69 @@
+# --------------------------------
+# clock/virtual.py
+# 仮想時間の時計（Clock実装）
+# --------------------------------
+from __future__ import annotations
+
+
+class VirtualClock:
+    """
+    明示的に進めたときだけ進む仮想時間のClock実装
+
+    sleep() / sleep_until_ns() は待たずに時刻を進めるだけなので、
+    同じ入力からは常に同じ結果になり（決定的）、実時間より速く実行できる。
+    シミュレーターやログ再生で使う（単一スレッドからの利用を想定）。
+    """
+
+    def __init__(self, start_sec: float = 0.0):
+        """
+        初期化
+
+        Args:
+            start_sec: 開始時刻（秒）
+        """
+        self._now_ns = int(round(start_sec * 1e9))
+
+    def now_ns(self) -> int:
+        """現在時刻（ナノ秒）"""
+        return self._now_ns
+
+    def now(self) -> float:
+        """現在時刻（秒）"""
+        return self._now_ns / 1e9
+
+    def sleep(self, duration_sec: float) -> None:
+        """
+        時刻を duration_sec だけ進める
+
+        Args:
+            duration_sec: 進める時間（秒）
+        """
+        if duration_sec > 0.0:
+            self._now_ns += int(round(duration_sec * 1e9))
+
+    def sleep_until_ns(self, deadline_ns: int) -> int:
+        """
+        時刻を deadline_ns まで進める（過去の時刻なら何もしない）
+
+        Args:
+            deadline_ns: 進める先の時刻（ナノ秒）
+
+        Returns:
+            int: 進めた後の時刻（ナノ秒）
+        """
+        if deadline_ns > self._now_ns:
+            self._now_ns = deadline_ns
+        return self._now_ns
+
+    def advance(self, duration_sec: float) -> None:
+        """時刻を duration_sec だけ進める（sleep() の別名）"""
+        self.sleep(duration_sec)
+
+    def set(self, t_sec: float) -> None:
+        """
+        時刻を設定する（ログ再生などで記録時刻に合わせる用途。巻き戻しも可能）
+
+        Args:
+            t_sec: 設定する時刻（秒）
+        """
+        self._now_ns = int(round(t_sec * 1e9))
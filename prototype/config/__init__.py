@@ -1,5 +1,8 @@
 # config パッケージ
 # ハードウェア設定とユーティリティ関数を提供
+# 環境変数 PROTOTYPE_CONFIG_OVERRIDE に設定上書きファイル（JSON）のパスがあれば、読み込み時に適用する
+
+import os
 
 from .hardware import HardwareConfig, hardware
 from .sensors import SensorConfig, sensors
@@ -7,7 +10,31 @@ from .timing import TimingConfig, timing
 from .perception import PerceptionConfig, perception
 from .decision import DecisionConfig, decision
 from .orchestrator import OrchestratorConfig, orchestrator
-from .utils import set_us
+from .sim import SimConfig, sim
+from .recorder import RecorderConfig, recorder
+from .bench import BenchConfig, bench
+from .tune import TuneConfig, tune
+from .maps import MapConfig, maps
+from .watchdog import WatchdogConfig, watchdog
+from .overrides import OVERRIDE_ENV_VAR, apply_overrides, load_overrides
+
+if os.environ.get(OVERRIDE_ENV_VAR):
+    # 各モジュールは既定値を読み込み時に取り込むので、他のパッケージより先にここで差し替える
+    _overrides = load_overrides(os.environ[OVERRIDE_ENV_VAR])
+    hardware = apply_overrides(hardware, _overrides.get("hardware"))
+    sensors = apply_overrides(sensors, _overrides.get("sensors"))
+    timing = apply_overrides(timing, _overrides.get("timing"))
+    perception = apply_overrides(perception, _overrides.get("perception"))
+    decision = apply_overrides(decision, _overrides.get("decision"))
+    orchestrator = apply_overrides(orchestrator, _overrides.get("orchestrator"))
+    sim = apply_overrides(sim, _overrides.get("sim"))
+    recorder = apply_overrides(recorder, _overrides.get("recorder"))
+    bench = apply_overrides(bench, _overrides.get("bench"))
+    tune = apply_overrides(tune, _overrides.get("tune"))
+    maps = apply_overrides(maps, _overrides.get("maps"))
+    watchdog = apply_overrides(watchdog, _overrides.get("watchdog"))
+
+from .utils import set_us, us_to_duty
 
 __all__ = [
     "HardwareConfig",
@@ -22,5 +49,21 @@ __all__ = [
     "decision",
     "OrchestratorConfig",
     "orchestrator",
+    "SimConfig",
+    "sim",
+    "RecorderConfig",
+    "recorder",
+    "BenchConfig",
+    "bench",
+    "TuneConfig",
+    "tune",
+    "MapConfig",
+    "maps",
+    "WatchdogConfig",
+    "watchdog",
+    "OVERRIDE_ENV_VAR",
+    "apply_overrides",
+    "load_overrides",
     "set_us",
+    "us_to_duty",
 ]
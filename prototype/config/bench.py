@@ -0,0 +1,26 @@
+# --------------------------------
+# config/bench.py
+# ベンチマーク関連の設定定数
+# --------------------------------
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Final
+
+
+@dataclass(frozen=True)
+class BenchConfig:
+    """ベンチマーク設定"""
+
+    ITERATIONS: Final[int] = 5000  # 計測する呼び出し回数
+    WARMUP_ITERATIONS: Final[int] = 500  # 計測前に捨てる呼び出し回数
+    ALLOCATION_ITERATIONS: Final[int] = 500  # tracemalloc でメモリ確保量を測る呼び出し回数
+    INPUT_FRAMES: Final[int] = 1000  # 入力データを作るためにシミュレーターで走らせるフレーム数
+    BASELINE_PATH: Final[str] = "./log/bench_baseline.json"  # ベースラインの保存先
+    REGRESSION_THRESHOLD: Final[float] = 0.25  # ベースライン比でこの割合を超えて悪化したら退行とみなす
+    MIN_REGRESSION_DELTA_US: Final[float] = 1.0  # これ未満の悪化（μs）は計測誤差として無視
+    MIN_REGRESSION_DELTA_BYTES: Final[float] = 64.0  # これ未満の増加（バイト/呼び出し）は無視
+
+
+# シングルトンインスタンス
+bench = BenchConfig()
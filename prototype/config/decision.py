@@ -32,11 +32,55 @@ class CorridorDecisionConfig:
     FORK_STEERING: Final[float] = 0.8  # 分岐回避時の転舵量（正=左固定。負にすると右固定）
 
 
+@dataclass(frozen=True)
+class LapProfileConfig:
+    """1周目の記録から作る速度プロファイル（2周目以降の速度制御）設定"""
+
+    # 速度プロファイルを使うか。perception.localization.ENABLED も有効にすること
+    # （自己位置推定がないと記録もプロファイルの適用もできない。run.py は起動時に止め、判断は1度だけ警告する）
+    ENABLED: Final[bool] = False
+    PATH: Final[str] = "./log/lap_profile.json"  # 記録した1周の保存先（再スタート時はここから読み込む）
+    BINS: Final[int] = 100  # 1周を分ける区間数（周回の進捗で等分）
+    MIN_COVERAGE: Final[float] = 0.9  # 記録のある区間がこの割合に満たない周回は使わない
+    MIN_CONFIDENCE: Final[float] = 0.5  # 自己位置推定の信頼度がこれ未満のサイクルは記録せず、前方距離による速度制御に戻す
+
+    # 曲率の推定
+    CURVATURE_SMOOTHING_BINS: Final[int] = 2  # 走行軌跡の曲率を前後この区間数で平均する
+    MAX_CURVATURE: Final[float] = 4.0  # 曲率の上限（1/m）
+
+    # 速度の上限（車両の能力）
+    LATERAL_ACCEL_MPS2: Final[float] = 3.0  # 横加速度の上限（m/s^2）。曲率 κ の区間は sqrt(a / κ) まで
+    ACCEL_MPS2: Final[float] = 2.0  # 加速の上限（m/s^2）
+    DECEL_MPS2: Final[float] = 3.0  # 減速の上限（m/s^2）
+    MAX_SPEED_MPS: Final[float] = 4.0  # throttle=1.0 で到達する速度（m/s）。速度からスロットルへの換算に使う
+    LOOKAHEAD_SEC: Final[float] = 0.3  # この時間で進む先までの最小速度を使う（ESCの応答遅れを見込む）
+    MIN_THROTTLE: Final[float] = 0.25  # プロファイルのスロットルの下限
+    MAX_THROTTLE: Final[float] = 0.7  # プロファイルのスロットルの上限
+
+
+@dataclass(frozen=True)
+class LatencyCompensationConfig:
+    """遅延補償（PWMに反映される時刻の状態を予測して判断する）設定"""
+
+    ENABLED: Final[bool] = False  # 遅延補償を使うか
+    ACTUATION_DELAY_SEC: Final[float] = 0.002  # 判断開始からPWM書き込み完了までの初期値（秒）。実測が届いたら置き換える
+    ACTUATION_DELAY_SMOOTHING: Final[float] = 0.9  # 実測の書き込み遅延の指数移動平均の係数 [0.0, 1.0)
+    PWM_OUTPUT_DELAY_SEC: Final[float] = 0.01  # 書き込みから次のPWMパルスに反映されるまでの平均（50Hzの周期の半分、秒）
+    MAX_PREDICTION_SEC: Final[float] = 0.1  # 予測する時間の上限（秒）。古すぎるサンプルを外挿しすぎない
+    ERROR_RATE_SMOOTHING: Final[float] = 0.0  # 左右バランス誤差の変化率の平滑化係数 [0.0, 1.0]
+
+    # スロットル→速度のモデル（一次遅れ）
+    MAX_SPEED_MPS: Final[float] = 4.0  # throttle=1.0 で到達する速度（m/s）
+    SPEED_TIME_CONSTANT_SEC: Final[float] = 0.3  # 速度応答の一次遅れ時定数（秒）
+
+
 @dataclass(frozen=True)
 class DecisionConfig:
     """判断モジュール設定の集約"""
 
     corridor: CorridorDecisionConfig = CorridorDecisionConfig()
+    lap_profile: LapProfileConfig = LapProfileConfig()
+    latency_compensation: LatencyCompensationConfig = LatencyCompensationConfig()
 
 
 # シングルトンインスタンス
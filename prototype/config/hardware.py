@@ -5,7 +5,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Final
+from typing import Final, Optional
 
 
 @dataclass(frozen=True)
@@ -25,6 +25,12 @@ class PCA9685Config:
     PWM_PERIOD_US: Final[int] = 20000        # PWM周期（20ms = 20000μs @ 50Hz）
     DUTY_CYCLE_MAX_VALUE: Final[int] = 65535  # duty_cycle最大値（16bit）
 
+    # ステアリング・スロットルから duty_cycle への変換表
+    LUT_STEPS: Final[int] = 1024  # 1.0あたりの刻み数（ステアリングは 2*LUT_STEPS+1 点、スロットルは LUT_STEPS+1 点）
+
+    # PWMフレームの位相の観測
+    FRAME_EDGE_PIN: Final[Optional[int]] = None  # PWM出力（サーボ）を引き込んだGPIO番号（BCM）。Noneなら周波数設定時刻だけで推定
+
 
 @dataclass(frozen=True)
 class ESCConfig:
@@ -0,0 +1,58 @@
+# --------------------------------
+# config/maps.py
+# コース画像（map.png）の読み込みとレイキャスト表関連の設定定数
+# --------------------------------
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Final, Tuple
+
+
+@dataclass(frozen=True)
+class MapImageConfig:
+    """コース画像から走行可能領域と壁を取り出す設定"""
+
+    PATH: Final[str] = "../map.png"  # コース画像のパス（prototype ディレクトリから実行する場合）
+    METERS_PER_PIXEL: Final[float] = 0.009  # 画像の縮尺（m/px）。通路幅 約110px を 1.0m とみなす
+    START_PX: Final[Tuple[float, float]] = (743.0, 509.0)  # スタート位置（画像上の (列, 行)）。ホームストレートのチェッカーフラッグ
+    START_HEADING_DEG: Final[float] = 180.0  # スタート時の向き（度、画像の右が0・上が90）。周回方向は画像の左向き
+
+    # 色の分類（HSV の彩度・明度、0〜255）
+    GRAY_SATURATION_MAX: Final[int] = 40  # これ以下の彩度を無彩色（路面・壁の線）とみなす
+    TRACK_VALUE_MIN: Final[int] = 85  # 路面の明度の下限
+    TRACK_VALUE_MAX: Final[int] = 125  # 路面の明度の上限
+    WALL_VALUE_MIN: Final[int] = 40  # 壁の線（路面の縁取り）の明度の下限。路面の下限未満が壁の線
+
+    # 注記（赤い丸・引き出し線・チェッカーフラッグ）の除去
+    ANNOTATION_SATURATION_MIN: Final[int] = 80  # これ以上の彩度を注記とみなす
+    ANNOTATION_VALUE_MAX: Final[int] = 40  # これ以下の明度（黒）を注記とみなす
+    ANNOTATION_DILATE_PX: Final[int] = 15  # 注記の周りの白い縁取りも含めるよう広げる幅（px）
+    INPAINT_RADIUS_PX: Final[int] = 7  # 注記の下の路面/路面外を周りから補間する半径（px）
+
+    # 路面内の文字・矢印（路面に囲まれた穴）の埋め戻し
+    MAX_HOLE_AREA_PX: Final[int] = 20000  # これより大きい穴は中島などの本物の路面外とみなす
+    HOLE_WALL_RATIO_MAX: Final[float] = 0.5  # 穴の縁のうち壁の線の割合がこれ未満なら文字とみなして埋める
+
+    CONTOUR_EPSILON_PX: Final[float] = 1.5  # 壁の輪郭を折れ線で近似するときの許容誤差（px）
+
+
+@dataclass(frozen=True)
+class RayTableConfig:
+    """レイキャスト表（位置・向きごとのToF期待距離）設定"""
+
+    PATH: Final[str] = "./log/ray_table.npy"  # 表の保存先（同じ名前の .json にメタ情報を書く）
+    CELL_M: Final[float] = 0.05  # 位置のグリッド間隔（m）
+    HEADING_BINS: Final[int] = 72  # 向きの分割数（72で5度刻み）
+    CHUNK_RAYS: Final[int] = 4096  # 1回の計算で扱うレイ数（一時配列のメモリを抑える）
+
+
+@dataclass(frozen=True)
+class MapConfig:
+    """コース地図設定の集約"""
+
+    image: MapImageConfig = MapImageConfig()
+    ray_table: RayTableConfig = RayTableConfig()
+
+
+# シングルトンインスタンス
+maps = MapConfig()
@@ -20,9 +20,35 @@ class OrchestratorConfig:
     # - 推奨範囲: 0.05-0.1秒（50-100ms）- センサー応答と処理時間を考慮
     # - 現在の設定: 0.1秒（100ms）- 安全マージンあり
     LOOP_INTERVAL_SEC: Final[float] = 0.02
-    LOG_INTERVAL_SEC: Final[float] = 0.02  # 詳細ログ出力間隔（秒）。デフォルトは1.0秒
+    LOG_INTERVAL_SEC: Final[float] = 0.5  # コンソールダッシュボードの表示間隔（秒）。毎サイクルの端末出力はループを遅らせるため間引く
     POLL_INTERVAL_SEC: Final[float] = 0.001  # ポーリング間隔（秒）。デフォルトは1ms
 
+    # デッドラインスケジューラー設定
+    OVERRUN_POLICY: Final[str] = "SKIP"  # デッドライン超過時の方針（"SKIP": 過ぎた周期を飛ばす / "CATCH_UP": 連続実行して追いつく）
+    SPIN_THRESHOLD_SEC: Final[float] = 0.0005  # デッドライン直前にsleepせずビジーウェイトする時間（秒）
+
+    # タイミングログ（非同期書き出し）設定
+    TIMING_LOG_QUEUE_SIZE: Final[int] = 4096  # キューの上限（件数）。満杯時は捨てて数える
+    TIMING_LOG_BATCH_SIZE: Final[int] = 256  # この件数たまったら書き出しスレッドがまとめて書き出す
+    TIMING_LOG_FLUSH_INTERVAL_SEC: Final[float] = 0.5  # 件数に達しなくてもこの間隔で書き出す（秒）
+
+    # 遅延トレース（センサー計測→PWM書き込み完了）設定
+    LATENCY_TRACE_ENABLED: Final[bool] = True  # フレームごとの遅延を集計するか
+    LATENCY_TRACE_FRAMES: Final[int] = 1024  # 残す直近のフレーム数
+    LATENCY_HISTOGRAM_MAX_SEC: Final[float] = 1.0  # ヒストグラムの上限（秒）。超えた値は上限に丸めて数える
+    LATENCY_SUB_BUCKET_BITS: Final[int] = 7  # 2の累乗ごとの区間を 2^7 個に分ける（相対誤差1%未満）
+
+    # PWMフレームに合わせた書き込み設定
+    PWM_ALIGNED: Final[bool] = False  # 判断結果をPCA9685の次のフレームの直前に書き込むか（Falseなら判断後すぐ書く）
+    PWM_WRITE_GUARD_SEC: Final[float] = 0.002  # 書き込みをフレームの先頭の何秒前に終えるか（I2C書き込みと起床の遅れの余裕）
+    PWM_PHASE_GAIN: Final[float] = 0.3  # エッジを観測したときに位相を補正する割合
+    PWM_PERIOD_GAIN: Final[float] = 0.05  # エッジを観測したときに周期を補正する割合（発振器の誤差への追従）
+    PWM_EDGE_REJECT_RATIO: Final[float] = 0.25  # 予測との差が周期のこの割合を超えるエッジは外れ値として捨てる
+
+    # 駆動スレッド（ActuationWorker）設定
+    ACTUATION_WORKER: Final[bool] = False  # PCA9685への書き込みを専用スレッドで行うか（制御ループはI2Cを待たない）
+    ACTUATION_STOP_TIMEOUT_SEC: Final[float] = 0.1  # 停止の書き込み完了を待つ時間（秒）。I2Cが応答しない場合に諦める
+
 
 # シングルトンインスタンス
 orchestrator = OrchestratorConfig()
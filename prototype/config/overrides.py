@@ -0,0 +1,64 @@
+# --------------------------------
+# config/overrides.py
+# 設定上書きファイル（JSON）の読み込みと適用
+# --------------------------------
+from __future__ import annotations
+
+import dataclasses
+import json
+from typing import Any, Mapping, Optional
+
+# 上書きファイルのパスを渡す環境変数（設定されていれば config パッケージの読み込み時に適用する）
+OVERRIDE_ENV_VAR: str = "PROTOTYPE_CONFIG_OVERRIDE"
+
+
+def load_overrides(path: str) -> dict:
+    """
+    設定上書きファイルを読み込む
+
+    ファイルは {"decision": {"corridor": {"KP": 0.004}}} のように、設定の階層をそのまま辿るJSON。
+    "_" で始まるキー（メタ情報）は無視する。
+
+    Args:
+        path: JSONファイルのパス
+
+    Returns:
+        dict: 設定名（"decision" など）ごとの上書き内容
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"Config override must be a JSON object: {path}")
+    return data
+
+
+def apply_overrides(config: Any, overrides: Optional[Mapping[str, Any]]) -> Any:
+    """
+    設定のインスタンスに上書き内容を適用した新しいインスタンスを返す
+
+    Args:
+        config: 設定のインスタンス（frozen dataclass）
+        overrides: フィールド名から値（入れ子の設定は同じ形の辞書）への対応。Noneの場合は何もしない
+
+    Returns:
+        Any: 上書き後の設定（元のインスタンスは変更しない）
+
+    Raises:
+        ValueError: 存在しないフィールドを指定した場合
+    """
+    if not overrides:
+        return config
+    names = {f.name for f in dataclasses.fields(config)}
+    changes = {}
+    for key, value in overrides.items():
+        if key.startswith("_"):
+            continue
+        if key not in names:
+            raise ValueError(f"Unknown config field: {type(config).__name__}.{key}")
+        current = getattr(config, key)
+        if dataclasses.is_dataclass(current):
+            changes[key] = apply_overrides(current, value)
+        else:
+            # JSON の整数をそのまま float のフィールドに入れないよう、元の型に揃える
+            changes[key] = type(current)(value) if isinstance(current, (int, float)) and not isinstance(current, bool) else value
+    return dataclasses.replace(config, **changes)
@@ -31,11 +31,77 @@ class CorridorPerceptionConfig:
     )
 
 
+@dataclass(frozen=True)
+class DistanceFilterConfig:
+    """距離フィルタ（センサーと知覚の間の外れ値除去・平滑化）設定"""
+
+    KIND: Final[str] = "none"  # フィルタの種類（"none" / "median" / "hampel" / "kalman"）
+    MAX_INPUT_MM: Final[float] = (
+        2000.0  # フィルタに入れる距離の上限（mm）。範囲外値（8190）はこの値に丸める
+    )
+
+    # 中央値フィルタ
+    MEDIAN_WINDOW: Final[int] = 5  # 窓幅（サンプル数）
+
+    # Hampel フィルタ
+    HAMPEL_WINDOW: Final[int] = 7  # 窓幅（サンプル数）
+    HAMPEL_N_SIGMAS: Final[float] = 3.0  # 外れ値とみなす距離（標準偏差換算の倍数）
+    # MADの下限（mm）。整数mmの同じ値が続くとMADが0になり、わずかな変化も外れ値になるのを防ぐ
+    # （既定値では中央値から約22mm以内の変化はそのまま通す）
+    HAMPEL_MIN_MAD_MM: Final[float] = 5.0
+
+    # 1次元カルマンフィルタ（等速度モデル）
+    KALMAN_PROCESS_NOISE_MM_S2: Final[float] = 5000.0  # 加速度ノイズの標準偏差（mm/s^2）
+    KALMAN_MEASUREMENT_NOISE_MM: Final[float] = 15.0  # 計測ノイズの標準偏差（mm）
+    KALMAN_MAX_GAP_SEC: Final[float] = 0.5  # この間隔以上サンプルが空いたら状態を作り直す（秒）
+
+
+@dataclass(frozen=True)
+class LocalizationConfig:
+    """パーティクルフィルタによるコース上の自己位置推定設定"""
+
+    ENABLED: Final[bool] = False  # 自己位置推定を行うか（レイキャスト表が必要）
+    PARTICLES: Final[int] = 500  # パーティクル数（固定。1サイクルの計算量はこれで決まる）
+    SEED: Final[int] = 0  # 乱数シード
+
+    # 初期分布（スタート位置の周り）
+    INIT_POSITION_STD_M: Final[float] = 0.05  # 位置の標準偏差（m）
+    INIT_HEADING_STD_DEG: Final[float] = 3.0  # 向きの標準偏差（度）
+
+    # 動作モデル（指令値からのキネマティック自転車モデル）。値は実車に合わせる（既定値はシミュレーターと同じ）
+    WHEELBASE_M: Final[float] = 0.26  # ホイールベース（m）
+    MAX_STEER_ANGLE_DEG: Final[float] = 30.0  # steer=±1.0 に対応する前輪切れ角（度）
+    MAX_SPEED_MPS: Final[float] = 4.0  # throttle=1.0 で到達する速度（m/s）
+    SPEED_TIME_CONSTANT_SEC: Final[float] = 0.3  # 速度応答の一次遅れ時定数（秒）
+    STEER_TIME_CONSTANT_SEC: Final[float] = 0.05  # サーボ応答の一次遅れ時定数（秒）
+    MAX_DT_SEC: Final[float] = 0.1  # 1回の予測で進める時間の上限（秒）。計測が途切れた後の飛びを抑える
+
+    # 動作モデルのノイズ（パーティクルごと）
+    SPEED_NOISE_RATIO: Final[float] = 0.15  # 速度の相対ノイズ（標準偏差、速度に対する割合）
+    STEER_NOISE_DEG: Final[float] = 2.0  # 前輪切れ角のノイズ（標準偏差、度）
+    POSITION_NOISE_M: Final[float] = 0.005  # 1回の予測ごとの位置のノイズ（標準偏差、m）
+    HEADING_NOISE_DEG: Final[float] = 0.5  # 1回の予測ごとの向きのノイズ（標準偏差、度）
+
+    # 計測モデル（期待距離と計測距離の尤度表）
+    BIN_MM: Final[int] = 20  # 尤度表の距離の刻み（mm）
+    SIGMA_MM: Final[float] = 40.0  # 計測誤差の標準偏差の固定分（mm）。表のグリッド・向きの量子化を含む
+    SIGMA_RATIO: Final[float] = 0.05  # 計測誤差の標準偏差の距離比例分
+    RANDOM_RATIO: Final[float] = 0.05  # 期待と無関係な値（他の物体・反射）が返る確率
+    MISS_RATIO: Final[float] = 0.05  # 壁があるのに範囲外値が返る確率
+    LIKELIHOOD_EXPONENT: Final[float] = 0.5  # 尤度を弱める指数（3本のビームの誤差の相関を考慮）
+
+    # 再サンプリングと出力
+    RESAMPLE_ESS_RATIO: Final[float] = 0.5  # 有効パーティクル数がこの割合を下回ったら再サンプリング
+    CONFIDENCE_RADIUS_M: Final[float] = 0.2  # 推定位置からこの距離以内の重みの合計を信頼度とする
+
+
 @dataclass(frozen=True)
 class PerceptionConfig:
     """知覚モジュール設定の集約"""
 
     corridor: CorridorPerceptionConfig = CorridorPerceptionConfig()
+    distance_filter: DistanceFilterConfig = DistanceFilterConfig()
+    localization: LocalizationConfig = LocalizationConfig()
 
 
 # シングルトンインスタンス
@@ -0,0 +1,21 @@
+# --------------------------------
+# config/recorder.py
+# フライトレコーダー関連の設定定数
+# --------------------------------
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Final
+
+
+@dataclass(frozen=True)
+class RecorderConfig:
+    """フライトレコーダー設定"""
+
+    CAPACITY_RECORDS: Final[int] = 8192  # リングバッファの容量（レコード数）。50Hzで約160秒分
+    FLUSH_BLOCK_RECORDS: Final[int] = 512  # この件数たまったらバックグラウンドスレッドがまとめて書き出す
+    FLUSH_INTERVAL_SEC: Final[float] = 1.0  # 件数に達しなくてもこの間隔で書き出す（秒）
+
+
+# シングルトンインスタンス
+recorder = RecorderConfig()
@@ -23,6 +23,23 @@ class VL53L0XConfig:
     NUM_SENSORS: Final[int] = 3  # センサーの数（前、右斜め前、左斜め前）
     MEASUREMENT_TIMING_BUDGET: Final[int] = 20000  # 計測時間バジェット（マイクロ秒）。小さいほど高速だが精度が下がる
     SENSOR_NAMES: Final[Tuple[str, ...]] = ("前", "右斜め前", "左斜め前")  # センサー名（順序はXSHUT_PINSと対応）
+    MOUNT_ANGLES_DEG: Final[Tuple[float, float, float]] = (0.0, -45.0, 45.0)  # 取り付け角度（度、車体前方が0、左が正）。前、右斜め前、左斜め前の順
+    MOUNT_OFFSET_M: Final[float] = 0.10  # 車体中心からセンサーまでの前方オフセット（m）
+    MAX_RANGE_MM: Final[int] = 2000  # 計測可能な最大距離（mm）。これを超えると範囲外値になる
+    OUT_OF_RANGE_MM: Final[int] = 8190  # 範囲外を示す値（mm）。VL53L0Xが壁を検出できない場合に返す
+
+    # ドライバ設定
+    BACKEND: Final[str] = "adafruit"  # 計測結果の読み出し方法（"adafruit": adafruit_vl53l0x / "fast": レジスタ直接のバースト読み出し）
+    IO_TIMEOUT_SEC: Final[float] = 0.5  # 計測完了を待つ最大時間（秒、0で無期限）
+
+    # 取得スレッド設定
+    ACQUISITION_THREAD: Final[bool] = False  # Trueの場合、専用スレッドでセンサーを読み出しpoll()はスナップショットを返す
+    ACQUISITION_IDLE_INTERVAL_SEC: Final[float] = 0.0005  # 取得スレッドでどのセンサーも未完了だった場合の待機時間（秒）
+
+    # GPIO1割り込み設定
+    INTERRUPT_MODE: Final[bool] = False  # Trueの場合、GPIO1のエッジ通知で計測完了したセンサーだけを読み出す（data_readyのポーリングなし）
+    GPIO1_PINS: Final[Tuple[int, int, int]] = (5, 6, 13)  # GPIO1を接続したGPIO番号（BCM）- 前、右斜め前、左斜め前の順
+    INTERRUPT_BOUNCE_MS: Final[int] = 0  # エッジ検出のチャタリング除去時間（ミリ秒、0で無効）
 
 
 @dataclass(frozen=True)
@@ -0,0 +1,68 @@
+# --------------------------------
+# config/sim.py
+# シミュレーター関連の設定定数
+# --------------------------------
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Final
+
+
+@dataclass(frozen=True)
+class VehicleSimConfig:
+    """車両モデル（キネマティック自転車モデル）設定"""
+
+    WHEELBASE_M: Final[float] = 0.26  # ホイールベース（m）
+    MAX_STEER_ANGLE_DEG: Final[float] = 30.0  # steer=±1.0 に対応する前輪切れ角（度）
+    MAX_SPEED_MPS: Final[float] = 4.0  # throttle=1.0 で到達する速度（m/s）
+    SPEED_TIME_CONSTANT_SEC: Final[float] = 0.3  # 速度応答の一次遅れ時定数（秒）
+    STEER_TIME_CONSTANT_SEC: Final[float] = 0.05  # サーボ応答の一次遅れ時定数（秒）
+    COLLISION_RADIUS_M: Final[float] = 0.11  # 衝突判定用の車体半径（m）。全幅220mmの半分
+    ACTUATION_DELAY_SEC: Final[float] = 0.0  # 指令が車両に反映されるまでの無駄時間（秒）。0で即時
+    PWM_FRAME_PERIOD_SEC: Final[float] = 0.0  # 指令をPWMフレームの先頭で反映する場合の周期（秒、PCA9685は0.02）。0で無効
+
+
+@dataclass(frozen=True)
+class CourseSimConfig:
+    """コース形状設定"""
+
+    CORRIDOR_WIDTH_M: Final[float] = 1.0  # 通路幅（m）
+    CURVE_RADIUS_M: Final[float] = 1.0  # カーブの中心線半径（m）
+    ARC_STEP_DEG: Final[float] = 5.0  # カーブを折れ線近似する角度刻み（度）
+    GRID_CELL_M: Final[float] = 0.5  # 壁セグメント検索用グリッドのセルサイズ（m）
+
+
+@dataclass(frozen=True)
+class TOFSimConfig:
+    """ToFセンサーモデル設定"""
+
+    NOISE_STD_MM: Final[float] = 0.0  # 計測ノイズの標準偏差（mm）
+    SEED: Final[int] = 0  # ノイズ用乱数シード
+
+
+@dataclass(frozen=True)
+class BatchSimConfig:
+    """バッチシミュレーター（NumPyで多数の車両を同時に進める）設定"""
+
+    CHUNK_SIZE: Final[int] = 2048  # 1回のレイキャストで扱う車両数（一時配列のメモリを抑える）
+    PROJECTION_WINDOW: Final[int] = 3  # 中心線への射影で前回の点から前後に調べる点数（物理演算1刻みの移動量より広く）
+    DIRECTION_BINS: Final[int] = 64  # レイキャストの候補表でレイの向きを分ける区間数
+    CLEARANCE_CELL_M: Final[float] = 0.125  # 壁との距離の候補表のセルサイズ（m）
+    SEED: Final[int] = 0  # ノイズ用乱数シード
+
+
+@dataclass(frozen=True)
+class SimConfig:
+    """シミュレーター設定の集約"""
+
+    vehicle: VehicleSimConfig = VehicleSimConfig()
+    course: CourseSimConfig = CourseSimConfig()
+    tof: TOFSimConfig = TOFSimConfig()
+    batch: BatchSimConfig = BatchSimConfig()
+
+    PHYSICS_DT_SEC: Final[float] = 0.005  # 物理演算の刻み（秒）
+    MAX_SIM_TIME_SEC: Final[float] = 180.0  # 1回の走行の最大シミュレーション時間（秒）
+
+
+# シングルトンインスタンス
+sim = SimConfig()
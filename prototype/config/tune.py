@@ -0,0 +1,37 @@
+# --------------------------------
+# config/tune.py
+# 自動パラメータ調整（シミュレーター上の探索）関連の設定定数
+# --------------------------------
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Final
+
+
+@dataclass(frozen=True)
+class TuneConfig:
+    """自動パラメータ調整設定"""
+
+    # 評価（シミュレーター走行）
+    LAPS: Final[int] = 2  # 1回の評価で走らせる周回数
+    FAILURE_COST_SEC: Final[float] = 1000.0  # 周回を完了できなかった場合の基本コスト（秒換算）。ラップタイムより十分大きく
+    CLEARANCE_MARGIN_M: Final[float] = 0.05  # 車体半径に加えて確保したい壁との距離（m）
+    CLEARANCE_PENALTY_SEC_PER_M: Final[float] = 100.0  # 余裕が足りない分に課すコスト（秒/m）
+
+    # 探索
+    SAMPLES: Final[int] = 64  # ラテン超方格サンプリングで評価する点数
+    REFINE_STARTS: Final[int] = 4  # 上位何点から Nelder-Mead で詰めるか
+    REFINE_ITERATIONS: Final[int] = 40  # Nelder-Mead の反復回数
+    REFINE_INITIAL_STEP: Final[float] = 0.1  # 初期単体の辺の長さ（探索範囲を1とした割合）
+    REFINE_TOLERANCE: Final[float] = 1e-3  # 単体内のコスト差がこれ未満になったら打ち切る（秒）
+    SEED: Final[int] = 0  # 乱数シード（同じシードなら同じ点を同じ順に評価する）
+    WORKERS: Final[int] = 0  # 評価プロセス数（0でCPUコア数）
+    CACHE_SIGNIFICANT_DIGITS: Final[int] = 10  # キャッシュのキーにするときパラメータの値を丸める有効桁数
+
+    # 出力
+    CACHE_PATH: Final[str] = "./log/tune_cache.jsonl"  # 評価結果のキャッシュ（1行1評価の追記）
+    OVERRIDE_PATH: Final[str] = "./log/tune_override.json"  # 最良のパラメータを書き出す設定上書きファイル
+
+
+# シングルトンインスタンス
+tune = TuneConfig()
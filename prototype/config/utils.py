@@ -4,17 +4,27 @@
 # --------------------------------
 from __future__ import annotations
 
-import sys
 import time
-from typing import Optional
+from typing import TYPE_CHECKING
 
-from .hardware import hardware
-from .timing import timing
+if TYPE_CHECKING:
+    from adafruit_pca9685 import PCA9685
 
-# ハードウェアモジュールのインポート（ラズベリーパイ環境専用）
-import board
-import busio
-from adafruit_pca9685 import PCA9685
+# 設定上書きファイルを適用した後のインスタンスを使う（config/__init__.py で上書きの後に読み込まれる）
+from . import hardware, timing
+
+
+def us_to_duty(us: int) -> int:
+    """
+    μs（マイクロ秒）をPCA9685のduty_cycle値（16bit）に変換する関数。
+
+    Args:
+        us: パルス幅（マイクロ秒）
+
+    Returns:
+        int: duty_cycle値
+    """
+    return int(us / hardware.pca9685.PWM_PERIOD_US * hardware.pca9685.DUTY_CYCLE_MAX_VALUE)
 
 
 def set_us(ch, us: int) -> None:
@@ -25,11 +35,10 @@ def set_us(ch, us: int) -> None:
         ch: PCA9685のチャンネルオブジェクト（duty_cycle属性を持つ）
         us: パルス幅（マイクロ秒）
     """
-    duty_cycle = int(us / hardware.pca9685.PWM_PERIOD_US * hardware.pca9685.DUTY_CYCLE_MAX_VALUE)
-    ch.duty_cycle = duty_cycle
+    ch.duty_cycle = us_to_duty(us)
 
 
-def initialize_pca9685(i2c_address: int = 0x40) -> tuple[PCA9685, any, any]:
+def initialize_pca9685(i2c_address: int = 0x40) -> tuple["PCA9685", object, object]:
     """
     PCA9685を初期化してESCとサーボのチャンネルを返す
     
@@ -39,6 +48,12 @@ def initialize_pca9685(i2c_address: int = 0x40) -> tuple[PCA9685, any, any]:
     Returns:
         (pca, esc_channel, servo_channel) のタプル
     """
+    # ハードウェアモジュールのインポート（ラズベリーパイ環境専用）
+    # set_us() などは実機なしでも使えるよう、ここで遅延インポートする
+    import board
+    import busio
+    from adafruit_pca9685 import PCA9685
+
     i2c = busio.I2C(board.SCL, board.SDA)
     pca = PCA9685(i2c, address=i2c_address)
     pca.frequency = hardware.pca9685.FREQUENCY  # ESC/サーボは50Hz
@@ -0,0 +1,24 @@
+# --------------------------------
+# config/watchdog.py
+# ウォッチドッグ（制御プロセスの停止を検知してESCをニュートラルにする別プロセス）関連の設定定数
+# --------------------------------
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Final
+
+
+@dataclass(frozen=True)
+class WatchdogConfig:
+    """ウォッチドッグ設定"""
+
+    ENABLED: Final[bool] = False  # オーケストレーターがハートビートを共有メモリに書くか（run.py が読む）
+    SHM_NAME: Final[str] = "minicar_heartbeat"  # ハートビートの共有メモリの名前
+    DEADLINE_SEC: Final[float] = 0.1  # ハートビートがこれより古くなったらニュートラルを書き込む（秒）。制御周期の5倍
+    POLL_INTERVAL_SEC: Final[float] = 0.002  # ハートビートを確認する間隔（秒）。最悪の反応遅延はおよそこの値＋書き込み時間
+    ATTACH_TIMEOUT_SEC: Final[float] = 30.0  # 起動時に共有メモリができるまで待つ時間（秒）
+    MEASURE_TRIALS: Final[int] = 50  # 反応遅延の計測で制御ループを止める回数
+
+
+# シングルトンインスタンス
+watchdog = WatchdogConfig()
@@ -3,5 +3,14 @@
 
 from .wall_follow import CorridorDecision
 from .differential import DifferentialController
+from .lap_profile import LapRecord, LapRecorder, LapSpeedProfile, build_lap_profile, throttle_profile
 
-__all__ = ["CorridorDecision",  "DifferentialController"]
+__all__ = [
+    "CorridorDecision",
+    "DifferentialController",
+    "LapRecord",
+    "LapRecorder",
+    "LapSpeedProfile",
+    "build_lap_profile",
+    "throttle_profile",
+]
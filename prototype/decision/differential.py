@@ -4,9 +4,11 @@
 # --------------------------------
 from __future__ import annotations
 
-import time
 from typing import Optional
 
+from ..interfaces.protocols import Clock
+from ..clock import system_clock
+
 
 class DifferentialController:
     """
@@ -19,7 +21,8 @@ class DifferentialController:
     def __init__(
         self,
         kd: float = 0.0,
-        smoothing_factor: float = 0.0
+        smoothing_factor: float = 0.0,
+        clock: Clock = system_clock,
     ):
         """
         初期化
@@ -29,8 +32,10 @@ class DifferentialController:
             smoothing_factor: 微分値の平滑化係数 [0.0, 1.0]
                               0.0: 平滑化なし（前回の微分値を使用しない）
                               1.0: 完全に前回の値を保持
+            clock: current_time 省略時に使う時計。デフォルトは実時間の単調時計
         """
         self.kd = kd
+        self.clock = clock
         self.smoothing_factor = max(0.0, min(1.0, smoothing_factor))
         
         # 前回の誤差
@@ -48,13 +53,13 @@ class DifferentialController:
         
         Args:
             error: 現在の誤差
-            current_time: 現在時刻（秒）。Noneの場合は自動取得
+            current_time: 現在時刻（秒）。Noneの場合は clock から取得
             
         Returns:
             float: 微分制御項（kd * derivative）
         """
         if current_time is None:
-            current_time = time.time()
+            current_time = self.clock.now()
         
         # 初回呼び出し時は微分を0として返す
         if self._prev_time is None or self._prev_error is None:
@@ -0,0 +1,359 @@
+# --------------------------------
+# decision/lap_profile.py
+# 1周目の走行を記録して、2周目以降に使う曲率制限の速度プロファイルを作る
+# 記録は周回の進捗で等分した区間ごとに持ち、走行中の参照は区間の添字だけで済む
+# --------------------------------
+from __future__ import annotations
+
+import json
+import math
+import os
+import sys
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from ..config import decision, sensors
+from ..config.decision import LapProfileConfig
+from ..domain.features import WallFeatures
+from ..domain.pose import PoseEstimate
+
+# 記録ファイルの形式のバージョン
+RECORD_VERSION: int = 1
+
+
+@dataclass(frozen=True)
+class LapRecord:
+    """記録した1周（周回の進捗で等分した区間ごと）"""
+
+    lap_length_m: float        # 1周の長さ（m、区間ごとの平均位置を結んだ折れ線の長さ）
+    curvature: List[float]     # 区間ごとの曲率の大きさ（1/m）
+    width_m: List[float]       # 区間ごとの通路幅（m、左右の壁が見えなかった区間は NaN）
+
+    @property
+    def bins(self) -> int:
+        """区間数"""
+        return len(self.curvature)
+
+    def save(self, path: str) -> None:
+        """
+        JSONに保存（書き終えてから置き換える）
+
+        Args:
+            path: 保存先
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = {
+            "version": RECORD_VERSION,
+            "lap_length_m": self.lap_length_m,
+            "curvature": self.curvature,
+            "width_m": [None if math.isnan(w) else w for w in self.width_m],
+        }
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+            f.write("\n")
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional[LapRecord]:
+        """
+        保存した記録を読み込む
+
+        Args:
+            path: 保存先
+
+        Returns:
+            Optional[LapRecord]: 記録（ファイルがない・壊れている・形式が古い場合はNone）
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != RECORD_VERSION:
+                return None
+            return cls(
+                lap_length_m=float(data["lap_length_m"]),
+                curvature=[float(k) for k in data["curvature"]],
+                width_m=[math.nan if w is None else float(w) for w in data["width_m"]],
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+
+class LapRecorder:
+    """
+    走行中の自己位置と距離データを区間ごとに集計する
+
+    区間ごとに位置の平均（走行軌跡）、左右斜め前の距離から求めた通路幅、
+    前方距離から求めたカーブの曲率を持つ。
+    """
+
+    def __init__(self, bins: int = decision.lap_profile.BINS):
+        """
+        初期化
+
+        Args:
+            bins: 1周を分ける区間数。デフォルトは設定ファイルの値
+        """
+        self.bins = bins
+        # 左右斜め前のセンサーの向きと車体の横方向のなす角の正弦（壁が走行方向と平行なら距離×これが壁までの横距離）
+        self._side_ratio = abs(math.sin(math.radians(sensors.vl53l0x.MOUNT_ANGLES_DEG[2])))
+        self.reset()
+
+    def reset(self) -> None:
+        """集計を捨てる"""
+        n = self.bins
+        self._count = np.zeros(n)
+        self._sum_x = np.zeros(n)
+        self._sum_y = np.zeros(n)
+        self._width_count = np.zeros(n)
+        self._width_sum = np.zeros(n)
+        self._front_curvature_max = np.zeros(n)
+
+    @property
+    def coverage(self) -> float:
+        """記録のある区間の割合"""
+        return float(np.count_nonzero(self._count)) / self.bins
+
+    def add(self, pose: PoseEstimate, features: WallFeatures, max_curvature: float) -> None:
+        """
+        1サイクル分を集計
+
+        通路幅 w は左右斜め前の距離の横方向成分の和。
+        曲率は、車体が通路の中央を走っているときに正面のレイが外側の壁に当たる距離 d から
+        κ = w / (d² - (w/2)²) で求める（中心線半径 R の円の接線が半径 R + w/2 の円に当たる距離から）。
+        正面が範囲外なら直線（0）とする。
+
+        Args:
+            pose: 自己位置
+            features: 特徴量（元の距離データの値を使う）
+            max_curvature: 曲率の上限（1/m）
+        """
+        i = int(pose.lap_progress * self.bins) % self.bins
+        self._count[i] += 1
+        self._sum_x[i] += pose.x
+        self._sum_y[i] += pose.y
+
+        max_range = sensors.vl53l0x.MAX_RANGE_MM
+        if features.left_front_mm > max_range or features.right_front_mm > max_range:
+            return
+        width = (features.left_front_mm + features.right_front_mm) / 1000.0 * self._side_ratio
+        self._width_count[i] += 1
+        self._width_sum[i] += width
+        if features.front_distance_mm > max_range:
+            return
+        d = features.front_distance_mm / 1000.0 + sensors.vl53l0x.MOUNT_OFFSET_M
+        half = 0.5 * width
+        curvature = width / (d * d - half * half) if d > half else max_curvature
+        self._front_curvature_max[i] = max(self._front_curvature_max[i], min(curvature, max_curvature))
+
+    def finish(
+        self,
+        smoothing_bins: int = decision.lap_profile.CURVATURE_SMOOTHING_BINS,
+        max_curvature: float = decision.lap_profile.MAX_CURVATURE,
+    ) -> LapRecord:
+        """
+        集計から1周の記録を作る
+
+        区間ごとの平均位置を結んだ閉じた折れ線を走行軌跡とし、頂点での向きの変化を前後の辺の長さで割って曲率にする。
+        前方距離から求めた曲率（カーブの手前で大きくなる）と大きい方を取る。
+
+        Args:
+            smoothing_bins: 走行軌跡の曲率を前後この区間数で平均する。デフォルトは設定ファイルの値
+            max_curvature: 曲率の上限（1/m）。デフォルトは設定ファイルの値
+
+        Returns:
+            LapRecord: 記録
+
+        Raises:
+            ValueError: 記録のある区間が3つ未満の場合
+        """
+        seen = np.flatnonzero(self._count)
+        if len(seen) < 3:
+            raise ValueError(f"Not enough recorded bins to build a lap: {len(seen)}")
+        n = self.bins
+        idx = np.arange(n)
+        # 記録のない区間は前後の区間の位置から補間する（1周で閉じているので周期的に）
+        x = np.interp(idx, seen, self._sum_x[seen] / self._count[seen], period=n)
+        y = np.interp(idx, seen, self._sum_y[seen] / self._count[seen], period=n)
+
+        dx = np.roll(x, -1) - x
+        dy = np.roll(y, -1) - y
+        length = np.hypot(dx, dy)
+        heading = np.arctan2(dy, dx)
+        turn = (heading - np.roll(heading, 1) + math.pi) % (2.0 * math.pi) - math.pi
+        ds = 0.5 * (length + np.roll(length, 1))
+        path_curvature = np.abs(turn) / np.maximum(ds, 1e-6)
+        if smoothing_bins > 0:
+            window = 2 * smoothing_bins + 1
+            padded = np.concatenate([path_curvature[-smoothing_bins:], path_curvature, path_curvature[:smoothing_bins]])
+            path_curvature = np.convolve(padded, np.ones(window) / window, mode="valid")
+        curvature = np.minimum(np.maximum(path_curvature, self._front_curvature_max), max_curvature)
+
+        width = np.full(n, np.nan)
+        measured = self._width_count > 0
+        width[measured] = self._width_sum[measured] / self._width_count[measured]
+        return LapRecord(
+            lap_length_m=float(length.sum()),
+            curvature=[float(k) for k in curvature],
+            width_m=[float(w) for w in width],
+        )
+
+
+def throttle_profile(record: LapRecord, cfg: LapProfileConfig = decision.lap_profile) -> np.ndarray:
+    """
+    記録から区間ごとのスロットルを作る
+
+    1. 曲率で横加速度の上限を超えない速度 sqrt(a / κ) を区間ごとの上限にする
+    2. 加速・減速の上限で前後に伝播させる（周回でつながるので2周分回す）
+    3. 応答遅れを見込み、LOOKAHEAD_SEC 先までの最小値を各区間の値にする
+
+    Args:
+        record: 記録した1周
+        cfg: 速度の上限などの設定。デフォルトは設定ファイルの値
+
+    Returns:
+        np.ndarray: 区間ごとのスロットル [MIN_THROTTLE, MAX_THROTTLE]
+    """
+    n = record.bins
+    ds = record.lap_length_m / n
+    v_cap = cfg.MAX_THROTTLE * cfg.MAX_SPEED_MPS
+    curvature = np.asarray(record.curvature, dtype=np.float64)
+    with np.errstate(divide="ignore"):
+        v = np.minimum(np.sqrt(cfg.LATERAL_ACCEL_MPS2 / curvature), v_cap)
+    v = list(v)
+    for _ in range(2):
+        for i in range(n):
+            v[i] = min(v[i], math.sqrt(v[i - 1] ** 2 + 2.0 * cfg.ACCEL_MPS2 * ds))
+    for _ in range(2):
+        for i in range(n - 1, -1, -1):
+            v[i] = min(v[i], math.sqrt(v[(i + 1) % n] ** 2 + 2.0 * cfg.DECEL_MPS2 * ds))
+
+    speed = np.asarray(v)
+    ahead = np.array(speed)
+    for i in range(n):
+        k = int(math.ceil(speed[i] * cfg.LOOKAHEAD_SEC / ds)) if ds > 0.0 else 0
+        ahead[i] = speed[np.arange(i, i + k + 1) % n].min()
+    return np.clip(ahead / cfg.MAX_SPEED_MPS, cfg.MIN_THROTTLE, cfg.MAX_THROTTLE)
+
+
+class LapSpeedProfile:
+    """
+    1周目を記録し、2周目以降は記録から作った速度プロファイルでスロットルを決める
+
+    自己位置推定の結果（WallFeatures.pose）の周回数が1つ進んだ時点で、その周回の記録が十分なら
+    プロファイルを作って保存する。保存した記録があれば起動時に読み込み、1周目からプロファイルで走る。
+    ステアリングは変えず、スロットルだけを置き換える。
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = decision.lap_profile.PATH,
+        cfg: LapProfileConfig = decision.lap_profile,
+    ):
+        """
+        初期化
+
+        Args:
+            path: 記録の保存先（Noneの場合は保存も読み込みもしない）。デフォルトは設定ファイルの値
+            cfg: 区間数・速度の上限などの設定。デフォルトは設定ファイルの値
+        """
+        self.path = path
+        self.cfg = cfg
+        self.record: Optional[LapRecord] = None
+        self._throttle: Optional[np.ndarray] = None
+        self._recorder = LapRecorder(cfg.BINS)
+        self._recording_lap: Optional[int] = None
+        self._armed = False
+        self._warned_no_pose = False
+        if path is not None:
+            record = LapRecord.load(path)
+            if record is not None:
+                self.use(record)
+
+    @property
+    def ready(self) -> bool:
+        """プロファイルができているか"""
+        return self._throttle is not None
+
+    def use(self, record: LapRecord) -> None:
+        """
+        記録からプロファイルを作って使う
+
+        Args:
+            record: 記録した1周
+        """
+        self.record = record
+        self._throttle = throttle_profile(record, self.cfg)
+
+    def observe(self, features: WallFeatures) -> None:
+        """
+        1サイクル分を記録する（プロファイルができるまで。判断の最初に毎サイクル呼ぶ）
+
+        Args:
+            features: 特徴量（pose がない場合は何もしない）
+        """
+        pose = features.pose
+        if pose is None:
+            if not self._warned_no_pose:
+                # 自己位置推定のない知覚モジュールでは記録もプロファイルの適用もできない
+                self._warned_no_pose = True
+                print(
+                    "[LapProfile] no pose in features: the speed profile needs localization "
+                    "(perception.localization.ENABLED); falling back to front-distance speed control",
+                    file=sys.stderr,
+                )
+            return
+        if self._throttle is not None:
+            return
+        if self._recording_lap is None:
+            self._recording_lap = pose.lap
+        if pose.lap != self._recording_lap:
+            finished = pose.lap == self._recording_lap + 1 and self._recorder.coverage >= self.cfg.MIN_COVERAGE
+            if finished:
+                record = self._recorder.finish(self.cfg.CURVATURE_SMOOTHING_BINS, self.cfg.MAX_CURVATURE)
+                self.use(record)
+                if self.path is not None:
+                    record.save(self.path)
+                return
+            # 途中から記録した周回や、逆走で周回数が戻った場合は記録し直す
+            self._recorder.reset()
+            self._recording_lap = pose.lap
+            self._armed = False
+        # スタートラインの手前（周回の終わりの区間）に止まっていた間の位置は、周回の終わりの軌跡を乱すので記録しない
+        if not self._armed:
+            self._armed = pose.lap_progress < 0.5
+        if self._armed and pose.confidence >= self.cfg.MIN_CONFIDENCE:
+            self._recorder.add(pose, features, self.cfg.MAX_CURVATURE)
+
+    def throttle(self, features: WallFeatures) -> Optional[float]:
+        """
+        現在位置のプロファイルのスロットル
+
+        Args:
+            features: 特徴量
+
+        Returns:
+            Optional[float]: スロットル。プロファイルがない・自己位置がない・信頼度が低い場合はNone
+        """
+        pose = features.pose
+        if self._throttle is None or pose is None or pose.confidence < self.cfg.MIN_CONFIDENCE:
+            return None
+        n = len(self._throttle)
+        return float(self._throttle[int(pose.lap_progress * n) % n])
+
+
+def build_lap_profile(enabled: bool = decision.lap_profile.ENABLED) -> Optional[LapSpeedProfile]:
+    """
+    設定ファイルの値で速度プロファイルを作る（保存した記録があれば読み込む）
+
+    Args:
+        enabled: 速度プロファイルを使うか。デフォルトは設定ファイルの値
+
+    Returns:
+        Optional[LapSpeedProfile]: 速度プロファイル（無効の場合None）
+    """
+    return LapSpeedProfile() if enabled else None
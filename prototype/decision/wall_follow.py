@@ -4,12 +4,17 @@
 # --------------------------------
 from __future__ import annotations
 
-import time
+import math
+from dataclasses import replace
+from typing import Optional
 
 from ..domain.command import Command, DriveMode
 from ..domain.features import WallFeatures
+from ..interfaces.protocols import Clock
+from ..clock import system_clock
 from ..config import decision, perception
 from .differential import DifferentialController
+from .lap_profile import LapSpeedProfile, build_lap_profile
 
 
 class CorridorDecision:
@@ -18,6 +23,12 @@ class CorridorDecision:
 
     左右のセンサー差分を元に、ステアリングと速度を決定します。
     P制御（比例制御）とD制御（微分制御）を組み合わせたPD制御を使用します。
+
+    速度プロファイルを設定すると、1周目を記録し、以降は記録から作ったプロファイルでスロットルを決める
+    （ステアリングのPD制御はそのまま。自己位置推定が必要）。
+
+    遅延補償を有効にすると、左右バランス誤差と前方距離をPWMに反映される時刻まで外挿してから判断する
+    （誤差は平滑化した変化率、前方距離はスロットルから推定した速度で進める）。
     """
 
     def __init__(
@@ -33,6 +44,11 @@ class CorridorDecision:
         front_slow_threshold_mm: float = perception.corridor.FRONT_SLOW_THRESHOLD_MM,
         fork_speed: float = decision.corridor.FORK_SPEED,
         fork_steering: float = decision.corridor.FORK_STEERING,
+        clock: Clock = system_clock,
+        use_lap_profile: bool = decision.lap_profile.ENABLED,
+        lap_profile: Optional[LapSpeedProfile] = None,
+        latency_compensation: bool = decision.latency_compensation.ENABLED,
+        output_delay_sec: float = decision.latency_compensation.PWM_OUTPUT_DELAY_SEC,
     ):
         """
         初期化
@@ -49,6 +65,11 @@ class CorridorDecision:
             front_slow_threshold_mm: 前方減速開始の閾値（mm）。デフォルトは設定ファイルの値
             fork_speed: Y字分岐検知時の速度。デフォルトは設定ファイルの値
             fork_steering: Y字分岐回避時の転舵量（絶対値）。デフォルトは設定ファイルの値
+            clock: 時計（コマンドの時刻とD制御の時間差分に使う）。デフォルトは実時間の単調時計
+            use_lap_profile: 速度プロファイルを使うか（保存した記録があれば読み込む）。デフォルトは設定ファイルの値
+            lap_profile: 速度プロファイル。指定した場合は use_lap_profile より優先
+            latency_compensation: 遅延補償を使うか。デフォルトは設定ファイルの値
+            output_delay_sec: PWM書き込みから車両に反映されるまでの見込み（秒）。デフォルトは設定ファイルの値
         """
         self.kp = kp
         self.base_speed = base_speed
@@ -59,12 +80,24 @@ class CorridorDecision:
         self.front_slow_threshold_mm = front_slow_threshold_mm
         self.fork_speed = fork_speed
         self.fork_steering = fork_steering
+        self.clock = clock
+        self.lap_profile = lap_profile if lap_profile is not None else build_lap_profile(use_lap_profile)
 
         # D制御器を初期化
         self._differential_controller = DifferentialController(
-            kd=kd, smoothing_factor=differential_smoothing_factor
+            kd=kd, smoothing_factor=differential_smoothing_factor, clock=clock
         )
 
+        # 遅延補償（誤差の変化率の推定とスロットルから推定した速度）
+        self.latency_compensation = latency_compensation
+        lc = decision.latency_compensation
+        self._error_rate = DifferentialController(kd=1.0, smoothing_factor=lc.ERROR_RATE_SMOOTHING, clock=clock)
+        self._actuation_delay_sec = lc.ACTUATION_DELAY_SEC
+        self.output_delay_sec = output_delay_sec
+        self._speed_mps = 0.0
+        self._prev_throttle = 0.0
+        self._prev_decide_time: float | None = None
+
         # frame_idカウンター
         self._frame_id = 0
 
@@ -82,8 +115,13 @@ class CorridorDecision:
         Returns:
             Command: 制御コマンド
         """
-        current_time = time.time()
+        current_time = self.clock.now()
         self._frame_id += 1
+        if self.lap_profile is not None:
+            self.lap_profile.observe(features)
+        measured_error = features.left_right_error
+        if self.latency_compensation:
+            features = self._predict(features, current_time)
 
         # 1. 前方に障害物がある場合：左右の空きを比較して回避方向を決定
         if features.is_front_blocked:
@@ -95,6 +133,7 @@ class CorridorDecision:
                 # 右の方が空いている → 右に回避（負のステアリング）
                 avoid_steering = -abs(self.front_blocked_steering)
 
+            self._prev_throttle = self.front_blocked_speed
             return Command(
                 frame_id=self._frame_id,
                 t_capture_sec=current_time,
@@ -108,6 +147,7 @@ class CorridorDecision:
         #    fork_steeringの符号で方向を決定（正=左、負=右）
         #    センサー値での判断はノイズで発振するため使用しない
         if features.is_fork_detected:
+            self._prev_throttle = self.fork_speed
             return Command(
                 frame_id=self._frame_id,
                 t_capture_sec=current_time,
@@ -126,7 +166,12 @@ class CorridorDecision:
         p_term = error * self.kp
 
         # D制御: 誤差の変化率を計算して過剰な応答を抑制
-        d_term = self._differential_controller.update(error, current_time)
+        # 時間差分は判断時刻ではなく左右センサーの計測時刻で取る（更新のない古い値で微分しない）
+        # 遅延補償で予測した誤差ではなく、計測した誤差で微分する
+        error_time = features.side_timestamp
+        if error_time is None:
+            error_time = current_time
+        d_term = self._differential_controller.update(measured_error, error_time)
 
         # PD制御: P項とD項を組み合わせ
         steering = p_term + d_term
@@ -134,8 +179,14 @@ class CorridorDecision:
         # ステアリングを -max_steering 〜 +max_steering の範囲にクランプ
         steering = max(min(steering, self.max_steering), -self.max_steering)
 
-        # 4. 速度制御: 前方距離に応じて速度を調整
-        speed = self._calculate_speed(features.front_distance_mm)
+        # 4. 速度制御: 速度プロファイルがあればその値、なければ前方距離に応じて調整
+        reason = "corridor_center"
+        speed = self.lap_profile.throttle(features) if self.lap_profile is not None else None
+        if speed is None:
+            speed = self._calculate_speed(features.front_distance_mm)
+        else:
+            reason = "lap_profile"
+        self._prev_throttle = speed
 
         return Command(
             frame_id=self._frame_id,
@@ -143,7 +194,57 @@ class CorridorDecision:
             steer=steering,
             throttle=speed,
             mode=DriveMode.RUN,
-            reason="corridor_center",
+            reason=reason,
+        )
+
+    def observe_actuation(self, delay_sec: float) -> None:
+        """
+        判断開始からPWM書き込み完了までの実測時間を受け取る（オーケストレーターが毎フレーム呼ぶ）
+
+        Args:
+            delay_sec: 実測の遅延（秒）
+        """
+        a = decision.latency_compensation.ACTUATION_DELAY_SMOOTHING
+        self._actuation_delay_sec = a * self._actuation_delay_sec + (1.0 - a) * max(delay_sec, 0.0)
+
+    @property
+    def actuation_delay_sec(self) -> float:
+        """判断開始からPWMパルスに反映されるまでの見込み時間（秒）"""
+        return self._actuation_delay_sec + self.output_delay_sec
+
+    def _predict(self, features: WallFeatures, current_time: float) -> WallFeatures:
+        """
+        左右バランス誤差と前方距離をPWMに反映される時刻まで外挿した特徴量
+
+        前方の障害物・分岐の判定は知覚の結果のまま（予測で安全側の判定を外さない）。
+
+        Args:
+            features: 知覚結果
+            current_time: 判断時刻（秒）
+
+        Returns:
+            WallFeatures: 予測した特徴量（元の特徴量は変更しない）
+        """
+        lc = decision.latency_compensation
+        # スロットル→速度の一次遅れモデルで現在の速度を進める
+        if self._prev_decide_time is not None and lc.SPEED_TIME_CONSTANT_SEC > 0.0:
+            dt = max(current_time - self._prev_decide_time, 0.0)
+            target = self._prev_throttle * lc.MAX_SPEED_MPS
+            self._speed_mps += (target - self._speed_mps) * (1.0 - math.exp(-dt / lc.SPEED_TIME_CONSTANT_SEC))
+        self._prev_decide_time = current_time
+
+        error_time = features.side_timestamp
+        if error_time is None:
+            error_time = current_time
+        error_rate = self._error_rate.update(features.left_right_error, error_time)
+
+        delay = self.actuation_delay_sec
+        error_horizon = min(max(current_time - error_time, 0.0) + delay, lc.MAX_PREDICTION_SEC)
+        front_horizon = min(features.age("front", current_time) + delay, lc.MAX_PREDICTION_SEC)
+        return replace(
+            features,
+            left_right_error=features.left_right_error + error_rate * error_horizon,
+            front_distance_mm=max(features.front_distance_mm - self._speed_mps * 1000.0 * front_horizon, 0.0),
         )
 
     def _calculate_speed(self, front_distance_mm: float) -> float:
@@ -3,12 +3,14 @@
 
 from .distance import DistanceData
 from .features import WallFeatures
+from .pose import PoseEstimate
 from .command import Command, DriveMode
 from .actuation import ActuationCalibration, Telemetry, ActuationStatus
 
 __all__ = [
     "DistanceData",
     "WallFeatures",
+    "PoseEstimate",
     "Command",
     "DriveMode",
     "ActuationCalibration",
@@ -33,6 +33,7 @@ class ActuationStatus(str, Enum):
     STOPPED = "STOPPED"
     DRIVER_ERROR = "DRIVER_ERROR"
     CALIBRATION_ERROR = "CALIBRATION_ERROR"
+    QUEUED = "QUEUED"  # 駆動スレッドに渡し、まだ書き込んでいない（ActuationWorker）
 
 
 @dataclass(frozen=True)
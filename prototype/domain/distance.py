@@ -5,7 +5,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-import time
+from typing import TYPE_CHECKING, Optional, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from ..interfaces.protocols import Clock
+    from ..sensors.tof import TOFReadings
+
+# チャンネル名（前、右斜め前、左斜め前の順。センサー番号と一致）
+CHANNELS: Tuple[str, ...] = ("front", "right_front", "left_front")
 
 
 @dataclass
@@ -13,26 +20,137 @@ class DistanceData:
     """
     TOFセンサーから取得した距離データ
     センサー配置: 前方、右斜め前、左斜め前
+
+    センサーは計測が完了したものだけ値が更新されるため、チャンネルごとに計測時刻と
+    サンプル番号（計測のたびに1増える。0は未計測）を持つ。
+    チャンネルごとの計測時刻を省略した場合は timestamp と同じ時刻とみなす。
     """
     front_mm: float        # 前方距離 (mm)
     right_front_mm: float  # 右斜め前方距離 (mm)
     left_front_mm: float   # 左斜め前方距離 (mm)
-    timestamp: float       # タイムスタンプ（秒）
+    timestamp: float       # タイムスタンプ（秒、単調時計。データを作成した時刻）
+    front_timestamp: Optional[float] = None        # 前方の計測時刻（秒、単調時計）
+    right_front_timestamp: Optional[float] = None  # 右斜め前の計測時刻（秒、単調時計）
+    left_front_timestamp: Optional[float] = None   # 左斜め前の計測時刻（秒、単調時計）
+    front_seq: int = 0        # 前方のサンプル番号
+    right_front_seq: int = 0  # 右斜め前のサンプル番号
+    left_front_seq: int = 0   # 左斜め前のサンプル番号
+
+    def __post_init__(self) -> None:
+        if self.front_timestamp is None:
+            self.front_timestamp = self.timestamp
+        if self.right_front_timestamp is None:
+            self.right_front_timestamp = self.timestamp
+        if self.left_front_timestamp is None:
+            self.left_front_timestamp = self.timestamp
 
     @classmethod
-    def from_tof_readings(cls, readings: "TOFReadings", timestamp: float | None = None) -> DistanceData:
+    def from_tof_readings(
+        cls,
+        readings: "TOFReadings",
+        timestamp: float | None = None,
+        channel_timestamps: Optional[Sequence[float]] = None,
+        sequences: Optional[Sequence[int]] = None,
+        clock: Optional["Clock"] = None,
+    ) -> DistanceData:
         """
         TOFReadingsからDistanceDataを作成
         
         Args:
             readings: TOFReadingsオブジェクト
-            timestamp: タイムスタンプ（Noneの場合は現在時刻）
+            timestamp: タイムスタンプ（Noneの場合は clock の現在時刻）
+            channel_timestamps: チャンネルごとの計測時刻（前、右斜め前、左斜め前の順）。
+                                Noneの場合は全チャンネルを timestamp とする
+            sequences: チャンネルごとのサンプル番号（前、右斜め前、左斜め前の順）。Noneの場合は0
+            clock: timestamp を省略した場合に現在時刻を読む時計（センサーと同じ時計を渡す）
+
+        Raises:
+            ValueError: timestamp と clock の両方を省略した場合
         """
         if timestamp is None:
-            timestamp = time.time()
+            if clock is None:
+                raise ValueError("from_tof_readings() needs either timestamp or clock")
+            timestamp = clock.now()
+        if channel_timestamps is None:
+            channel_timestamps = (timestamp, timestamp, timestamp)
+        if sequences is None:
+            sequences = (0, 0, 0)
         return cls(
             front_mm=float(readings.front),
             right_front_mm=float(readings.right_front),
             left_front_mm=float(readings.left_front),
-            timestamp=timestamp
+            timestamp=timestamp,
+            front_timestamp=channel_timestamps[0],
+            right_front_timestamp=channel_timestamps[1],
+            left_front_timestamp=channel_timestamps[2],
+            front_seq=sequences[0],
+            right_front_seq=sequences[1],
+            left_front_seq=sequences[2],
+        )
+
+    def channel_timestamps(self) -> Tuple[float, float, float]:
+        """
+        チャンネルごとの計測時刻
+
+        Returns:
+            (front, right_front, left_front): 計測時刻（秒）
+        """
+        return self.front_timestamp, self.right_front_timestamp, self.left_front_timestamp
+
+    def sequences(self) -> Tuple[int, int, int]:
+        """
+        チャンネルごとのサンプル番号
+
+        Returns:
+            (front, right_front, left_front): サンプル番号
+        """
+        return self.front_seq, self.right_front_seq, self.left_front_seq
+
+    def age(self, channel: str, now: float) -> float:
+        """
+        チャンネルの計測値の古さ
+
+        Args:
+            channel: チャンネル名（"front" / "right_front" / "left_front"）
+            now: 現在時刻（秒、単調時計）
+
+        Returns:
+            float: now から計測時刻を引いた経過時間（秒）
+
+        Raises:
+            ValueError: 不明なチャンネル名の場合
+        """
+        if channel not in CHANNELS:
+            raise ValueError(f"Unknown channel: {channel!r} (expected one of {CHANNELS})")
+        return now - getattr(self, f"{channel}_timestamp")
+
+    def ages(self, now: float) -> Tuple[float, float, float]:
+        """
+        全チャンネルの計測値の古さ
+
+        Args:
+            now: 現在時刻（秒、単調時計）
+
+        Returns:
+            (front, right_front, left_front): 経過時間（秒）
+        """
+        return (
+            now - self.front_timestamp,
+            now - self.right_front_timestamp,
+            now - self.left_front_timestamp,
         )
+
+    @property
+    def oldest_timestamp(self) -> float:
+        """最も古いチャンネルの計測時刻（秒）"""
+        return min(self.front_timestamp, self.right_front_timestamp, self.left_front_timestamp)
+
+    @property
+    def latest_timestamp(self) -> float:
+        """最も新しいチャンネルの計測時刻（秒）。このデータで処理を始めるきっかけになった計測"""
+        return max(self.front_timestamp, self.right_front_timestamp, self.left_front_timestamp)
+
+    @property
+    def side_timestamp(self) -> float:
+        """左右斜め前のうち新しい方の計測時刻（秒）。左右バランス誤差が最後に変化した時刻"""
+        return max(self.right_front_timestamp, self.left_front_timestamp)
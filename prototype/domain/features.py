@@ -5,6 +5,10 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Optional
+
+from .distance import DistanceData
+from .pose import PoseEstimate
 
 
 @dataclass
@@ -19,3 +23,27 @@ class WallFeatures:
     front_distance_mm: float   # 前方距離（速度制御用）
     left_front_mm: float       # 左斜め前距離（回避方向判断用）
     right_front_mm: float      # 右斜め前距離（回避方向判断用）
+    sample: Optional[DistanceData] = None  # 元の距離データ（チャンネルごとの計測時刻の参照用）
+    pose: Optional[PoseEstimate] = None    # コース上の自己位置（自己位置推定を行わない場合None）
+
+    @property
+    def side_timestamp(self) -> Optional[float]:
+        """左右バランス誤差の計測時刻（左右斜め前の新しい方、秒）。元の距離データがない場合None"""
+        if self.sample is None:
+            return None
+        return self.sample.side_timestamp
+
+    def age(self, channel: str, now: float) -> float:
+        """
+        チャンネルの計測値の古さ
+
+        Args:
+            channel: チャンネル名（"front" / "right_front" / "left_front"）
+            now: 現在時刻（秒、単調時計）
+
+        Returns:
+            float: 経過時間（秒）。元の距離データがない場合は0.0
+        """
+        if self.sample is None:
+            return 0.0
+        return self.sample.age(channel, now)
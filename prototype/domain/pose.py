@@ -0,0 +1,22 @@
+# --------------------------------
+# domain/pose.py
+# コース上の自己位置推定結果の型定義
+# --------------------------------
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class PoseEstimate:
+    """
+    自己位置推定の結果（座標はコース地図の座標系、m）
+    """
+
+    x: float              # 位置 x（m）
+    y: float              # 位置 y（m）
+    heading: float        # 向き（rad、x軸から反時計回り、[-π, π)）
+    lap_progress: float   # 周回の進捗 [0, 1)（スタートラインが0）
+    lap: int              # 完了した周回数（スタートラインを周回方向に越えるたびに1増える）
+    confidence: float     # 信頼度 [0, 1]（推定位置の近くに集まっている重みの割合）
+    timestamp: float      # 推定に使った距離データの時刻（秒、単調時計）
@@ -2,17 +2,21 @@
 # 各モジュール間のインターフェース（プロトコル）を定義
 
 from .protocols import (
+    Clock,
     CameraModule,
     DistanceSensorModule,
     Perception,
     Decision,
     Actuation,
 )
+from .fake_bus import FakeRegisterBus
 
 __all__ = [
+    "Clock",
     "CameraModule",
     "DistanceSensorModule",
     "Perception",
     "Decision",
     "Actuation",
+    "FakeRegisterBus",
 ]
@@ -0,0 +1,58 @@
+# --------------------------------
+# interfaces/fake_bus.py
+# 実機なしでI2Cドライバを動かすためのレジスタマップ付きI2Cデバイス（センサー・駆動の偽物が共有する）
+# --------------------------------
+from __future__ import annotations
+
+
+class FakeRegisterBus:
+    """
+    256バイトのレジスタマップを持つ I2CDevice 互換オブジェクト
+
+    読み書きはアドレスの自動インクリメントで連続したレジスタに対して行う。
+    トランザクション数と転送バイト数を数えるので、ドライバの1サイクルあたりのバスアクセスを計測できる。
+    """
+
+    def __init__(self):
+        self.registers = bytearray(256)
+        self.transactions = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def __enter__(self) -> FakeRegisterBus:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+    def write_then_readinto(
+        self, out_buffer, in_buffer, *, out_start: int = 0, out_end=None, in_start: int = 0, in_end=None
+    ) -> None:
+        """レジスタアドレスを書き込み、そこから連続して読み出す（1トランザクション）"""
+        out_end = len(out_buffer) if out_end is None else out_end
+        in_end = len(in_buffer) if in_end is None else in_end
+        address = out_buffer[out_start]
+        for i in range(in_end - in_start):
+            in_buffer[in_start + i] = self.registers[(address + i) & 0xFF]
+        self.transactions += 1
+        self.bytes_written += out_end - out_start
+        self.bytes_read += in_end - in_start
+
+    def write(self, buffer, *, start: int = 0, end=None) -> None:
+        """先頭バイトをレジスタアドレスとして、続くバイトを連続して書き込む（1トランザクション）"""
+        end = len(buffer) if end is None else end
+        address = buffer[start]
+        for i, value in enumerate(buffer[start + 1:end]):
+            self.write_register((address + i) & 0xFF, value)
+        self.transactions += 1
+        self.bytes_written += end - start
+
+    def write_register(self, address: int, value: int) -> None:
+        """レジスタへの書き込み（派生クラスで副作用を追加する）"""
+        self.registers[address] = value
+
+    def reset_counters(self) -> None:
+        """トランザクション数と転送バイト数をリセット"""
+        self.transactions = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
@@ -11,6 +11,28 @@ from ..domain.command import Command
 from ..domain.actuation import ActuationCalibration, Telemetry
 
 
+class Clock(Protocol):
+    """
+    Clock external I/F:
+    - 単調時計の現在時刻と待機を提供する責務（実時間 / 仮想時間を差し替え可能にする）
+    """
+    def now_ns(self) -> int:
+        """現在時刻（ナノ秒、単調増加）"""
+        ...
+
+    def now(self) -> float:
+        """現在時刻（秒、単調増加）"""
+        ...
+
+    def sleep(self, duration_sec: float) -> None:
+        """指定時間待機"""
+        ...
+
+    def sleep_until_ns(self, deadline_ns: int) -> int:
+        """絶対時刻（ナノ秒）まで待機し、待機を終えた時刻を返す"""
+        ...
+
+
 class CameraModule(Protocol):
     """
     Camera module external I/F:
@@ -24,6 +46,9 @@ class DistanceSensorModule(Protocol):
     """
     Distance sensor module external I/F:
     - 3方向の距離を計測して返す責務
+
+    計測完了の通知手段（割り込み等）を持つ実装は wait_ready(timeout_sec) -> bool も持てる
+    （計測完了を待ち、タイムアウトならFalse）。持たない実装では Orchestrator は呼ばない
     """
     def read(self) -> DistanceData:
         """3方向の距離を計測して返す"""
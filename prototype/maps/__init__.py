@@ -0,0 +1,28 @@
+# maps パッケージ
+# コース画像（map.png）からの地図作成と、ToF期待距離のレイキャスト表・周回の進捗の表
+
+from .track import TrackMap, extract_free_space, trace_walls
+from .ray_table import (
+    UNKNOWN_MM,
+    RayTable,
+    build_ray_table,
+    load_or_build_ray_table,
+    stored_key,
+    table_key,
+)
+from .progress import ProgressTable, build_progress_table, progress_table_from_ray_table
+
+__all__ = [
+    "TrackMap",
+    "extract_free_space",
+    "trace_walls",
+    "UNKNOWN_MM",
+    "RayTable",
+    "build_ray_table",
+    "load_or_build_ray_table",
+    "stored_key",
+    "table_key",
+    "ProgressTable",
+    "build_progress_table",
+    "progress_table_from_ray_table",
+]
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+コース画像（map.png）からレイキャスト表を作るスクリプト
+
+地図画像・画像の読み取り設定・センサー配置・グリッドが前回と同じなら作り直さない。
+
+使用例:
+    python -m prototype.maps                              # ../map.png から ./log/ray_table.npy を作る（変更があれば）
+    python -m prototype.maps --force --preview ./log/map_preview.png
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from ..config import maps
+from .progress import progress_table_from_ray_table
+from .ray_table import UNKNOWN_MM, load_or_build_ray_table
+from .track import TrackMap
+
+
+def _write_preview(image_path: str, path: str) -> None:
+    """走行可能領域（緑）と壁の線分（赤）を描いた確認用の画像を書き出す"""
+    import cv2
+
+    track = TrackMap.from_image(image_path)
+    rows = track.free.shape[0]
+    preview = np.full(track.free.shape + (3,), 255, dtype=np.uint8)
+    preview[track.free] = (80, 200, 80)
+    preview = np.ascontiguousarray(preview[::-1])
+    scale = 1.0 / track.meters_per_pixel
+    for w in track.walls:
+        p1 = (int(round(w.x1 * scale)), rows - 1 - int(round(w.y1 * scale)))
+        p2 = (int(round(w.x2 * scale)), rows - 1 - int(round(w.y2 * scale)))
+        cv2.line(preview, p1, p2, (0, 0, 220), 1)
+    cv2.imwrite(path, preview)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="コース画像からToF期待距離のレイキャスト表を作る")
+    parser.add_argument("--image", default=maps.image.PATH, help="コース画像のパス")
+    parser.add_argument("--output", default=maps.ray_table.PATH, help="表の保存先（.npy）")
+    parser.add_argument("--force", action="store_true", help="変更がなくても作り直す")
+    parser.add_argument("--preview", help="走行可能領域と壁を描いた確認用画像の書き出し先")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        table, rebuilt = load_or_build_ray_table(args.image, args.output, force=args.force)
+    except FileNotFoundError as e:
+        print(f"[MAP] {e}", file=sys.stderr)
+        return 2
+    elapsed = time.perf_counter() - start
+
+    ny, nx, bins, n_sensors = table.ranges.shape
+    free_cells = int(np.count_nonzero(table.ranges[:, :, 0, 0] != UNKNOWN_MM))
+    print(
+        f"[MAP] {'built' if rebuilt else 'up to date'}: {args.output} in {elapsed:.2f}s "
+        f"({nx}x{ny} cells of {table.cell_m * 1000.0:.0f}mm, {free_cells} on track, "
+        f"{bins} headings, {n_sensors} sensors, {table.ranges.nbytes / 1e6:.1f}MB)"
+    )
+    progress = progress_table_from_ray_table(table)
+    x, y, heading = table.start_pose
+    print(
+        f"[MAP] start: ({x:.2f}, {y:.2f})m heading={heading * 180.0 / np.pi:.0f}deg, "
+        f"lap length={progress.lap_length_m:.2f}m"
+    )
+    if args.preview:
+        _write_preview(args.image, args.preview)
+        print(f"[MAP] wrote preview to {args.preview}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
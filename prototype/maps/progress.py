@@ -0,0 +1,165 @@
+# --------------------------------
+# maps/progress.py
+# 走行可能なセルごとの周回の進捗（スタートラインからのコース沿いの距離の割合）の表
+# --------------------------------
+from __future__ import annotations
+
+import heapq
+import math
+from typing import Tuple
+
+import numpy as np
+
+from .ray_table import UNKNOWN_MM, RayTable
+
+# 8近傍の移動（行, 列, 距離の倍率）
+_NEIGHBORS = (
+    (0, 1, 1.0), (0, -1, 1.0), (1, 0, 1.0), (-1, 0, 1.0),
+    (1, 1, math.sqrt(2.0)), (1, -1, math.sqrt(2.0)), (-1, 1, math.sqrt(2.0)), (-1, -1, math.sqrt(2.0)),
+)
+
+
+class ProgressTable:
+    """
+    位置ごとの周回の進捗の表
+
+    progress[iy, ix] はセル (ix, iy) の中心の進捗（スタートラインが0、1周で1に近づく）。
+    走行可能でないセルは NaN。
+    """
+
+    def __init__(self, progress: np.ndarray, cell_m: float, origin: Tuple[float, float], lap_length_m: float):
+        """
+        初期化
+
+        Args:
+            progress: 進捗（float32、[ny, nx]）
+            cell_m: グリッド間隔（m）
+            origin: セル (0, 0) の角の座標（m）
+            lap_length_m: 1周の長さ（m、走行可能領域内の最短経路）
+        """
+        self.progress = progress
+        self.cell_m = cell_m
+        self.origin = origin
+        self.lap_length_m = lap_length_m
+
+    def lookup(self, x, y) -> np.ndarray:
+        """
+        位置の進捗
+
+        Args:
+            x, y: 位置（m、配列可）
+
+        Returns:
+            np.ndarray: 進捗 [0, 1)。表の外・走行可能でない位置は NaN
+        """
+        ny, nx = self.progress.shape
+        ix = np.floor((np.asarray(x, dtype=np.float64) - self.origin[0]) / self.cell_m).astype(np.int64)
+        iy = np.floor((np.asarray(y, dtype=np.float64) - self.origin[1]) / self.cell_m).astype(np.int64)
+        inside = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+        values = self.progress[np.where(inside, iy, 0), np.where(inside, ix, 0)]
+        return np.where(inside, values, np.nan)
+
+
+def build_progress_table(
+    free: np.ndarray,
+    cell_m: float,
+    origin: Tuple[float, float],
+    start_pose: Tuple[float, float, float],
+    line_half_width_m: float = 1.5,
+) -> ProgressTable:
+    """
+    スタートラインからの最短経路の距離で進捗の表を作る
+
+    スタートラインのすぐ後ろ（2セル分）を通れなくしてから、スタートラインの前側のセルを起点に
+    8近傍のダイクストラ法で距離を求める。こうすると逆回りの経路が塞がれ、距離が周回方向に増えていく。
+    塞いだセルには1周の長さからの残りを割り当てる（1周の長さを超えるセルは1未満に丸める）。
+
+    Args:
+        free: 走行可能なセル（bool、[ny, nx]）
+        cell_m: グリッド間隔（m）
+        origin: セル (0, 0) の角の座標（m）
+        start_pose: スタート位置と向き (x, y, heading[rad])
+        line_half_width_m: スタートラインの片側の長さ（m）。通路幅の半分より長く、隣の通路に届かない長さにする
+
+    Returns:
+        ProgressTable: 進捗の表
+
+    Raises:
+        ValueError: スタート位置が走行可能でない場合
+    """
+    ny, nx = free.shape
+    sx, sy, heading = start_pose
+    cx = origin[0] + (np.arange(nx) + 0.5) * cell_m
+    cy = origin[1] + (np.arange(ny) + 0.5) * cell_m
+    gx, gy = np.meshgrid(cx, cy)
+    along = (gx - sx) * math.cos(heading) + (gy - sy) * math.sin(heading)
+    lateral = -(gx - sx) * math.sin(heading) + (gy - sy) * math.cos(heading)
+    near_line = free & (np.abs(lateral) < line_half_width_m)
+    behind = near_line & (along >= -2.0 * cell_m) & (along < 0.0)
+    seeds = near_line & (along >= 0.0) & (along < cell_m)
+
+    start = (int((sy - origin[1]) // cell_m), int((sx - origin[0]) // cell_m))
+    if not (0 <= start[0] < ny and 0 <= start[1] < nx and free[start]):
+        raise ValueError(f"Start pose is not on the track: ({sx:.3f}, {sy:.3f})")
+
+    passable = free & ~behind
+    dist = np.full((ny, nx), np.inf)
+    heap = []
+    for r, c in zip(*np.nonzero(seeds)):
+        dist[r, c] = 0.0
+        heap.append((0.0, int(r), int(c)))
+    heapq.heapify(heap)
+    while heap:
+        d, r, c = heapq.heappop(heap)
+        if d > dist[r, c]:
+            continue
+        for dr, dc, scale in _NEIGHBORS:
+            nr = r + dr
+            nc = c + dc
+            if not (0 <= nr < ny and 0 <= nc < nx and passable[nr, nc]):
+                continue
+            # 斜めの移動は角を挟む2セルが両方通れる場合だけ（塞いだ線のすき間を抜けないように）
+            if dr and dc and not (passable[r, nc] and passable[nr, c]):
+                continue
+            nd = d + scale * cell_m
+            if nd < dist[nr, nc]:
+                dist[nr, nc] = nd
+                heapq.heappush(heap, (nd, nr, nc))
+
+    reached = np.isfinite(dist)
+    # 1周の長さは、塞いだ帯に後ろ側から接するセル（周回の最後のセル）までの距離の平均に帯の幅を足したもの
+    touching = np.zeros_like(behind)
+    touching[1:, :] |= behind[:-1, :]
+    touching[:-1, :] |= behind[1:, :]
+    touching[:, 1:] |= behind[:, :-1]
+    touching[:, :-1] |= behind[:, 1:]
+    touching &= reached & (along < 0.0)
+    if touching.any():
+        lap_length_m = float(dist[touching].mean()) + 2.0 * cell_m
+    else:
+        lap_length_m = float(dist[reached].max()) + 2.0 * cell_m if reached.any() else 0.0
+    dist[behind] = lap_length_m + along[behind]
+    progress = np.full((ny, nx), np.nan, dtype=np.float32)
+    valid = reached | behind
+    if lap_length_m > 0.0:
+        progress[valid] = np.clip(dist[valid] / lap_length_m, 0.0, np.nextafter(np.float32(1.0), np.float32(0.0)))
+    return ProgressTable(progress, cell_m, origin, lap_length_m)
+
+
+def progress_table_from_ray_table(table: RayTable) -> ProgressTable:
+    """
+    レイキャスト表の走行可能なセルとスタート位置から進捗の表を作る
+
+    Args:
+        table: レイキャスト表（start_pose が記録されているもの）
+
+    Returns:
+        ProgressTable: レイキャスト表と同じグリッドの進捗の表
+
+    Raises:
+        ValueError: レイキャスト表にスタート位置がない場合
+    """
+    if table.start_pose is None:
+        raise ValueError("Ray table has no start pose; rebuild it with python -m prototype.maps --force")
+    free = np.asarray(table.ranges[:, :, 0, 0]) != UNKNOWN_MM
+    return build_progress_table(free, table.cell_m, table.origin, table.start_pose)
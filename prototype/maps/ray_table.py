@@ -0,0 +1,343 @@
+# --------------------------------
+# maps/ray_table.py
+# 位置・向きのグリッドごとに、各ToFの取り付け方向の期待距離を前計算した表
+# 表は uint16（mm）の .npy で保存し、np.load(mmap_mode="r") で読むので、
+# 参照は配列の添字だけで済み、ファイル全体をメモリに載せる必要もない
+# --------------------------------
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+from dataclasses import asdict
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..config import maps, sensors
+from .track import TrackMap
+
+# 表の形式のバージョン（変えると既存の表は作り直しになる）
+TABLE_VERSION: int = 2
+
+# 走行可能でない位置（表の外を含む）の値
+UNKNOWN_MM: int = 0
+
+
+class RayTable:
+    """
+    位置・向きごとのToF期待距離の表
+
+    ranges[iy, ix, ih, k] は、車体中心がセル (ix, iy) の中心にあり向きが ih * 2π / heading_bins のとき、
+    k 番目のセンサー（前、右斜め前、左斜め前の順）が返すはずの距離（mm）。
+    最大距離以内に壁がない場合は範囲外値（OUT_OF_RANGE_MM）、走行可能でないセルは UNKNOWN_MM。
+    """
+
+    def __init__(
+        self,
+        ranges: np.ndarray,
+        cell_m: float,
+        mount_angles_deg: Sequence[float],
+        origin: Tuple[float, float] = (0.0, 0.0),
+        start_pose: Optional[Tuple[float, float, float]] = None,
+        key: str = "",
+    ):
+        """
+        初期化
+
+        Args:
+            ranges: 期待距離（uint16、[ny, nx, heading_bins, センサー数]）。memmap でもよい
+            cell_m: 位置のグリッド間隔（m）
+            mount_angles_deg: 表を作ったときのセンサー取り付け角度（度）
+            origin: セル (0, 0) の角の座標（m）
+            start_pose: 地図のスタート位置と向き (x, y, heading[rad])
+            key: 表を作った入力（地図・センサー配置）のハッシュ
+        """
+        self.ranges = ranges
+        self.cell_m = cell_m
+        self.mount_angles_deg = tuple(mount_angles_deg)
+        self.origin = origin
+        self.start_pose = start_pose
+        self.key = key
+
+    @property
+    def heading_bins(self) -> int:
+        """向きの分割数"""
+        return self.ranges.shape[2]
+
+    def index(self, x, y, heading) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        位置・向きを表の添字にする（最も近いセル・向き）
+
+        Args:
+            x, y: 位置（m、配列可）
+            heading: 向き（rad、配列可）
+
+        Returns:
+            (iy, ix, ih, inside): 添字と、表の範囲内かどうか（範囲外の添字は0）
+        """
+        ny, nx, bins = self.ranges.shape[:3]
+        ix = np.floor((np.asarray(x, dtype=np.float64) - self.origin[0]) / self.cell_m).astype(np.int64)
+        iy = np.floor((np.asarray(y, dtype=np.float64) - self.origin[1]) / self.cell_m).astype(np.int64)
+        ih = np.rint(np.asarray(heading, dtype=np.float64) * (bins / (2.0 * math.pi))).astype(np.int64) % bins
+        inside = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+        ix = np.where(inside, ix, 0)
+        iy = np.where(inside, iy, 0)
+        return iy, ix, ih, inside
+
+    def expected(self, x, y, heading) -> np.ndarray:
+        """
+        位置・向きでの期待距離
+
+        Args:
+            x, y: 位置（m、配列可）
+            heading: 向き（rad、配列可）
+
+        Returns:
+            np.ndarray: [..., センサー数] の期待距離（mm、uint16）。表の範囲外は UNKNOWN_MM
+        """
+        iy, ix, ih, inside = self.index(x, y, heading)
+        values = self.ranges[iy, ix, ih]
+        return np.where(inside[..., None], values, UNKNOWN_MM).astype(np.uint16)
+
+    def save(self, path: str) -> None:
+        """
+        表を .npy に、メタ情報を同じ名前の .json に保存（書き終えてから置き換える）
+
+        Args:
+            path: .npy のパス
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = path + ".tmp.npy"
+        np.save(tmp, np.ascontiguousarray(self.ranges, dtype=np.uint16))
+        os.replace(tmp, path)
+        meta = {
+            "version": TABLE_VERSION,
+            "key": self.key,
+            "cell_m": self.cell_m,
+            "origin": list(self.origin),
+            "start_pose": list(self.start_pose) if self.start_pose is not None else None,
+            "mount_angles_deg": list(self.mount_angles_deg),
+            "shape": list(self.ranges.shape),
+        }
+        with open(_meta_path(path), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+            f.write("\n")
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> RayTable:
+        """
+        保存した表を読み込む
+
+        Args:
+            path: .npy のパス
+            mmap: Trueの場合はメモリマップで読む（参照したページだけが読み込まれる）
+
+        Returns:
+            RayTable: 表
+        """
+        with open(_meta_path(path), encoding="utf-8") as f:
+            meta = json.load(f)
+        ranges = np.load(path, mmap_mode="r" if mmap else None)
+        return cls(
+            ranges,
+            cell_m=meta["cell_m"],
+            mount_angles_deg=meta["mount_angles_deg"],
+            origin=tuple(meta["origin"]),
+            start_pose=tuple(meta["start_pose"]) if meta.get("start_pose") is not None else None,
+            key=meta["key"],
+        )
+
+
+def build_ray_table(
+    track: TrackMap,
+    cell_m: float = maps.ray_table.CELL_M,
+    heading_bins: int = maps.ray_table.HEADING_BINS,
+    mount_angles_deg: Sequence[float] = sensors.vl53l0x.MOUNT_ANGLES_DEG,
+    mount_offset_m: float = sensors.vl53l0x.MOUNT_OFFSET_M,
+    max_range_mm: int = sensors.vl53l0x.MAX_RANGE_MM,
+    chunk_rays: int = maps.ray_table.CHUNK_RAYS,
+    key: str = "",
+) -> RayTable:
+    """
+    地図の壁へのレイキャストで表を作る
+
+    走行可能なセルの中心に車体を置き、全ての向き・センサーのレイを壁の全線分と交差判定する。
+    一時配列が大きくならないよう、chunk_rays 本ずつまとめて計算する。
+
+    Args:
+        track: コース地図
+        cell_m: 位置のグリッド間隔（m）。デフォルトは設定ファイルの値
+        heading_bins: 向きの分割数。デフォルトは設定ファイルの値
+        mount_angles_deg: センサー取り付け角度（度、前方0・左が正）。デフォルトは設定ファイルの値
+        mount_offset_m: 車体中心からセンサーまでの前方オフセット（m）。デフォルトは設定ファイルの値
+        max_range_mm: 計測可能な最大距離（mm）。デフォルトは設定ファイルの値
+        chunk_rays: 1回の計算で扱うレイ数。デフォルトは設定ファイルの値
+        key: 表に記録する入力のハッシュ
+
+    Returns:
+        RayTable: 表
+    """
+    width_m, height_m = track.size_m
+    nx = int(math.ceil(width_m / cell_m))
+    ny = int(math.ceil(height_m / cell_m))
+    n_sensors = len(mount_angles_deg)
+    ranges = np.full((ny, nx, heading_bins, n_sensors), UNKNOWN_MM, dtype=np.uint16)
+
+    # 走行可能なセル（中心で判定）
+    cx = track.origin[0] + (np.arange(nx) + 0.5) * cell_m
+    cy = track.origin[1] + (np.arange(ny) + 0.5) * cell_m
+    gx, gy = np.meshgrid(cx, cy)
+    free_iy, free_ix = np.nonzero(track.is_free(gx, gy))
+
+    # レイ: (セル, 向き, センサー) の全組み合わせ
+    headings = np.arange(heading_bins) * (2.0 * math.pi / heading_bins)
+    mounts = np.radians(np.asarray(mount_angles_deg, dtype=np.float64))
+    cell_idx, head_idx, sensor_idx = np.meshgrid(
+        np.arange(len(free_ix)), np.arange(heading_bins), np.arange(n_sensors), indexing="ij"
+    )
+    cell_idx = cell_idx.ravel()
+    head_idx = head_idx.ravel()
+    sensor_idx = sensor_idx.ravel()
+
+    segs = track.segment_array()
+    seg_min_x = np.minimum(segs[:, 0], segs[:, 2])
+    seg_max_x = np.maximum(segs[:, 0], segs[:, 2])
+    seg_min_y = np.minimum(segs[:, 1], segs[:, 3])
+    seg_max_y = np.maximum(segs[:, 1], segs[:, 3])
+    max_range_m = max_range_mm / 1000.0
+    out = np.empty(len(cell_idx), dtype=np.uint16)
+    for start in range(0, len(cell_idx), chunk_rays):
+        sl = slice(start, start + chunk_rays)
+        heading = headings[head_idx[sl]]
+        ox = cx[free_ix[cell_idx[sl]]] + np.cos(heading) * mount_offset_m
+        oy = cy[free_iy[cell_idx[sl]]] + np.sin(heading) * mount_offset_m
+        angle = heading + mounts[sensor_idx[sl]]
+        # レイは同じセルの周りに固まっているので、届かない線分を先に除く
+        near = (
+            (seg_max_x >= ox.min() - max_range_m) & (seg_min_x <= ox.max() + max_range_m)
+            & (seg_max_y >= oy.min() - max_range_m) & (seg_min_y <= oy.max() + max_range_m)
+        )
+        dist = cast_rays(ox, oy, np.cos(angle), np.sin(angle), segs[near], max_range_m)
+        mm = np.where(
+            np.isfinite(dist),
+            np.minimum(np.rint(dist * 1000.0), max_range_mm),
+            sensors.vl53l0x.OUT_OF_RANGE_MM,
+        )
+        out[sl] = mm.astype(np.uint16)
+
+    ranges[free_iy[cell_idx], free_ix[cell_idx], head_idx, sensor_idx] = out
+    return RayTable(
+        ranges,
+        cell_m=cell_m,
+        mount_angles_deg=mount_angles_deg,
+        origin=track.origin,
+        start_pose=track.start_pose,
+        key=key,
+    )
+
+
+def table_key(
+    image_path: str,
+    cell_m: float = maps.ray_table.CELL_M,
+    heading_bins: int = maps.ray_table.HEADING_BINS,
+    mount_angles_deg: Sequence[float] = sensors.vl53l0x.MOUNT_ANGLES_DEG,
+    mount_offset_m: float = sensors.vl53l0x.MOUNT_OFFSET_M,
+    max_range_mm: int = sensors.vl53l0x.MAX_RANGE_MM,
+) -> str:
+    """
+    表の入力（地図画像の内容・画像の読み取り設定・グリッド・センサー配置）のハッシュ
+
+    Returns:
+        str: SHA-256 の16進文字列
+    """
+    digest = hashlib.sha256()
+    with open(image_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    params = {
+        "version": TABLE_VERSION,
+        "image": asdict(maps.image),
+        "cell_m": cell_m,
+        "heading_bins": heading_bins,
+        "mount_angles_deg": list(mount_angles_deg),
+        "mount_offset_m": mount_offset_m,
+        "max_range_mm": max_range_mm,
+        "out_of_range_mm": sensors.vl53l0x.OUT_OF_RANGE_MM,
+    }
+    digest.update(json.dumps(params, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def stored_key(table_path: str) -> Optional[str]:
+    """保存済みの表のハッシュ（表がない・形式が古い場合はNone）"""
+    if not (os.path.exists(table_path) and os.path.exists(_meta_path(table_path))):
+        return None
+    try:
+        with open(_meta_path(table_path), encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != TABLE_VERSION:
+        return None
+    return meta.get("key")
+
+
+def load_or_build_ray_table(
+    image_path: str = maps.image.PATH,
+    table_path: str = maps.ray_table.PATH,
+    force: bool = False,
+) -> Tuple[RayTable, bool]:
+    """
+    保存済みの表を読み込む。地図画像やセンサー配置が変わっていれば作り直して保存する
+
+    Args:
+        image_path: コース画像のパス。デフォルトは設定ファイルの値
+        table_path: 表の保存先。デフォルトは設定ファイルの値
+        force: Trueの場合は変更がなくても作り直す
+
+    Returns:
+        (table, rebuilt): 表（メモリマップ）と、作り直したかどうか
+    """
+    key = table_key(image_path)
+    rebuilt = force or stored_key(table_path) != key
+    if rebuilt:
+        track = TrackMap.from_image(image_path)
+        build_ray_table(track, key=key).save(table_path)
+    return RayTable.load(table_path), rebuilt
+
+
+def _meta_path(table_path: str) -> str:
+    """表のメタ情報（.json）のパス"""
+    root, _ = os.path.splitext(table_path)
+    return root + ".json"
+
+
+def cast_rays(
+    ox: np.ndarray, oy: np.ndarray, dx: np.ndarray, dy: np.ndarray, segs: np.ndarray, max_range_m: float
+) -> np.ndarray:
+    """
+    レイの束と線分の集合の交差判定（sim.geometry.Course.cast_ray と同じ式）
+
+    Returns:
+        np.ndarray: 各レイの最も近い壁までの距離（m）。max_range_m 以内に壁がない場合は inf
+    """
+    if len(segs) == 0:
+        return np.full(len(ox), np.inf)
+    x1 = segs[None, :, 0]
+    y1 = segs[None, :, 1]
+    sx = segs[None, :, 2] - x1
+    sy = segs[None, :, 3] - y1
+    dx = dx[:, None]
+    dy = dy[:, None]
+    qx = x1 - ox[:, None]
+    qy = y1 - oy[:, None]
+    denom = dx * sy - dy * sx
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = (qx * sy - qy * sx) / denom
+        u = (qx * dy - qy * dx) / denom
+    hit = (denom != 0.0) & (t >= 0.0) & (t <= max_range_m) & (u >= 0.0) & (u <= 1.0)
+    return np.where(hit, t, np.inf).min(axis=1)
@@ -0,0 +1,267 @@
+# --------------------------------
+# maps/track.py
+# コース画像（map.png）から走行可能領域と壁の線分を取り出す
+# --------------------------------
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ..config import maps
+from ..sim.geometry import Course, Segment
+
+
+class TrackMap:
+    """
+    走行可能領域のグリッドと壁の線分からなるコース地図
+
+    座標は x を右、y を上とするメートル単位（シミュレーターのコースと同じ向き）。
+    free[row, col] は y の小さい行から並び（画像とは上下が逆）、ピクセル (0, 0) の左下の角が origin。
+    """
+
+    def __init__(
+        self,
+        free: np.ndarray,
+        meters_per_pixel: float,
+        walls: List[Segment],
+        origin: Tuple[float, float] = (0.0, 0.0),
+        start_pose: Optional[Tuple[float, float, float]] = None,
+    ):
+        """
+        初期化
+
+        Args:
+            free: 走行可能なピクセル（bool、[rows, cols]、行0が y の最小側）
+            meters_per_pixel: 1ピクセルの大きさ（m）
+            walls: 壁の線分（m）
+            origin: ピクセル (0, 0) の左下の角の座標（m）
+            start_pose: スタート位置と向き (x, y, heading[rad])。周回の進捗の基準になる
+        """
+        self.free = np.ascontiguousarray(free, dtype=bool)
+        self.meters_per_pixel = meters_per_pixel
+        self.walls = walls
+        self.origin = origin
+        self.start_pose = start_pose
+
+    @property
+    def size_m(self) -> Tuple[float, float]:
+        """地図の大きさ (幅, 高さ)（m）"""
+        rows, cols = self.free.shape
+        return cols * self.meters_per_pixel, rows * self.meters_per_pixel
+
+    def is_free(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        位置が走行可能か（地図の外はFalse）
+
+        Args:
+            x, y: 位置（m、配列可）
+
+        Returns:
+            np.ndarray: 走行可能ならTrue
+        """
+        col = np.floor((np.asarray(x) - self.origin[0]) / self.meters_per_pixel).astype(np.int64)
+        row = np.floor((np.asarray(y) - self.origin[1]) / self.meters_per_pixel).astype(np.int64)
+        rows, cols = self.free.shape
+        inside = (col >= 0) & (col < cols) & (row >= 0) & (row < rows)
+        result = np.zeros(np.broadcast(col, row).shape, dtype=bool)
+        result[inside] = self.free[row[inside], col[inside]]
+        return result
+
+    def segment_array(self) -> np.ndarray:
+        """壁の線分を [N, 4]（x1, y1, x2, y2）の配列で返す"""
+        return np.array([(w.x1, w.y1, w.x2, w.y2) for w in self.walls], dtype=np.float64).reshape(-1, 4)
+
+    @classmethod
+    def from_image(
+        cls,
+        path: str = maps.image.PATH,
+        meters_per_pixel: float = maps.image.METERS_PER_PIXEL,
+        start_px: Tuple[float, float] = maps.image.START_PX,
+        start_heading_deg: float = maps.image.START_HEADING_DEG,
+        margin_px: int = 4,
+    ) -> TrackMap:
+        """
+        コース画像から地図を作る
+
+        路面（無彩色の中間の灰色）を走行可能とし、赤い注記やチェッカーフラッグはその周りの路面/路面外から補間する。
+        路面に囲まれた穴のうち、縁に壁の線（濃い灰色）がほとんどないもの（路面に書かれた文字・矢印）は路面に戻す。
+        最後に最も大きい連結成分だけを残し、その輪郭を折れ線で近似して壁の線分にする。
+
+        Args:
+            path: 画像のパス。デフォルトは設定ファイルの値
+            meters_per_pixel: 画像の縮尺（m/px）。デフォルトは設定ファイルの値
+            start_px: スタート位置（画像上のピクセル座標 (列, 行)）。デフォルトは設定ファイルの値
+            start_heading_deg: スタート時の向き（度、画像の右が0・上が90）。デフォルトは設定ファイルの値
+            margin_px: 走行可能領域の外接矩形の周りに残す余白（px）
+
+        Returns:
+            TrackMap: 地図（走行可能領域の外接矩形で切り出したもの）
+
+        Raises:
+            FileNotFoundError: 画像を読み込めない場合
+        """
+        # 画像処理は地図の作成時だけ必要なので、ここで遅延インポートする
+        import cv2
+
+        image = cv2.imread(path, cv2.IMREAD_COLOR)
+        if image is None:
+            raise FileNotFoundError(f"Cannot read map image: {path}")
+        free = extract_free_space(image)
+
+        # 走行可能領域の外接矩形で切り出し、y が上向きになるよう上下を反転する
+        rows = np.flatnonzero(free.any(axis=1))
+        cols = np.flatnonzero(free.any(axis=0))
+        r0 = max(rows[0] - margin_px, 0)
+        r1 = min(rows[-1] + margin_px + 1, free.shape[0])
+        c0 = max(cols[0] - margin_px, 0)
+        c1 = min(cols[-1] + margin_px + 1, free.shape[1])
+        free = free[r0:r1, c0:c1][::-1]
+        start_pose = (
+            float((start_px[0] - c0 + 0.5) * meters_per_pixel),
+            float((r1 - 1 - start_px[1] + 0.5) * meters_per_pixel),
+            math.radians(start_heading_deg),
+        )
+        return cls(free, meters_per_pixel, trace_walls(free, meters_per_pixel), start_pose=start_pose)
+
+    @classmethod
+    def from_course(
+        cls,
+        course: Course,
+        meters_per_pixel: float = maps.ray_table.CELL_M,
+        margin_m: float = 0.2,
+    ) -> TrackMap:
+        """
+        シミュレーターのコースから地図を作る
+
+        スタート位置のピクセルから、壁を横切らずに隣のピクセルの中心へ移れる範囲を塗りつぶして走行可能領域とする。
+
+        Args:
+            course: コース
+            meters_per_pixel: 1ピクセルの大きさ（m）。デフォルトはレイキャスト表のグリッド間隔
+            margin_m: 壁の外接矩形の周りに残す余白（m）
+
+        Returns:
+            TrackMap: 地図（壁はコースの線分そのもの）
+        """
+        from .ray_table import cast_rays
+
+        min_x, min_y, max_x, max_y = course.bounds()
+        origin = (min_x - margin_m, min_y - margin_m)
+        cols = int(math.ceil((max_x - min_x + 2.0 * margin_m) / meters_per_pixel))
+        rows = int(math.ceil((max_y - min_y + 2.0 * margin_m) / meters_per_pixel))
+        cx = origin[0] + (np.arange(cols) + 0.5) * meters_per_pixel
+        cy = origin[1] + (np.arange(rows) + 0.5) * meters_per_pixel
+        gx, gy = np.meshgrid(cx, cy)
+        segs = np.array([(w.x1, w.y1, w.x2, w.y2) for w in course.walls], dtype=np.float64).reshape(-1, 4)
+
+        # 右隣・上隣のピクセル中心へのレイが壁に当たるか
+        ox = gx.ravel()
+        oy = gy.ravel()
+        ones = np.ones_like(ox)
+        zeros = np.zeros_like(ox)
+        blocked_right = np.isfinite(cast_rays(ox, oy, ones, zeros, segs, meters_per_pixel)).reshape(rows, cols)
+        blocked_up = np.isfinite(cast_rays(ox, oy, zeros, ones, segs, meters_per_pixel)).reshape(rows, cols)
+
+        free = np.zeros((rows, cols), dtype=bool)
+        sx, sy, _ = course.start_pose
+        start = (int((sy - origin[1]) // meters_per_pixel), int((sx - origin[0]) // meters_per_pixel))
+        free[start] = True
+        queue = deque([start])
+        while queue:
+            r, c = queue.popleft()
+            for nr, nc, blocked in (
+                (r, c + 1, c + 1 < cols and blocked_right[r, c]),
+                (r, c - 1, c > 0 and blocked_right[r, c - 1]),
+                (r + 1, c, r + 1 < rows and blocked_up[r, c]),
+                (r - 1, c, r > 0 and blocked_up[r - 1, c]),
+            ):
+                if 0 <= nr < rows and 0 <= nc < cols and not blocked and not free[nr, nc]:
+                    free[nr, nc] = True
+                    queue.append((nr, nc))
+        return cls(free, meters_per_pixel, list(course.walls), origin=origin, start_pose=course.start_pose)
+
+
+def extract_free_space(image: np.ndarray, cfg=maps.image) -> np.ndarray:
+    """
+    コース画像（BGR）から走行可能なピクセルを取り出す
+
+    Args:
+        image: BGR画像（[rows, cols, 3]、uint8）
+        cfg: 色の分類・注記除去の設定。デフォルトは設定ファイルの値
+
+    Returns:
+        np.ndarray: 走行可能なピクセル（bool、画像と同じ向き）
+    """
+    import cv2
+
+    hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+    saturation = hsv[..., 1]
+    value = hsv[..., 2]
+    gray = saturation <= cfg.GRAY_SATURATION_MAX
+    track = gray & (value >= cfg.TRACK_VALUE_MIN) & (value <= cfg.TRACK_VALUE_MAX)
+    wall = gray & (value >= cfg.WALL_VALUE_MIN) & (value < cfg.TRACK_VALUE_MIN)
+
+    # 注記（彩度の高い赤・黒）とその白い縁取りを、周りの路面/路面外から補間して埋める
+    annotation = (saturation >= cfg.ANNOTATION_SATURATION_MIN) | (value <= cfg.ANNOTATION_VALUE_MAX)
+    kernel = cv2.getStructuringElement(
+        cv2.MORPH_ELLIPSE, (cfg.ANNOTATION_DILATE_PX, cfg.ANNOTATION_DILATE_PX)
+    )
+    annotation = cv2.dilate(annotation.astype(np.uint8), kernel)
+    labels = np.where(track, 255, 0).astype(np.uint8)
+    labels = cv2.inpaint(labels, annotation, cfg.INPAINT_RADIUS_PX, cv2.INPAINT_TELEA)
+    free = (labels >= 128).astype(np.uint8)
+    wall &= annotation == 0
+
+    # 路面に囲まれた穴のうち、縁がほとんど壁の線でないもの（文字・矢印）を埋める
+    count, holes, stats, _ = cv2.connectedComponentsWithStats(1 - free, connectivity=4)
+    edge = cv2.dilate(free, np.ones((3, 3), np.uint8)).astype(bool) & (free == 0)
+    edge_total = np.bincount(holes[edge], minlength=count)
+    edge_wall = np.bincount(holes[edge & wall], minlength=count)
+    for i in range(1, count):
+        if stats[i, cv2.CC_STAT_AREA] >= cfg.MAX_HOLE_AREA_PX or edge_total[i] == 0:
+            continue
+        if edge_wall[i] < cfg.HOLE_WALL_RATIO_MAX * edge_total[i]:
+            free[holes == i] = 1
+
+    # 最も大きい連結成分をコースとする
+    count, components, stats, _ = cv2.connectedComponentsWithStats(free, connectivity=4)
+    if count <= 1:
+        return np.zeros(free.shape, dtype=bool)
+    largest = 1 + int(np.argmax(stats[1:, cv2.CC_STAT_AREA]))
+    return components == largest
+
+
+def trace_walls(
+    free: np.ndarray,
+    meters_per_pixel: float,
+    epsilon_px: float = maps.image.CONTOUR_EPSILON_PX,
+) -> List[Segment]:
+    """
+    走行可能領域の輪郭を折れ線で近似して壁の線分にする
+
+    Args:
+        free: 走行可能なピクセル（bool、行0が y の最小側）
+        meters_per_pixel: 1ピクセルの大きさ（m）
+        epsilon_px: 折れ線近似の許容誤差（px）。デフォルトは設定ファイルの値
+
+    Returns:
+        List[Segment]: 壁の線分（m）
+    """
+    import cv2
+
+    found = cv2.findContours(free.astype(np.uint8), cv2.RETR_LIST, cv2.CHAIN_APPROX_NONE)
+    contours = found[0] if len(found) == 2 else found[1]  # OpenCV 3 は (image, contours, hierarchy)
+    walls: List[Segment] = []
+    for contour in contours:
+        points = cv2.approxPolyDP(contour, epsilon_px, True).reshape(-1, 2)
+        if len(points) < 2:
+            continue
+        # 輪郭の点は走行可能領域の縁のピクセル（の中心）
+        xy = (points.astype(np.float64) + 0.5) * meters_per_pixel  # origin は (0, 0)
+        for (x1, y1), (x2, y2) in zip(xy, np.roll(xy, -1, axis=0)):
+            walls.append(Segment(float(x1), float(y1), float(x2), float(y2)))
+    return walls
+
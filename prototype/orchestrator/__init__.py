@@ -2,7 +2,24 @@
 # 全モジュールを統合して実行するオーケストレーター
 
 from .orchestrator import Orchestrator
+from .scheduler import DeadlineScheduler, OverrunPolicy, SchedulerStats
+from .dashboard import ConsoleDashboard
+from .timing_log import AsyncTimingLogger, TimingLogStats
+from .latency import LatencyHistogram, LatencyStats, LatencyTracer
+from .pwm_frame import GPIOFrameEdgeSource, PWMFrameScheduler, PWMFrameStats
 
 __all__ = [
     "Orchestrator",
+    "DeadlineScheduler",
+    "OverrunPolicy",
+    "SchedulerStats",
+    "ConsoleDashboard",
+    "AsyncTimingLogger",
+    "TimingLogStats",
+    "LatencyHistogram",
+    "LatencyStats",
+    "LatencyTracer",
+    "PWMFrameScheduler",
+    "PWMFrameStats",
+    "GPIOFrameEdgeSource",
 ]
@@ -0,0 +1,213 @@
+# --------------------------------
+# orchestrator/dashboard.py
+# 表示間隔ごとに集計値を出すコンソールダッシュボード
+# --------------------------------
+from __future__ import annotations
+
+import sys
+from typing import List, Optional, TextIO
+
+from ..domain.actuation import Telemetry
+from ..domain.command import Command
+from ..domain.distance import DistanceData
+from ..domain.features import WallFeatures
+from ..config import orchestrator
+
+# ANSIエスケープシーケンス
+_CURSOR_UP_LINES = "\x1b[{n}F"  # n行上の行頭へ移動
+_CLEAR_LINE = "\x1b[2K"
+
+
+class _RollingStat:
+    """前回表示以降の最小・平均・最大"""
+
+    __slots__ = ("min", "max", "sum", "count")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.sum = 0.0
+        self.count = 0
+
+    def add(self, value: float) -> None:
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.sum += value
+        self.count += 1
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+
+class ConsoleDashboard:
+    """
+    コンソールダッシュボード
+
+    update() は毎サイクル呼んでも集計値を更新するだけで、出力は interval_sec ごとに1回に間引く。
+    端末（TTY）への出力ではカーソルを戻して同じ位置に描き直し（スクロールしない）、
+    ファイルやパイプへの出力では表示間隔ごとに1行の要約を追記する。
+    """
+
+    # (ラベル, 単位, 表示形式)
+    _ROWS = (
+        ("F_DIST", "mm", "{:>8.0f}"),
+        ("RF_DIST", "mm", "{:>8.0f}"),
+        ("LF_DIST", "mm", "{:>8.0f}"),
+        ("LR_ERR", "mm", "{:>+8.0f}"),
+        ("STEER", "", "{:>+8.2f}"),
+        ("THROTTLE", "", "{:>8.2f}"),
+        ("E2E_LAT", "ms", "{:>8.2f}"),
+    )
+
+    def __init__(
+        self,
+        interval_sec: float = orchestrator.LOG_INTERVAL_SEC,
+        stream: Optional[TextIO] = None,
+        in_place: Optional[bool] = None,
+    ):
+        """
+        初期化
+
+        Args:
+            interval_sec: 表示間隔（秒）。デフォルトは設定ファイルの値
+            stream: 出力先。Noneの場合は標準出力
+            in_place: 同じ位置に描き直すか。Noneの場合は出力先がTTYなら描き直す
+        """
+        self.interval_sec = interval_sec
+        self.stream = stream if stream is not None else sys.stdout
+        if in_place is None:
+            isatty = getattr(self.stream, "isatty", None)
+            in_place = bool(isatty and isatty())
+        self.in_place = in_place
+        self._stats = tuple(_RollingStat() for _ in self._ROWS)
+        self._cycles = 0
+        self._last_render_time: Optional[float] = None
+        self._rendered_lines = 0
+        self._latest: Optional[tuple] = None
+
+    def update(
+        self,
+        now: float,
+        elapsed_sec: float,
+        distance_data: DistanceData,
+        features: WallFeatures,
+        command: Command,
+        telemetry: Telemetry,
+        deadline_misses: int = 0,
+        latency_sec: Optional[float] = None,
+    ) -> bool:
+        """
+        1サイクル分の値を集計し、表示間隔が過ぎていれば描画
+
+        Args:
+            now: 現在時刻（秒、単調時計）
+            elapsed_sec: ループ開始からの経過時間（秒）
+            distance_data: センサーデータ
+            features: 知覚結果
+            command: 判断結果
+            telemetry: 駆動結果
+            deadline_misses: 制御デッドラインの累積ミス回数
+            latency_sec: センサー計測からPWM書き込み完了までの遅延（秒）。Noneの場合は集計しない
+
+        Returns:
+            bool: 描画した場合True
+        """
+        f, rf, lf, err, steer, throttle, latency = self._stats
+        f.add(distance_data.front_mm)
+        rf.add(distance_data.right_front_mm)
+        lf.add(distance_data.left_front_mm)
+        err.add(features.left_right_error)
+        steer.add(command.steer)
+        throttle.add(command.throttle)
+        if latency_sec is not None:
+            latency.add(latency_sec * 1000.0)
+        self._cycles += 1
+        self._latest = (elapsed_sec, features, telemetry, deadline_misses)
+
+        if self._last_render_time is None:
+            # 初回は計測区間の起点にする（周波数は起点以降のサイクル数で数える）
+            self._last_render_time = now
+            self._cycles = 0
+            return False
+        if now - self._last_render_time < self.interval_sec:
+            return False
+        self._render(now - self._last_render_time)
+        self._last_render_time = now
+        return True
+
+    def close(self) -> None:
+        """描き直し領域の後ろにカーソルを移動"""
+        if self.in_place and self._rendered_lines:
+            self.stream.write("\n")
+            self.stream.flush()
+        self._rendered_lines = 0
+
+    def _render(self, window_sec: float) -> None:
+        """集計値を描画してリセット"""
+        elapsed_sec, features, telemetry, misses = self._latest
+        hz = self._cycles / window_sec if window_sec > 0 else 0.0
+        status = telemetry.status.value if hasattr(telemetry.status, "value") else str(telemetry.status)
+        front_flag = "Y" if features.is_front_blocked else "N"
+        fork_flag = "Y" if features.is_fork_detected else "N"
+        steer_pwm = telemetry.steer_pwm_us if telemetry.steer_pwm_us is not None else 0
+        throttle_pwm = telemetry.throttle_pwm_us if telemetry.throttle_pwm_us is not None else 0
+
+        if self.in_place:
+            lines = self._format_block(elapsed_sec, hz, misses, status, front_flag, fork_flag, steer_pwm, throttle_pwm)
+            out = []
+            if self._rendered_lines > 1:
+                out.append(_CURSOR_UP_LINES.format(n=self._rendered_lines - 1))
+            elif self._rendered_lines == 1:
+                out.append("\r")
+            out.append("\n".join(_CLEAR_LINE + line for line in lines))
+            self.stream.write("".join(out))
+            self._rendered_lines = len(lines)
+        else:
+            cols = " ".join(
+                f"{label}={fmt.format(s.min).strip()}/{fmt.format(s.mean).strip()}/{fmt.format(s.max).strip()}"
+                for (label, _, fmt), s in zip(self._ROWS, self._stats)
+                if s.count
+            )
+            self.stream.write(
+                f"t={elapsed_sec:.1f}s hz={hz:.1f} cycles={self._cycles} misses={misses} "
+                f"front={front_flag} fork={fork_flag} status={status} {cols}\n"
+            )
+        self.stream.flush()
+
+        for s in self._stats:
+            s.reset()
+        self._cycles = 0
+
+    def _format_block(
+        self,
+        elapsed_sec: float,
+        hz: float,
+        misses: int,
+        status: str,
+        front_flag: str,
+        fork_flag: str,
+        steer_pwm: int,
+        throttle_pwm: int,
+    ) -> List[str]:
+        """描き直し用の複数行ブロック"""
+        lines = [
+            f"TIME {elapsed_sec:>7.1f}s | LOOP {hz:>6.1f}Hz | CYCLES {self._cycles:>4} | MISSES {misses:>5} | STATUS {status}",
+            f"{'':<9}{'MIN':>8}{'MEAN':>8}{'MAX':>8}",
+        ]
+        for (label, unit, fmt), s in zip(self._ROWS, self._stats):
+            if not s.count:
+                lines.append(f"{label:<9}{'NA':>8}{'NA':>8}{'NA':>8} {unit}")
+                continue
+            lines.append(
+                f"{label:<9}{fmt.format(s.min)}{fmt.format(s.mean)}{fmt.format(s.max)} {unit}"
+            )
+        lines.append(
+            f"FRONT {front_flag} | FORK {fork_flag} | STEER_PWM {steer_pwm:>5}us | THROTTLE_PWM {throttle_pwm:>5}us"
+        )
+        return lines
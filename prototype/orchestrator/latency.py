@@ -0,0 +1,394 @@
+# --------------------------------
+# orchestrator/latency.py
+# センサー計測からPWM書き込み完了までの遅延をフレーム番号ごとに追跡するトレーサー
+# 区間ごとの遅延はHDR形式のヒストグラム（対数の区間を線形に細分）に集計する
+# --------------------------------
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..config import orchestrator
+
+DUMP_VERSION = 1
+
+# 区間名（計測 → 知覚開始 → 知覚終了 → 判断終了 → PWM書き込み完了）
+STAGES: Tuple[str, ...] = ("sensor_age", "perception", "decision", "actuation", "end_to_end")
+
+
+@dataclass(frozen=True)
+class LatencyStats:
+    """
+    遅延ヒストグラムの統計（マイクロ秒）
+
+    パーセンタイルは値を含むビンの上端（実際の値以上）で、相対誤差は 2^-sub_bucket_bits 以下。
+    """
+
+    count: int
+    min_us: Optional[int]
+    mean_us: Optional[float]
+    p50_us: Optional[int]
+    p90_us: Optional[int]
+    p99_us: Optional[int]
+    p999_us: Optional[int]
+    max_us: Optional[int]
+    clamped: int  # 上限を超えて上限に丸めた件数
+
+    def summary(self) -> str:
+        """1行の要約文字列"""
+        def fmt_ms(value: Optional[float]) -> str:
+            return "NA" if value is None else f"{value / 1000.0:.3f}ms"
+
+        return (
+            f"count={self.count} min={fmt_ms(self.min_us)} mean={fmt_ms(self.mean_us)} "
+            f"p50={fmt_ms(self.p50_us)} p90={fmt_ms(self.p90_us)} p99={fmt_ms(self.p99_us)} "
+            f"p99.9={fmt_ms(self.p999_us)} max={fmt_ms(self.max_us)} clamped={self.clamped}"
+        )
+
+
+class LatencyHistogram:
+    """
+    HDR形式の遅延ヒストグラム（整数マイクロ秒）
+
+    値を2の累乗ごとの区間に分け、各区間を 2^sub_bucket_bits 個のビンに線形に分ける。
+    記録は整数演算とリストの加算だけで、ヒストグラムの大きさは上限値の対数に比例する。
+    """
+
+    def __init__(
+        self,
+        max_us: int = int(orchestrator.LATENCY_HISTOGRAM_MAX_SEC * 1e6),
+        sub_bucket_bits: int = orchestrator.LATENCY_SUB_BUCKET_BITS,
+    ):
+        """
+        初期化
+
+        Args:
+            max_us: 記録できる最大値（マイクロ秒）。超えた値は最大値に丸める。デフォルトは設定ファイルの値
+            sub_bucket_bits: 区間あたりのビン数の指数（相対誤差 2^-sub_bucket_bits）。デフォルトは設定ファイルの値
+
+        Raises:
+            ValueError: max_us または sub_bucket_bits が正でない場合
+        """
+        if max_us <= 0 or sub_bucket_bits <= 0:
+            raise ValueError(f"max_us and sub_bucket_bits must be positive: {max_us}, {sub_bucket_bits}")
+        self.max_us = int(max_us)
+        self.sub_bucket_bits = int(sub_bucket_bits)
+        self._half = 1 << sub_bucket_bits
+        buckets = max(0, self.max_us.bit_length() - (sub_bucket_bits + 1))
+        self._counts: List[int] = [0] * (buckets * self._half + 2 * self._half)
+        self.reset()
+
+    def reset(self) -> None:
+        """記録を消去"""
+        for i in range(len(self._counts)):
+            self._counts[i] = 0
+        self.count = 0
+        self.clamped = 0
+        self._sum = 0
+        self._min: Optional[int] = None
+        self._max: Optional[int] = None
+
+    def _index(self, value: int) -> int:
+        """値のビン番号"""
+        bucket = value.bit_length() - (self.sub_bucket_bits + 1)
+        if bucket <= 0:
+            return value
+        return bucket * self._half + (value >> bucket)
+
+    def _highest_equivalent(self, index: int) -> int:
+        """ビンに入る最大の値"""
+        if index < 2 * self._half:
+            return index
+        bucket = index // self._half - 1
+        sub = index - bucket * self._half
+        return ((sub + 1) << bucket) - 1
+
+    def record(self, value_us: int) -> None:
+        """
+        値を記録
+
+        Args:
+            value_us: 遅延（マイクロ秒）。負の値は0、上限を超える値は上限に丸める
+        """
+        if value_us < 0:
+            value_us = 0
+        elif value_us > self.max_us:
+            value_us = self.max_us
+            self.clamped += 1
+        self._counts[self._index(value_us)] += 1
+        self.count += 1
+        self._sum += value_us
+        if self._min is None or value_us < self._min:
+            self._min = value_us
+        if self._max is None or value_us > self._max:
+            self._max = value_us
+
+    def merge(self, other: LatencyHistogram) -> None:
+        """
+        同じ設定のヒストグラムの記録を足し込む
+
+        Args:
+            other: 足し込むヒストグラム
+
+        Raises:
+            ValueError: 上限値またはビンの細かさが異なる場合
+        """
+        if other.max_us != self.max_us or other.sub_bucket_bits != self.sub_bucket_bits:
+            raise ValueError("Cannot merge histograms with different max_us or sub_bucket_bits")
+        for i, n in enumerate(other._counts):
+            if n:
+                self._counts[i] += n
+        self.count += other.count
+        self.clamped += other.clamped
+        self._sum += other._sum
+        for value in (other._min, other._max):
+            if value is None:
+                continue
+            if self._min is None or value < self._min:
+                self._min = value
+            if self._max is None or value > self._max:
+                self._max = value
+
+    def percentiles(self, qs: Tuple[float, ...]) -> List[Optional[int]]:
+        """
+        パーセンタイル（値を含むビンの上端、最大値を超えない）
+
+        Args:
+            qs: 割合 [0, 1] の組
+
+        Returns:
+            List[Optional[int]]: 各割合の値（マイクロ秒）。記録がない場合は None
+        """
+        if self.count == 0:
+            return [None] * len(qs)
+        cumulative = np.cumsum(np.asarray(self._counts, dtype=np.int64))
+        result: List[Optional[int]] = []
+        for q in qs:
+            rank = max(1, int(np.ceil(min(max(q, 0.0), 1.0) * self.count)))
+            index = int(np.searchsorted(cumulative, rank))
+            result.append(min(self._highest_equivalent(index), self._max))
+        return result
+
+    def stats(self) -> LatencyStats:
+        """現時点の統計"""
+        p50, p90, p99, p999 = self.percentiles((0.50, 0.90, 0.99, 0.999))
+        return LatencyStats(
+            count=self.count,
+            min_us=self._min,
+            mean_us=self._sum / self.count if self.count else None,
+            p50_us=p50,
+            p90_us=p90,
+            p99_us=p99,
+            p999_us=p999,
+            max_us=self._max,
+            clamped=self.clamped,
+        )
+
+    def buckets(self) -> List[Tuple[int, int]]:
+        """
+        記録のあるビン
+
+        Returns:
+            List[Tuple[int, int]]: (ビンの上端の値（マイクロ秒）, 件数) の昇順のリスト
+        """
+        return [(self._highest_equivalent(i), n) for i, n in enumerate(self._counts) if n]
+
+
+class LatencyTracer:
+    """
+    フレーム番号ごとの遅延トレーサー
+
+    1フレームの時刻（センサー計測・知覚の開始と終了・判断の終了・PWM書き込み完了）を同じ単調時計で受け取り、
+    区間ごとの遅延をヒストグラムに集計する。PWMの書き込みを別の場所で行う場合は、
+    begin() で判断までの時刻を登録し、書き込み後に complete() にフレーム番号と完了時刻を渡す。
+    直近のフレームは固定長のリングバッファに残す（フレーム番号を容量で割った余りの位置）。
+
+    集計は制御ループのスレッドで行い、stats() は別スレッドから呼んでもよい（ロックで保護する）。
+    """
+
+    def __init__(
+        self,
+        capacity: int = orchestrator.LATENCY_TRACE_FRAMES,
+        max_us: int = int(orchestrator.LATENCY_HISTOGRAM_MAX_SEC * 1e6),
+        sub_bucket_bits: int = orchestrator.LATENCY_SUB_BUCKET_BITS,
+    ):
+        """
+        初期化
+
+        Args:
+            capacity: 残す直近のフレーム数。デフォルトは設定ファイルの値
+            max_us: ヒストグラムの最大値（マイクロ秒）。デフォルトは設定ファイルの値
+            sub_bucket_bits: ヒストグラムのビンの細かさ。デフォルトは設定ファイルの値
+
+        Raises:
+            ValueError: capacity が正でない場合
+        """
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive: {capacity}")
+        self.capacity = capacity
+        self.histograms: Dict[str, LatencyHistogram] = {
+            name: LatencyHistogram(max_us, sub_bucket_bits) for name in STAGES
+        }
+        self._lock = threading.Lock()
+        # (frame_id, capture, perception_start, perception_end, decision_end, actuated)。actuated が None なら書き込み待ち
+        self._frames: List[Optional[tuple]] = [None] * capacity
+        self.completed = 0  # 集計したフレーム数
+        self.dropped = 0    # 書き込み完了が来ないまま上書きしたフレーム数
+        self.unknown = 0    # 登録のないフレーム番号で complete() が呼ばれた回数
+
+    def reset(self) -> None:
+        """記録と集計を消去"""
+        with self._lock:
+            for hist in self.histograms.values():
+                hist.reset()
+            self._frames = [None] * self.capacity
+            self.completed = 0
+            self.dropped = 0
+            self.unknown = 0
+
+    def begin(
+        self,
+        frame_id: int,
+        capture: float,
+        perception_start: float,
+        perception_end: float,
+        decision_end: float,
+    ) -> None:
+        """
+        判断までの時刻を登録（PWM書き込み完了は complete() で渡す）
+
+        Args:
+            frame_id: フレーム番号（Command.frame_id）
+            capture: センサーの計測時刻（秒、単調時計）
+            perception_start: 知覚の開始時刻（秒）
+            perception_end: 知覚の終了時刻（秒）
+            decision_end: 判断の終了時刻（秒）
+        """
+        slot = frame_id % self.capacity
+        with self._lock:
+            previous = self._frames[slot]
+            if previous is not None and previous[5] is None and previous[0] != frame_id:
+                self.dropped += 1
+            self._frames[slot] = (frame_id, capture, perception_start, perception_end, decision_end, None)
+
+    def complete(self, frame_id: int, actuated: float) -> bool:
+        """
+        PWM書き込み完了時刻を渡してフレームを集計
+
+        Args:
+            frame_id: フレーム番号
+            actuated: PWM書き込みの完了時刻（秒、単調時計）
+
+        Returns:
+            bool: 集計した場合True。登録のないフレーム番号（上書き済み・集計済みを含む）はFalse
+        """
+        slot = frame_id % self.capacity
+        with self._lock:
+            frame = self._frames[slot]
+            if frame is None or frame[0] != frame_id or frame[5] is not None:
+                self.unknown += 1
+                return False
+            frame = frame[:5] + (actuated,)
+            self._frames[slot] = frame
+            self._aggregate(frame)
+        return True
+
+    def record(
+        self,
+        frame_id: int,
+        capture: float,
+        perception_start: float,
+        perception_end: float,
+        decision_end: float,
+        actuated: float,
+    ) -> None:
+        """
+        1フレーム分の時刻をまとめて集計（同じスレッドでPWMを書き込む場合）
+
+        Args:
+            frame_id: フレーム番号
+            capture: センサーの計測時刻（秒、単調時計）
+            perception_start: 知覚の開始時刻（秒）
+            perception_end: 知覚の終了時刻（秒）
+            decision_end: 判断の終了時刻（秒）
+            actuated: PWM書き込みの完了時刻（秒）
+        """
+        frame = (frame_id, capture, perception_start, perception_end, decision_end, actuated)
+        slot = frame_id % self.capacity
+        with self._lock:
+            previous = self._frames[slot]
+            if previous is not None and previous[5] is None and previous[0] != frame_id:
+                self.dropped += 1
+            self._frames[slot] = frame
+            self._aggregate(frame)
+
+    def _aggregate(self, frame: tuple) -> None:
+        """フレームの区間ごとの遅延をヒストグラムに記録（ロック内で呼ぶ）"""
+        _, capture, perception_start, perception_end, decision_end, actuated = frame
+        h = self.histograms
+        h["sensor_age"].record(round((perception_start - capture) * 1e6))
+        h["perception"].record(round((perception_end - perception_start) * 1e6))
+        h["decision"].record(round((decision_end - perception_end) * 1e6))
+        h["actuation"].record(round((actuated - decision_end) * 1e6))
+        h["end_to_end"].record(round((actuated - capture) * 1e6))
+        self.completed += 1
+
+    def stats(self) -> Dict[str, LatencyStats]:
+        """
+        区間ごとの統計（別スレッドから呼んでもよい）
+
+        Returns:
+            Dict[str, LatencyStats]: 区間名（STAGES）→ 統計
+        """
+        with self._lock:
+            return {name: hist.stats() for name, hist in self.histograms.items()}
+
+    def frames(self) -> np.ndarray:
+        """
+        直近の集計済みフレーム（フレーム番号順）
+
+        Returns:
+            np.ndarray: [N, 6]（frame_id, capture, perception_start, perception_end, decision_end, actuated）
+        """
+        with self._lock:
+            done = [f for f in self._frames if f is not None and f[5] is not None]
+        done.sort(key=lambda f: f[0])
+        return np.asarray(done, dtype=np.float64).reshape(-1, 6)
+
+    def dump(self, path: str) -> None:
+        """
+        統計・ヒストグラム・直近のフレームをJSONに書き出す（一時ファイルに書いてから置き換える）
+
+        Args:
+            path: 出力先のパス
+        """
+        with self._lock:
+            stages = {
+                name: {"stats": hist.stats().__dict__, "buckets": hist.buckets()}
+                for name, hist in self.histograms.items()
+            }
+            completed, dropped, unknown = self.completed, self.dropped, self.unknown
+            any_hist = self.histograms[STAGES[0]]
+        data = {
+            "version": DUMP_VERSION,
+            "unit": "us",
+            "max_us": any_hist.max_us,
+            "sub_bucket_bits": any_hist.sub_bucket_bits,
+            "completed": completed,
+            "dropped": dropped,
+            "unknown": unknown,
+            "stages": stages,
+            "frames": self.frames().tolist(),
+        }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
@@ -3,16 +3,33 @@
 # --------------------------------
 from __future__ import annotations
 
-import logging
-import os
-from typing import Optional
+import math
+import threading
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 
-from ..interfaces.protocols import DistanceSensorModule, Perception, Decision, Actuation
-from ..domain.actuation import Telemetry
-from ..domain.distance import DistanceData
-from ..domain.features import WallFeatures
+from ..interfaces.protocols import Clock, DistanceSensorModule, Perception, Decision, Actuation
+from ..domain.actuation import ActuationStatus, Telemetry
 from ..domain.command import Command
+from ..domain.features import WallFeatures
+from ..domain.distance import DistanceData
 from ..config import orchestrator
+from ..clock import system_clock
+from ..recorder import FlightRecorder
+from .dashboard import ConsoleDashboard
+from .latency import STAGES, LatencyStats, LatencyTracer
+from .pwm_frame import PWMFrameScheduler, PWMFrameStats
+from .scheduler import DeadlineScheduler, OverrunPolicy, SchedulerStats
+from .timing_log import (
+    AsyncTimingLogger,
+    KIND_EVENT,
+    KIND_FREQUENCY,
+    KIND_SCHEDULE,
+    KIND_STAGE,
+    KIND_TEXT,
+)
+
+if TYPE_CHECKING:
+    from ..watchdog import HeartbeatWriter
 
 
 class Orchestrator:
@@ -28,6 +45,12 @@ class Orchestrator:
         decision: Decision,
         actuation: Actuation,
         timing_log_path: Optional[str] = None,
+        clock: Clock = system_clock,
+        recorder: Optional[FlightRecorder] = None,
+        latency_trace: bool = orchestrator.LATENCY_TRACE_ENABLED,
+        latency_dump_path: Optional[str] = None,
+        pwm_frame: Optional[PWMFrameScheduler] = None,
+        heartbeat: Optional["HeartbeatWriter"] = None,
     ):
         """
         初期化
@@ -36,22 +59,56 @@ class Orchestrator:
             sensor: 距離センサーモジュール
             perception: 知覚モジュール
             decision: 判断モジュール
-            actuation: 駆動モジュール
-            timing_log_path: タイミングログファイルのパス（Noneの場合はログを出力しない）
+            actuation: 駆動モジュール。add_listener() を持つ駆動モジュール（ActuationWorker）は書き込みを別スレッドで行うとみなし、
+                       実測時間・遅延・PWMフレームの余裕は書き込み完了の通知で記録する
+            timing_log_path: タイミングログファイルのパス（Noneの場合はログを出力しない）。
+                             書き出しは別スレッドで行うので、終了時に close() を呼ぶこと
+            clock: 時計（全ステージの時刻計測とループの待機に使う）。デフォルトは実時間の単調時計
+            recorder: フライトレコーダー（Noneの場合は記録しない）。クローズは呼び出し側の責任
+            latency_trace: センサー計測からPWM書き込み完了までの遅延を集計するか。デフォルトは設定ファイルの値
+            latency_dump_path: 遅延の集計を close() 時に書き出すJSONのパス（Noneの場合は書き出さない）
+            pwm_frame: PWMフレームのスケジューラー。指定した場合、run_loop() は判断結果を次のフレームの直前に書き込む
+                       （Noneの場合は判断後すぐ書き込む）
+            heartbeat: ウォッチドッグへのハートビート（Noneの場合は書かない）。PWMの書き込みが成功するたびに書き、
+                       run_loop() の終了時に監視を止める（停止に失敗した場合は監視を続ける）。クローズは呼び出し側の責任
         """
         self.sensor = sensor
         self.perception = perception
         self.decision = decision
         self.actuation = actuation
+        self.clock = clock
+        self.recorder = recorder
+        self.latency: Optional[LatencyTracer] = LatencyTracer() if latency_trace else None
+        self._latency_dump_path = latency_dump_path
+        self.pwm_frame = pwm_frame
+        self.heartbeat = heartbeat
+        self._watchdog_trips = heartbeat.watchdog_trips if heartbeat is not None else 0
+        # 判断結果を知覚に戻す口（自己位置推定の動作モデル用）。持たない知覚モジュールでは呼ばない
+        self._observe_command = getattr(perception, "observe_command", None)
+        # 判断開始からPWM書き込み完了までの実測時間を判断に戻す口（遅延補償用）。持たない判断モジュールでは呼ばない
+        self._observe_actuation = getattr(decision, "observe_actuation", None)
+        # 計測完了を待つ口（割り込み等の通知手段）。持たないセンサーモジュールでは次のポーリングデッドラインまで待つ
+        self._wait_ready = getattr(sensor, "wait_ready", None)
+        # 書き込みを専用スレッドで行う駆動モジュール（ActuationWorker）は、書き込み完了を通知で受け取る
+        add_listener = getattr(actuation, "add_listener", None)
+        self._async_actuation = add_listener is not None
+        # 駆動スレッドに渡したフレーム番号 → (判断の開始時刻, 狙ったPWMフレームのエッジ)
+        self._frame_pending: Dict[int, Tuple[float, Optional[float]]] = {}
+        self._frame_pending_lock = threading.Lock()
+        # 判断に戻した実測遅延のうち最新のもの（次の判断で取り出す）と、フライトレコーダーに残す値（再生で同じ順に戻す）
+        self._delay_since_decide = math.nan
+        self._delay_for_record = math.nan
+        if add_listener is not None:
+            add_listener(self._on_actuated)
         self._last_sensor_time: Optional[float] = None
         self._last_actuation_time: Optional[float] = None
         self._last_loop_time: Optional[float] = None
+        self._control_scheduler: Optional[DeadlineScheduler] = None
+        self._poll_scheduler: Optional[DeadlineScheduler] = None
         self._timing_logger = self._setup_timing_logger(timing_log_path)
-        import time
-
-        self._timing_start_time = time.time()
+        self._timing_start_time = clock.now()
         if self._timing_logger:
-            self._timing_logger.info("event=run_start t=%.3fs", 0.0)
+            self._timing_logger.log(KIND_EVENT, 0.0, "run_start")
 
     def run_once(self) -> Telemetry:
         """
@@ -60,34 +117,33 @@ class Orchestrator:
         Returns:
             Telemetry: 駆動モジュールの適用結果
         """
-        import time
-
+        now = self.clock.now
         loop_idx = 0
-        t0 = time.perf_counter()
+        t0 = now()
 
         # 1. 計測 (Measure)
-        t1 = time.perf_counter()
+        t1 = now()
         distance_data = self.sensor.read()
-        t2 = time.perf_counter()
+        t2 = now()
         self._log_stage(loop_idx, "sensor", t1, t2)
 
         # 2. 知覚 (Perceive)
-        t3 = time.perf_counter()
+        t3 = now()
         features = self.perception.analyze(distance_data)
-        t4 = time.perf_counter()
+        t4 = now()
         self._log_stage(loop_idx, "perception", t3, t4)
 
         # 3. 判断 (Decide)
-        t5 = time.perf_counter()
+        t5 = now()
+        self._take_actuation_delay()
         command = self.decision.decide(features)
-        t6 = time.perf_counter()
+        if self._observe_command is not None:
+            self._observe_command(command)
+        t6 = now()
         self._log_stage(loop_idx, "decision", t5, t6)
 
         # 4. 実行 (Act)
-        t7 = time.perf_counter()
-        telemetry = self.actuation.apply(command)
-        t8 = time.perf_counter()
-        self._log_stage(loop_idx, "actuation", t7, t8)
+        telemetry, t7, t8 = self._actuate(loop_idx, distance_data, features, command, t1, t2, t3, t4, t5, t6)
 
         self._log_event("loop_end")
         self._log_frequency(loop_idx, t1, t7, t0)
@@ -97,127 +153,464 @@ class Orchestrator:
         self,
         max_iterations: Optional[int] = None,
         poll_interval_sec: float = orchestrator.POLL_INTERVAL_SEC,
-        log_interval_sec: float = orchestrator.LOG_INTERVAL_SEC,
+        log_interval_sec: Optional[float] = orchestrator.LOG_INTERVAL_SEC,
+        loop_interval_sec: float = orchestrator.LOOP_INTERVAL_SEC,
+        overrun_policy: OverrunPolicy = OverrunPolicy(orchestrator.OVERRUN_POLICY),
     ) -> None:
         """
         ポーリングベースの連続実行。
         sensor.poll() で data-ready なセンサーのみ読み出し、
         更新があったときだけ perception→decision→actuation を実行する。
 
+        ポーリングと制御はそれぞれ絶対デッドラインのスケジューラーで周期を刻むため、
+        処理時間や sleep の誤差が周期に蓄積しない。
+
+        PWMフレームのスケジューラーがある場合は、制御周期で待つ代わりに更新のたびに判断し、
+        判断結果は次のフレームの直前（書き込み時刻）まで持っておく。その間に次の判断結果が出たら置き換え、
+        書き込み時刻に最新の結果だけを書き込む。max_iterations は判断の回数で数える。
+
         Args:
             max_iterations: 最大実行回数（Noneの場合は無限ループ）
             poll_interval_sec: ポーリング間隔（秒）。デフォルトは設定ファイルの値（1ms）
-            log_interval_sec: 詳細ログ出力間隔（秒）。デフォルトは設定ファイルの値
+            log_interval_sec: コンソールダッシュボードの表示間隔（秒）。デフォルトは設定ファイルの値。
+                              Noneの場合は表示しない
+            loop_interval_sec: 制御周期（秒）。デフォルトは設定ファイルの値（20ms）
+            overrun_policy: 制御デッドライン超過時の方針。デフォルトは設定ファイルの値
         """
-        import time
-
-        start_time = time.time()
+        now = self.clock.now
+        start_time = now()
         iteration = 0
-        last_log_time = 0.0
-        header_printed = False
+        dashboard = ConsoleDashboard(log_interval_sec) if log_interval_sec is not None else None
+
+        # PWMフレームに合わせる場合は、制御周期の代わりにフレームの先頭で書き込みの間隔を刻む
+        frame = self.pwm_frame
+        if frame is not None and not frame.synced:
+            origin = getattr(self.actuation, "frame_origin_sec", None)
+            if origin is not None:
+                frame.reset_phase(origin)
+        control_scheduler = DeadlineScheduler(
+            loop_interval_sec, policy=overrun_policy, clock=self.clock
+        )
+        poll_scheduler = DeadlineScheduler(
+            poll_interval_sec, policy=OverrunPolicy.SKIP, clock=self.clock
+        )
+        self._control_scheduler = control_scheduler if frame is None else None
+        self._poll_scheduler = poll_scheduler
+        control_scheduler.start()
+        poll_scheduler.start()
+
+        # 書き込み待ちの判断結果 (ループインデックス, distance_data, features, command, 時刻 t1〜t6, 狙うエッジ) と書き込み時刻
+        pending: Optional[tuple] = None
+        write_at_ns = 0
+        # 監視を止めてよいか（正常に終わった、または停止の書き込みが成功した場合だけ True）
+        stopped_safely = False
 
         try:
-            while max_iterations is None or iteration < max_iterations:
-                t0 = time.perf_counter()
+            while max_iterations is None or iteration < max_iterations or pending is not None:
+                t0 = now()
+
+                # 0. 書き込み時刻に達した判断結果をPWMに書き込む（フレームに合わせる場合）
+                #    最大実行回数に達していれば、新しい計測は読まずに書き込み時刻まで待つ
+                if pending is not None:
+                    if self.clock.now_ns() >= write_at_ns:
+                        self._actuate_pending(pending, dashboard, start_time)
+                        pending = None
+                        poll_scheduler.start()
+                        continue
+                    if max_iterations is not None and iteration >= max_iterations:
+                        self.clock.sleep_until_ns(write_at_ns)
+                        continue
 
                 # 1. ポーリング (Poll)
-                t1 = time.perf_counter()
+                t1 = now()
                 updated, distance_data = self.sensor.poll()
-                t2 = time.perf_counter()
+                t2 = now()
 
-                # 更新なしならスキップして次のポーリングへ
+                # 更新なしなら計測完了の通知を待つ
+                # （通知手段がないセンサーやタイムアウト時は次のポーリングデッドラインまで待つ）
+                # 書き込み待ちがあれば、書き込み時刻を過ぎて待たない
                 if not updated:
-                    time.sleep(poll_interval_sec)
+                    if pending is None:
+                        if self._wait_ready is None or not self._wait_ready(loop_interval_sec):
+                            poll_scheduler.wait_next()
+                    else:
+                        remaining = (write_at_ns - self.clock.now_ns()) / 1e9
+                        if remaining > 0.0 and (self._wait_ready is None or not self._wait_ready(remaining)):
+                            if (write_at_ns - self.clock.now_ns()) / 1e9 < poll_scheduler.time_to_deadline_sec():
+                                self.clock.sleep_until_ns(write_at_ns)
+                            else:
+                                poll_scheduler.wait_next()
                     continue
 
                 self._log_stage(iteration, "sensor", t1, t2)
 
                 # 2. 知覚 (Perceive)
-                t3 = time.perf_counter()
+                t3 = now()
                 features = self.perception.analyze(distance_data)
-                t4 = time.perf_counter()
+                t4 = now()
                 self._log_stage(iteration, "perception", t3, t4)
 
                 # 3. 判断 (Decide)
-                t5 = time.perf_counter()
+                t5 = now()
+                self._take_actuation_delay()
                 command = self.decision.decide(features)
-                t6 = time.perf_counter()
+                if self._observe_command is not None:
+                    self._observe_command(command)
+                t6 = now()
                 self._log_stage(iteration, "decision", t5, t6)
 
+                # フレームに合わせる場合は書き込み時刻まで持っておく
+                # （書き込み前に次の判断結果が出たら、同じフレームに間に合わない古い結果は書かずに置き換える）
+                deadline = frame.write_deadline(t6) if frame is not None else None
+                if deadline is not None:
+                    if pending is not None:
+                        frame.record_coalesced()
+                    if self.latency is not None:
+                        self.latency.begin(command.frame_id, distance_data.latest_timestamp, t3, t4, t6)
+                    write_at, edge = deadline
+                    write_at_ns = int(round(write_at * 1e9))
+                    pending = (iteration, distance_data, features, command, (t1, t2, t3, t4, t5, t6), edge)
+                    iteration += 1
+                    self._log_event("decision_end")
+                    continue
+
                 # 4. 実行 (Act)
-                t7 = time.perf_counter()
-                telemetry = self.actuation.apply(command)
-                t8 = time.perf_counter()
-                self._log_stage(iteration, "actuation", t7, t8)
-
-                # ヘッダーを一度だけ出力
-                if not header_printed:
-                    print(
-                        "TIME   | F_DIST | RF_DIST | LF_DIST | LR_ERR  | FRONT | FORK  | STEER | THROTTLE | STEER_PWM | THROTTLE_PWM | STATUS"
-                    )
-                    header_printed = True
+                telemetry, t7, t8 = self._actuate(iteration, distance_data, features, command, t1, t2, t3, t4, t5, t6)
 
-                # 詳細ログ出力（毎ループ）
-                current_time = time.time()
+                # コンソールダッシュボード（表示は log_interval_sec ごとに間引く）
                 iteration += 1
-                elapsed_time = current_time - start_time
-                self._log_cycle(
-                    elapsed_time, distance_data, features, command, telemetry
-                )
+                if dashboard is not None:
+                    current_time = now()
+                    dashboard.update(
+                        current_time,
+                        current_time - start_time,
+                        distance_data,
+                        features,
+                        command,
+                        self._latest_telemetry(telemetry),
+                        control_scheduler.deadline_misses,
+                        t8 - distance_data.latest_timestamp,
+                    )
 
                 self._log_event("loop_end")
                 self._log_frequency(iteration, t1, t7, t0)
 
-                elapsed = time.perf_counter() - t0
-                remaining = orchestrator.LOOP_INTERVAL_SEC - elapsed
-                if remaining > 0:
-                    time.sleep(remaining)
+                # 次の制御デッドラインまで待ち、ポーリングの位相をそこに合わせ直す
+                lateness = control_scheduler.wait_next()
+                self._log_schedule(iteration, lateness)
+                poll_scheduler.start()
+            stopped_safely = True
         except KeyboardInterrupt:
             print("\n[Orchestrator] Interrupted by user")
-            self.emergency_stop("user_interrupt")
+            stopped_safely = self._stop_succeeded(self.emergency_stop("user_interrupt"))
         except Exception as e:
             print(f"\n[Orchestrator] Error occurred: {e}")
-            self.emergency_stop(f"error: {str(e)}")
+            stopped_safely = self._stop_succeeded(self.emergency_stop(f"error: {str(e)}"))
+        finally:
+            if self.heartbeat is not None:
+                if stopped_safely:
+                    # 止めた後のハートビートの途絶えでウォッチドッグを発動させない
+                    self.heartbeat.disarm()
+                else:
+                    # 停止を書き込めていない（または処理できない例外）: 監視を続け、ウォッチドッグにニュートラルを書かせる
+                    print("[Orchestrator] stop not confirmed; leaving the heartbeat armed for the watchdog")
+            if dashboard is not None:
+                dashboard.close()
+            self._report_schedule()
+            self._report_latency()
+            self._report_pwm_frame()
+            if self._timing_logger:
+                try:
+                    self._timing_logger.flush()
+                except Exception as e:
+                    print(f"[Orchestrator] timing log flush failed: {e}")
+
+    def _actuate(
+        self,
+        loop_idx: int,
+        distance_data: DistanceData,
+        features: WallFeatures,
+        command: Command,
+        t1: float,
+        t2: float,
+        t3: float,
+        t4: float,
+        t5: float,
+        t6: float,
+        edge: Optional[float] = None,
+    ) -> Tuple[Telemetry, float, float]:
+        """
+        コマンドをPWMに書き込み、実測時間を判断に戻して遅延とフライトレコーダーに記録
 
-    def _setup_timing_logger(
-        self, timing_log_path: Optional[str]
-    ) -> Optional[logging.Logger]:
+        駆動スレッドを使う場合は、判断の開始時刻と狙ったエッジをフレーム番号で覚えておき、
+        書き込み完了の通知（_on_actuated）で実測時間（判断の開始から書き込み完了まで）と遅延を記録する。
+
+        Args:
+            loop_idx: ループインデックス
+            distance_data: 計測結果
+            features: 知覚結果
+            command: 判断結果
+            t1, t2: 計測の開始・終了時刻
+            t3, t4: 知覚の開始・終了時刻
+            t5, t6: 判断の開始・終了時刻
+            edge: 狙うPWMフレームのエッジ（PWMフレームに合わせる場合）
+
+        Returns:
+            (テレメトリ, 書き込みの開始時刻, 書き込みの完了時刻)
         """
-        タイミングロガーをセットアップ
+        capture = distance_data.latest_timestamp
+        if self.heartbeat is not None:
+            self._check_watchdog()
+        if self._async_actuation:
+            # 駆動スレッドが書き込みを終える前に登録しておく
+            with self._frame_pending_lock:
+                self._frame_pending[command.frame_id] = (t5, edge)
+            if self.latency is not None:
+                self.latency.begin(command.frame_id, capture, t3, t4, t6)
+        t7 = self.clock.now()
+        telemetry = self.actuation.apply(command)
+        t8 = self.clock.now()
+        self._log_stage(loop_idx, "actuation", t7, t8)
+        if not self._async_actuation:
+            if self.heartbeat is not None and telemetry.status is ActuationStatus.OK:
+                self.heartbeat.beat(command.frame_id)
+            if self._observe_actuation is not None:
+                self._feed_actuation_delay(t8 - t5)
+            if self.latency is not None:
+                self.latency.record(command.frame_id, capture, t3, t4, t6, t8)
+
+        if self.recorder is not None:
+            self.recorder.record(
+                distance_data,
+                features,
+                command,
+                telemetry,
+                (t2 - t1, t4 - t3, t6 - t5, t8 - t7),
+                self._delay_for_record,
+            )
+            self._delay_for_record = math.nan
+        return telemetry, t7, t8
+
+    def _actuate_pending(
+        self, pending: tuple, dashboard: Optional[ConsoleDashboard], start_time: float
+    ) -> Telemetry:
+        """
+        書き込み時刻に達した判断結果をPWMに書き込み、狙ったエッジまでの余裕を記録（フレームに合わせる場合）
 
         Args:
-            timing_log_path: ログファイルのパス（Noneの場合はログを出力しない）
+            pending: (ループインデックス, distance_data, features, command, 時刻 t1〜t6, 狙うエッジ)
+            dashboard: コンソールダッシュボード（Noneの場合は表示しない）
+            start_time: run_loop() の開始時刻
 
         Returns:
-            設定されたロガー。timing_log_pathがNoneの場合はNone
+            Telemetry: 駆動モジュールの適用結果
         """
-        if timing_log_path is None:
+        loop_idx, distance_data, features, command, (t1, t2, t3, t4, t5, t6), edge = pending
+        # 駆動スレッドを使う場合、余裕は書き込み完了の通知で記録する
+        telemetry, t7, t8 = self._actuate(
+            loop_idx, distance_data, features, command, t1, t2, t3, t4, t5, t6, edge=edge
+        )
+        slack = None if self._async_actuation else self.pwm_frame.record_write(edge, t8)
+
+        if dashboard is not None:
+            current_time = self.clock.now()
+            dashboard.update(
+                current_time,
+                current_time - start_time,
+                distance_data,
+                features,
+                command,
+                self._latest_telemetry(telemetry),
+                self.pwm_frame.missed,
+                t8 - distance_data.latest_timestamp,
+            )
+
+        # 狙ったエッジからの遅れ（負の値は余裕）をスケジュールのログとして残す
+        if self._timing_logger and slack is not None:
+            self._timing_logger.log(
+                KIND_SCHEDULE, t8 - self._timing_start_time, loop_idx, -slack, self.pwm_frame.missed, 0
+            )
+        self._log_event("loop_end")
+        self._log_frequency(loop_idx + 1, t1, t7, t7)
+        return telemetry
+
+    def _feed_actuation_delay(self, delay_sec: float) -> None:
+        """
+        判断の開始から書き込み完了までの実測時間を判断に戻し、次の判断のフライトレコードに残すため覚えておく
+
+        Args:
+            delay_sec: 実測の遅延（秒）
+        """
+        with self._frame_pending_lock:
+            self._delay_since_decide = delay_sec
+        self._observe_actuation(delay_sec)
+
+    def _take_actuation_delay(self) -> None:
+        """判断の直前に呼び、前の判断から戻した最新の実測遅延をこの判断のフライトレコードに回す"""
+        with self._frame_pending_lock:
+            delay = self._delay_since_decide
+            self._delay_since_decide = math.nan
+        if not math.isnan(delay):
+            self._delay_for_record = delay
+
+    def _on_actuated(self, telemetry: Telemetry, started: float, done: float) -> None:
+        """
+        駆動スレッドの書き込み完了の通知（駆動スレッドから呼ばれる）
+
+        Args:
+            telemetry: 書き込み結果
+            started: 書き込みの開始時刻（秒）
+            done: 書き込みの完了時刻（秒）
+        """
+        frame_id = telemetry.frame_id
+        with self._frame_pending_lock:
+            decision_start, edge = self._frame_pending.pop(frame_id, (None, None))
+            # 置き換えられて書き込まれなかったフレームの分を捨てる
+            for stale in [k for k in self._frame_pending if k < frame_id]:
+                del self._frame_pending[stale]
+        if edge is not None and self.pwm_frame is not None:
+            self.pwm_frame.record_write(edge, done)
+        if telemetry.status is not ActuationStatus.OK:
+            return
+        if self.heartbeat is not None:
+            self.heartbeat.beat(frame_id)
+        # 同期の書き込みと同じく、判断の開始から書き込み完了までを戻す
+        if self._observe_actuation is not None and decision_start is not None:
+            self._feed_actuation_delay(done - decision_start)
+        if self.latency is not None:
+            self.latency.complete(frame_id, done)
+
+    def _check_watchdog(self) -> None:
+        """
+        ウォッチドッグが発動していたら、駆動モジュールが覚えている書き込み済みの値を忘れさせる
+
+        ウォッチドッグはPCA9685に直接ニュートラルを書くので、覚えている値のままでは
+        停止前と同じコマンドの書き込みが省かれてニュートラルのまま走れなくなる。
+        """
+        trips = self.heartbeat.watchdog_trips
+        if trips == self._watchdog_trips:
+            return
+        self._watchdog_trips = trips
+        invalidate_cache = getattr(self.actuation, "invalidate_cache", None)
+        if invalidate_cache is not None:
+            invalidate_cache()
+        print(f"[Orchestrator] watchdog neutralized the ESC (trips={trips}); resuming PWM writes")
+        self._log_event("watchdog_trip")
+
+    def _latest_telemetry(self, telemetry: Telemetry) -> Telemetry:
+        """表示用のテレメトリ（駆動スレッドを使う場合は最後に書き込みを終えた結果）"""
+        if not self._async_actuation:
+            return telemetry
+        latest = getattr(self.actuation, "last_telemetry", None)
+        return latest if latest is not None else telemetry
+
+    def close(self) -> None:
+        """タイミングログの残りを書き出して閉じる（遅延の集計の書き出し先があれば書き出す）"""
+        if self.latency is not None and self._latency_dump_path is not None:
+            self.latency.dump(self._latency_dump_path)
+        if self._timing_logger:
+            self._timing_logger.close()
+            self._timing_logger = None
+
+    def scheduler_stats(self) -> dict[str, SchedulerStats]:
+        """
+        直近の run_loop() のスケジューラー統計を取得
+
+        Returns:
+            {"control": 制御周期の統計, "poll": ポーリング周期の統計}。未実行の場合は空
+        """
+        stats: dict[str, SchedulerStats] = {}
+        if self._control_scheduler is not None:
+            stats["control"] = self._control_scheduler.stats()
+        if self._poll_scheduler is not None:
+            stats["poll"] = self._poll_scheduler.stats()
+        return stats
+
+    def latency_stats(self) -> dict[str, LatencyStats]:
+        """
+        センサー計測からPWM書き込み完了までの区間ごとの遅延の統計（実行中に別スレッドから呼んでもよい）
+
+        Returns:
+            {区間名: 統計}（"sensor_age" / "perception" / "decision" / "actuation" / "end_to_end"）。
+            遅延を集計しない場合は空
+        """
+        if self.latency is None:
+            return {}
+        return self.latency.stats()
+
+    def pwm_frame_stats(self) -> Optional[PWMFrameStats]:
+        """
+        PWMフレームに合わせた書き込みの統計（実行中に別スレッドから呼んでもよい）
+
+        Returns:
+            Optional[PWMFrameStats]: 統計。PWMフレームに合わせない場合は None
+        """
+        if self.pwm_frame is None:
             return None
+        return self.pwm_frame.stats()
 
-        # ログディレクトリが存在しない場合は作成
-        log_dir = os.path.dirname(timing_log_path)
-        if log_dir and not os.path.exists(log_dir):
-            os.makedirs(log_dir, exist_ok=True)
+    def _log_schedule(self, loop_idx: int, lateness_sec: float) -> None:
+        """
+        制御デッドラインからの遅れと累積ミス回数をログに記録
 
-        # ロガーを作成
-        logger = logging.getLogger(f"{__name__}.timing")
-        logger.setLevel(logging.INFO)
+        Args:
+            loop_idx: ループインデックス
+            lateness_sec: デッドラインからの遅れ（秒）
+        """
+        if not self._timing_logger or self._control_scheduler is None:
+            return
 
-        # 既存のハンドラーをクリア（重複を防ぐ）
-        logger.handlers.clear()
+        scheduler = self._control_scheduler
+        self._timing_logger.log(
+            KIND_SCHEDULE,
+            self.clock.now() - self._timing_start_time,
+            loop_idx,
+            lateness_sec,
+            scheduler.deadline_misses,
+            scheduler.skipped_periods,
+        )
 
-        # ファイルハンドラーを作成
-        file_handler = logging.FileHandler(timing_log_path, mode="w", encoding="utf-8")
-        file_handler.setLevel(logging.INFO)
+    def _report_schedule(self) -> None:
+        """run_loop() 終了時にスケジューラー統計を出力"""
+        for name, stats in self.scheduler_stats().items():
+            print(f"[Orchestrator] schedule {name}: {stats.summary()}")
+            if self._timing_logger:
+                self._timing_logger.log(KIND_TEXT, f"event=schedule_summary name={name} {stats.summary()}")
+
+    def _report_latency(self) -> None:
+        """run_loop() 終了時に区間ごとの遅延の統計を出力"""
+        stats = self.latency_stats()
+        for name in STAGES:
+            if name not in stats or stats[name].count == 0:
+                continue
+            print(f"[Orchestrator] latency {name}: {stats[name].summary()}")
+            if self._timing_logger:
+                self._timing_logger.log(KIND_TEXT, f"event=latency_summary name={name} {stats[name].summary()}")
+
+    def _report_pwm_frame(self) -> None:
+        """run_loop() 終了時にPWMフレームに合わせた書き込みの統計を出力"""
+        stats = self.pwm_frame_stats()
+        if stats is None:
+            return
+        print(f"[Orchestrator] pwm_frame: {stats.summary()}")
+        if self._timing_logger:
+            self._timing_logger.log(KIND_TEXT, f"event=pwm_frame_summary {stats.summary()}")
 
-        # フォーマッターを設定（シンプルな形式）
-        formatter = logging.Formatter("%(message)s")
-        file_handler.setFormatter(formatter)
+    def _setup_timing_logger(
+        self, timing_log_path: Optional[str]
+    ) -> Optional[AsyncTimingLogger]:
+        """
+        タイミングロガーをセットアップ
 
-        logger.addHandler(file_handler)
-        logger.propagate = False  # 親ロガーに伝播しない
+        Args:
+            timing_log_path: ログファイルのパス（Noneの場合はログを出力しない）
 
-        return logger
+        Returns:
+            非同期タイミングロガー。timing_log_pathがNoneの場合はNone
+        """
+        if timing_log_path is None:
+            return None
+        return AsyncTimingLogger(timing_log_path)
 
     def _log_event(self, event: str) -> None:
         """
@@ -229,10 +622,7 @@ class Orchestrator:
         if not self._timing_logger:
             return
 
-        import time
-
-        elapsed_sec = time.time() - self._timing_start_time
-        self._timing_logger.info("event=%s t=%.3fs", event, elapsed_sec)
+        self._timing_logger.log(KIND_EVENT, self.clock.now() - self._timing_start_time, event)
 
     def _log_stage(
         self, loop_idx: int, stage_name: str, start_time: float, end_time: float
@@ -249,16 +639,13 @@ class Orchestrator:
         if not self._timing_logger:
             return
 
-        duration = end_time - start_time
-        import time
-
-        elapsed_sec = time.time() - self._timing_start_time
-        self._timing_logger.info(
-            "t=%.3fs loop=%d stage=%s duration=%.6fs",
-            elapsed_sec,
+        # 時刻はステージの終了時刻を使う（ここで時計を読み直さない）
+        self._timing_logger.log(
+            KIND_STAGE,
+            end_time - self._timing_start_time,
             loop_idx,
             stage_name,
-            duration,
+            end_time - start_time,
         )
 
     def _log_frequency(
@@ -280,16 +667,13 @@ class Orchestrator:
         actuation_hz = self._calculate_hz(actuation_time, self._last_actuation_time)
         loop_hz = self._calculate_hz(loop_time, self._last_loop_time)
 
-        import time
-
-        elapsed_sec = time.time() - self._timing_start_time
-        self._timing_logger.info(
-            "t=%.3fs loop=%d metric=frequency sensor_hz=%s actuation_hz=%s loop_hz=%s",
-            elapsed_sec,
+        self._timing_logger.log(
+            KIND_FREQUENCY,
+            self.clock.now() - self._timing_start_time,
             loop_idx,
-            self._format_hz(sensor_hz),
-            self._format_hz(actuation_hz),
-            self._format_hz(loop_hz),
+            sensor_hz,
+            actuation_hz,
+            loop_hz,
         )
 
         self._last_sensor_time = sensor_time
@@ -318,64 +702,9 @@ class Orchestrator:
         return 1.0 / dt
 
     @staticmethod
-    def _format_hz(value: Optional[float]) -> str:
-        """
-        周波数値を文字列にフォーマット
-
-        Args:
-            value: 周波数値（Hz）
-
-        Returns:
-            フォーマットされた文字列。Noneの場合は"NA"
-        """
-        if value is None:
-            return "NA"
-        return f"{value:.2f}"
-
-    def _log_cycle(
-        self,
-        elapsed_time: float,
-        distance_data: DistanceData,
-        features: WallFeatures,
-        command: Command,
-        telemetry: Telemetry,
-    ) -> None:
-        """
-        1サイクルの詳細情報をログ出力（パイプ区切りのテーブル形式）
-
-        Args:
-            elapsed_time: ループ開始からの経過時間（秒）
-            distance_data: センサーデータ
-            features: 知覚結果
-            command: 判断結果
-            telemetry: 駆動結果
-        """
-        # データ取得
-        timestamp = elapsed_time
-        f_dist = distance_data.front_mm
-        rf_dist = distance_data.right_front_mm
-        lf_dist = distance_data.left_front_mm
-        lr_error = features.left_right_error
-        steer = command.steer
-        speed = command.throttle
-        steer_pwm = telemetry.steer_pwm_us if telemetry.steer_pwm_us is not None else 0
-        throttle_pwm = (
-            telemetry.throttle_pwm_us if telemetry.throttle_pwm_us is not None else 0
-        )
-        status_str = (
-            telemetry.status.value
-            if hasattr(telemetry.status, "value")
-            else str(telemetry.status)
-        )
-
-        # 知覚結果のフラグ
-        front_flag = "Y" if features.is_front_blocked else "N"
-        fork_flag = "Y" if features.is_fork_detected else "N"
-
-        # パイプ区切りのテーブル形式で出力
-        print(
-            f"{timestamp:>5.1f}s | {f_dist:>4.0f}mm | {rf_dist:>5.0f}mm | {lf_dist:>5.0f}mm | {lr_error:>+6.0f}mm | {front_flag:>5} | {fork_flag:>5} | {steer:>+5.2f} | {speed:>6.2f}   | {steer_pwm:>7}us | {throttle_pwm:>9}us |  {status_str}"
-        )
+    def _stop_succeeded(telemetry: Telemetry) -> bool:
+        """停止処理の結果がニュートラルを書き込めたことを示すか"""
+        return telemetry.status in (ActuationStatus.STOPPED, ActuationStatus.OK)
 
     def emergency_stop(self, reason: str = "emergency") -> Telemetry:
         """
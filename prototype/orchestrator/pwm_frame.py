@@ -0,0 +1,285 @@
+# --------------------------------
+# orchestrator/pwm_frame.py
+# PCA9685 のPWMフレーム（50Hz）の位相を推定し、判断結果を次のフレームの直前に書き込むためのスケジューラー
+# --------------------------------
+from __future__ import annotations
+
+import math
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from ..config import hardware, orchestrator
+from ..interfaces.protocols import Clock
+from ..clock import system_clock
+from .latency import LatencyHistogram, LatencyStats
+
+
+@dataclass(frozen=True)
+class PWMFrameStats:
+    """PWMフレームに合わせた書き込みの統計"""
+
+    period_sec: float  # 推定したフレーム周期（秒）
+    edges: int         # 位相の推定に使ったエッジの数
+    rejected: int      # 外れ値として捨てたエッジの数
+    writes: int        # フレームに合わせて書き込んだ回数
+    coalesced: int     # 書き込み前に新しい判断結果で置き換えた回数
+    missed: int        # 書き込み完了が狙ったエッジに間に合わなかった回数
+    slack: LatencyStats  # 書き込み完了から狙ったエッジまでの余裕（間に合った書き込みのみ）
+
+    def summary(self) -> str:
+        """1行の要約文字列"""
+        def fmt_ms(value: Optional[float]) -> str:
+            return "NA" if value is None else f"{value / 1000.0:.3f}ms"
+
+        s = self.slack
+        return (
+            f"period={self.period_sec * 1000.0:.3f}ms edges={self.edges} rejected={self.rejected} "
+            f"writes={self.writes} coalesced={self.coalesced} missed={self.missed} "
+            f"slack_min={fmt_ms(s.min_us)} slack_p50={fmt_ms(s.p50_us)} slack_max={fmt_ms(s.max_us)}"
+        )
+
+
+class PWMFrameScheduler:
+    """
+    PCA9685 のPWMフレームの位相推定と書き込み時刻の決定
+
+    PCA9685 は書き込んだ値を次のフレームの先頭から出力するので、フレームの途中で書いても
+    次のエッジまでは反映されない。判断結果をすぐ書く代わりに「次のエッジの guard_sec 前」まで持っておけば、
+    その間に来た新しい判断結果で置き換えられ（間に合わない古い結果は書かずにまとめる）、
+    書いた値はすぐにパルスになる。
+
+    位相はフレームの先頭の時刻（PWM出力の立ち上がり、または周波数設定で発振器を再起動した時刻）から推定する。
+    エッジを観測するたびに、予測したエッジとの差で位相と周期を少しずつ補正する（α-βフィルタ）。
+    発振器の誤差（数%）で周期が公称値とずれても、エッジの観測が続けば追従する。
+
+    observe_edge() はGPIOのコールバックなど別スレッドから呼んでもよい（ロックで保護する）。
+    """
+
+    def __init__(
+        self,
+        period_sec: float = hardware.pca9685.PWM_PERIOD_US / 1e6,
+        guard_sec: float = orchestrator.PWM_WRITE_GUARD_SEC,
+        phase_gain: float = orchestrator.PWM_PHASE_GAIN,
+        period_gain: float = orchestrator.PWM_PERIOD_GAIN,
+        reject_ratio: float = orchestrator.PWM_EDGE_REJECT_RATIO,
+        clock: Clock = system_clock,
+    ):
+        """
+        初期化
+
+        Args:
+            period_sec: フレーム周期の公称値（秒）。デフォルトは設定ファイルのPWM周期
+            guard_sec: 書き込みをエッジの何秒前に終えるか（I2Cの書き込み時間と起床の遅れの余裕）。デフォルトは設定ファイルの値
+            phase_gain: エッジの観測で位相を補正する割合 [0, 1]。デフォルトは設定ファイルの値
+            period_gain: エッジの観測で周期を補正する割合 [0, 1]。デフォルトは設定ファイルの値
+            reject_ratio: 予測との差が周期のこの割合を超えるエッジを捨てる。デフォルトは設定ファイルの値
+            clock: 時計（エッジの観測時刻に使う）。デフォルトは実時間の単調時計
+
+        Raises:
+            ValueError: period_sec が正でない、または guard_sec が 0 以上 period_sec 未満でない場合
+        """
+        if period_sec <= 0.0:
+            raise ValueError(f"period_sec must be positive: {period_sec}")
+        if not 0.0 <= guard_sec < period_sec:
+            raise ValueError(f"guard_sec must be in [0, period_sec): {guard_sec}")
+        self.nominal_period_sec = period_sec
+        self.guard_sec = guard_sec
+        self.phase_gain = phase_gain
+        self.period_gain = period_gain
+        self.reject_ratio = reject_ratio
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._origin: Optional[float] = None
+        self._period = period_sec
+        self._slack = LatencyHistogram()
+        self.edges = 0
+        self.rejected = 0
+        self.writes = 0
+        self.coalesced = 0
+        self.missed = 0
+
+    @property
+    def synced(self) -> bool:
+        """位相の基準（フレームの先頭の時刻）があるか"""
+        return self._origin is not None
+
+    @property
+    def period_sec(self) -> float:
+        """推定したフレーム周期（秒）"""
+        return self._period
+
+    def reset_phase(self, edge_sec: float) -> None:
+        """
+        位相の基準を設定し直す（周波数設定で発振器を再起動した時刻など）
+
+        Args:
+            edge_sec: フレームの先頭の時刻（秒、単調時計）
+        """
+        with self._lock:
+            self._origin = edge_sec
+            self._period = self.nominal_period_sec
+
+    def observe_edge(self, edge_sec: Optional[float] = None) -> bool:
+        """
+        観測したフレームの先頭で位相と周期を補正
+
+        Args:
+            edge_sec: エッジの時刻（秒、単調時計）。Noneの場合は現在時刻
+
+        Returns:
+            bool: 推定に使った場合True（外れ値として捨てた場合False）
+        """
+        if edge_sec is None:
+            edge_sec = self.clock.now()
+        with self._lock:
+            if self._origin is None:
+                self._origin = edge_sec
+                self.edges += 1
+                return True
+            n = round((edge_sec - self._origin) / self._period)
+            predicted = self._origin + n * self._period
+            error = edge_sec - predicted
+            if abs(error) > self.reject_ratio * self._period:
+                self.rejected += 1
+                return False
+            self._origin = predicted + self.phase_gain * error
+            if n > 0:
+                self._period += self.period_gain * error / n
+            self.edges += 1
+            return True
+
+    def next_edge(self, t: float) -> Optional[float]:
+        """
+        時刻 t 以降で最初のフレームの先頭
+
+        Args:
+            t: 時刻（秒、単調時計）
+
+        Returns:
+            Optional[float]: エッジの時刻。位相の基準がない場合は None
+        """
+        origin, period = self._origin, self._period
+        if origin is None:
+            return None
+        return origin + math.ceil((t - origin) / period) * period
+
+    def write_deadline(self, t: float) -> Optional[Tuple[float, float]]:
+        """
+        時刻 t の判断結果を書き込む時刻と、それが反映されるエッジ
+
+        guard_sec 以上先にある最初のエッジを狙い、その guard_sec 前に書き込む。
+
+        Args:
+            t: 判断結果が出た時刻（秒、単調時計）
+
+        Returns:
+            Optional[Tuple[float, float]]: (書き込み時刻, 狙うエッジの時刻)。位相の基準がない場合は None
+        """
+        edge = self.next_edge(t + self.guard_sec)
+        if edge is None:
+            return None
+        return edge - self.guard_sec, edge
+
+    def record_write(self, edge_sec: float, done_sec: float) -> float:
+        """
+        書き込みの完了時刻を記録
+
+        Args:
+            edge_sec: 狙ったエッジの時刻（秒）
+            done_sec: 書き込みの完了時刻（秒）
+
+        Returns:
+            float: 書き込み完了からエッジまでの余裕（秒）。負の場合は間に合わなかった
+        """
+        slack = edge_sec - done_sec
+        with self._lock:
+            self.writes += 1
+            if slack < 0.0:
+                self.missed += 1
+            else:
+                self._slack.record(round(slack * 1e6))
+        return slack
+
+    def record_coalesced(self) -> None:
+        """書き込み前の判断結果を新しい結果で置き換えたことを記録"""
+        with self._lock:
+            self.coalesced += 1
+
+    def stats(self) -> PWMFrameStats:
+        """現時点の統計（別スレッドから呼んでもよい）"""
+        with self._lock:
+            return PWMFrameStats(
+                period_sec=self._period,
+                edges=self.edges,
+                rejected=self.rejected,
+                writes=self.writes,
+                coalesced=self.coalesced,
+                missed=self.missed,
+                slack=self._slack.stats(),
+            )
+
+    def reset_stats(self) -> None:
+        """書き込みの統計を消去（位相の推定は残す）"""
+        with self._lock:
+            self._slack.reset()
+            self.writes = 0
+            self.coalesced = 0
+            self.missed = 0
+
+
+class GPIOFrameEdgeSource:
+    """
+    RPi.GPIO のエッジ検出でPWM出力の立ち上がりを PWMFrameScheduler に通知する
+
+    PCA9685 の出力（サーボのチャンネルなど、ON時刻0で立ち上がるもの）をGPIOに引き込んで使う。
+    サーボ信号は5V系のことがあるので、分圧かレベル変換を挟むこと。
+    """
+
+    def __init__(self, pin: int, bounce_ms: int = 0):
+        """
+        初期化（この時点ではGPIOに触れない）
+
+        Args:
+            pin: PWM出力を引き込んだGPIO番号（BCM）
+            bounce_ms: チャタリング除去時間（ミリ秒、0で無効）
+        """
+        self.pin = pin
+        self.bounce_ms = bounce_ms
+        self._gpio = None
+
+    def start(self, frame: PWMFrameScheduler) -> None:
+        """
+        エッジ検出を開始
+
+        Args:
+            frame: 通知先
+        """
+        if self._gpio is not None:
+            return
+        # ハードウェアモジュールのインポート（ラズベリーパイ環境専用）
+        import RPi.GPIO as GPIO
+
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setup(self.pin, GPIO.IN)
+        kwargs = {"bouncetime": self.bounce_ms} if self.bounce_ms > 0 else {}
+        GPIO.add_event_detect(
+            self.pin,
+            GPIO.RISING,
+            callback=lambda _channel: frame.observe_edge(),
+            **kwargs,
+        )
+        self._gpio = GPIO
+        print(f"[Orchestrator] PWMフレームのエッジ検出を有効にしました (pin={self.pin})", file=sys.stderr)
+
+    def stop(self) -> None:
+        """エッジ検出を停止してピンを解放"""
+        if self._gpio is None:
+            return
+        try:
+            self._gpio.remove_event_detect(self.pin)
+        except Exception:
+            pass  # エラーは無視
+        self._gpio.cleanup([self.pin])
+        self._gpio = None
@@ -0,0 +1,214 @@
+# --------------------------------
+# orchestrator/scheduler.py
+# 絶対デッドラインに基づく固定周期スケジューラー
+# --------------------------------
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+from ..clock import system_clock
+from ..config import orchestrator
+from ..interfaces.protocols import Clock
+
+
+class OverrunPolicy(str, Enum):
+    """デッドラインに間に合わなかった場合の方針"""
+
+    SKIP = "SKIP"          # 過ぎた周期は飛ばし、次の未来の周期に合わせる（位相は維持）
+    CATCH_UP = "CATCH_UP"  # 過ぎた周期も1つずつ消化する（待たずに連続実行して追いつく）
+
+
+@dataclass(frozen=True)
+class SchedulerStats:
+    """
+    スケジューラーの実測統計
+    """
+
+    period_sec: float          # 目標周期（秒）
+    ticks: int                 # wait_next() の呼び出し回数
+    deadline_misses: int       # デッドラインを過ぎてから wait_next() が呼ばれた回数
+    skipped_periods: int       # SKIP方針で飛ばした周期の数
+    max_lateness_sec: float    # デッドラインからの最大遅れ（秒）
+    period_min_sec: Optional[float]   # 実測周期の最小値（秒）
+    period_mean_sec: Optional[float]  # 実測周期の平均値（秒）
+    period_max_sec: Optional[float]   # 実測周期の最大値（秒）
+    period_std_sec: Optional[float]   # 実測周期の標準偏差（秒）
+
+    @property
+    def achieved_hz(self) -> Optional[float]:
+        """実測周期の平均から求めた周波数（Hz）"""
+        if not self.period_mean_sec:
+            return None
+        return 1.0 / self.period_mean_sec
+
+    def summary(self) -> str:
+        """1行の要約文字列"""
+        def fmt_ms(value: Optional[float]) -> str:
+            return "NA" if value is None else f"{value * 1000.0:.3f}ms"
+
+        hz = self.achieved_hz
+        return (
+            f"target={self.period_sec * 1000.0:.3f}ms ticks={self.ticks} "
+            f"misses={self.deadline_misses} skipped={self.skipped_periods} "
+            f"max_late={self.max_lateness_sec * 1000.0:.3f}ms "
+            f"period(min/mean/max/std)={fmt_ms(self.period_min_sec)}/{fmt_ms(self.period_mean_sec)}/"
+            f"{fmt_ms(self.period_max_sec)}/{fmt_ms(self.period_std_sec)} "
+            f"hz={'NA' if hz is None else f'{hz:.2f}'}"
+        )
+
+
+class DeadlineScheduler:
+    """
+    絶対デッドライン（単調時計のナノ秒）に基づく固定周期スケジューラー
+
+    周期の開始時刻から相対的に sleep するのではなく、start() 時刻 + n * period の
+    絶対時刻まで待つため、処理時間や sleep の誤差が次の周期に蓄積しない。
+    待機は clock.sleep_until_ns() に任せる（実時間の時計は sleep + 最後だけビジーウェイト）。
+    """
+
+    def __init__(
+        self,
+        period_sec: float,
+        policy: OverrunPolicy = OverrunPolicy(orchestrator.OVERRUN_POLICY),
+        clock: Clock = system_clock,
+    ):
+        """
+        初期化
+
+        Args:
+            period_sec: 周期（秒）
+            policy: デッドライン超過時の方針。デフォルトは設定ファイルの値
+            clock: 時計。デフォルトは実時間の単調時計
+        """
+        if period_sec <= 0.0:
+            raise ValueError(f"period_sec must be positive, got {period_sec}")
+        self.period_sec = period_sec
+        self.policy = policy
+        self.clock = clock
+        self._period_ns = int(period_sec * 1e9)
+        self._deadline_ns: Optional[int] = None
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        """統計をリセット"""
+        self._ticks = 0
+        self._misses = 0
+        self._skipped = 0
+        self._max_lateness_ns = 0
+        self._last_release_ns: Optional[int] = None
+        self._period_count = 0
+        self._period_sum_ns = 0
+        self._period_sq_sum = 0.0
+        self._period_min_ns: Optional[int] = None
+        self._period_max_ns: Optional[int] = None
+
+    def start(self, now_ns: Optional[int] = None) -> None:
+        """
+        周期の基準時刻を設定（最初のデッドラインは基準時刻 + period）
+
+        Args:
+            now_ns: 基準時刻（ナノ秒）。Noneの場合は現在時刻
+        """
+        if now_ns is None:
+            now_ns = self.clock.now_ns()
+        self._deadline_ns = now_ns + self._period_ns
+        self._last_release_ns = now_ns
+
+    def wait_next(self) -> float:
+        """
+        次のデッドラインまで待機し、デッドラインを1周期進める
+
+        Returns:
+            float: デッドラインからの遅れ（秒）。間に合った場合は0.0以上の微小値
+        """
+        if self._deadline_ns is None:
+            self.start()
+
+        deadline = self._deadline_ns
+        now = self.clock.now_ns()
+        self._ticks += 1
+
+        if now > deadline:
+            # デッドライン超過: 待たずに方針に従って次のデッドラインを決める
+            self._misses += 1
+            if self.policy == OverrunPolicy.SKIP:
+                missed_periods = (now - deadline) // self._period_ns
+                self._skipped += missed_periods
+                self._deadline_ns = deadline + (missed_periods + 1) * self._period_ns
+            else:
+                self._deadline_ns = deadline + self._period_ns
+        else:
+            now = self.clock.sleep_until_ns(deadline)
+            self._deadline_ns = deadline + self._period_ns
+
+        lateness_ns = now - deadline
+        if lateness_ns > self._max_lateness_ns:
+            self._max_lateness_ns = lateness_ns
+        self._record_period(now)
+        return lateness_ns / 1e9
+
+    def _record_period(self, release_ns: int) -> None:
+        """前回の解放時刻からの実測周期を記録"""
+        if self._last_release_ns is not None:
+            period = release_ns - self._last_release_ns
+            self._period_count += 1
+            self._period_sum_ns += period
+            self._period_sq_sum += float(period) * float(period)
+            if self._period_min_ns is None or period < self._period_min_ns:
+                self._period_min_ns = period
+            if self._period_max_ns is None or period > self._period_max_ns:
+                self._period_max_ns = period
+        self._last_release_ns = release_ns
+
+    @property
+    def deadline_misses(self) -> int:
+        """現在までのデッドラインミス回数（stats() を作らずに参照する用）"""
+        return self._misses
+
+    @property
+    def skipped_periods(self) -> int:
+        """現在までに飛ばした周期の数（stats() を作らずに参照する用）"""
+        return self._skipped
+
+    def time_to_deadline_sec(self) -> float:
+        """次のデッドラインまでの残り時間（秒）。超過している場合は負の値"""
+        if self._deadline_ns is None:
+            return self.period_sec
+        return (self._deadline_ns - self.clock.now_ns()) / 1e9
+
+    def stats(self) -> SchedulerStats:
+        """
+        現在までの統計を取得
+
+        Returns:
+            SchedulerStats: 実測統計
+        """
+        count = self._period_count
+        if count > 0:
+            mean_ns = self._period_sum_ns / count
+            variance = max(self._period_sq_sum / count - mean_ns * mean_ns, 0.0)
+            period_mean = mean_ns / 1e9
+            period_std = variance ** 0.5 / 1e9
+            period_min = self._period_min_ns / 1e9
+            period_max = self._period_max_ns / 1e9
+        else:
+            period_mean = period_std = period_min = period_max = None
+        return SchedulerStats(
+            period_sec=self.period_sec,
+            ticks=self._ticks,
+            deadline_misses=self._misses,
+            skipped_periods=self._skipped,
+            max_lateness_sec=self._max_lateness_ns / 1e9,
+            period_min_sec=period_min,
+            period_mean_sec=period_mean,
+            period_max_sec=period_max,
+            period_std_sec=period_std,
+        )
+
+    def reset_stats(self) -> None:
+        """統計のみをリセット（デッドラインの位相は維持）"""
+        last_release = self._last_release_ns
+        self._reset_stats()
+        self._last_release_ns = last_release
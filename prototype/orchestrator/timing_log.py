@@ -0,0 +1,229 @@
+# --------------------------------
+# orchestrator/timing_log.py
+# キュー経由でバックグラウンド書き出しするタイミングロガー
+# 制御ループは数値のタプルを積むだけで、文字列整形とファイル書き込みは別スレッドが行う
+# --------------------------------
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Optional, Tuple
+
+from ..config import orchestrator
+
+# レコード種別（タプルの先頭要素）
+KIND_EVENT = 0      # (KIND_EVENT, t, event)
+KIND_STAGE = 1      # (KIND_STAGE, t, loop_idx, stage, duration)
+KIND_FREQUENCY = 2  # (KIND_FREQUENCY, t, loop_idx, sensor_hz, actuation_hz, loop_hz)
+KIND_SCHEDULE = 3   # (KIND_SCHEDULE, t, loop_idx, lateness, misses, skipped)
+KIND_TEXT = 4       # (KIND_TEXT, line)
+
+
+def _format_hz(value: Optional[float]) -> str:
+    """
+    周波数値を文字列にフォーマット
+
+    Args:
+        value: 周波数値（Hz）
+
+    Returns:
+        フォーマットされた文字列。Noneの場合は"NA"
+    """
+    if value is None:
+        return "NA"
+    return f"{value:.2f}"
+
+
+def format_record(record: Tuple) -> str:
+    """
+    レコードを1行のログ文字列に整形（改行なし）
+
+    Args:
+        record: ホットパスで積まれたタプル
+
+    Returns:
+        str: ログ行
+    """
+    kind = record[0]
+    if kind == KIND_STAGE:
+        _, t, loop_idx, stage, duration = record
+        return f"t={t:.3f}s loop={loop_idx} stage={stage} duration={duration:.6f}s"
+    if kind == KIND_FREQUENCY:
+        _, t, loop_idx, sensor_hz, actuation_hz, loop_hz = record
+        return (
+            f"t={t:.3f}s loop={loop_idx} metric=frequency "
+            f"sensor_hz={_format_hz(sensor_hz)} actuation_hz={_format_hz(actuation_hz)} "
+            f"loop_hz={_format_hz(loop_hz)}"
+        )
+    if kind == KIND_SCHEDULE:
+        _, t, loop_idx, lateness, misses, skipped = record
+        return (
+            f"t={t:.3f}s loop={loop_idx} metric=schedule "
+            f"lateness={lateness:.6f}s misses={misses} skipped={skipped}"
+        )
+    if kind == KIND_EVENT:
+        _, t, event = record
+        return f"event={event} t={t:.3f}s"
+    return str(record[1])
+
+
+@dataclass(frozen=True)
+class TimingLogStats:
+    """タイミングロガーの統計"""
+
+    enqueued: int  # キューに積んだ件数
+    dropped: int   # キューが満杯で捨てた件数
+    written: int   # ファイルに書き出した件数
+
+
+class AsyncTimingLogger:
+    """
+    非同期タイミングロガー
+
+    log() はタプルを上限付きキュー（deque）に積むだけで、ロックもファイルI/Oも行わない。
+    書き出しスレッドが batch_size 件ごと（または flush_interval_sec ごと）にまとめて整形・書き出す。
+    キューが満杯のときは待たずに捨てて dropped を数えるので、ログが駆動を止めることはない。
+    積む側は1スレッド（制御ループ）のみを想定する。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        queue_size: int = orchestrator.TIMING_LOG_QUEUE_SIZE,
+        batch_size: int = orchestrator.TIMING_LOG_BATCH_SIZE,
+        flush_interval_sec: float = orchestrator.TIMING_LOG_FLUSH_INTERVAL_SEC,
+    ):
+        """
+        初期化（ファイルを作成し、書き出しスレッドを開始）
+
+        Args:
+            path: ログファイルのパス
+            queue_size: キューの上限（件数）。デフォルトは設定ファイルの値
+            batch_size: まとめて書き出す件数。デフォルトは設定ファイルの値
+            flush_interval_sec: 件数に達しなくても書き出す間隔（秒）。デフォルトは設定ファイルの値
+        """
+        if queue_size <= 0:
+            raise ValueError(f"queue_size must be positive, got {queue_size}")
+        self.path = path
+        self.queue_size = queue_size
+        self.batch_size = max(1, min(batch_size, queue_size))
+        self.flush_interval_sec = flush_interval_sec
+
+        log_dir = os.path.dirname(path)
+        if log_dir and not os.path.exists(log_dir):
+            os.makedirs(log_dir, exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8")
+
+        # deque の append/popleft はスレッドセーフなので、積む側はロック不要
+        self._queue: Deque[Tuple] = deque()
+        self._enqueued = 0
+        self._dropped = 0
+        self._written = 0
+
+        self._wakeup = threading.Event()
+        self._drained = threading.Condition()
+        self._error: Optional[BaseException] = None  # 書き出しスレッドで最初に起きた例外
+        self._closing = False
+        self._thread = threading.Thread(target=self._run, name="timing-log", daemon=True)
+        self._thread.start()
+
+    def log(self, *record) -> bool:
+        """
+        レコードを積む（ホットパス用）
+
+        Args:
+            *record: (KIND_*, 値...) の形式のタプル要素
+
+        Returns:
+            bool: 積めた場合True（キュー満杯で捨てた場合False）
+        """
+        queue = self._queue
+        if len(queue) >= self.queue_size:
+            self._dropped += 1
+            return False
+        queue.append(record)
+        self._enqueued += 1
+        if len(queue) >= self.batch_size:
+            self._wakeup.set()
+        return True
+
+    def flush(self, timeout_sec: float = 5.0) -> bool:
+        """
+        積んだ分がすべて書き出されるまで待つ
+
+        Args:
+            timeout_sec: 最大待ち時間（秒）
+
+        Returns:
+            bool: 書き出しが完了した場合True
+
+        Raises:
+            Exception: 書き出しスレッドが書き出しに失敗していた場合（その例外。失敗した分は書き出されない）
+        """
+        target = self._enqueued
+        self._wakeup.set()
+        with self._drained:
+            done = self._drained.wait_for(lambda: self._written >= target or self._error is not None, timeout_sec)
+            if self._error is not None:
+                raise self._error
+            return done
+
+    def stats(self) -> TimingLogStats:
+        """
+        統計を取得
+
+        Returns:
+            TimingLogStats: 積んだ・捨てた・書き出した件数
+        """
+        return TimingLogStats(enqueued=self._enqueued, dropped=self._dropped, written=self._written)
+
+    def close(self) -> None:
+        """残りを書き出してファイルを閉じる"""
+        if self._closing:
+            return
+        self._closing = True
+        self._wakeup.set()
+        self._thread.join()
+        self._file.close()
+        if self._dropped:
+            print(f"[TimingLog] {self.path}: dropped {self._dropped} records (queue full)", file=sys.stderr)
+
+    def _run(self) -> None:
+        """書き出しスレッド本体"""
+        while True:
+            self._wakeup.wait(self.flush_interval_sec)
+            self._wakeup.clear()
+            closing = self._closing
+            self._write_pending()
+            if closing:
+                return
+
+    def _write_pending(self) -> None:
+        """キューにある分を整形してまとめて書き出す"""
+        queue = self._queue
+        lines = []
+        try:
+            while queue:
+                lines.append(format_record(queue.popleft()))
+                if len(lines) >= self.batch_size:
+                    self._write_lines(lines)
+                    lines = []
+            if lines:
+                self._write_lines(lines)
+            self._file.flush()
+        except Exception as e:
+            # flush() で待っている側を起こし、例外を渡す
+            with self._drained:
+                if self._error is None:
+                    self._error = e
+                self._drained.notify_all()
+            print(f"[TimingLog] 書き出しに失敗しました: {e}", file=sys.stderr)
+
+    def _write_lines(self, lines: list) -> None:
+        self._file.write("\n".join(lines) + "\n")
+        with self._drained:
+            self._written += len(lines)
+            self._drained.notify_all()
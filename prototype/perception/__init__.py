@@ -2,7 +2,25 @@
 # 距離データから特徴量を抽出する知覚モジュールの実装
 
 from .wall_position import CorridorPerception
+from .filters import (
+    FILTER_KINDS,
+    DistanceFilterStage,
+    HampelFilter,
+    KalmanFilter1D,
+    MedianFilter,
+    build_distance_filter,
+)
+from .localization import ParticleFilterLocalizer, build_localizer, likelihood_table
 
 __all__ = [
     "CorridorPerception",
+    "FILTER_KINDS",
+    "DistanceFilterStage",
+    "HampelFilter",
+    "KalmanFilter1D",
+    "MedianFilter",
+    "build_distance_filter",
+    "ParticleFilterLocalizer",
+    "build_localizer",
+    "likelihood_table",
 ]
@@ -0,0 +1,320 @@
+# --------------------------------
+# perception/filters.py
+# センサーと知覚の間に挟む距離フィルタ（外れ値除去・平滑化）
+# チャンネルごとに固定長のリングバッファ（または2状態）だけを持ち、1サンプルの更新は窓幅で決まる一定時間で終わる
+# --------------------------------
+from __future__ import annotations
+
+import math
+from bisect import bisect_left, insort
+from typing import Callable, List, Optional
+
+from ..domain.distance import DistanceData
+from ..config import perception
+
+# フィルタの種類
+FILTER_KINDS = ("none", "median", "hampel", "kalman")
+
+# MAD を標準偏差に換算する係数（正規分布の場合）
+_MAD_SCALE: float = 1.4826
+
+
+class MedianFilter:
+    """
+    直近 window サンプルの中央値を返すフィルタ
+
+    到着順のリングバッファと、同じ値を並べた整列済みリストを持つ。
+    更新は最も古い値の削除と新しい値の挿入（二分探索）だけなので、window が小さい間は数µsで終わる。
+    """
+
+    def __init__(self, window: int = perception.distance_filter.MEDIAN_WINDOW):
+        """
+        初期化
+
+        Args:
+            window: 窓幅（サンプル数、1以上）。デフォルトは設定ファイルの値
+        """
+        if window < 1:
+            raise ValueError(f"window must be >= 1: {window}")
+        self.window = window
+        self._ring: List[float] = [0.0] * window
+        self._sorted: List[float] = []
+        self._index = 0
+
+    def update(self, value: float, timestamp: float) -> float:
+        """
+        サンプルを追加して中央値を返す
+
+        Args:
+            value: 距離（mm）
+            timestamp: 計測時刻（秒、使用しない）
+
+        Returns:
+            float: 直近 window サンプルの中央値（mm）
+        """
+        self._push(value)
+        return self.median()
+
+    def median(self) -> float:
+        """現在の窓の中央値（mm）。サンプルがない場合は0.0"""
+        values = self._sorted
+        n = len(values)
+        if n == 0:
+            return 0.0
+        mid = n // 2
+        if n % 2:
+            return values[mid]
+        return (values[mid - 1] + values[mid]) * 0.5
+
+    def reset(self) -> None:
+        """窓を空にする"""
+        self._sorted.clear()
+        self._index = 0
+
+    def _push(self, value: float) -> None:
+        """窓にサンプルを追加（満杯なら最も古い値を捨てる）"""
+        values = self._sorted
+        if len(values) == self.window:
+            del values[bisect_left(values, self._ring[self._index])]
+        self._ring[self._index] = value
+        self._index = (self._index + 1) % self.window
+        insort(values, value)
+
+
+class HampelFilter(MedianFilter):
+    """
+    Hampel フィルタ（中央値と MAD による外れ値の置き換え）
+
+    直近 window サンプル（新しいサンプルを含む）の中央値から n_sigmas × 1.4826 × MAD より離れたサンプルを
+    外れ値とみなし、中央値に置き換える。外れ値でなければ新しいサンプルをそのまま返すので、
+    中央値フィルタと違って正常な値には遅れが出ない。
+    MAD は min_mad_mm を下限にする（同じ値が続いてMADが0のときに、わずかな変化まで中央値に置き換えないように）。
+    """
+
+    def __init__(
+        self,
+        window: int = perception.distance_filter.HAMPEL_WINDOW,
+        n_sigmas: float = perception.distance_filter.HAMPEL_N_SIGMAS,
+        min_mad_mm: float = perception.distance_filter.HAMPEL_MIN_MAD_MM,
+    ):
+        """
+        初期化
+
+        Args:
+            window: 窓幅（サンプル数、1以上）。デフォルトは設定ファイルの値
+            n_sigmas: 外れ値とみなす距離（標準偏差換算の倍数）。デフォルトは設定ファイルの値
+            min_mad_mm: MADの下限（mm）。デフォルトは設定ファイルの値
+        """
+        super().__init__(window)
+        self.n_sigmas = n_sigmas
+        self.min_mad_mm = min_mad_mm
+        self._deviations: List[float] = [0.0] * window
+        self.outliers = 0
+
+    def update(self, value: float, timestamp: float) -> float:
+        """
+        サンプルを追加し、外れ値なら中央値に置き換えて返す
+
+        Args:
+            value: 距離（mm）
+            timestamp: 計測時刻（秒、使用しない）
+
+        Returns:
+            float: フィルタ後の距離（mm）
+        """
+        self._push(value)
+        median = self.median()
+        values = self._sorted
+        n = len(values)
+        deviations = self._deviations
+        for i in range(n):
+            deviations[i] = abs(values[i] - median)
+        # 窓幅は小さいので、部分的な整列ではなく全体を並べ替える
+        mad = max(sorted(deviations[:n])[n // 2], self.min_mad_mm)
+        if abs(value - median) > self.n_sigmas * _MAD_SCALE * mad:
+            self.outliers += 1
+            return median
+        return value
+
+
+class KalmanFilter1D:
+    """
+    等速度モデルの1次元カルマンフィルタ
+
+    状態は距離と距離の変化率（mm/s）。サンプルの計測時刻の差分で予測し、
+    プロセスノイズは加速度の白色ノイズ（標準偏差 process_noise mm/s^2）として与える。
+    前回のサンプルから max_gap_sec 以上空いた場合は状態を作り直す。
+    """
+
+    def __init__(
+        self,
+        process_noise: float = perception.distance_filter.KALMAN_PROCESS_NOISE_MM_S2,
+        measurement_noise: float = perception.distance_filter.KALMAN_MEASUREMENT_NOISE_MM,
+        max_gap_sec: float = perception.distance_filter.KALMAN_MAX_GAP_SEC,
+    ):
+        """
+        初期化
+
+        Args:
+            process_noise: 加速度ノイズの標準偏差（mm/s^2）。デフォルトは設定ファイルの値
+            measurement_noise: 計測ノイズの標準偏差（mm）。デフォルトは設定ファイルの値
+            max_gap_sec: 状態を作り直すサンプル間隔（秒）。デフォルトは設定ファイルの値
+        """
+        self.q = process_noise * process_noise
+        self.r = measurement_noise * measurement_noise
+        self.max_gap_sec = max_gap_sec
+        self.reset()
+
+    def update(self, value: float, timestamp: float) -> float:
+        """
+        サンプルで予測・更新して距離の推定値を返す
+
+        Args:
+            value: 距離（mm）
+            timestamp: 計測時刻（秒、単調時計）
+
+        Returns:
+            float: 距離の推定値（mm）
+        """
+        prev_time = self._time
+        self._time = timestamp
+        if prev_time is None:
+            self._init(value)
+            return value
+        dt = timestamp - prev_time
+        if dt <= 0.0 or dt > self.max_gap_sec:
+            self._init(value)
+            return value
+
+        # 予測: x' = F x、P' = F P F^T + Q（F = [[1, dt], [0, 1]]）
+        x = self.x + self.v * dt
+        v = self.v
+        dt2 = dt * dt
+        p00 = self.p00 + dt * (2.0 * self.p01 + dt * self.p11) + self.q * dt2 * dt2 * 0.25
+        p01 = self.p01 + dt * self.p11 + self.q * dt2 * dt * 0.5
+        p11 = self.p11 + self.q * dt2
+
+        # 更新（観測は距離のみ）
+        s = p00 + self.r
+        k0 = p00 / s
+        k1 = p01 / s
+        innovation = value - x
+        self.x = x + k0 * innovation
+        self.v = v + k1 * innovation
+        self.p00 = (1.0 - k0) * p00
+        self.p01 = (1.0 - k0) * p01
+        self.p11 = p11 - k1 * p01
+        return self.x
+
+    def reset(self) -> None:
+        """状態を破棄（次のサンプルで作り直す）"""
+        self._time: Optional[float] = None
+        self.x = 0.0
+        self.v = 0.0
+        self.p00 = self.p01 = self.p11 = 0.0
+
+    @property
+    def velocity(self) -> float:
+        """距離の変化率の推定値（mm/s）"""
+        return self.v
+
+    def _init(self, value: float) -> None:
+        """サンプル1つで状態を作り直す（速度0、速度の分散は大きく）"""
+        self.x = value
+        self.v = 0.0
+        self.p00 = self.r
+        self.p01 = 0.0
+        self.p11 = 1e6
+
+
+class DistanceFilterStage:
+    """
+    DistanceData の3チャンネルにそれぞれフィルタをかける段
+
+    チャンネルの計測時刻が前回から変わった（新しいサンプルが来た）ときだけフィルタを更新し、
+    変わっていなければ前回のフィルタ出力を使う。範囲外値（8190など）は max_input_mm に丸めてから通す。
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], object],
+        max_input_mm: float = perception.distance_filter.MAX_INPUT_MM,
+    ):
+        """
+        初期化
+
+        Args:
+            factory: チャンネルごとのフィルタを作る関数（update(value, timestamp) / reset() を持つオブジェクトを返す）
+            max_input_mm: フィルタに入れる距離の上限（mm）。デフォルトは設定ファイルの値
+        """
+        self.max_input_mm = max_input_mm
+        self.filters = [factory(), factory(), factory()]
+        self._last_times: List[Optional[float]] = [None, None, None]
+        self._outputs = [0.0, 0.0, 0.0]
+
+    def apply(self, data: DistanceData) -> DistanceData:
+        """
+        距離データにフィルタをかける
+
+        Args:
+            data: センサーの距離データ
+
+        Returns:
+            DistanceData: フィルタ後の距離データ（計測時刻・サンプル番号は元のまま）
+        """
+        front = self._update(0, data.front_mm, data.front_timestamp)
+        right_front = self._update(1, data.right_front_mm, data.right_front_timestamp)
+        left_front = self._update(2, data.left_front_mm, data.left_front_timestamp)
+        return DistanceData(
+            front_mm=front,
+            right_front_mm=right_front,
+            left_front_mm=left_front,
+            timestamp=data.timestamp,
+            front_timestamp=data.front_timestamp,
+            right_front_timestamp=data.right_front_timestamp,
+            left_front_timestamp=data.left_front_timestamp,
+            front_seq=data.front_seq,
+            right_front_seq=data.right_front_seq,
+            left_front_seq=data.left_front_seq,
+        )
+
+    def reset(self) -> None:
+        """全チャンネルのフィルタを初期状態に戻す"""
+        for f in self.filters:
+            f.reset()
+        self._last_times = [None, None, None]
+
+    def _update(self, index: int, value: float, timestamp: float) -> float:
+        """チャンネル index に新しいサンプルがあればフィルタを更新し、最新の出力を返す"""
+        if timestamp == self._last_times[index]:
+            return self._outputs[index]
+        self._last_times[index] = timestamp
+        if value > self.max_input_mm or math.isnan(value):
+            value = self.max_input_mm
+        output = self.filters[index].update(value, timestamp)
+        self._outputs[index] = output
+        return output
+
+
+def build_distance_filter(kind: str = perception.distance_filter.KIND) -> Optional[DistanceFilterStage]:
+    """
+    設定ファイルの値でフィルタ段を作る
+
+    Args:
+        kind: フィルタの種類（"none" / "median" / "hampel" / "kalman"）。デフォルトは設定ファイルの値
+
+    Returns:
+        Optional[DistanceFilterStage]: フィルタ段（"none" の場合None）
+
+    Raises:
+        ValueError: 不明な種類の場合
+    """
+    if kind not in FILTER_KINDS:
+        raise ValueError(f"Unknown filter kind: {kind!r} (expected one of {FILTER_KINDS})")
+    if kind == "median":
+        return DistanceFilterStage(MedianFilter)
+    if kind == "hampel":
+        return DistanceFilterStage(HampelFilter)
+    if kind == "kalman":
+        return DistanceFilterStage(KalmanFilter1D)
+    return None
@@ -0,0 +1,313 @@
+# --------------------------------
+# perception/localization.py
+# レイキャスト表を使ったパーティクルフィルタによるコース上の自己位置推定
+# パーティクル数は固定で、尤度は前計算した表の参照だけなので、1サイクルの計算量は一定
+# --------------------------------
+from __future__ import annotations
+
+import math
+from typing import TYPE_CHECKING, Optional, Tuple
+
+import numpy as np
+
+from ..config import perception, sensors
+from ..config.perception import LocalizationConfig
+from ..domain.command import Command
+from ..domain.distance import DistanceData
+from ..domain.pose import PoseEstimate
+
+if TYPE_CHECKING:
+    # maps はシミュレーターのコース形状を使い、シミュレーターは知覚モジュールを使うので、実行時は使う場所で読み込む
+    from ..maps.progress import ProgressTable
+    from ..maps.ray_table import RayTable
+
+# 周回の数え方: 進捗がこの値より大きい位置から小さい位置へ移ったらスタートラインを越えたとみなす
+_LAP_WRAP_HIGH: float = 0.75
+_LAP_WRAP_LOW: float = 0.25
+
+
+def likelihood_table(
+    max_range_mm: int = sensors.vl53l0x.MAX_RANGE_MM,
+    cfg: LocalizationConfig = perception.localization,
+) -> np.ndarray:
+    """
+    期待距離と計測距離の対数尤度の表を作る
+
+    距離を cfg.BIN_MM 刻みの区間に分け、最後の区間を範囲外値とする。
+    期待が範囲内の場合は、期待距離を中心とする正規分布（標準偏差は距離に比例して広がる）に、
+    無関係な値が返る一様分布と、範囲外値が返る確率を混ぜる。
+    期待が範囲外の場合は、ほぼ範囲外値が返り、まれに無関係な値が返る。
+
+    Args:
+        max_range_mm: 計測可能な最大距離（mm）。デフォルトは設定ファイルの値
+        cfg: 計測モデルの設定。デフォルトは設定ファイルの値
+
+    Returns:
+        np.ndarray: [期待の区間, 計測の区間] の対数尤度（cfg.LIKELIHOOD_EXPONENT を掛けたもの）
+    """
+    bins = max_range_mm // cfg.BIN_MM + 1
+    centers = np.arange(bins, dtype=np.float64) * cfg.BIN_MM
+    sigma = cfg.SIGMA_MM + cfg.SIGMA_RATIO * centers[:, None]
+    gauss = np.exp(-0.5 * ((centers[None, :] - centers[:, None]) / sigma) ** 2)
+    gauss /= gauss.sum(axis=1, keepdims=True)
+
+    prob = np.empty((bins + 1, bins + 1))
+    hit_ratio = 1.0 - cfg.RANDOM_RATIO - cfg.MISS_RATIO
+    prob[:bins, :bins] = hit_ratio * gauss + cfg.RANDOM_RATIO / bins
+    prob[:bins, bins] = cfg.MISS_RATIO
+    prob[bins, :bins] = cfg.RANDOM_RATIO / bins
+    prob[bins, bins] = 1.0 - cfg.RANDOM_RATIO
+    return cfg.LIKELIHOOD_EXPONENT * np.log(prob)
+
+
+class ParticleFilterLocalizer:
+    """
+    パーティクルフィルタによる自己位置推定
+
+    1サイクルの処理:
+    1. 予測: 前回の計測からの経過時間だけ、直前の指令値（steer / throttle）でキネマティック自転車モデルを進める。
+       速度と前輪切れ角の一次遅れは全パーティクル共通で、パーティクルごとにノイズを加える
+    2. 更新: 各パーティクルの位置・向きでのToF期待距離をレイキャスト表から引き、尤度表で計測距離と照合する
+       （計測が更新されたチャンネルだけ。走行可能でない位置のパーティクルは重み0）
+    3. 有効パーティクル数が減ったら系統的再サンプリング
+    4. 重み付き平均の位置・向きと、進捗の表から周回の進捗を出力する
+    """
+
+    def __init__(
+        self,
+        table: RayTable,
+        progress: Optional[ProgressTable] = None,
+        particles: int = perception.localization.PARTICLES,
+        seed: int = perception.localization.SEED,
+        cfg: LocalizationConfig = perception.localization,
+    ):
+        """
+        初期化
+
+        Args:
+            table: レイキャスト表（センサー配置は距離データのチャンネル順と同じ前、右斜め前、左斜め前）
+            progress: 進捗の表。Noneの場合はレイキャスト表から作る
+            particles: パーティクル数。デフォルトは設定ファイルの値
+            seed: 乱数シード。デフォルトは設定ファイルの値
+            cfg: 動作モデル・計測モデルなどの設定。デフォルトは設定ファイルの値
+
+        Raises:
+            ValueError: パーティクル数が1未満、またはレイキャスト表にスタート位置がない場合
+        """
+        from ..maps.progress import progress_table_from_ray_table
+        from ..maps.ray_table import UNKNOWN_MM
+
+        if particles < 1:
+            raise ValueError(f"particles must be >= 1: {particles}")
+        if table.start_pose is None:
+            raise ValueError("Ray table has no start pose; rebuild it with python -m prototype.maps --force")
+        self.table = table
+        self.progress = progress if progress is not None else progress_table_from_ray_table(table)
+        self.particles = particles
+        self.cfg = cfg
+        self._rng = np.random.default_rng(seed)
+        self._unknown_mm = UNKNOWN_MM
+        self._log_likelihood = likelihood_table(cfg=cfg)
+        self._out_of_range_bin = self._log_likelihood.shape[0] - 1
+        self._max_steer_angle = math.radians(cfg.MAX_STEER_ANGLE_DEG)
+        self._steer_noise = math.radians(cfg.STEER_NOISE_DEG)
+        self._heading_noise = math.radians(cfg.HEADING_NOISE_DEG)
+
+        self.x = np.empty(particles)
+        self.y = np.empty(particles)
+        self.heading = np.empty(particles)
+        self.weights = np.empty(particles)
+        self.resamples = 0
+        self.reinitializations = 0
+        self.reset()
+
+    def reset(self, pose: Optional[Tuple[float, float, float]] = None) -> None:
+        """
+        パーティクルを初期位置の周りにばらまき直す（周回数・指令値も初期化）
+
+        Args:
+            pose: 初期位置と向き (x, y, heading[rad])。Noneの場合はレイキャスト表のスタート位置
+        """
+        self._scatter(pose if pose is not None else self.table.start_pose)
+        self._speed = 0.0
+        self._steer_angle = 0.0
+        self._target_speed = 0.0
+        self._target_steer_angle = 0.0
+        self._last_timestamp: Optional[float] = None
+        self._last_seqs = (0, 0, 0)
+        self._last_progress: Optional[float] = None
+        self._lap = 0
+        self.estimate: Optional[PoseEstimate] = None
+
+    def observe_command(self, command: Command) -> None:
+        """
+        次の予測に使う指令値を受け取る（判断の直後に呼ぶ）
+
+        Args:
+            command: 判断モジュールの出力
+        """
+        steer = max(-1.0, min(1.0, command.steer))
+        throttle = max(0.0, min(1.0, command.throttle))
+        self._target_steer_angle = steer * self._max_steer_angle
+        self._target_speed = throttle * self.cfg.MAX_SPEED_MPS
+
+    def update(self, data: DistanceData) -> Optional[PoseEstimate]:
+        """
+        距離データ1件で推定を進める
+
+        Args:
+            data: 距離データ（フィルタ前の値。範囲外値をそのまま使う）
+
+        Returns:
+            Optional[PoseEstimate]: 推定結果。同じ時刻の距離データを受け取った場合は前回の結果
+        """
+        if self._last_timestamp is not None:
+            if data.timestamp == self._last_timestamp:
+                return self.estimate
+            self._predict(min(max(data.timestamp - self._last_timestamp, 0.0), self.cfg.MAX_DT_SEC))
+        self._last_timestamp = data.timestamp
+
+        self._weigh(data)
+        ess = 1.0 / float(np.dot(self.weights, self.weights))
+        if ess < self.cfg.RESAMPLE_ESS_RATIO * self.particles:
+            self._resample()
+        self.estimate = self._estimate(data.timestamp)
+        return self.estimate
+
+    def _scatter(self, pose: Tuple[float, float, float]) -> None:
+        """姿勢の周りに初期分布の標準偏差でパーティクルを置き、重みを均等にする"""
+        n = self.particles
+        x, y, heading = pose
+        self.x[:] = x + self._rng.normal(0.0, self.cfg.INIT_POSITION_STD_M, n)
+        self.y[:] = y + self._rng.normal(0.0, self.cfg.INIT_POSITION_STD_M, n)
+        self.heading[:] = heading + self._rng.normal(0.0, math.radians(self.cfg.INIT_HEADING_STD_DEG), n)
+        self.weights[:] = 1.0 / n
+
+    def _predict(self, dt: float) -> None:
+        """指令値と一次遅れで速度・切れ角を進め、各パーティクルを動かす"""
+        if dt <= 0.0:
+            return
+        cfg = self.cfg
+        n = self.particles
+        speed_prev = self._speed
+        if cfg.SPEED_TIME_CONSTANT_SEC > 0.0:
+            self._speed += (self._target_speed - self._speed) * (1.0 - math.exp(-dt / cfg.SPEED_TIME_CONSTANT_SEC))
+        else:
+            self._speed = self._target_speed
+        if cfg.STEER_TIME_CONSTANT_SEC > 0.0:
+            self._steer_angle += (self._target_steer_angle - self._steer_angle) * (
+                1.0 - math.exp(-dt / cfg.STEER_TIME_CONSTANT_SEC)
+            )
+        else:
+            self._steer_angle = self._target_steer_angle
+
+        rng = self._rng
+        speed = 0.5 * (speed_prev + self._speed) * (1.0 + cfg.SPEED_NOISE_RATIO * rng.standard_normal(n))
+        steer = self._steer_angle + self._steer_noise * rng.standard_normal(n)
+        yaw = speed / cfg.WHEELBASE_M * np.tan(steer) * dt
+        mid = self.heading + 0.5 * yaw
+        self.x += speed * np.cos(mid) * dt + cfg.POSITION_NOISE_M * rng.standard_normal(n)
+        self.y += speed * np.sin(mid) * dt + cfg.POSITION_NOISE_M * rng.standard_normal(n)
+        self.heading += yaw + self._heading_noise * rng.standard_normal(n)
+
+    def _weigh(self, data: DistanceData) -> None:
+        """計測が更新されたチャンネルの尤度を重みに掛ける"""
+        seqs = data.sequences()
+        # サンプル番号がないセンサー（0）は毎回更新されたものとみなす
+        fresh = [k for k in range(3) if seqs[k] == 0 or seqs[k] != self._last_seqs[k]]
+        self._last_seqs = seqs
+
+        expected = self.table.expected(self.x, self.y, self.heading)
+        on_track = expected[:, 0] != self._unknown_mm
+        log_w = np.log(np.maximum(self.weights, 1e-300))
+        if fresh:
+            bin_mm = self.cfg.BIN_MM
+            measured = (data.front_mm, data.right_front_mm, data.left_front_mm)
+            for k in fresh:
+                e = expected[:, k]
+                e_bin = np.where(e > sensors.vl53l0x.MAX_RANGE_MM, self._out_of_range_bin, e // bin_mm)
+                z = measured[k]
+                z_bin = self._out_of_range_bin if z > sensors.vl53l0x.MAX_RANGE_MM else int(max(z, 0.0) // bin_mm)
+                log_w += self._log_likelihood[e_bin, z_bin]
+        log_w[~on_track] = -np.inf
+
+        if not on_track.any():
+            # 全てのパーティクルがコースを外れた: 直前の推定位置（なければスタート位置）からやり直す
+            self.reinitializations += 1
+            last = self.estimate
+            self._scatter((last.x, last.y, last.heading) if last is not None else self.table.start_pose)
+            return
+        log_w -= log_w.max()
+        w = np.exp(log_w)
+        self.weights[:] = w / w.sum()
+
+    def _resample(self) -> None:
+        """系統的再サンプリング（重みの累積和を等間隔に区切る）"""
+        n = self.particles
+        positions = (self._rng.random() + np.arange(n)) / n
+        cumulative = np.cumsum(self.weights)
+        cumulative[-1] = 1.0
+        idx = np.searchsorted(cumulative, positions)
+        self.x[:] = self.x[idx]
+        self.y[:] = self.y[idx]
+        self.heading[:] = self.heading[idx]
+        self.weights[:] = 1.0 / n
+        self.resamples += 1
+
+    def _estimate(self, timestamp: float) -> PoseEstimate:
+        """重み付き平均の姿勢・周回の進捗・信頼度"""
+        w = self.weights
+        x = float(np.dot(w, self.x))
+        y = float(np.dot(w, self.y))
+        heading = math.atan2(float(np.dot(w, np.sin(self.heading))), float(np.dot(w, np.cos(self.heading))))
+        near = (self.x - x) ** 2 + (self.y - y) ** 2 <= self.cfg.CONFIDENCE_RADIUS_M ** 2
+        confidence = float(w[near].sum())
+
+        # 進捗はスタートラインで 1→0 に戻るので、円周上の平均を取る
+        progress = self.progress.lookup(self.x, self.y)
+        valid = np.isfinite(progress)
+        if valid.any():
+            angle = 2.0 * math.pi * progress[valid]
+            lap_progress = math.atan2(float(np.dot(w[valid], np.sin(angle))), float(np.dot(w[valid], np.cos(angle))))
+            lap_progress = (lap_progress / (2.0 * math.pi)) % 1.0
+        else:
+            lap_progress = self._last_progress if self._last_progress is not None else 0.0
+
+        if self._last_progress is None:
+            # スタートラインの手前に置いた場合は、最初にラインを越えた時点を0周目の開始にする
+            self._lap = -1 if lap_progress > 0.5 else 0
+        elif self._last_progress > _LAP_WRAP_HIGH and lap_progress < _LAP_WRAP_LOW:
+            self._lap += 1
+        elif self._last_progress < _LAP_WRAP_LOW and lap_progress > _LAP_WRAP_HIGH:
+            self._lap -= 1
+        self._last_progress = lap_progress
+
+        return PoseEstimate(
+            x=x,
+            y=y,
+            heading=heading,
+            lap_progress=lap_progress,
+            lap=max(self._lap, 0),
+            confidence=confidence,
+            timestamp=timestamp,
+        )
+
+
+def build_localizer(enabled: bool = perception.localization.ENABLED) -> Optional[ParticleFilterLocalizer]:
+    """
+    設定ファイルの値で自己位置推定を作る
+
+    レイキャスト表はコース画像から作ったもの（変更がなければ保存済みの表をメモリマップで読む）を使う。
+
+    Args:
+        enabled: 自己位置推定を行うか。デフォルトは設定ファイルの値
+
+    Returns:
+        Optional[ParticleFilterLocalizer]: 自己位置推定（無効の場合None）
+    """
+    if not enabled:
+        return None
+    from ..maps.ray_table import load_or_build_ray_table
+
+    table, _ = load_or_build_ray_table()
+    return ParticleFilterLocalizer(table)
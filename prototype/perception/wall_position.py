@@ -4,9 +4,14 @@
 # --------------------------------
 from __future__ import annotations
 
+from typing import Optional
+
+from ..domain.command import Command
 from ..domain.distance import DistanceData
 from ..domain.features import WallFeatures
 from ..config import perception
+from .filters import DistanceFilterStage, build_distance_filter
+from .localization import ParticleFilterLocalizer, build_localizer
 
 
 class CorridorPerception:
@@ -17,6 +22,9 @@ class CorridorPerception:
     - 左右バランス誤差（回廊中央からのズレ）
     - 前方の障害物判定
     - 各方向の距離情報（速度制御・回避方向判断用）
+
+    距離フィルタを設定すると、特徴量の抽出前に外れ値除去・平滑化をかける。
+    自己位置推定を設定すると、フィルタ前の距離データでコース上の位置も推定し、特徴量に含める。
     """
 
     def __init__(
@@ -26,6 +34,10 @@ class CorridorPerception:
         wall_detection_threshold_mm: float = perception.corridor.WALL_DETECTION_THRESHOLD_MM,
         fork_front_threshold_mm: float = perception.corridor.FORK_FRONT_THRESHOLD_MM,
         fork_side_open_threshold_mm: float = perception.corridor.FORK_SIDE_OPEN_THRESHOLD_MM,
+        filter_kind: str = perception.distance_filter.KIND,
+        distance_filter: Optional[DistanceFilterStage] = None,
+        localization: bool = perception.localization.ENABLED,
+        localizer: Optional[ParticleFilterLocalizer] = None,
     ):
         """
         初期化
@@ -36,12 +48,28 @@ class CorridorPerception:
             wall_detection_threshold_mm: 壁を検知する最大距離（mm）。デフォルトは設定ファイルの値
             fork_front_threshold_mm: Y字分岐で正面が壁を検知する距離の閾値（mm）
             fork_side_open_threshold_mm: Y字分岐で左右が「開けている」と判定する距離の閾値（mm）
+            filter_kind: 距離フィルタの種類（"none" / "median" / "hampel" / "kalman"）。デフォルトは設定ファイルの値
+            distance_filter: 距離フィルタ段（apply(data) を持つオブジェクト）。指定した場合は filter_kind より優先
+            localization: 自己位置推定を行うか（コース画像のレイキャスト表を使う）。デフォルトは設定ファイルの値
+            localizer: 自己位置推定。指定した場合は localization より優先
         """
         self.front_blocked_threshold_mm = front_blocked_threshold_mm
         self.front_slow_threshold_mm = front_slow_threshold_mm
         self.wall_detection_threshold_mm = wall_detection_threshold_mm
         self.fork_front_threshold_mm = fork_front_threshold_mm
         self.fork_side_open_threshold_mm = fork_side_open_threshold_mm
+        self.distance_filter = distance_filter if distance_filter is not None else build_distance_filter(filter_kind)
+        self.localizer = localizer if localizer is not None else build_localizer(localization)
+
+    def observe_command(self, command: Command) -> None:
+        """
+        判断モジュールの出力を受け取る（自己位置推定の動作モデルに使う）
+
+        Args:
+            command: 判断モジュールの出力
+        """
+        if self.localizer is not None:
+            self.localizer.observe_command(command)
 
     def analyze(self, data: DistanceData) -> WallFeatures:
         """
@@ -53,6 +81,10 @@ class CorridorPerception:
         Returns:
             WallFeatures: 抽出した特徴量
         """
+        pose = self.localizer.update(data) if self.localizer is not None else None
+        if self.distance_filter is not None:
+            data = self.distance_filter.apply(data)
+
         # 左右バランス誤差を計算
         # left_front_mm - right_front_mm:
         #   正の値 → 左が遠い（右寄り）→ 左に寄る必要がある → steering を正の値にする
@@ -80,4 +112,6 @@ class CorridorPerception:
             front_distance_mm=data.front_mm,
             left_front_mm=data.left_front_mm,
             right_front_mm=data.right_front_mm,
+            sample=data,
+            pose=pose,
         )
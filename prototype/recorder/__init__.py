@@ -0,0 +1,19 @@
+# recorder パッケージ
+# 制御サイクルごとのデータを固定長バイナリで記録するフライトレコーダー
+
+from .format import FIELDS, RECORD_SIZE
+from .flight_recorder import FlightRecorder, RecorderStats
+from .reader import RECORD_DTYPE, load_flight_log, read_records
+from .replay import ReplayResult, replay
+
+__all__ = [
+    "FIELDS",
+    "RECORD_SIZE",
+    "FlightRecorder",
+    "RecorderStats",
+    "RECORD_DTYPE",
+    "load_flight_log",
+    "read_records",
+    "ReplayResult",
+    "replay",
+]
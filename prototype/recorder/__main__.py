@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+フライトログを再生し、記録されたコマンドと再計算したコマンドを比較するスクリプト
+
+使用例:
+    python -m prototype.recorder ./log/flight.bin --csv ./log/replay.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from .reader import read_records
+from .replay import replay
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="フライトログの再生（知覚・判断の再計算）")
+    parser.add_argument("path", help="フライトログのパス")
+    parser.add_argument("--csv", help="記録値と再計算値を並べたCSVの出力先")
+    parser.add_argument("--tolerance", type=float, default=1e-6, help="食い違いとみなす steer/throttle の差")
+    parser.add_argument("--show", type=int, default=10, help="表示する食い違いフレーム数")
+    args = parser.parse_args()
+
+    records = read_records(args.path)
+    result = replay(records)
+    print(f"[REPLAY] {args.path}: {result.summary()}")
+
+    diverging = result.diverging_frames(args.tolerance)
+    if len(diverging) > 0:
+        print(f"[REPLAY] {len(diverging)} frames diverge (first {min(args.show, len(diverging))}):")
+        print("FRAME  | T_CAPTURE | STEER rec/new     | THROTTLE rec/new  | MODE rec/new")
+        for i in diverging[: args.show].tolist():
+            print(
+                f"{int(result.frame_id[i]):6d} | {result.t_capture[i]:9.3f} | "
+                f"{result.recorded_steer[i]:+.3f}/{result.replayed_steer[i]:+.3f} | "
+                f"{result.recorded_throttle[i]:.3f}/{result.replayed_throttle[i]:.3f}       | "
+                f"{int(result.recorded_mode[i])}/{int(result.replayed_mode[i])}"
+            )
+
+    if args.csv:
+        result.to_csv(args.csv)
+        print(f"[REPLAY] wrote {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+# --------------------------------
+# recorder/flight_recorder.py
+# 固定長バイナリレコードのフライトレコーダー
+# 制御ループはリングバッファへ struct.pack_into するだけで、ファイル書き出しは別スレッドが行う
+# --------------------------------
+from __future__ import annotations
+
+import math
+import os
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from ..domain.distance import DistanceData
+from ..domain.features import WallFeatures
+from ..domain.command import Command
+from ..domain.actuation import Telemetry
+from ..config import recorder
+from .format import (
+    ACTUATION_STATUSES,
+    DRIVE_MODES,
+    FLAG_FORK_DETECTED,
+    FLAG_FRONT_BLOCKED,
+    RECORD,
+    RECORD_SIZE,
+    pack_header,
+)
+
+# 列挙型 -> インデックスの逆引き（ホットパスで index() を呼ばないため）
+_MODE_INDEX = {mode: i for i, mode in enumerate(DRIVE_MODES)}
+_STATUS_INDEX = {status: i for i, status in enumerate(ACTUATION_STATUSES)}
+
+
+@dataclass(frozen=True)
+class RecorderStats:
+    """フライトレコーダーの統計"""
+
+    recorded: int  # リングバッファに書き込んだレコード数
+    dropped: int   # バッファが満杯で捨てたレコード数
+    flushed: int   # ファイルに書き出したレコード数
+
+
+class FlightRecorder:
+    """
+    フライトレコーダー
+
+    事前確保したリングバッファ（bytearray）に1フレーム1レコードの固定長データを詰め、
+    バックグラウンドスレッドが FLUSH_BLOCK_RECORDS 件ごと（または FLUSH_INTERVAL_SEC ごと）に
+    まとめてファイルへ書き出す。書き込み側は1スレッド（制御ループ）のみを想定し、
+    書き出しが追いつかずバッファが満杯になった場合は待たずにレコードを捨てて dropped を数える。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        capacity_records: int = recorder.CAPACITY_RECORDS,
+        flush_block_records: int = recorder.FLUSH_BLOCK_RECORDS,
+        flush_interval_sec: float = recorder.FLUSH_INTERVAL_SEC,
+    ):
+        """
+        初期化（ファイルを作成してヘッダーを書き込み、書き出しスレッドを開始）
+
+        Args:
+            path: 出力ファイルのパス
+            capacity_records: リングバッファの容量（レコード数）。デフォルトは設定ファイルの値
+            flush_block_records: まとめて書き出す件数。デフォルトは設定ファイルの値
+            flush_interval_sec: 件数に達しなくても書き出す間隔（秒）。デフォルトは設定ファイルの値
+        """
+        if capacity_records <= 0:
+            raise ValueError(f"capacity_records must be positive, got {capacity_records}")
+        self.path = path
+        self.capacity_records = capacity_records
+        self.flush_block_records = max(1, min(flush_block_records, capacity_records))
+        self.flush_interval_sec = flush_interval_sec
+
+        log_dir = os.path.dirname(path)
+        if log_dir and not os.path.exists(log_dir):
+            os.makedirs(log_dir, exist_ok=True)
+        self._file = open(path, "wb")
+        self._file.write(pack_header())
+
+        self._buf = bytearray(capacity_records * RECORD_SIZE)
+        self._view = memoryview(self._buf)
+        self._head = 0  # 書き込み済みレコード数（制御ループのみが更新）
+        self._tail = 0  # 書き出し済みレコード数（書き出しスレッドのみが更新）
+        self._dropped = 0
+
+        self._wakeup = threading.Event()
+        self._closing = False
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="flight-recorder", daemon=True)
+        self._thread.start()
+
+    def record(
+        self,
+        distance_data: DistanceData,
+        features: WallFeatures,
+        command: Command,
+        telemetry: Telemetry,
+        durations: Tuple[float, float, float, float],
+        actuation_delay: float = math.nan,
+    ) -> bool:
+        """
+        1フレーム分を記録
+
+        Args:
+            distance_data: センサーデータ
+            features: 知覚結果
+            command: 判断結果
+            telemetry: 駆動結果
+            durations: (sensor, perception, decision, actuation) の処理時間（秒）
+            actuation_delay: この判断の前に判断モジュールへ戻した実測遅延（秒、戻していなければNaN）
+
+        Returns:
+            bool: 記録できた場合True（バッファ満杯で捨てた場合False）
+        """
+        flags = (FLAG_FRONT_BLOCKED if features.is_front_blocked else 0) | (
+            FLAG_FORK_DETECTED if features.is_fork_detected else 0
+        )
+        return self.record_values(
+            command.frame_id,
+            command.t_capture_sec,
+            distance_data.front_mm,
+            distance_data.right_front_mm,
+            distance_data.left_front_mm,
+            distance_data.front_timestamp,
+            distance_data.right_front_timestamp,
+            distance_data.left_front_timestamp,
+            features.left_right_error,
+            features.front_distance_mm,
+            flags,
+            command.steer,
+            command.throttle,
+            _MODE_INDEX.get(command.mode, 0),
+            telemetry.steer_pwm_us or 0,
+            telemetry.throttle_pwm_us or 0,
+            _STATUS_INDEX.get(telemetry.status, 0),
+            durations[0],
+            durations[1],
+            durations[2],
+            durations[3],
+            actuation_delay,
+        )
+
+    def record_values(self, *values) -> bool:
+        """
+        format.FIELDS の順に並べた値をそのまま1レコードとして記録
+
+        Returns:
+            bool: 記録できた場合True（バッファ満杯で捨てた場合False）
+        """
+        head = self._head
+        if head - self._tail >= self.capacity_records:
+            self._dropped += 1
+            return False
+        RECORD.pack_into(self._buf, (head % self.capacity_records) * RECORD_SIZE, *values)
+        head += 1
+        self._head = head
+        if head - self._tail >= self.flush_block_records:
+            self._wakeup.set()
+        return True
+
+    def stats(self) -> RecorderStats:
+        """
+        統計を取得
+
+        Returns:
+            RecorderStats: 記録・破棄・書き出し件数
+        """
+        return RecorderStats(recorded=self._head, dropped=self._dropped, flushed=self._tail)
+
+    def close(self) -> None:
+        """残りを書き出してファイルを閉じる"""
+        if self._closing:
+            return
+        self._closing = True
+        self._wakeup.set()
+        self._thread.join()
+        self._file.close()
+        stats = self.stats()
+        print(
+            f"[Recorder] {self.path}: recorded={stats.recorded} flushed={stats.flushed} dropped={stats.dropped}",
+            file=sys.stderr,
+        )
+        if self._error is not None:
+            raise RuntimeError(f"Flight recorder failed: {self._error}") from self._error
+
+    def __enter__(self) -> FlightRecorder:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        """書き出しスレッド本体"""
+        try:
+            while True:
+                self._wakeup.wait(self.flush_interval_sec)
+                self._wakeup.clear()
+                self._flush_available()
+                if self._closing:
+                    self._flush_available()
+                    self._file.flush()
+                    return
+        except Exception as e:
+            self._error = e
+            print(f"[Recorder] 書き出しスレッドでエラーが発生しました: {e}", file=sys.stderr)
+
+    def _flush_available(self) -> None:
+        """書き込み済みで未書き出しのレコードを連続ブロックとして書き出す"""
+        head = self._head
+        tail = self._tail
+        capacity = self.capacity_records
+        while tail < head:
+            start = tail % capacity
+            count = min(head - tail, capacity - start)
+            self._file.write(self._view[start * RECORD_SIZE:(start + count) * RECORD_SIZE])
+            tail += count
+            # 書き出し完了後に解放する（書き込み側はこの位置まで上書きできる）
+            self._tail = tail
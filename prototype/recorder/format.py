@@ -0,0 +1,105 @@
+# --------------------------------
+# recorder/format.py
+# フライトレコーダーのバイナリ形式（固定長レコード）定義
+# --------------------------------
+from __future__ import annotations
+
+import struct
+from typing import List, Tuple
+
+from ..domain.command import DriveMode
+from ..domain.actuation import ActuationStatus
+
+# ファイル先頭のヘッダー: マジック(4) + バージョン(2) + レコード長(2) + 予約(8)
+MAGIC: bytes = b"MCFR"
+VERSION: int = 2
+HEADER = struct.Struct("<4sHH8x")
+
+# レコードのフィールド定義（名前, structの型文字）
+# 1制御サイクル（frame_id）につき1レコード。すべてリトルエンディアン・パディングなし
+FIELDS: List[Tuple[str, str]] = [
+    ("frame_id", "I"),
+    ("t_capture", "d"),            # コマンドの時刻（秒、単調時計）
+    # センサー値（mm）と各センサーの計測時刻（秒）
+    ("front_mm", "f"),
+    ("right_front_mm", "f"),
+    ("left_front_mm", "f"),
+    ("t_front", "d"),
+    ("t_right_front", "d"),
+    ("t_left_front", "d"),
+    # 特徴量
+    ("left_right_error", "f"),
+    ("front_distance_mm", "f"),
+    ("flags", "B"),                # bit0: is_front_blocked, bit1: is_fork_detected
+    # コマンド
+    ("steer", "f"),
+    ("throttle", "f"),
+    ("mode", "B"),                 # DRIVE_MODES のインデックス
+    # テレメトリ
+    ("steer_pwm_us", "H"),
+    ("throttle_pwm_us", "H"),
+    ("status", "B"),               # ACTUATION_STATUSES のインデックス
+    # 各ステージの処理時間（秒）
+    ("dur_sensor", "f"),
+    ("dur_perception", "f"),
+    ("dur_decision", "f"),
+    ("dur_actuation", "f"),
+    # この判断の前に判断モジュールへ戻した実測遅延（秒、observe_actuation() の値。前の判断から戻していなければNaN）
+    ("actuation_delay", "f"),
+]
+
+RECORD = struct.Struct("<" + "".join(code for _, code in FIELDS))
+RECORD_SIZE: int = RECORD.size
+
+FLAG_FRONT_BLOCKED: int = 0x01
+FLAG_FORK_DETECTED: int = 0x02
+
+# 列挙型 <-> インデックスの対応（順序を変えると既存ログが読めなくなるので追加は末尾に）
+DRIVE_MODES: Tuple[DriveMode, ...] = (DriveMode.RUN, DriveMode.SLOW, DriveMode.STOP)
+ACTUATION_STATUSES: Tuple[ActuationStatus, ...] = (
+    ActuationStatus.OK,
+    ActuationStatus.STOPPED,
+    ActuationStatus.DRIVER_ERROR,
+    ActuationStatus.CALIBRATION_ERROR,
+    ActuationStatus.QUEUED,
+)
+
+# structの型文字 -> NumPyのdtype文字列
+_NUMPY_TYPES = {"I": "<u4", "d": "<f8", "f": "<f4", "B": "u1", "H": "<u2"}
+
+
+def numpy_dtype_spec() -> List[Tuple[str, str]]:
+    """
+    レコードに対応するNumPy構造化dtypeの定義
+
+    Returns:
+        [(フィールド名, dtype文字列), ...]
+    """
+    return [(name, _NUMPY_TYPES[code]) for name, code in FIELDS]
+
+
+def pack_header() -> bytes:
+    """ファイルヘッダーを生成"""
+    return HEADER.pack(MAGIC, VERSION, RECORD_SIZE)
+
+
+def unpack_header(data: bytes) -> None:
+    """
+    ファイルヘッダーを検証
+
+    Args:
+        data: ファイル先頭 HEADER.size バイト
+
+    Raises:
+        ValueError: マジック・バージョン・レコード長が一致しない場合
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("Flight log is too short to contain a header")
+    magic, version, record_size = HEADER.unpack(data[: HEADER.size])
+    if magic != MAGIC:
+        raise ValueError(f"Not a flight log (magic={magic!r})")
+    if version != VERSION or record_size != RECORD_SIZE:
+        raise ValueError(
+            f"Unsupported flight log version={version} record_size={record_size} "
+            f"(expected version={VERSION} record_size={RECORD_SIZE})"
+        )
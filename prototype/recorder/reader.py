@@ -0,0 +1,50 @@
+# --------------------------------
+# recorder/reader.py
+# フライトログをNumPy配列として読み込む
+# --------------------------------
+from __future__ import annotations
+
+from typing import Dict
+
+import numpy as np
+
+from .format import HEADER, RECORD_SIZE, numpy_dtype_spec, unpack_header
+
+# レコードに対応するNumPy構造化dtype
+RECORD_DTYPE = np.dtype(numpy_dtype_spec())
+
+
+def read_records(path: str, mmap: bool = False) -> np.ndarray:
+    """
+    フライトログを構造化配列として読み込む
+
+    Args:
+        path: フライトログのパス
+        mmap: Trueの場合はメモリマップで開く（大きなログを一部だけ読む場合）
+
+    Returns:
+        np.ndarray: RECORD_DTYPE の構造化配列（1要素 = 1フレーム）。
+                    書き込み途中で切れた末尾の不完全なレコードは無視する
+    """
+    with open(path, "rb") as f:
+        unpack_header(f.read(HEADER.size))
+        f.seek(0, 2)
+        size = f.tell()
+    count = max(0, (size - HEADER.size) // RECORD_SIZE)
+    if mmap:
+        return np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER.size, shape=(count,))
+    return np.fromfile(path, dtype=RECORD_DTYPE, count=count, offset=HEADER.size)
+
+
+def load_flight_log(path: str) -> Dict[str, np.ndarray]:
+    """
+    フライトログを列ごとの配列として読み込む
+
+    Args:
+        path: フライトログのパス
+
+    Returns:
+        {フィールド名: 1次元配列}（フィールドは format.FIELDS を参照）
+    """
+    records = read_records(path)
+    return {name: np.ascontiguousarray(records[name]) for name in RECORD_DTYPE.names}
@@ -0,0 +1,225 @@
+# --------------------------------
+# recorder/replay.py
+# フライトログの決定的な再生（DistanceData → 知覚 → 判断 を記録時刻どおりに再計算）
+# --------------------------------
+from __future__ import annotations
+
+import csv
+import math
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from ..interfaces.protocols import Perception, Decision
+from ..domain.command import Command
+from ..domain.distance import DistanceData
+from ..clock.virtual import VirtualClock
+from ..perception import CorridorPerception
+from ..decision import CorridorDecision
+from .format import DRIVE_MODES
+
+_MODE_INDEX = {mode: i for i, mode in enumerate(DRIVE_MODES)}
+
+
+@dataclass(frozen=True)
+class ReplayResult:
+    """再生結果（記録されたコマンドと再計算したコマンドをフレームごとに並べたもの）"""
+
+    frame_id: np.ndarray
+    t_capture: np.ndarray
+    recorded_steer: np.ndarray
+    replayed_steer: np.ndarray
+    recorded_throttle: np.ndarray
+    replayed_throttle: np.ndarray
+    recorded_mode: np.ndarray      # DRIVE_MODES のインデックス
+    replayed_mode: np.ndarray      # DRIVE_MODES のインデックス
+    wall_time_sec: float           # 再生にかかった実時間（秒）
+
+    @property
+    def frames(self) -> int:
+        return len(self.frame_id)
+
+    @property
+    def steer_max_abs_diff(self) -> float:
+        if self.frames == 0:
+            return 0.0
+        return float(np.max(np.abs(self.replayed_steer - self.recorded_steer)))
+
+    @property
+    def throttle_max_abs_diff(self) -> float:
+        if self.frames == 0:
+            return 0.0
+        return float(np.max(np.abs(self.replayed_throttle - self.recorded_throttle)))
+
+    @property
+    def mode_mismatches(self) -> int:
+        return int(np.count_nonzero(self.replayed_mode != self.recorded_mode))
+
+    @property
+    def frames_per_sec(self) -> float:
+        return self.frames / self.wall_time_sec if self.wall_time_sec > 0 else 0.0
+
+    def diverging_frames(self, tolerance: float = 1e-6) -> np.ndarray:
+        """
+        記録と再計算が食い違うフレームのインデックス
+
+        Args:
+            tolerance: steer/throttle の許容差
+
+        Returns:
+            np.ndarray: インデックス配列
+        """
+        diverged = (
+            (np.abs(self.replayed_steer - self.recorded_steer) > tolerance)
+            | (np.abs(self.replayed_throttle - self.recorded_throttle) > tolerance)
+            | (self.replayed_mode != self.recorded_mode)
+        )
+        return np.flatnonzero(diverged)
+
+    def summary(self) -> str:
+        """1行の要約"""
+        return (
+            f"frames={self.frames} "
+            f"steer_max_diff={self.steer_max_abs_diff:.6f} "
+            f"throttle_max_diff={self.throttle_max_abs_diff:.6f} "
+            f"mode_mismatches={self.mode_mismatches} "
+            f"speed={self.frames_per_sec:.0f} frames/s"
+        )
+
+    def to_csv(self, path: str) -> None:
+        """
+        記録値と再計算値を並べたCSVを書き出す
+
+        Args:
+            path: 出力ファイルのパス
+        """
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(
+                [
+                    "frame_id", "t_capture",
+                    "recorded_steer", "replayed_steer",
+                    "recorded_throttle", "replayed_throttle",
+                    "recorded_mode", "replayed_mode",
+                ]
+            )
+            for row in zip(
+                self.frame_id.tolist(),
+                self.t_capture.tolist(),
+                self.recorded_steer.tolist(),
+                self.replayed_steer.tolist(),
+                self.recorded_throttle.tolist(),
+                self.replayed_throttle.tolist(),
+                self.recorded_mode.tolist(),
+                self.replayed_mode.tolist(),
+            ):
+                writer.writerow(
+                    [
+                        row[0], f"{row[1]:.6f}",
+                        f"{row[2]:.6f}", f"{row[3]:.6f}",
+                        f"{row[4]:.6f}", f"{row[5]:.6f}",
+                        DRIVE_MODES[row[6]].value, DRIVE_MODES[row[7]].value,
+                    ]
+                )
+
+
+def replay(
+    records: np.ndarray,
+    perception: Optional[Perception] = None,
+    decision: Optional[Decision] = None,
+    clock: Optional[VirtualClock] = None,
+) -> ReplayResult:
+    """
+    記録された DistanceData を知覚・判断に流し直してコマンドを再計算
+
+    判断モジュールが参照する時計を各フレームの記録時刻（t_capture）に合わせてから decide() を呼ぶため、
+    D制御の時間差分は実車と同じになり、実時間に依存せずCPUの速さで再生できる。
+
+    Orchestrator と同じく、判断の前に記録された実測遅延を observe_actuation() で判断に戻し（遅延補償用）、
+    判断の後に記録されたコマンドを observe_command() で知覚に戻す（自己位置推定用）。
+    どちらも持たないモジュールでは呼ばない。
+
+    Args:
+        records: read_records() で読み込んだ構造化配列
+        perception: 知覚モジュール。Noneの場合は設定ファイルの値で CorridorPerception を作る
+        decision: 判断モジュール。Noneの場合は設定ファイルの値で CorridorDecision を作る。
+                  渡す場合は clock と同じ VirtualClock で作成しておくこと
+        clock: 再生用の仮想時計。Noneの場合は新しく作る
+
+    Returns:
+        ReplayResult: 記録値と再計算値
+    """
+    if clock is None:
+        clock = VirtualClock()
+    if perception is None:
+        perception = CorridorPerception()
+    if decision is None:
+        decision = CorridorDecision(clock=clock)
+
+    frames = len(records)
+    replayed_steer = np.empty(frames, dtype=np.float64)
+    replayed_throttle = np.empty(frames, dtype=np.float64)
+    replayed_mode = np.empty(frames, dtype=np.uint8)
+
+    # 行ごとの numpy スカラー参照は遅いので、先に Python のリストにしておく
+    front = records["front_mm"].tolist()
+    right_front = records["right_front_mm"].tolist()
+    left_front = records["left_front_mm"].tolist()
+    t_front = records["t_front"].tolist()
+    t_right_front = records["t_right_front"].tolist()
+    t_left_front = records["t_left_front"].tolist()
+    t_capture = records["t_capture"].tolist()
+    frame_id = records["frame_id"].tolist()
+    steer = records["steer"].tolist()
+    throttle = records["throttle"].tolist()
+    mode = records["mode"].tolist()
+    actuation_delay = records["actuation_delay"].tolist()
+    observe_command = getattr(perception, "observe_command", None)
+    observe_actuation = getattr(decision, "observe_actuation", None)
+
+    wall_start = time.perf_counter()
+    for i in range(frames):
+        data = DistanceData(
+            front_mm=front[i],
+            right_front_mm=right_front[i],
+            left_front_mm=left_front[i],
+            timestamp=max(t_front[i], t_right_front[i], t_left_front[i]),
+            front_timestamp=t_front[i],
+            right_front_timestamp=t_right_front[i],
+            left_front_timestamp=t_left_front[i],
+        )
+        features = perception.analyze(data)
+        clock.set(t_capture[i])
+        if observe_actuation is not None and not math.isnan(actuation_delay[i]):
+            observe_actuation(actuation_delay[i])
+        command = decision.decide(features)
+        if observe_command is not None:
+            # 再計算したコマンドではなく、実車が出したコマンドで動作モデルを進める
+            observe_command(
+                Command(
+                    frame_id=frame_id[i],
+                    t_capture_sec=t_capture[i],
+                    steer=steer[i],
+                    throttle=throttle[i],
+                    mode=DRIVE_MODES[mode[i]],
+                )
+            )
+        replayed_steer[i] = command.steer
+        replayed_throttle[i] = command.throttle
+        replayed_mode[i] = _MODE_INDEX[command.mode]
+    wall_time = time.perf_counter() - wall_start
+
+    # 記録値は float32 なので、比較のため再計算値も同じ精度に丸める
+    return ReplayResult(
+        frame_id=np.asarray(records["frame_id"]),
+        t_capture=np.asarray(records["t_capture"]),
+        recorded_steer=records["steer"].astype(np.float64),
+        replayed_steer=replayed_steer.astype(np.float32).astype(np.float64),
+        recorded_throttle=records["throttle"].astype(np.float64),
+        replayed_throttle=replayed_throttle.astype(np.float32).astype(np.float64),
+        recorded_mode=np.asarray(records["mode"]),
+        replayed_mode=replayed_mode,
+        wall_time_sec=wall_time,
+    )
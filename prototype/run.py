@@ -3,13 +3,15 @@
 実機でオーケストレーターを実行するスクリプト
 """
 
-from prototype.orchestrator import Orchestrator
+from prototype.orchestrator import GPIOFrameEdgeSource, Orchestrator, PWMFrameScheduler
 from prototype.sensors import TOFSensor
 from prototype.perception import CorridorPerception
 from prototype.decision import CorridorDecision
-from prototype.actuation import PWMActuation
+from prototype.actuation import ActuationWorker, PWMActuation
+from prototype.recorder import FlightRecorder
+from prototype.watchdog import HeartbeatWriter
 from prototype.domain.actuation import ActuationCalibration
-from prototype.config import hardware
+from prototype.config import hardware, orchestrator as orchestrator_config, watchdog
 
 
 def main():
@@ -19,7 +21,15 @@ def main():
     sensor = TOFSensor()
     perception = CorridorPerception()  # 設定ファイルからデフォルト値を読み込む
     decision = CorridorDecision()  # 設定ファイルからデフォルト値を読み込む
+    if decision.lap_profile is not None and perception.localizer is None:
+        # 速度プロファイルは自己位置推定の結果で区間を引くので、なければ記録も適用もされない
+        raise ValueError(
+            "decision.lap_profile.ENABLED requires perception.localization.ENABLED (the speed profile needs a pose)"
+        )
     actuation = PWMActuation()
+    if orchestrator_config.ACTUATION_WORKER:
+        # PCA9685への書き込みは専用スレッドに任せ、制御ループはI2Cを待たない
+        actuation = ActuationWorker(actuation)
 
     # キャリブレーションを設定（設定ファイルから値を読み込む）
     calib = ActuationCalibration(
@@ -31,6 +41,21 @@ def main():
     )
     actuation.configure(calib)
 
+    # フライトレコーダー（全フレームをバイナリで記録）
+    recorder = FlightRecorder("./log/flight.bin")
+
+    # PWMフレームに合わせた書き込み（位相は周波数設定の時刻から推定し、PWM出力を引き込んでいればエッジで補正する）
+    pwm_frame = None
+    frame_edges = None
+    if orchestrator_config.PWM_ALIGNED:
+        pwm_frame = PWMFrameScheduler()
+        if hardware.pca9685.FRAME_EDGE_PIN is not None:
+            frame_edges = GPIOFrameEdgeSource(hardware.pca9685.FRAME_EDGE_PIN)
+            frame_edges.start(pwm_frame)
+
+    # ウォッチドッグへのハートビート（ウォッチドッグは別プロセスで `python -m prototype.watchdog` を起動する）
+    heartbeat = HeartbeatWriter() if watchdog.ENABLED else None
+
     # オーケストレーターを作成
     orchestrator = Orchestrator(
         sensor,
@@ -38,6 +63,10 @@ def main():
         decision,
         actuation,
         timing_log_path="./log/timing.log",
+        recorder=recorder,
+        latency_dump_path="./log/latency.json",
+        pwm_frame=pwm_frame,
+        heartbeat=heartbeat,
     )
 
     print("[REAL MODE] Starting loop (Ctrl+C to stop)...")
@@ -46,7 +75,13 @@ def main():
     except KeyboardInterrupt:
         print("\n[REAL MODE] Stopped by user")
     finally:
+        if frame_edges is not None:
+            frame_edges.stop()
         actuation.close()
+        if heartbeat is not None:
+            heartbeat.close()
+        orchestrator.close()
+        recorder.close()
 
 
 if __name__ == "__main__":
@@ -1,10 +1,22 @@
 # sensors パッケージ
 # TOFセンサー（距離センサー）の実装モジュール（前・右斜め前・左斜め前の3方向）
 
-# TOFSensorとTOFReadingsをインポート（ラズベリーパイ環境専用）
+# TOFSensorとTOFReadingsをインポート（ハードウェアモジュールは初期化時に遅延インポート）
 from .tof import TOFSensor, TOFReadings
+from .acquisition import AcquisitionThread, LatestValueBuffer
+from .interrupt import DataReadyEvents, GPIOEdgeSource, SoftwareEdgeSource
+from .vl53l0x_fast import FastVL53L0X
+from .fake import FakeRegisterBus, FakeVL53L0XBus
 
 __all__ = [
     "TOFSensor",
     "TOFReadings",
+    "AcquisitionThread",
+    "LatestValueBuffer",
+    "DataReadyEvents",
+    "GPIOEdgeSource",
+    "SoftwareEdgeSource",
+    "FastVL53L0X",
+    "FakeRegisterBus",
+    "FakeVL53L0XBus",
 ]
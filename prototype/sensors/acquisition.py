@@ -0,0 +1,192 @@
+# --------------------------------
+# sensors/acquisition.py
+# センサー取得スレッドと最新値ダブルバッファ
+# I2Cの data_ready / range 読み出しを制御スレッドから切り離す
+# --------------------------------
+from __future__ import annotations
+
+import sys
+import threading
+from typing import Callable, Optional, Sequence, Tuple
+
+from ..clock import system_clock
+
+
+class LatestValueBuffer:
+    """
+    最新値ダブルバッファ（単一ロック）
+
+    書き込み側（取得スレッド）は裏バッファに値を書き込み、ロック内で表裏を入れ替える。
+    読み出し側（制御スレッド）はロック内で表バッファをコピーするだけなので定数時間で終わる。
+    古い値は上書きされ、常に最新の値だけが読み出される。
+    値と一緒にチャンネルごとの計測時刻とサンプル番号も入れ替えるので、読み出し側は同じ公開の組を得る。
+    """
+
+    def __init__(self, initial: Sequence[int]):
+        """
+        初期化
+
+        Args:
+            initial: 初期値（前、右斜め前、左斜め前の順）
+        """
+        self._cond = threading.Condition(threading.Lock())
+        self._buffers = [list(initial), list(initial)]
+        self._time_buffers = [[0.0] * len(initial), [0.0] * len(initial)]
+        self._seq_buffers = [[0] * len(initial), [0] * len(initial)]
+        self._front = 0
+        self._version = 0
+        self._timestamp = 0.0
+
+    def publish(
+        self,
+        values: Sequence[int],
+        timestamp: float,
+        channel_timestamps: Sequence[float],
+        sequences: Sequence[int],
+    ) -> None:
+        """
+        新しい値を公開する（書き込み側は1スレッドのみを想定）
+
+        Args:
+            values: 各センサーの値
+            timestamp: 取得時刻（秒）
+            channel_timestamps: 各センサーの計測時刻（秒）
+            sequences: 各センサーのサンプル番号
+        """
+        back = 1 - self._front
+        self._buffers[back][:] = values
+        self._time_buffers[back][:] = channel_timestamps
+        self._seq_buffers[back][:] = sequences
+        with self._cond:
+            self._front = 1 - self._front
+            self._version += 1
+            self._timestamp = timestamp
+            self._cond.notify_all()
+
+    def snapshot(
+        self,
+    ) -> Tuple[int, float, Tuple[int, ...], Tuple[float, ...], Tuple[int, ...]]:
+        """
+        最新値のスナップショットを取得
+
+        Returns:
+            (version, timestamp, values, channel_timestamps, sequences):
+                公開回数、取得時刻、各センサーの値、各センサーの計測時刻、各センサーのサンプル番号
+        """
+        with self._cond:
+            front = self._front
+            return (
+                self._version,
+                self._timestamp,
+                tuple(self._buffers[front]),
+                tuple(self._time_buffers[front]),
+                tuple(self._seq_buffers[front]),
+            )
+
+    def wait_for_update(self, version: int, timeout_sec: Optional[float]) -> bool:
+        """
+        version より新しい値が公開されるまで待機
+
+        Args:
+            version: 呼び出し側が最後に読んだ公開回数
+            timeout_sec: タイムアウト（秒）。Noneの場合は無期限
+
+        Returns:
+            bool: 新しい値が公開されていればTrue
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: self._version != version, timeout_sec)
+
+    @property
+    def version(self) -> int:
+        """公開回数"""
+        return self._version
+
+
+class AcquisitionThread:
+    """
+    センサー取得スレッド
+
+    センサーデバイスを専有し、data-readyになったセンサーだけを読み出して
+    LatestValueBuffer に公開する。読み出し中の例外は保持し、check() で制御スレッドへ再送出する。
+    """
+
+    def __init__(
+        self,
+        devices: Sequence,
+        buffer: LatestValueBuffer,
+        idle_interval_sec: float,
+        time_source: Callable[[], float] = system_clock.now,
+    ):
+        """
+        初期化
+
+        Args:
+            devices: data_ready / range 属性を持つセンサーデバイス（前、右斜め前、左斜め前の順）
+            buffer: 公開先のバッファ
+            idle_interval_sec: どのセンサーも未完了だった場合の待機時間（秒）
+            time_source: 取得時刻の時刻源（秒）
+        """
+        self._devices = list(devices)
+        self._buffer = buffer
+        self._idle_interval_sec = idle_interval_sec
+        self._time_source = time_source
+        _, _, values, channel_timestamps, sequences = buffer.snapshot()
+        self._values = list(values)
+        self._channel_timestamps = list(channel_timestamps)
+        self._sequences = list(sequences)
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+
+    def start(self) -> None:
+        """取得スレッドを開始"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._error = None
+        self._thread = threading.Thread(
+            target=self._run, name="tof-acquisition", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout_sec: float = 1.0) -> None:
+        """取得スレッドを停止"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout_sec)
+            self._thread = None
+
+    def check(self) -> None:
+        """取得スレッドで発生した例外を呼び出し側で再送出"""
+        if self._error is not None:
+            raise RuntimeError(f"TOF acquisition thread failed: {self._error}") from self._error
+
+    @property
+    def is_running(self) -> bool:
+        """取得スレッドが動作中か"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def _run(self) -> None:
+        """取得ループ本体"""
+        devices = self._devices
+        values = self._values
+        channel_timestamps = self._channel_timestamps
+        sequences = self._sequences
+        time_source = self._time_source
+        try:
+            while not self._stop_event.is_set():
+                updated = False
+                for i, device in enumerate(devices):
+                    if device.data_ready:
+                        values[i] = device.range
+                        channel_timestamps[i] = time_source()
+                        sequences[i] += 1
+                        updated = True
+                if updated:
+                    self._buffer.publish(values, time_source(), channel_timestamps, sequences)
+                else:
+                    self._stop_event.wait(self._idle_interval_sec)
+        except Exception as e:
+            self._error = e
+            print(f"[TOF] 取得スレッドでエラーが発生しました: {e}", file=sys.stderr)
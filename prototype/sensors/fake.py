@@ -0,0 +1,38 @@
+# --------------------------------
+# sensors/fake.py
+# 実機なしで FastVL53L0X を動かすためのレジスタマップ付きI2Cデバイス
+# --------------------------------
+from __future__ import annotations
+
+from ..interfaces.fake_bus import FakeRegisterBus
+from .vl53l0x_fast import (
+    RANGE_STATUS_VALID,
+    RESULT_INTERRUPT_STATUS,
+    RESULT_RANGE_MM,
+    RESULT_RANGE_STATUS,
+    SYSTEM_INTERRUPT_CLEAR,
+)
+
+
+class FakeVL53L0XBus(FakeRegisterBus):
+    """
+    VL53L0X の計測結果レジスタと割り込みクリアを模擬する FakeRegisterBus
+    """
+
+    def complete_measurement(self, range_mm: int, range_status: int = RANGE_STATUS_VALID) -> None:
+        """
+        計測完了状態にする（結果レジスタに距離を書き、割り込みステータスを立てる）
+
+        Args:
+            range_mm: 距離（mm）
+            range_status: 距離ステータス（11 = 有効）
+        """
+        self.registers[RESULT_RANGE_STATUS] = (range_status & 0x0F) << 3
+        self.registers[RESULT_RANGE_MM] = (range_mm >> 8) & 0xFF
+        self.registers[RESULT_RANGE_MM + 1] = range_mm & 0xFF
+        self.registers[RESULT_INTERRUPT_STATUS] = 0x04  # New Sample Ready
+
+    def write_register(self, address: int, value: int) -> None:
+        super().write_register(address, value)
+        if address == SYSTEM_INTERRUPT_CLEAR and value & 0x01:
+            self.registers[RESULT_INTERRUPT_STATUS] = 0x00
@@ -0,0 +1,171 @@
+# --------------------------------
+# sensors/interrupt.py
+# VL53L0X の GPIO1（計測完了割り込み）のエッジ通知
+# 計測が終わったセンサーだけを読み出し、制御ループは通知が来るまでブロックする
+# --------------------------------
+from __future__ import annotations
+
+import sys
+import threading
+from typing import Optional, Sequence
+
+from ..config import sensors
+
+
+class DataReadyEvents:
+    """
+    センサーごとの計測完了フラグ（ビットマスク）
+
+    エッジ通知のコールバック（別スレッド）が signal() でビットを立て、
+    制御スレッドが take() でまとめて取り出す。wait() は1つでもビットが立つまでブロックする。
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._pending = 0
+        self._edges = 0
+
+    def signal(self, index: int) -> None:
+        """
+        センサー index の計測完了を通知（エッジ通知のコールバックから呼ぶ）
+
+        Args:
+            index: センサー番号（前=0、右斜め前=1、左斜め前=2）
+        """
+        with self._cond:
+            self._pending |= 1 << index
+            self._edges += 1
+            self._cond.notify_all()
+
+    def take(self) -> int:
+        """
+        立っているビットを取り出してクリア
+
+        Returns:
+            int: 計測完了したセンサーのビットマスク（bit i = センサー i）
+        """
+        with self._cond:
+            pending = self._pending
+            self._pending = 0
+            return pending
+
+    def wait(self, timeout_sec: Optional[float]) -> bool:
+        """
+        1つでもビットが立つまで待機
+
+        Args:
+            timeout_sec: タイムアウト（秒）。Noneの場合は無期限
+
+        Returns:
+            bool: ビットが立っていればTrue（タイムアウトした場合False）
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending != 0, timeout_sec)
+
+    def clear(self) -> None:
+        """立っているビットをすべてクリア"""
+        with self._cond:
+            self._pending = 0
+
+    @property
+    def edges(self) -> int:
+        """これまでに受けたエッジ通知の回数"""
+        return self._edges
+
+
+class GPIOEdgeSource:
+    """
+    RPi.GPIO のエッジ検出で GPIO1 の立ち下がりを DataReadyEvents に通知する
+
+    VL53L0X の GPIO1 はオープンドレイン・アクティブLow（計測完了でLow、割り込みクリアでHigh）なので、
+    プルアップして立ち下がりエッジを検出する。
+    """
+
+    def __init__(
+        self,
+        pins: Sequence[int] = sensors.vl53l0x.GPIO1_PINS,
+        bounce_ms: int = sensors.vl53l0x.INTERRUPT_BOUNCE_MS,
+    ):
+        """
+        初期化（この時点ではGPIOに触れない）
+
+        Args:
+            pins: GPIO1を接続したGPIO番号（BCM、前、右斜め前、左斜め前の順）。デフォルトは設定ファイルの値
+            bounce_ms: チャタリング除去時間（ミリ秒、0で無効）。デフォルトは設定ファイルの値
+        """
+        self.pins = tuple(pins)
+        self.bounce_ms = bounce_ms
+        self._gpio = None
+
+    def start(self, events: DataReadyEvents) -> None:
+        """
+        エッジ検出を開始
+
+        Args:
+            events: 通知先
+        """
+        if self._gpio is not None:
+            return
+        # ハードウェアモジュールのインポート（ラズベリーパイ環境専用）
+        import RPi.GPIO as GPIO
+
+        GPIO.setmode(GPIO.BCM)
+        for index, pin in enumerate(self.pins):
+            GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+            kwargs = {"bouncetime": self.bounce_ms} if self.bounce_ms > 0 else {}
+            GPIO.add_event_detect(
+                pin,
+                GPIO.FALLING,
+                callback=lambda _channel, i=index: events.signal(i),
+                **kwargs,
+            )
+        self._gpio = GPIO
+        print(f"[TOF] GPIO1割り込みを有効にしました (pins={self.pins})", file=sys.stderr)
+
+    def stop(self) -> None:
+        """エッジ検出を停止してピンを解放"""
+        if self._gpio is None:
+            return
+        for pin in self.pins:
+            try:
+                self._gpio.remove_event_detect(pin)
+            except Exception:
+                pass  # エラーは無視
+        self._gpio.cleanup(list(self.pins))
+        self._gpio = None
+
+
+class SoftwareEdgeSource:
+    """
+    GPIOEdgeSource の代わりに使うソフトウェアのエッジ源（実機なしの試験用）
+
+    trigger(i) を呼ぶと、GPIO1 の立ち下がりを受けたのと同じように DataReadyEvents に通知する。
+    """
+
+    def __init__(self):
+        self._events: Optional[DataReadyEvents] = None
+        self.triggers = 0
+
+    def start(self, events: DataReadyEvents) -> None:
+        """
+        通知先を設定
+
+        Args:
+            events: 通知先
+        """
+        self._events = events
+
+    def stop(self) -> None:
+        """通知先を解除（以降の trigger() は無視される）"""
+        self._events = None
+
+    def trigger(self, index: int) -> None:
+        """
+        センサー index の立ち下がりエッジを発生させる
+
+        Args:
+            index: センサー番号（前=0、右斜め前=1、左斜め前=2）
+        """
+        self.triggers += 1
+        if self._events is not None:
+            self._events.signal(index)
@@ -7,20 +7,26 @@ from __future__ import annotations
 
 import sys
 import time
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, Optional, Tuple
 from dataclasses import dataclass
 
 from ..domain.distance import DistanceData
+from ..interfaces.protocols import Clock
+from ..clock import system_clock
 from ..config import timing, sensors
+from .acquisition import AcquisitionThread, LatestValueBuffer
+from .interrupt import DataReadyEvents, GPIOEdgeSource
+from .vl53l0x_fast import FastVL53L0X
 
-# ハードウェアモジュールのインポート（ラズベリーパイ環境専用）
-import board
-import busio
-import digitalio
-import adafruit_vl53l0x
+if TYPE_CHECKING:
+    import busio
+    import digitalio
+
+# 読み出し方法
+BACKENDS: Tuple[str, ...] = ("adafruit", "fast")
 
 # 範囲外を示すデフォルト値（mm）
-_OUT_OF_RANGE: int = 8190
+_OUT_OF_RANGE: int = sensors.vl53l0x.OUT_OF_RANGE_MM
 
 
 @dataclass
@@ -40,7 +46,12 @@ class TOFSensor:
     def __init__(
         self,
         xshut_pins: Tuple[int, int, int] = sensors.vl53l0x.XSHUT_PINS,
-        i2c_addresses: Tuple[int, int, int] = sensors.vl53l0x.I2C_ADDRESSES
+        i2c_addresses: Tuple[int, int, int] = sensors.vl53l0x.I2C_ADDRESSES,
+        use_acquisition_thread: bool = sensors.vl53l0x.ACQUISITION_THREAD,
+        clock: Clock = system_clock,
+        use_interrupts: bool = sensors.vl53l0x.INTERRUPT_MODE,
+        edge_source=None,
+        backend: str = sensors.vl53l0x.BACKEND,
     ):
         """
         初期化
@@ -48,22 +59,61 @@ class TOFSensor:
         Args:
             xshut_pins: XSHUTピンのGPIO番号（前、右斜め前、左斜め前の順）。デフォルトは設定ファイルの値
             i2c_addresses: I2Cアドレス（前、右斜め前、左斜め前の順）。デフォルトは設定ファイルの値
+            use_acquisition_thread: Trueの場合、専用スレッドがセンサーを読み出し、
+                                    poll()/read() は最新値のスナップショットを返す。デフォルトは設定ファイルの値
+            clock: 計測時刻のタイムスタンプに使う時計。デフォルトは実時間の単調時計
+            use_interrupts: Trueの場合、GPIO1のエッジ通知があったセンサーだけを読み出す
+                            （data_readyのポーリングなし）。デフォルトは設定ファイルの値
+            edge_source: エッジ通知源（start(events)/stop() を持つオブジェクト）。
+                         Noneの場合は GPIOEdgeSource（設定ファイルの GPIO1_PINS）
+            backend: 計測結果の読み出し方法。"adafruit"（adafruit_vl53l0x のプロパティ）または
+                     "fast"（FastVL53L0X によるレジスタ直接のバースト読み出し）。デフォルトは設定ファイルの値
         """
+        if use_interrupts and use_acquisition_thread:
+            raise ValueError("use_interrupts and use_acquisition_thread cannot be combined")
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend!r} (expected one of {BACKENDS})")
+        self.backend = backend
         self.xshut_pins = xshut_pins
         self.i2c_addresses = i2c_addresses
+        self.use_acquisition_thread = use_acquisition_thread
+        self.clock = clock
         self._i2c: Optional[busio.I2C] = None
-        self._sensors: list[adafruit_vl53l0x.VL53L0X] = []
+        self._sensors: list = []  # adafruit_vl53l0x.VL53L0X または FastVL53L0X
         self._xshut_controls: list[digitalio.DigitalInOut] = []
         self._is_initialized = False
         self._last_readings = TOFReadings(
             front=_OUT_OF_RANGE, right_front=_OUT_OF_RANGE, left_front=_OUT_OF_RANGE
         )
+        # チャンネルごとの計測時刻とサンプル番号（前、右斜め前、左斜め前の順。0は未計測）
+        self._channel_timestamps = [0.0] * sensors.vl53l0x.NUM_SENSORS
+        self._sequences = [0] * sensors.vl53l0x.NUM_SENSORS
+
+        # 取得スレッドモード用
+        self._buffer = LatestValueBuffer((_OUT_OF_RANGE,) * sensors.vl53l0x.NUM_SENSORS)
+        self._acquisition: Optional[AcquisitionThread] = None
+        self._last_version = 0
+
+        # 割り込みモード用
+        self.use_interrupts = use_interrupts
+        self._edge_source = edge_source if edge_source is not None else (GPIOEdgeSource() if use_interrupts else None)
+        self._ready_events = DataReadyEvents()
+        self._edge_started = False
+        # エッジを取りこぼした可能性があるとき（開始直後・待機タイムアウト後）は data_ready を1度確認する
+        self._resync = True
     
     def _initialize_hardware(self) -> None:
         """ハードウェアを初期化"""
         if self._is_initialized:
             return
         
+        # ハードウェアモジュールのインポート（ラズベリーパイ環境専用）
+        # FastVL53L0X や割り込み関連のクラスは実機なしでも使えるよう、ここで遅延インポートする
+        import board
+        import busio
+        import digitalio
+        import adafruit_vl53l0x
+
         try:
             # I2Cバスを初期化
             self._i2c = busio.I2C(board.SCL, board.SDA)
@@ -91,6 +141,10 @@ class TOFSensor:
                 # 重ならないようにアドレスを変えていく
                 new_address = self.i2c_addresses[i]
                 sensor.set_address(new_address)
+
+                # 計測結果の読み出しだけをレジスタ直接アクセスに置き換える
+                if self.backend == "fast":
+                    sensor = FastVL53L0X.from_adafruit(sensor, clock=self.clock)
                 
                 self._sensors.append(sensor)
                 sensor_name = sensors.vl53l0x.SENSOR_NAMES[i] if i < len(sensors.vl53l0x.SENSOR_NAMES) else f"センサー{i}"
@@ -110,6 +164,10 @@ class TOFSensor:
         """
         if not self._is_initialized:
             self._initialize_hardware()
+
+        # 取得スレッドがバスを専有しているため、最新のスナップショットを返す
+        if self._acquisition is not None:
+            return self._snapshot_readings()
         
         # センサー数が期待値と一致することを確認
         expected_count = sensors.vl53l0x.NUM_SENSORS
@@ -118,8 +176,9 @@ class TOFSensor:
         
         # 前、右斜め前、左斜め前の順でループして読み取り
         readings_list = []
-        for sensor in self._sensors:
+        for i, sensor in enumerate(self._sensors):
             readings_list.append(sensor.range)
+            self._mark_measured(i)
         
         # TOFReadings形式に変換（3つのセンサーを想定）
         if len(readings_list) >= 3:
@@ -135,38 +194,54 @@ class TOFSensor:
         Returns:
             DistanceData: 前、右斜め前、左斜め前の距離データ（タイムスタンプ付き）
         """
-        readings = self.read_tof_readings()
-        return DistanceData.from_tof_readings(readings)
+        if not self._is_initialized:
+            self._initialize_hardware()
+        if self._acquisition is not None:
+            return self._snapshot_distance_data()[1]
+        self._last_readings = self.read_tof_readings()
+        return self._last_distance_data()
     
     def read_front(self) -> int:
         """前方のセンサーから距離を読み取る（mm）"""
         if not self._is_initialized:
             self._initialize_hardware()
-        return self._sensors[0].range
+        if self._acquisition is not None:
+            return self._snapshot_readings().front
+        return self._read_channel(0)
     
     def read_right_front(self) -> int:
         """右斜め前のセンサーから距離を読み取る（mm）"""
         if not self._is_initialized:
             self._initialize_hardware()
-        return self._sensors[1].range
+        if self._acquisition is not None:
+            return self._snapshot_readings().right_front
+        return self._read_channel(1)
     
     def read_left_front(self) -> int:
         """左斜め前のセンサーから距離を読み取る（mm）"""
         if not self._is_initialized:
             self._initialize_hardware()
-        return self._sensors[2].range
+        if self._acquisition is not None:
+            return self._snapshot_readings().left_front
+        return self._read_channel(2)
     
     def start_continuous(self) -> None:
         """全センサーを連続計測モードに切り替える"""
         if not self._is_initialized:
             self._initialize_hardware()
             return  # _initialize_hardware 内で start_continuous が呼ばれる
+        if self.use_interrupts:
+            self._start_interrupts()
         for sensor in self._sensors:
             sensor.start_continuous()
         print("[TOF] 連続計測モードを開始しました", file=sys.stderr)
+        if self.use_acquisition_thread:
+            self._start_acquisition()
 
     def stop_continuous(self) -> None:
         """全センサーの連続計測モードを停止する"""
+        self._stop_acquisition()
+        self._stop_interrupts()
         for sensor in self._sensors:
             sensor.stop_continuous()
         print("[TOF] 連続計測モードを停止しました", file=sys.stderr)
@@ -182,19 +257,159 @@ class TOFSensor:
         if not self._is_initialized:
             self._initialize_hardware()
 
+        # 取得スレッドモード: 公開回数が進んでいれば更新ありとみなす（I2Cアクセスなし）
+        if self._acquisition is not None:
+            version, data = self._snapshot_distance_data()
+            updated = version != self._last_version
+            self._last_version = version
+            return updated, data
+
+        # 割り込みモード: エッジ通知のあったセンサーだけ読み出す
+        if self.use_interrupts:
+            return self._poll_interrupts()
+
         updated = False
         # front=0, right_front=1, left_front=2
         if self._sensors[0].data_ready:
             self._last_readings.front = self._sensors[0].range
+            self._mark_measured(0)
             updated = True
         if self._sensors[1].data_ready:
             self._last_readings.right_front = self._sensors[1].range
+            self._mark_measured(1)
             updated = True
         if self._sensors[2].data_ready:
             self._last_readings.left_front = self._sensors[2].range
+            self._mark_measured(2)
             updated = True
 
-        return updated, DistanceData.from_tof_readings(self._last_readings)
+        return updated, self._last_distance_data()
+
+    def wait_ready(self, timeout_sec: float) -> bool:
+        """
+        いずれかのセンサーの計測完了を待つ（割り込みモード・取得スレッドモードのみブロックする）
+
+        Args:
+            timeout_sec: タイムアウト（秒）
+
+        Returns:
+            bool: 計測完了の通知を受けた場合True。通知手段がないモードでは待たずにFalse
+        """
+        if not self._is_initialized:
+            self._initialize_hardware()
+        if self._acquisition is not None:
+            return self._buffer.wait_for_update(self._last_version, timeout_sec)
+        if self.use_interrupts:
+            if self._ready_events.wait(timeout_sec):
+                return True
+            # 計測周期を過ぎても通知がない場合はエッジを取りこぼしたとみなし、次のpollで data_ready を確認する
+            self._resync = True
+            return False
+        return False
+
+    def _poll_interrupts(self) -> tuple[bool, DistanceData]:
+        """割り込みモードの poll()（I2Cアクセスは計測完了したセンサーの range 読み出しのみ）"""
+        pending = self._ready_events.take()
+        if self._resync:
+            # GPIO1はLowのまま割り込みクリアを待つので、読み出さないと次のエッジが来ない
+            self._resync = False
+            for i, sensor in enumerate(self._sensors):
+                if sensor.data_ready:
+                    pending |= 1 << i
+        if pending == 0:
+            return False, self._last_distance_data()
+
+        # range の読み出しで割り込みがクリアされ、GPIO1がHighに戻る
+        if pending & 0b001:
+            self._last_readings.front = self._sensors[0].range
+            self._mark_measured(0)
+        if pending & 0b010:
+            self._last_readings.right_front = self._sensors[1].range
+            self._mark_measured(1)
+        if pending & 0b100:
+            self._last_readings.left_front = self._sensors[2].range
+            self._mark_measured(2)
+        return True, self._last_distance_data()
+
+    def _read_channel(self, index: int) -> int:
+        """センサー index の距離を読み取り、計測時刻とサンプル番号を更新する（mm）"""
+        value = self._sensors[index].range
+        self._mark_measured(index)
+        return value
+
+    def _mark_measured(self, index: int) -> None:
+        """センサー index の計測値を読み出した時刻を記録し、サンプル番号を進める"""
+        self._channel_timestamps[index] = self.clock.now()
+        self._sequences[index] += 1
+
+    def _last_distance_data(self) -> DistanceData:
+        """保持している最新値をDistanceDataに変換（timestamp は現在時刻、チャンネルごとの時刻は計測時刻）"""
+        return DistanceData.from_tof_readings(
+            self._last_readings,
+            channel_timestamps=self._channel_timestamps,
+            sequences=self._sequences,
+            clock=self.clock,
+        )
+
+    def _start_interrupts(self) -> None:
+        """エッジ検出を開始（連続計測の開始前に呼び、最初のエッジを取りこぼさないようにする）"""
+        if self._edge_started:
+            return
+        self._ready_events.clear()
+        self._edge_source.start(self._ready_events)
+        self._edge_started = True
+        self._resync = True
+
+    def _stop_interrupts(self) -> None:
+        """エッジ検出を停止"""
+        if not self._edge_started:
+            return
+        self._edge_source.stop()
+        self._edge_started = False
+
+    def _start_acquisition(self) -> None:
+        """取得スレッドを開始（センサーデバイスの読み出しはこのスレッドが専有する）"""
+        if self._acquisition is not None:
+            return
+        self._acquisition = AcquisitionThread(
+            self._sensors,
+            self._buffer,
+            idle_interval_sec=sensors.vl53l0x.ACQUISITION_IDLE_INTERVAL_SEC,
+            time_source=self.clock.now,
+        )
+        self._acquisition.start()
+        print("[TOF] 取得スレッドを開始しました", file=sys.stderr)
+
+    def _stop_acquisition(self) -> None:
+        """取得スレッドを停止"""
+        if self._acquisition is None:
+            return
+        self._acquisition.stop()
+        self._acquisition = None
+        print("[TOF] 取得スレッドを停止しました", file=sys.stderr)
+
+    def _snapshot_readings(self) -> TOFReadings:
+        """
+        取得スレッドが公開した最新値を取得
+
+        Returns:
+            TOFReadings: 読み取り値
+        """
+        self._acquisition.check()
+        values = self._buffer.snapshot()[2]
+        return TOFReadings(front=values[0], right_front=values[1], left_front=values[2])
+
+    def _snapshot_distance_data(self) -> tuple[int, DistanceData]:
+        """
+        取得スレッドが公開した最新値をチャンネルごとの計測時刻付きで取得
+
+        Returns:
+            (version, distance_data): 公開回数、距離データ
+        """
+        self._acquisition.check()
+        version, timestamp, values, channel_timestamps, sequences = self._buffer.snapshot()
+        readings = TOFReadings(front=values[0], right_front=values[1], left_front=values[2])
+        return version, DistanceData.from_tof_readings(readings, timestamp, channel_timestamps, sequences)
 
     def close(self) -> None:
         """リソースを解放"""
@@ -0,0 +1,149 @@
+# --------------------------------
+# sensors/vl53l0x_fast.py
+# VL53L0X の連続計測結果をレジスタ直接アクセスで読む軽量ドライバ
+# 割り込みステータス〜距離結果を1回のバースト読み出しで取得し、割り込みクリアの書き込みと合わせて
+# 1計測あたり2トランザクションで済ませる（adafruit_vl53l0x は data_ready / 距離 / クリアで3回）
+# --------------------------------
+from __future__ import annotations
+
+from typing import Optional
+
+from ..interfaces.protocols import Clock
+from ..clock import system_clock
+from ..config import sensors
+
+# レジスタアドレス
+SYSTEM_INTERRUPT_CLEAR: int = 0x0B
+RESULT_INTERRUPT_STATUS: int = 0x13
+RESULT_RANGE_STATUS: int = 0x14
+RESULT_RANGE_MM: int = RESULT_RANGE_STATUS + 10  # 距離（mm、ビッグエンディアン16bit）
+
+# 0x13（割り込みステータス）から距離の下位バイト（0x1F）までを一度に読む
+BURST_LENGTH: int = RESULT_RANGE_MM + 2 - RESULT_INTERRUPT_STATUS
+_RANGE_OFFSET: int = RESULT_RANGE_MM - RESULT_INTERRUPT_STATUS
+_RANGE_STATUS_OFFSET: int = RESULT_RANGE_STATUS - RESULT_INTERRUPT_STATUS
+
+# 距離ステータス（RESULT_RANGE_STATUS のビット3-6）の「有効な計測」
+RANGE_STATUS_VALID: int = 11
+
+
+class FastVL53L0X:
+    """
+    VL53L0X の連続計測用の軽量ドライバ
+
+    初期化・アドレス変更・連続計測の開始/停止は adafruit_vl53l0x に任せ、
+    計測結果の読み出しだけをレジスタ直接アクセスで行う。
+    data_ready / range / start_continuous / stop_continuous を持つので、TOFSensor や
+    AcquisitionThread からは adafruit_vl53l0x.VL53L0X と同じように扱える。
+    """
+
+    def __init__(
+        self,
+        device,
+        controller=None,
+        io_timeout_sec: float = sensors.vl53l0x.IO_TIMEOUT_SEC,
+        clock: Clock = system_clock,
+    ):
+        """
+        初期化
+
+        Args:
+            device: レジスタアクセス用のI2Cデバイス（with 文でバスを確保し、
+                    write_then_readinto(out, in) / write(buf) を持つ。adafruit_bus_device.I2CDevice 互換）
+            controller: start_continuous() / stop_continuous() の委譲先（adafruit_vl53l0x.VL53L0X）。
+                        Noneの場合は何もしない
+            io_timeout_sec: range で計測完了を待つ最大時間（秒、0で無期限）。デフォルトは設定ファイルの値
+            clock: タイムアウト判定に使う時計。デフォルトは実時間の単調時計
+        """
+        self._device = device
+        self._controller = controller
+        self.io_timeout_sec = io_timeout_sec
+        self.clock = clock
+        # 読み書きバッファは使い回す（1回の読み出しでオブジェクトを作らない）
+        self._burst_address = bytes([RESULT_INTERRUPT_STATUS])
+        self._burst = bytearray(BURST_LENGTH)
+        self._clear_command = bytes([SYSTEM_INTERRUPT_CLEAR, 0x01])
+        self._ready_range: Optional[int] = None
+        self.last_range_status = 0
+
+    @classmethod
+    def from_adafruit(cls, sensor, **kwargs) -> FastVL53L0X:
+        """
+        初期化・アドレス設定済みの adafruit_vl53l0x.VL53L0X から作る
+
+        Args:
+            sensor: adafruit_vl53l0x.VL53L0X（set_address() 後のもの）
+            **kwargs: コンストラクタに渡す追加引数
+
+        Returns:
+            FastVL53L0X: 同じI2Cデバイスを使う軽量ドライバ
+        """
+        # set_address() で作り直された I2CDevice を共有する
+        return cls(sensor._device, controller=sensor, **kwargs)
+
+    def read_result(self) -> Optional[int]:
+        """
+        計測結果を1回のバースト読み出しで取得し、完了していれば割り込みをクリア
+
+        Returns:
+            Optional[int]: 距離（mm）。計測が完了していない場合None
+        """
+        if self._ready_range is None and not self._read_burst():
+            return None
+        return self._consume()
+
+    @property
+    def data_ready(self) -> bool:
+        """計測完了しているか（完了時は結果も読み込み済みにし、range で追加の読み出しをしない）"""
+        return self._ready_range is not None or self._read_burst()
+
+    @property
+    def range(self) -> int:
+        """
+        距離（mm）。計測完了まで待ってから読み出し、割り込みをクリアする
+
+        Raises:
+            RuntimeError: io_timeout_sec 以内に計測が完了しなかった場合
+        """
+        if self._ready_range is None:
+            start = self.clock.now()
+            while not self._read_burst():
+                if self.io_timeout_sec > 0 and self.clock.now() - start >= self.io_timeout_sec:
+                    raise RuntimeError("Timeout waiting for VL53L0X!")
+        return self._consume()
+
+    def start_continuous(self) -> None:
+        """連続計測を開始（controller に委譲）"""
+        self._ready_range = None
+        if self._controller is not None:
+            self._controller.start_continuous()
+
+    def stop_continuous(self) -> None:
+        """連続計測を停止（controller に委譲）"""
+        if self._controller is not None:
+            self._controller.stop_continuous()
+        self._ready_range = None
+
+    def _read_burst(self) -> bool:
+        """
+        割り込みステータス〜距離結果をバースト読み出し
+
+        Returns:
+            bool: 計測完了していればTrue（距離を _ready_range に保持）
+        """
+        burst = self._burst
+        with self._device:
+            self._device.write_then_readinto(self._burst_address, burst)
+        if burst[0] & 0x07 == 0:
+            return False
+        self.last_range_status = (burst[_RANGE_STATUS_OFFSET] >> 3) & 0x0F
+        self._ready_range = (burst[_RANGE_OFFSET] << 8) | burst[_RANGE_OFFSET + 1]
+        return True
+
+    def _consume(self) -> int:
+        """保持している距離を返し、割り込みをクリアして次の計測結果を受け付ける"""
+        range_mm = self._ready_range
+        self._ready_range = None
+        with self._device:
+            self._device.write(self._clear_command)
+        return range_mm
@@ -0,0 +1,30 @@
+# sim パッケージ
+# 実機なしで Orchestrator / 知覚 / 判断 を動かすヘッドレスの回廊シミュレーター
+
+from .geometry import Course, CourseBuilder, Segment, default_course
+from .vehicle import BicycleModel, VehicleState
+from .world import SimWorld
+from .sensors import SimTOFSensor
+from .actuation import SimActuation
+from .runner import SimResult, SimRunner, build_simulation, default_calibration
+from .batch import BatchParams, BatchResult, BatchSimulator, gain_grid
+
+__all__ = [
+    "Course",
+    "CourseBuilder",
+    "Segment",
+    "default_course",
+    "BicycleModel",
+    "VehicleState",
+    "SimWorld",
+    "SimTOFSensor",
+    "SimActuation",
+    "SimResult",
+    "SimRunner",
+    "build_simulation",
+    "default_calibration",
+    "BatchParams",
+    "BatchResult",
+    "BatchSimulator",
+    "gain_grid",
+]
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+シミュレーターで周回走行を実行するスクリプト
+
+使用例:
+    python -m prototype.sim --laps 3 --runs 10
+    python -m prototype.sim --fork                                                       # Y字分岐のあるコース（現状は島に衝突する）
+    python -m prototype.sim --sweep-kp 0.001:0.02:100 --sweep-kd 0:0.005:100   # バッチシミュレーターでゲイン探索
+    python -m prototype.sim --lap-profile ./log/sim_lap_profile.json                     # 1周目を記録して2周目以降を速度プロファイルで
+    python -m prototype.sim --actuation-delay-ms 60 --latency-compensation               # 無駄時間のある車両で遅延補償あり（外すと比較できる）
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .geometry import default_course
+from .runner import build_simulation
+from .batch import BatchSimulator, gain_grid
+from ..clock import VirtualClock
+from ..config import decision
+
+
+def _parse_range(text: str) -> np.ndarray:
+    """'start:stop:num' を等間隔の値の配列に（'value' だけなら1点）"""
+    parts = [float(p) for p in text.split(":")]
+    if len(parts) == 1:
+        return np.asarray(parts)
+    if len(parts) != 3:
+        raise argparse.ArgumentTypeError(f"expected 'start:stop:num' or 'value': {text!r}")
+    return np.linspace(parts[0], parts[1], int(parts[2]))
+
+
+def _run_sweep(args: argparse.Namespace) -> None:
+    """KP × KD の格子をバッチシミュレーターで走らせ、速い順に表示"""
+    kp_values = args.sweep_kp if args.sweep_kp is not None else np.asarray([decision.corridor.KP])
+    kd_values = args.sweep_kd if args.sweep_kd is not None else np.asarray([decision.corridor.KD])
+    params = gain_grid(kp_values, kd_values)
+    simulator = BatchSimulator(course=default_course(with_fork=args.fork))
+    result = simulator.run(params, laps=args.laps)
+    ranking = result.ranking()
+    print(
+        f"[SIM] sweep: {len(params)} cars, {int(result.finished.sum())} finished, "
+        f"{int(result.collided.sum())} collided, {result.sim_time_sec:.1f}s simulated in {result.wall_time_sec:.2f}s"
+    )
+    for rank, index in enumerate(ranking[:args.top], start=1):
+        print(f"[SIM] #{rank} {result.summary(index)}")
+
+
+def _build_modules(
+    table,
+    lap_profile_path: Optional[str],
+    latency_compensation: bool,
+    output_delay_sec: float,
+) -> Tuple[object, object, VirtualClock]:
+    """
+    知覚・判断モジュールを組み立てる
+
+    自己位置推定は table がある場合、速度プロファイルは lap_profile_path がある場合だけ使う。
+    遅延補償を使う場合は、シミュレーターの無駄時間を判断の見込みに渡す。
+    """
+    from ..decision import CorridorDecision, LapSpeedProfile
+    from ..perception import CorridorPerception, ParticleFilterLocalizer
+
+    clock = VirtualClock()
+    perception = CorridorPerception(localizer=ParticleFilterLocalizer(table) if table is not None else None)
+    profile = LapSpeedProfile(path=lap_profile_path) if lap_profile_path is not None else None
+    decision_module = CorridorDecision(
+        clock=clock,
+        lap_profile=profile,
+        latency_compensation=latency_compensation,
+        output_delay_sec=output_delay_sec,
+    )
+    return perception, decision_module, clock
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ヘッドレス回廊シミュレーター")
+    parser.add_argument("--laps", type=int, default=3, help="1回の走行の周回数")
+    parser.add_argument("--runs", type=int, default=1, help="走行回数")
+    fork = parser.add_mutually_exclusive_group()
+    fork.add_argument("--fork", action="store_true", help="Y字分岐のあるコースで走行（現状は分岐で島に衝突する）")
+    fork.add_argument("--no-fork", action="store_true", help="Y字分岐のないコースで走行（既定。以前のコマンドとの互換のため残す）")
+    parser.add_argument("--sweep-kp", type=_parse_range, help="バッチシミュレーターで探索するKP（start:stop:num）")
+    parser.add_argument("--sweep-kd", type=_parse_range, help="バッチシミュレーターで探索するKD（start:stop:num）")
+    parser.add_argument("--top", type=int, default=10, help="ゲイン探索で表示する上位の数")
+    parser.add_argument("--localize", action="store_true", help="コースから作ったレイキャスト表で自己位置推定を行う")
+    parser.add_argument(
+        "--lap-profile",
+        metavar="PATH",
+        help="速度プロファイルの記録の保存先（自己位置推定も行う）。実機用の記録と混ざらないよう別のパスにする",
+    )
+    parser.add_argument(
+        "--actuation-delay-ms", type=float, default=0.0, help="指令が車両に反映されるまでの無駄時間（ms）"
+    )
+    parser.add_argument(
+        "--latency-compensation", action="store_true", help="判断で反映時刻の誤差・前方距離を予測する（遅延補償）"
+    )
+    args = parser.parse_args()
+
+    if args.sweep_kp is not None or args.sweep_kd is not None:
+        _run_sweep(args)
+        return
+
+    course = default_course(with_fork=args.fork)
+    table = None
+    if args.localize or args.lap_profile is not None:
+        from ..maps import TrackMap, build_ray_table
+
+        table = build_ray_table(TrackMap.from_course(course))
+
+    wall_start = time.perf_counter()
+    total_sim = 0.0
+    total_laps = 0
+    for run in range(args.runs):
+        delay_sec = args.actuation_delay_ms / 1000.0
+        perception, decision_module, clock = _build_modules(
+            table, args.lap_profile, args.latency_compensation, delay_sec
+        )
+        _, _, runner = build_simulation(
+            course=course,
+            perception=perception,
+            decision=decision_module,
+            clock=clock,
+            actuation_delay_sec=delay_sec,
+        )
+        result = runner.run(laps=args.laps)
+        total_sim += result.sim_time_sec
+        total_laps += result.laps
+        laps_str = ", ".join(f"{t:.2f}s" for t in result.lap_times_sec) or "-"
+        print(
+            f"[SIM] run={run} laps={result.laps} lap_times=[{laps_str}] "
+            f"collided={'Y' if result.collided else 'N'} "
+            f"min_clearance={result.min_clearance_m * 1000.0:.0f}mm "
+            f"x{result.realtime_factor:.1f} realtime"
+        )
+    wall = time.perf_counter() - wall_start
+    print(
+        f"[SIM] total: {total_laps} laps, {total_sim:.1f}s simulated in {wall:.2f}s "
+        f"({total_laps / wall * 60.0 if wall > 0 else 0.0:.0f} laps/min)"
+    )
+
+
+if __name__ == "__main__":
+    main()
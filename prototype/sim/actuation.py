@@ -0,0 +1,136 @@
+# --------------------------------
+# sim/actuation.py
+# シミュレーター用のActuation実装
+# --------------------------------
+from __future__ import annotations
+
+import math
+from typing import Optional
+
+from ..domain.command import Command, DriveMode
+from ..domain.actuation import ActuationCalibration, Telemetry, ActuationStatus
+from ..config import sim
+from .world import SimWorld
+
+
+class SimActuation:
+    """
+    Commandをシミュレーション世界の車両入力に変換するActuation実装
+
+    PWMActuation と同じリミット・PWM換算を行い、換算後の値をテレメトリとして返す。
+    delay_sec を指定すると、入力は apply() から delay_sec 後に車両に反映される（PWM周期・サーボの無駄時間の模擬）。
+    frame_period_sec を指定すると、入力はさらに次のPWMフレームの先頭（frame_origin_sec から周期の整数倍）まで待って反映される
+    （PCA9685 が書き込んだ値を次のフレームから出力するのと同じ。frame_origin_sec を変えるとフレームの位相をずらせる）。
+    """
+
+    def __init__(
+        self,
+        world: SimWorld,
+        delay_sec: float = sim.vehicle.ACTUATION_DELAY_SEC,
+        frame_period_sec: float = sim.vehicle.PWM_FRAME_PERIOD_SEC,
+    ):
+        """
+        初期化
+
+        Args:
+            world: シミュレーション世界
+            delay_sec: apply() から入力が車両に反映されるまでの時間（秒）。デフォルトは設定ファイルの値
+            frame_period_sec: PWMフレームの周期（秒、0で無効）。デフォルトは設定ファイルの値
+        """
+        self.world = world
+        self.delay_sec = delay_sec
+        self.frame_period_sec = frame_period_sec
+        # PWMフレームの先頭の基準時刻（PWMActuation.frame_origin_sec と同じ口。フレームを模擬しない場合は None）
+        self.frame_origin_sec: Optional[float] = 0.0 if frame_period_sec > 0.0 else None
+        self._calib: Optional[ActuationCalibration] = None
+
+    def configure(self, calib: ActuationCalibration) -> None:
+        """
+        キャリブレーションを設定し、ニュートラルにする
+
+        Args:
+            calib: キャリブレーションパラメータ
+        """
+        self._calib = calib
+        self.world.set_inputs(0.0, 0.0)
+
+    def _steer_to_us(self, steer: float) -> int:
+        """ステアリング値（-1.0 ～ 1.0）をμs値に変換"""
+        c = self._calib
+        if steer >= 0:
+            return int(c.steer_center_us + (c.steer_left_us - c.steer_center_us) * steer)
+        return int(c.steer_center_us + (c.steer_right_us - c.steer_center_us) * abs(steer))
+
+    def _throttle_to_us(self, throttle: float) -> int:
+        """スロットル値（0.0 ～ 1.0）をμs値に変換"""
+        c = self._calib
+        return int(c.throttle_stop_us + (c.throttle_max_us - c.throttle_stop_us) * throttle)
+
+    def apply(self, command: Command) -> Telemetry:
+        """
+        コマンドを車両入力として適用
+
+        Args:
+            command: 制御コマンド
+
+        Returns:
+            テレメトリ情報
+        """
+        if not self._calib:
+            return Telemetry(
+                frame_id=command.frame_id,
+                t_capture_sec=command.t_capture_sec,
+                status=ActuationStatus.CALIBRATION_ERROR,
+                message="Calibration not configured",
+            )
+
+        steer = max(min(command.steer, self._calib.steer_limit), -self._calib.steer_limit)
+        if command.mode == DriveMode.STOP:
+            throttle = 0.0
+        else:
+            throttle = max(min(command.throttle, self._calib.throttle_limit), 0.0)
+
+        # 入力が変わる時刻まで物理演算を進めてから入力を切り替える
+        self.world.sync()
+        at_sec = self.world.time_sec + self.delay_sec if self.delay_sec > 0.0 else None
+        if self.frame_period_sec > 0.0:
+            t = self.world.time_sec if at_sec is None else at_sec
+            origin = self.frame_origin_sec
+            at_sec = origin + math.ceil((t - origin) / self.frame_period_sec - 1e-9) * self.frame_period_sec
+        self.world.set_inputs(steer, throttle, at_sec)
+        return Telemetry(
+            frame_id=command.frame_id,
+            t_capture_sec=command.t_capture_sec,
+            status=ActuationStatus.OK,
+            applied_steer=command.steer,
+            applied_throttle=throttle,
+            steer_pwm_us=self._steer_to_us(steer),
+            throttle_pwm_us=self._throttle_to_us(throttle),
+        )
+
+    def stop(self, reason: str = "emergency") -> Telemetry:
+        """
+        停止（ニュートラル）
+
+        Args:
+            reason: 停止理由
+
+        Returns:
+            テレメトリ情報
+        """
+        self.world.sync()
+        self.world.set_inputs(0.0, 0.0)
+        return Telemetry(
+            frame_id=0,
+            t_capture_sec=0.0,
+            status=ActuationStatus.STOPPED,
+            applied_steer=0.0,
+            applied_throttle=0.0,
+            steer_pwm_us=self._calib.steer_center_us if self._calib else None,
+            throttle_pwm_us=self._calib.throttle_stop_us if self._calib else None,
+            message=reason,
+        )
+
+    def close(self) -> None:
+        """リソースを解放（ニュートラルにする）"""
+        self.world.set_inputs(0.0, 0.0)
@@ -0,0 +1,721 @@
+# --------------------------------
+# sim/batch.py
+# NumPyで多数の車両を同時に走らせるバッチシミュレーター（ゲイン探索用）
+# 車両ごとに KP / KD / BASE_SPEED / HIGH_SPEED を持ち、同じコースを互いに干渉せずに走る
+# --------------------------------
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+from ..domain.actuation import ActuationCalibration
+from ..config import decision, orchestrator, perception, sensors, sim
+from .geometry import Course, default_course
+from .vehicle import BicycleModel
+
+# 候補表の穴埋めに使う長さ0の線分の位置（レイも最近傍距離も当たらない）
+_FAR_M: float = 1e9
+
+
+@dataclass(frozen=True)
+class BatchParams:
+    """車両ごとのパラメータ（同じ長さの1次元配列）"""
+
+    kp: np.ndarray          # P制御の比例ゲイン
+    kd: np.ndarray          # D制御の微分ゲイン
+    base_speed: np.ndarray  # 通常走行時の基本速度
+    high_speed: np.ndarray  # 前方が開けている場合の高速
+
+    def __len__(self) -> int:
+        return len(self.kp)
+
+    @classmethod
+    def broadcast(
+        cls,
+        kp=decision.corridor.KP,
+        kd=decision.corridor.KD,
+        base_speed=decision.corridor.BASE_SPEED,
+        high_speed=decision.corridor.HIGH_SPEED,
+    ) -> BatchParams:
+        """
+        スカラーと配列を混ぜて指定し、同じ長さにそろえて作る
+
+        Args:
+            kp, kd, base_speed, high_speed: 値または配列。デフォルトは設定ファイルの値
+
+        Returns:
+            BatchParams: 車両ごとのパラメータ
+        """
+        arrays = np.broadcast_arrays(
+            *(np.asarray(v, dtype=np.float64) for v in (kp, kd, base_speed, high_speed))
+        )
+        return cls(*(np.array(a, dtype=np.float64).ravel() for a in arrays))
+
+    def row(self, index: int) -> dict:
+        """車両 index のパラメータ"""
+        return {
+            "kp": float(self.kp[index]),
+            "kd": float(self.kd[index]),
+            "base_speed": float(self.base_speed[index]),
+            "high_speed": float(self.high_speed[index]),
+        }
+
+
+def gain_grid(
+    kp_values,
+    kd_values,
+    base_speed=decision.corridor.BASE_SPEED,
+    high_speed=decision.corridor.HIGH_SPEED,
+) -> BatchParams:
+    """
+    KP × KD の格子を作る（kp が外側、kd が内側の順に並ぶ）
+
+    Args:
+        kp_values: KP の候補
+        kd_values: KD の候補
+        base_speed: 基本速度（全車両共通）。デフォルトは設定ファイルの値
+        high_speed: 高速（全車両共通）。デフォルトは設定ファイルの値
+
+    Returns:
+        BatchParams: len(kp_values) * len(kd_values) 台分のパラメータ
+    """
+    kp, kd = np.meshgrid(np.asarray(kp_values, dtype=np.float64), np.asarray(kd_values, dtype=np.float64), indexing="ij")
+    return BatchParams.broadcast(kp.ravel(), kd.ravel(), base_speed, high_speed)
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """バッチ走行の結果（車両ごとの配列）"""
+
+    params: BatchParams
+    laps: np.ndarray             # 完了した周回数
+    lap_times_sec: np.ndarray    # [車両, 周回] のラップタイム（仮想時間、秒。未完了はNaN）
+    collided: np.ndarray         # 壁に衝突したか
+    min_clearance_m: np.ndarray  # 壁との最小距離（m、車体中心から）
+    progress_m: np.ndarray       # 中心線上の累積走行距離（m）
+    sim_time_sec: float          # 経過した仮想時間（秒）
+    wall_time_sec: float         # 実際にかかった時間（秒）
+    frames: int                  # 制御サイクル数
+
+    @property
+    def total_time_sec(self) -> np.ndarray:
+        """全周回の合計タイム（完走していない車両はNaN）"""
+        return self.lap_times_sec.sum(axis=1)
+
+    @property
+    def finished(self) -> np.ndarray:
+        """衝突せずに全周回を完走したか"""
+        return ~self.collided & ~np.isnan(self.total_time_sec)
+
+    def ranking(self) -> np.ndarray:
+        """
+        完走した車両を合計タイムの短い順に並べる（同タイムは壁との最小距離が大きい順）
+
+        Returns:
+            np.ndarray: 車両インデックス
+        """
+        index = np.flatnonzero(self.finished)
+        order = np.lexsort((-self.min_clearance_m[index], self.total_time_sec[index]))
+        return index[order]
+
+    def summary(self, index: int) -> str:
+        """車両 index の結果を1行で"""
+        p = self.params.row(index)
+        laps = ", ".join(f"{t:.2f}s" for t in self.lap_times_sec[index] if not math.isnan(t)) or "-"
+        return (
+            f"kp={p['kp']:.5f} kd={p['kd']:.5f} base={p['base_speed']:.2f} high={p['high_speed']:.2f} "
+            f"laps={int(self.laps[index])} lap_times=[{laps}] "
+            f"collided={'Y' if self.collided[index] else 'N'} "
+            f"min_clearance={self.min_clearance_m[index] * 1000.0:.0f}mm"
+        )
+
+
+class BatchSimulator:
+    """
+    多数の車両を1つのコースで同時に走らせるシミュレーター
+
+    SimRunner + SimTOFSensor + CorridorPerception + CorridorDecision + SimActuation + BicycleModel の
+    1制御周期を、車両方向の配列演算に置き換えたもの。制御周期ごとに全センサーを計測し
+    （Orchestrator.run_once() と同じ）、物理演算は physics_dt_sec 刻みで進める。
+    知覚・判断の閾値と回避動作は設定ファイルの値を使う（CorridorPerception / CorridorDecision の既定値と同じ）。
+    距離フィルタ（perception.distance_filter）は適用しない。
+
+    レイキャストと壁との距離は、グリッドセル（レイキャストはさらにレイの向きの区間）ごとに候補の線分を
+    可変長のリストにしておき、全車両の（レイ, 候補）の組を1本の配列に展開して一度に判定する。
+    """
+
+    def __init__(
+        self,
+        course: Optional[Course] = None,
+        model: Optional[BicycleModel] = None,
+        control_period_sec: float = orchestrator.LOOP_INTERVAL_SEC,
+        physics_dt_sec: float = sim.PHYSICS_DT_SEC,
+        collision_radius_m: float = sim.vehicle.COLLISION_RADIUS_M,
+        mount_angles_deg: Tuple[float, float, float] = sensors.vl53l0x.MOUNT_ANGLES_DEG,
+        mount_offset_m: float = sensors.vl53l0x.MOUNT_OFFSET_M,
+        max_range_mm: int = sensors.vl53l0x.MAX_RANGE_MM,
+        noise_std_mm: float = sim.tof.NOISE_STD_MM,
+        calibration: Optional[ActuationCalibration] = None,
+        chunk_size: int = sim.batch.CHUNK_SIZE,
+        projection_window: int = sim.batch.PROJECTION_WINDOW,
+        direction_bins: int = sim.batch.DIRECTION_BINS,
+        clearance_cell_m: float = sim.batch.CLEARANCE_CELL_M,
+        seed: int = sim.batch.SEED,
+    ):
+        """
+        初期化
+
+        Args:
+            course: コース（Noneの場合は default_course()）
+            model: 車両モデル（Noneの場合は設定ファイルの値で生成）
+            control_period_sec: 制御周期（秒）
+            physics_dt_sec: 物理演算の刻み（秒）
+            collision_radius_m: 衝突判定用の車体半径（m）
+            mount_angles_deg: センサーの取り付け角度（度、前方0・左が正）。前、右斜め前、左斜め前の順
+            mount_offset_m: 車体中心からセンサーまでの前方オフセット（m）
+            max_range_mm: 計測可能な最大距離（mm）
+            noise_std_mm: 計測ノイズの標準偏差（mm）
+            calibration: ステアリング・スロットルのリミット（Noneの場合は実機と同じキャリブレーション）
+            chunk_size: 1回のレイキャストで扱う車両数
+            projection_window: 中心線への射影で前回の点から前後に調べる点数
+            direction_bins: レイキャストの候補表でレイの向きを分ける区間数
+            clearance_cell_m: 壁との距離の候補表のセルサイズ（m）
+            seed: ノイズ用乱数シード
+        """
+        # 循環インポートを避けるため、ここでインポートする（runner は orchestrator に依存する）
+        from .runner import default_calibration
+
+        self.course = course if course is not None else default_course()
+        self.model = model if model is not None else BicycleModel()
+        self.control_period_sec = control_period_sec
+        self.physics_dt_sec = physics_dt_sec
+        self.collision_radius_m = collision_radius_m
+        self.mount_angles = np.radians(np.asarray(mount_angles_deg, dtype=np.float64))
+        self.mount_offset_m = mount_offset_m
+        self.max_range_mm = max_range_mm
+        self.noise_std_mm = noise_std_mm
+        self.calibration = calibration if calibration is not None else default_calibration()
+        self.chunk_size = chunk_size
+        self.projection_window = projection_window
+        self.direction_bins = direction_bins
+        self.clearance_cell_m = clearance_cell_m
+        self.seed = seed
+
+        # 知覚・判断の固定パラメータ
+        self.front_blocked_threshold_mm = perception.corridor.FRONT_BLOCKED_THRESHOLD_MM
+        self.front_slow_threshold_mm = perception.corridor.FRONT_SLOW_THRESHOLD_MM
+        self.wall_detection_threshold_mm = perception.corridor.WALL_DETECTION_THRESHOLD_MM
+        self.fork_front_threshold_mm = perception.corridor.FORK_FRONT_THRESHOLD_MM
+        self.fork_side_open_threshold_mm = perception.corridor.FORK_SIDE_OPEN_THRESHOLD_MM
+        self.smoothing_factor = max(0.0, min(1.0, decision.corridor.DIFFERENTIAL_SMOOTHING_FACTOR))
+        self.max_steering = decision.corridor.MAX_STEERING
+        self.front_blocked_speed = decision.corridor.FRONT_BLOCKED_SPEED
+        self.front_blocked_steering = abs(decision.corridor.FRONT_BLOCKED_STEERING)
+        self.fork_speed = decision.corridor.FORK_SPEED
+        self.fork_steering = decision.corridor.FORK_STEERING
+
+        self._build_tables()
+
+    def _build_tables(self) -> None:
+        """線分・グリッドセルごとの候補線分・中心線を配列にする"""
+        course = self.course
+        segs = np.asarray(course._segs, dtype=np.float64).reshape(-1, 4)
+        max_range_m = self.max_range_mm / 1000.0
+        min_x, min_y, max_x, max_y = course.bounds()
+
+        # レイキャスト: セル × レイの向きの区間ごとに、そのセル内から向きの区間内へ最大距離まで伸ばしたレイが
+        # 当たりうる線分
+        self._ray_grid = _CellGrid(course.cell_size_m, (min_x, min_y, max_x, max_y), max_range_m)
+        self._direction_bins = self.direction_bins
+        ray_mask = np.stack(
+            [
+                _sector_candidates(self._ray_grid, segs, 2.0 * math.pi * b / self.direction_bins,
+                                   2.0 * math.pi * (b + 1) / self.direction_bins, max_range_m)
+                for b in range(self.direction_bins)
+            ],
+            axis=1,
+        )  # [セル, 区間, 線分]
+        self._ray_lists = _CandidateLists(ray_mask.reshape(-1, len(segs)), segs)
+
+        # 最近傍距離: Course.clearance() はセルサイズ以上の距離をセルサイズに丸めるので、
+        # 細かいセルごとにセルサイズ以内に入りうる線分だけを持てば同じ値になる
+        c = course.cell_size_m
+        self._near_grid = _CellGrid(self.clearance_cell_m, (min_x, min_y, max_x, max_y), c)
+        cx, cy = self._near_grid.centers()
+        near_mask = _point_segment_distance(cx[:, None], cy[:, None], segs) <= (
+            c + self._near_grid.cell_size * math.sqrt(0.5)
+        )
+        self._near_lists = _CandidateLists(near_mask, segs)
+        self._clearance_cap = c
+
+        # 中心線
+        centerline = np.asarray(course.centerline, dtype=np.float64)
+        self._center_x = centerline[:, 0].copy()
+        self._center_y = centerline[:, 1].copy()
+        self._center_s = np.asarray(course.centerline_s, dtype=np.float64)
+        # 射影の探索窓が端をまたいでも添字の剰余を取らずに済むよう、前後 w 点を足した配列を作る
+        w = self.projection_window
+        n = len(centerline)
+        wrap = np.arange(-w, n + w)
+        wrap = wrap % n if course.closed else np.clip(wrap, 0, n - 1)
+        self._window_x = self._center_x[wrap]
+        self._window_y = self._center_y[wrap]
+        self._window_offsets = np.arange(2 * w + 1)[None, :]
+
+    def measure(self, x: np.ndarray, y: np.ndarray, heading: np.ndarray, rng=None) -> np.ndarray:
+        """
+        全車両の全センサーを計測（SimTOFSensor.measure() と同じ変換）
+
+        Args:
+            x, y, heading: 車両の姿勢（m, rad）
+            rng: ノイズ用の np.random.Generator（ノイズなしの場合は不要）
+
+        Returns:
+            np.ndarray: [車両, センサー] の距離（mm）。前、右斜め前、左斜め前の順
+        """
+        ox = x + np.cos(heading) * self.mount_offset_m
+        oy = y + np.sin(heading) * self.mount_offset_m
+        angles = heading[:, None] + self.mount_angles[None, :]
+        bins = np.floor(angles * (self._direction_bins / (2.0 * math.pi))).astype(np.intp) % self._direction_bins
+        keys = (self._ray_grid.index(ox, oy)[:, None] * self._direction_bins + bins).ravel()
+        lists = self._ray_lists
+        owner, pos, bounds = lists.expand(keys)  # (レイ, 候補) の組ごとのレイ番号と候補の位置
+        ray_car = owner // len(self.mount_angles)
+        qx = lists.x1[pos] - ox[ray_car]
+        qy = lists.y1[pos] - oy[ray_car]
+        sx = lists.sx[pos]
+        sy = lists.sy[pos]
+        dx = np.cos(angles).ravel()[owner]
+        dy = np.sin(angles).ravel()[owner]
+
+        # t = t_num / denom >= 0 と 0 <= u = u_num / denom <= 1 を、割り算の前に符号と大きさで判定する
+        max_range_m = self.max_range_mm / 1000.0
+        denom = dx * sy - dy * sx
+        t_num = qx * sy - qy * sx
+        u_num = qx * dy - qy * dx
+        sign = np.sign(denom)
+        t_num = t_num * sign
+        u_num *= sign
+        denom = np.abs(denom)
+        hit = (denom > 0.0) & (t_num >= 0.0) & (u_num >= 0.0) & (u_num <= denom)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dist = np.minimum.reduceat(np.where(hit, t_num / denom, np.inf), bounds).reshape(angles.shape)
+
+        mm = dist * 1000.0
+        if self.noise_std_mm > 0.0 and rng is not None:
+            mm = mm + rng.normal(0.0, self.noise_std_mm, size=mm.shape)
+        mm = np.floor(np.clip(mm, 0.0, self.max_range_mm))
+        return np.where(dist < max_range_m, mm, float(sensors.vl53l0x.OUT_OF_RANGE_MM))
+
+    def clearance(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        全車両の最も近い壁までの距離（Course.clearance() と同じ、m）
+
+        Args:
+            x, y: 位置（m）
+
+        Returns:
+            np.ndarray: 距離（m）。セルサイズより遠い壁しかない場合は cell_size_m
+        """
+        lists = self._near_lists
+        owner, pos, bounds = lists.expand(self._near_grid.index(x, y))
+        sx = lists.sx[pos]
+        sy = lists.sy[pos]
+        px = x[owner] - lists.x1[pos]
+        py = y[owner] - lists.y1[pos]
+        u = np.clip((px * sx + py * sy) * lists.inv_length_sq[pos], 0.0, 1.0)
+        dx = u * sx - px
+        dy = u * sy - py
+        d = np.sqrt(np.minimum.reduceat(dx * dx + dy * dy, bounds))
+        return np.minimum(d, self._clearance_cap)
+
+    def run(
+        self,
+        params: BatchParams,
+        laps: int = 1,
+        max_time_sec: float = sim.MAX_SIM_TIME_SEC,
+    ) -> BatchResult:
+        """
+        全車両を指定周回数まで（または時間切れまで）走らせる
+
+        衝突した車両と完走した車両はその場で止まり、以降の計算から外れる。
+
+        Args:
+            params: 車両ごとのパラメータ
+            laps: 目標周回数
+            max_time_sec: 最大シミュレーション時間（秒）
+
+        Returns:
+            BatchResult: 走行結果
+        """
+        n = len(params)
+        course = self.course
+        model = self.model
+        calib = self.calibration
+        period = self.control_period_sec
+        substeps = max(1, int(round(period / self.physics_dt_sec)))
+        dt = period / substeps
+        rng = np.random.default_rng(self.seed) if self.noise_std_mm > 0.0 else None
+
+        # 車両の状態
+        sx0, sy0, sh0 = course.start_pose
+        x = np.full(n, sx0)
+        y = np.full(n, sy0)
+        heading = np.full(n, sh0)
+        speed = np.zeros(n)
+        steer_angle = np.zeros(n)
+        steer_in = np.zeros(n)
+        throttle_in = np.zeros(n)
+
+        # 記録
+        collided = np.zeros(n, dtype=bool)
+        min_clearance = np.full(n, course.clearance(sx0, sy0))
+        center_index = np.full(n, course.project(sx0, sy0), dtype=np.intp)
+        progress = np.zeros(n)
+        laps_done = np.zeros(n, dtype=np.int64)
+        lap_start = np.zeros(n)
+        lap_times = np.full((n, laps), np.nan)
+
+        # D制御器の状態
+        d_state = _DifferentialState(n)
+
+        # 一次遅れの係数（時定数が0なら即時に追従）
+        a_steer = min(1.0, dt / model.steer_time_constant_sec) if model.steer_time_constant_sec > 0.0 else 1.0
+        a_speed = min(1.0, dt / model.speed_time_constant_sec) if model.speed_time_constant_sec > 0.0 else 1.0
+
+        frames = 0
+        t = 0.0
+        wall_start = time.perf_counter()
+        while t < max_time_sec:
+            active = np.flatnonzero(~collided & (laps_done < laps))
+            if len(active) == 0:
+                break
+
+            # 1. 計測・知覚・判断・駆動（制御周期の先頭）
+            for start in range(0, len(active), self.chunk_size):
+                sel = active[start:start + self.chunk_size]
+                distances = self.measure(x[sel], y[sel], heading[sel], rng)
+                steer, throttle = self._decide(sel, distances, t, params, d_state)
+                steer_in[sel] = np.clip(steer, -calib.steer_limit, calib.steer_limit)
+                throttle_in[sel] = np.clip(throttle, 0.0, calib.throttle_limit)
+
+            # 2. 物理演算（対象車両だけ取り出して進め、最後に書き戻す）
+            ax = x[active]
+            ay = y[active]
+            ah = heading[active]
+            av = speed[active]
+            aa = steer_angle[active]
+            acol = collided[active]
+            target_angle = np.clip(steer_in[active], -1.0, 1.0) * model.max_steer_angle
+            target_speed = np.clip(throttle_in[active], 0.0, 1.0) * model.max_speed_mps
+            a_center = center_index[active]
+            a_progress = progress[active]
+            a_laps = laps_done[active]
+            a_lap_start = lap_start[active]
+            a_min_clear = min_clearance[active]
+            for k in range(substeps):
+                t_sub = t + (k + 1) * dt
+                live = ~acol
+                aa = np.where(live, aa + (target_angle - aa) * a_steer, aa)
+                av = np.where(live, av + (target_speed - av) * a_speed, av)
+                ax = np.where(live, ax + av * np.cos(ah) * dt, ax)
+                ay = np.where(live, ay + av * np.sin(ah) * dt, ay)
+                ah = np.where(live, ah + av / model.wheelbase_m * np.tan(aa) * dt, ah)
+
+                # 衝突判定・最小距離
+                clearance = self.clearance(ax, ay)
+                a_min_clear = np.where(live, np.minimum(a_min_clear, clearance), a_min_clear)
+                hit = live & (clearance < self.collision_radius_m)
+                av = np.where(hit, 0.0, av)
+
+                # 周回進捗（衝突したステップまでは数える）
+                new_center = self._project(ax, ay, a_center)
+                ds = self._center_s[new_center] - self._center_s[a_center]
+                if course.closed:
+                    half = course.length_m / 2.0
+                    ds = np.where(ds > half, ds - course.length_m, np.where(ds < -half, ds + course.length_m, ds))
+                a_progress = np.where(live, a_progress + ds, a_progress)
+                a_center = np.where(live, new_center, a_center)
+                acol = acol | hit
+
+                if course.closed:
+                    lapped = live & (a_progress >= (a_laps + 1) * course.length_m) & (a_laps < laps)
+                    if lapped.any():
+                        rows = np.flatnonzero(lapped)
+                        lap_times[active[rows], a_laps[rows]] = t_sub - a_lap_start[rows]
+                        a_lap_start = np.where(lapped, t_sub, a_lap_start)
+                        a_laps = a_laps + lapped
+            x[active] = ax
+            y[active] = ay
+            heading[active] = ah
+            speed[active] = av
+            steer_angle[active] = aa
+            collided[active] = acol
+            center_index[active] = a_center
+            progress[active] = a_progress
+            laps_done[active] = a_laps
+            lap_start[active] = a_lap_start
+            min_clearance[active] = a_min_clear
+
+            frames += 1
+            t = frames * period
+
+        return BatchResult(
+            params=params,
+            laps=laps_done,
+            lap_times_sec=lap_times,
+            collided=collided,
+            min_clearance_m=min_clearance,
+            progress_m=progress,
+            sim_time_sec=t,
+            wall_time_sec=time.perf_counter() - wall_start,
+            frames=frames,
+        )
+
+    def _decide(
+        self,
+        sel: np.ndarray,
+        distances: np.ndarray,
+        t: float,
+        params: BatchParams,
+        d: _DifferentialState,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        CorridorPerception.analyze() + CorridorDecision.decide() の配列版
+
+        Args:
+            sel: 対象車両のインデックス
+            distances: [車両, センサー] の距離（mm）
+            t: 計測時刻（秒）
+            params: 車両ごとのパラメータ
+            d: D制御器の状態（通常走行の車両だけ更新する）
+
+        Returns:
+            (steer, throttle)
+        """
+        front = distances[:, 0]
+        right_front = distances[:, 1]
+        left_front = distances[:, 2]
+
+        # 知覚
+        wall = self.wall_detection_threshold_mm
+        error = np.minimum(left_front, wall) - np.minimum(right_front, wall)
+        blocked = front < self.front_blocked_threshold_mm
+        fork = (
+            (front < self.fork_front_threshold_mm)
+            & (left_front > self.fork_side_open_threshold_mm)
+            & (right_front > self.fork_side_open_threshold_mm)
+        )
+        normal = ~blocked & ~fork
+
+        # 前方障害物（空いている方へ回避）と Y字分岐（固定方向へ転舵）
+        steer = np.where(
+            blocked,
+            np.where(left_front >= right_front, self.front_blocked_steering, -self.front_blocked_steering),
+            self.fork_steering,
+        )
+        throttle = np.where(blocked, self.front_blocked_speed, self.fork_speed)
+
+        # 通常の回廊中央走行（PD制御 + 前方距離に応じた速度）
+        rows = np.flatnonzero(normal)
+        if len(rows) > 0:
+            cars = sel[rows]
+            e = error[rows]
+            d_term = params.kd[cars] * d.update(cars, e, t, self.smoothing_factor)
+            steering = np.clip(e * params.kp[cars] + d_term, -self.max_steering, self.max_steering)
+            f = front[rows]
+            base = params.base_speed[cars]
+            high = params.high_speed[cars]
+            speed = np.where(
+                f >= self.front_slow_threshold_mm,
+                high,
+                base + (high - base) * (f / self.front_slow_threshold_mm),
+            )
+            steer[rows] = steering
+            throttle[rows] = speed
+        return steer, throttle
+
+    def _project(self, x: np.ndarray, y: np.ndarray, hint: np.ndarray) -> np.ndarray:
+        """中心線上で hint の前後 projection_window 点のうち最も近い点（Course.project() の局所探索に相当）"""
+        w = self.projection_window
+        cand = hint[:, None] + self._window_offsets  # 前後 w 点を足した中心線の添字
+        dx = self._window_x[cand] - x[:, None]
+        dy = self._window_y[cand] - y[:, None]
+        best = hint + np.argmin(dx * dx + dy * dy, axis=1) - w
+        n = len(self._center_x)
+        return best % n if self.course.closed else np.clip(best, 0, n - 1)
+
+
+class _DifferentialState:
+    """DifferentialController の状態を車両ごとに持つ配列"""
+
+    def __init__(self, n: int):
+        self.has_prev = np.zeros(n, dtype=bool)
+        self.prev_error = np.zeros(n)
+        self.prev_time = np.zeros(n)
+        self.smoothed = np.zeros(n)
+
+    def update(self, cars: np.ndarray, error: np.ndarray, t: float, smoothing_factor: float) -> np.ndarray:
+        """
+        DifferentialController.update() の配列版（kd を掛ける前の平滑化済み微分値を返す）
+
+        Args:
+            cars: 対象車両のインデックス
+            error: 誤差
+            t: 時刻（秒）
+            smoothing_factor: 平滑化係数
+
+        Returns:
+            np.ndarray: 平滑化済みの微分値（初回は0）
+        """
+        has_prev = self.has_prev[cars]
+        dt = t - self.prev_time[cars]
+        ok = has_prev & (dt > 0.0) & (dt <= 1.0)
+        derivative = (error - self.prev_error[cars]) / np.where(ok, dt, 1.0)
+        smoothed = self.smoothed[cars]
+        smoothed = np.where(
+            ok,
+            smoothing_factor * smoothed + (1.0 - smoothing_factor) * derivative,
+            np.where(has_prev, smoothed, 0.0),
+        )
+        self.smoothed[cars] = smoothed
+        self.prev_error[cars] = error
+        self.prev_time[cars] = t
+        self.has_prev[cars] = True
+        return smoothed
+
+
+class _CellGrid:
+    """コースの外接矩形を margin_m だけ広げた一様グリッド（範囲外の点は端のセルに丸める）"""
+
+    def __init__(self, cell_size: float, bounds: Tuple[float, float, float, float], margin_m: float):
+        min_x, min_y, max_x, max_y = bounds
+        margin = int(math.ceil(margin_m / cell_size)) + 1
+        self.cell_size = cell_size
+        self.i0 = math.floor(min_x / cell_size) - margin
+        self.j0 = math.floor(min_y / cell_size) - margin
+        self.ni = math.floor(max_x / cell_size) + margin - self.i0 + 1
+        self.nj = math.floor(max_y / cell_size) + margin - self.j0 + 1
+
+    def __len__(self) -> int:
+        return self.ni * self.nj
+
+    def index(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """位置のセル番号（表の行）"""
+        c = self.cell_size
+        i = np.clip(np.floor(x / c).astype(np.intp) - self.i0, 0, self.ni - 1)
+        j = np.clip(np.floor(y / c).astype(np.intp) - self.j0, 0, self.nj - 1)
+        return i * self.nj + j
+
+    def origins(self) -> Tuple[np.ndarray, np.ndarray]:
+        """各セルの左下の座標"""
+        ii, jj = np.meshgrid(np.arange(self.ni), np.arange(self.nj), indexing="ij")
+        return (ii.ravel() + self.i0) * self.cell_size, (jj.ravel() + self.j0) * self.cell_size
+
+    def centers(self) -> Tuple[np.ndarray, np.ndarray]:
+        """各セルの中心の座標"""
+        x0, y0 = self.origins()
+        half = self.cell_size * 0.5
+        return x0 + half, y0 + half
+
+
+def _sector_candidates(grid: _CellGrid, segs: np.ndarray, lo: float, hi: float, range_m: float) -> np.ndarray:
+    """
+    セル内の点から向き [lo, hi) に range_m まで伸ばしたレイが当たりうる線分
+
+    レイの通る領域は「セルの正方形」と「原点・区間の両端方向の2点からなる三角形（円弧に外接）」の
+    ミンコフスキー和に含まれる。この凸多角形と線分の分離軸判定（正方形の2軸・三角形の3辺・線分の法線）で
+    交わらない線分を除く。
+
+    Returns:
+        np.ndarray: [セル, 線分] の真偽表
+    """
+    reach = range_m / math.cos((hi - lo) * 0.5)
+    ax, ay = reach * math.cos(lo), reach * math.sin(lo)
+    bx, by = reach * math.cos(hi), reach * math.sin(hi)
+    c = grid.cell_size
+    x0, y0 = grid.origins()
+    x0 = x0[:, None]
+    y0 = y0[:, None]
+    px, py = segs[None, :, 0], segs[None, :, 1]
+    qx, qy = segs[None, :, 2], segs[None, :, 3]
+
+    def separated(nx, ny) -> np.ndarray:
+        # 多角形（正方形 + 三角形）と線分を軸 n に射影した区間が離れているか
+        tri = (0.0 * nx, ax * nx + ay * ny, bx * nx + by * ny)
+        tri_min = np.minimum(np.minimum(tri[0], tri[1]), tri[2])
+        tri_max = np.maximum(np.maximum(tri[0], tri[1]), tri[2])
+        base = x0 * nx + y0 * ny
+        poly_min = base + np.minimum(0.0, nx * c) + np.minimum(0.0, ny * c) + tri_min
+        poly_max = base + np.maximum(0.0, nx * c) + np.maximum(0.0, ny * c) + tri_max
+        p = px * nx + py * ny
+        q = qx * nx + qy * ny
+        return (np.maximum(p, q) < poly_min) | (np.minimum(p, q) > poly_max)
+
+    result = np.ones((len(grid), len(segs)), dtype=bool)
+    for nx, ny in ((1.0, 0.0), (0.0, 1.0), (-ay, ax), (-(by - ay), bx - ax), (by, -bx)):
+        result &= ~separated(nx, ny)
+    result &= ~separated(-(qy - py), qx - px)
+    return result
+
+
+class _CandidateLists:
+    """
+    行（セルなど）ごとの候補線分のリスト（CSR形式）
+
+    線分の座標は行の順に並べて持つ。候補のない行には長さ0の遠くの線分（レイも最近傍距離も当たらない）を1本入れ、
+    どの行も1本以上の候補を持つようにする（np.minimum.reduceat で行ごとの最小値を取るため）。
+    """
+
+    def __init__(self, mask: np.ndarray, segs: np.ndarray):
+        """
+        初期化
+
+        Args:
+            mask: [行, 線分] の真偽表
+            segs: [線分, (x1, y1, x2, y2)]
+        """
+        segs = np.vstack([segs, [[_FAR_M, _FAR_M, _FAR_M, _FAR_M]]])
+        mask = np.hstack([mask, ~mask.any(axis=1, keepdims=True)])
+        rows, cols = np.nonzero(mask)
+        self.counts = np.bincount(rows, minlength=len(mask))
+        self.starts = np.cumsum(self.counts) - self.counts
+        self.x1 = segs[cols, 0]
+        self.y1 = segs[cols, 1]
+        self.sx = segs[cols, 2] - self.x1
+        self.sy = segs[cols, 3] - self.y1
+        length_sq = self.sx * self.sx + self.sy * self.sy
+        self.inv_length_sq = np.divide(1.0, length_sq, out=np.zeros_like(length_sq), where=length_sq > 0.0)
+
+    def expand(self, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        問い合わせごとの行の候補を1本の配列に展開する
+
+        Args:
+            keys: 問い合わせごとの行番号
+
+        Returns:
+            (owner, pos, bounds): 組ごとの問い合わせ番号、組ごとの候補の位置（x1 などの添字）、
+                                  問い合わせごとの先頭の組の位置（np.minimum.reduceat 用）
+        """
+        counts = self.counts[keys]
+        bounds = np.cumsum(counts) - counts
+        owner = np.repeat(np.arange(len(keys)), counts)
+        pos = np.arange(int(bounds[-1] + counts[-1]) if len(keys) else 0) + np.repeat(self.starts[keys] - bounds, counts)
+        return owner, pos, bounds
+
+
+def _point_segment_distance(px: np.ndarray, py: np.ndarray, segs: np.ndarray) -> np.ndarray:
+    """点（列ベクトル）と線分（行）の距離の表"""
+    x1, y1, x2, y2 = (segs[:, k][None, :] for k in range(4))
+    sx = x2 - x1
+    sy = y2 - y1
+    length_sq = sx * sx + sy * sy
+    with np.errstate(divide="ignore", invalid="ignore"):
+        u = np.where(length_sq > 0.0, ((px - x1) * sx + (py - y1) * sy) / length_sq, 0.0)
+    u = np.clip(u, 0.0, 1.0)
+    return np.hypot(x1 + u * sx - px, y1 + u * sy - py)
@@ -0,0 +1,425 @@
+# --------------------------------
+# sim/geometry.py
+# 回廊コースの形状定義（直線・カーブ・Y字分岐）とレイキャスト
+# --------------------------------
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..config import sim
+
+# 中心線のサンプリング間隔（m）。進捗（周回距離）の分解能になる
+_CENTERLINE_STEP_M: float = 0.05
+
+
+@dataclass(frozen=True)
+class Segment:
+    """壁の線分（m）"""
+
+    x1: float
+    y1: float
+    x2: float
+    y2: float
+
+
+class Course:
+    """
+    壁の線分集合と中心線からなるコース
+
+    壁の線分はグリッドに登録しておき、レイキャストと最近傍距離の計算では
+    近傍セルの線分だけを調べる。
+    """
+
+    def __init__(
+        self,
+        walls: Sequence[Segment],
+        centerline: Sequence[Tuple[float, float]],
+        start_pose: Tuple[float, float, float],
+        closed: bool = True,
+        cell_size_m: float = sim.course.GRID_CELL_M,
+    ):
+        """
+        初期化
+
+        Args:
+            walls: 壁の線分
+            centerline: 中心線の点列（進行方向順）
+            start_pose: スタート位置と向き (x, y, heading[rad])
+            closed: 周回コースか
+            cell_size_m: 線分検索用グリッドのセルサイズ（m）
+        """
+        self.walls: List[Segment] = list(walls)
+        self.centerline: List[Tuple[float, float]] = list(centerline)
+        self.start_pose = start_pose
+        self.closed = closed
+        self.cell_size_m = cell_size_m
+
+        # 中心線の累積距離
+        self.centerline_s: List[float] = [0.0]
+        for (x0, y0), (x1, y1) in zip(self.centerline, self.centerline[1:]):
+            self.centerline_s.append(self.centerline_s[-1] + math.hypot(x1 - x0, y1 - y0))
+        self.length_m = self.centerline_s[-1]
+        if closed and len(self.centerline) > 1:
+            (x0, y0), (x1, y1) = self.centerline[-1], self.centerline[0]
+            self.length_m += math.hypot(x1 - x0, y1 - y0)
+
+        # 線分をタプルで保持（属性アクセスより速い）
+        self._segs: List[Tuple[float, float, float, float]] = [
+            (w.x1, w.y1, w.x2, w.y2) for w in self.walls
+        ]
+        self._grid: Dict[Tuple[int, int], List[int]] = {}
+        self._near_cache: Dict[Tuple[int, int], Tuple[Tuple[float, float, float, float], ...]] = {}
+        for idx, (x1, y1, x2, y2) in enumerate(self._segs):
+            for cell in self._cells_in_box(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)):
+                self._grid.setdefault(cell, []).append(idx)
+
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """
+        壁全体の外接矩形
+
+        Returns:
+            (min_x, min_y, max_x, max_y)（m）
+        """
+        xs = [v for s in self._segs for v in (s[0], s[2])]
+        ys = [v for s in self._segs for v in (s[1], s[3])]
+        return min(xs), min(ys), max(xs), max(ys)
+
+    def _cells_in_box(self, x0: float, y0: float, x1: float, y1: float) -> List[Tuple[int, int]]:
+        """矩形と重なるグリッドセルの一覧"""
+        c = self.cell_size_m
+        i0, i1 = math.floor(x0 / c), math.floor(x1 / c)
+        j0, j1 = math.floor(y0 / c), math.floor(y1 / c)
+        return [(i, j) for i in range(i0, i1 + 1) for j in range(j0, j1 + 1)]
+
+    def _candidates(self, x0: float, y0: float, x1: float, y1: float) -> set:
+        """矩形と重なるセルに登録された線分インデックス"""
+        found: set = set()
+        grid = self._grid
+        for cell in self._cells_in_box(x0, y0, x1, y1):
+            bucket = grid.get(cell)
+            if bucket:
+                found.update(bucket)
+        return found
+
+    def cast_ray(self, x: float, y: float, angle: float, max_range_m: float) -> Optional[float]:
+        """
+        レイキャストで最も近い壁までの距離を求める
+
+        Args:
+            x, y: レイの始点（m）
+            angle: レイの向き（rad）
+            max_range_m: 最大距離（m）
+
+        Returns:
+            壁までの距離（m）。max_range_m以内に壁がない場合はNone
+        """
+        dx = math.cos(angle)
+        dy = math.sin(angle)
+        ex = x + dx * max_range_m
+        ey = y + dy * max_range_m
+        best = max_range_m
+        hit = False
+        segs = self._segs
+        for idx in self._candidates(min(x, ex), min(y, ey), max(x, ex), max(y, ey)):
+            x1, y1, x2, y2 = segs[idx]
+            sx = x2 - x1
+            sy = y2 - y1
+            denom = dx * sy - dy * sx
+            if denom == 0.0:
+                continue
+            qx = x1 - x
+            qy = y1 - y
+            t = (qx * sy - qy * sx) / denom
+            if t < 0.0 or t >= best:
+                continue
+            u = (qx * dy - qy * dx) / denom
+            if 0.0 <= u <= 1.0:
+                best = t
+                hit = True
+        return best if hit else None
+
+    def clearance(self, x: float, y: float) -> float:
+        """
+        点から最も近い壁までの距離
+
+        点を含むセルと隣接8セルの線分だけを調べるため、セルサイズ以内の壁は必ず見つかる。
+
+        Args:
+            x, y: 位置（m）
+
+        Returns:
+            最も近い壁までの距離（m）。セルサイズより遠い壁しかない場合は cell_size_m
+        """
+        c = self.cell_size_m
+        cell = (math.floor(x / c), math.floor(y / c))
+        near = self._near_cache.get(cell)
+        if near is None:
+            i, j = cell
+            found: set = set()
+            for di in (-1, 0, 1):
+                for dj in (-1, 0, 1):
+                    found.update(self._grid.get((i + di, j + dj), ()))
+            near = tuple(self._segs[idx] for idx in found)
+            self._near_cache[cell] = near
+
+        best = c
+        for x1, y1, x2, y2 in near:
+            sx = x2 - x1
+            sy = y2 - y1
+            length_sq = sx * sx + sy * sy
+            if length_sq == 0.0:
+                u = 0.0
+            else:
+                u = ((x - x1) * sx + (y - y1) * sy) / length_sq
+                if u < 0.0:
+                    u = 0.0
+                elif u > 1.0:
+                    u = 1.0
+            dx = x1 + u * sx - x
+            dy = y1 + u * sy - y
+            d = dx * dx + dy * dy
+            if d < best * best:
+                best = math.sqrt(d)
+        return best
+
+    def project(self, x: float, y: float, hint: Optional[int] = None) -> int:
+        """
+        位置を中心線に射影し、最も近い中心線の点のインデックスを返す
+
+        Args:
+            x, y: 位置（m）
+            hint: 前回のインデックス。指定すると hint から前後に距離が減る方向へ辿る（局所探索）
+
+        Returns:
+            中心線の点のインデックス
+        """
+        pts = self.centerline
+        n = len(pts)
+
+        def dist_sq(i: int) -> float:
+            px, py = pts[i]
+            return (px - x) * (px - x) + (py - y) * (py - y)
+
+        if hint is None:
+            return min(range(n), key=dist_sq)
+
+        best_idx = hint
+        best_d = dist_sq(hint)
+        for step in (1, -1):
+            i = best_idx
+            while True:
+                nxt = i + step
+                if self.closed:
+                    nxt %= n
+                elif nxt < 0 or nxt >= n:
+                    break
+                d = dist_sq(nxt)
+                if d >= best_d:
+                    break
+                best_d = d
+                best_idx = i = nxt
+        return best_idx
+
+
+class CourseBuilder:
+    """
+    タートル方式で回廊コースを組み立てるビルダー
+
+    現在位置・向きから直線／カーブ／Y字分岐を順に追加し、左右の壁と中心線を生成する。
+    カーブの角度は正で左旋回（反時計回り）、負で右旋回。
+    """
+
+    def __init__(
+        self,
+        width_m: float = sim.course.CORRIDOR_WIDTH_M,
+        start: Tuple[float, float] = (0.0, 0.0),
+        heading_deg: float = 0.0,
+        arc_step_deg: float = sim.course.ARC_STEP_DEG,
+    ):
+        """
+        初期化
+
+        Args:
+            width_m: 通路幅（m）
+            start: スタート位置（m）
+            heading_deg: スタート時の向き（度、x軸正方向が0、反時計回りが正）
+            arc_step_deg: カーブを折れ線近似する角度刻み（度）
+        """
+        self.width_m = width_m
+        self.arc_step_deg = arc_step_deg
+        self._x, self._y = start
+        self._heading = math.radians(heading_deg)
+        self._start_pose = (self._x, self._y, self._heading)
+        self._left: List[Tuple[float, float]] = []
+        self._right: List[Tuple[float, float]] = []
+        self._extra: List[Segment] = []
+        self._centerline: List[Tuple[float, float]] = []
+        self._add_cross_section(self.width_m / 2.0, self.width_m / 2.0)
+
+    def _offset(self, x: float, y: float, heading: float, lateral: float) -> Tuple[float, float]:
+        """進行方向の左を正として横にずらした点"""
+        return x - math.sin(heading) * lateral, y + math.cos(heading) * lateral
+
+    def _add_cross_section(self, left_half: float, right_half: float) -> None:
+        """現在位置の断面で左右の壁の点を追加"""
+        self._left.append(self._offset(self._x, self._y, self._heading, left_half))
+        self._right.append(self._offset(self._x, self._y, self._heading, -right_half))
+
+    def _add_centerline(self, x0: float, y0: float, x1: float, y1: float) -> None:
+        """中心線を_CENTERLINE_STEP_M間隔でサンプリングして追加"""
+        length = math.hypot(x1 - x0, y1 - y0)
+        steps = max(1, int(math.ceil(length / _CENTERLINE_STEP_M)))
+        if not self._centerline:
+            self._centerline.append((x0, y0))
+        for k in range(1, steps + 1):
+            r = k / steps
+            self._centerline.append((x0 + (x1 - x0) * r, y0 + (y1 - y0) * r))
+
+    def straight(self, length_m: float) -> CourseBuilder:
+        """
+        直線を追加
+
+        Args:
+            length_m: 長さ（m）
+        """
+        x0, y0 = self._x, self._y
+        self._x += math.cos(self._heading) * length_m
+        self._y += math.sin(self._heading) * length_m
+        self._add_cross_section(self.width_m / 2.0, self.width_m / 2.0)
+        self._add_centerline(x0, y0, self._x, self._y)
+        return self
+
+    def curve(self, radius_m: float, angle_deg: float) -> CourseBuilder:
+        """
+        円弧カーブを追加
+
+        Args:
+            radius_m: 中心線の半径（m）
+            angle_deg: 旋回角（度）。正で左、負で右
+        """
+        steps = max(1, int(math.ceil(abs(angle_deg) / self.arc_step_deg)))
+        dtheta = math.radians(angle_deg) / steps
+        sign = 1.0 if angle_deg > 0 else -1.0
+        # 旋回中心（進行方向の左/右に半径だけずらした点）
+        cx, cy = self._offset(self._x, self._y, self._heading, sign * radius_m)
+        for _ in range(steps):
+            x0, y0 = self._x, self._y
+            self._heading += dtheta
+            self._x, self._y = self._offset(cx, cy, self._heading, -sign * radius_m)
+            self._add_cross_section(self.width_m / 2.0, self.width_m / 2.0)
+            self._add_centerline(x0, y0, self._x, self._y)
+        return self
+
+    def fork(self, length_m: float, island_width_m: float = 0.4) -> CourseBuilder:
+        """
+        Y字分岐（中央の島で左右2本に分かれて再合流する直線区間）を追加
+
+        区間の前後1/4で外壁が広がり／すぼまり、中央に両端が尖った島を置く。
+        分岐後の各通路の幅は通常の通路幅と同じ。
+
+        Args:
+            length_m: 区間長（m）
+            island_width_m: 中央の島の幅（m）
+        """
+        half_w = self.width_m / 2.0
+        outer_half = island_width_m / 2.0 + self.width_m
+        ramp = length_m * 0.25
+        tip = length_m * 0.1
+        x0, y0, h = self._x, self._y, self._heading
+
+        def at(u: float, lateral: float) -> Tuple[float, float]:
+            px = x0 + math.cos(h) * u
+            py = y0 + math.sin(h) * u
+            return self._offset(px, py, h, lateral)
+
+        # 外壁: 広がり → 平行 → すぼまり
+        for u, half in ((ramp, outer_half), (length_m - ramp, outer_half), (length_m, half_w)):
+            self._left.append(at(u, half))
+            self._right.append(at(u, -half))
+
+        # 中央の島（六角形）
+        island_half = island_width_m / 2.0
+        island = [
+            at(ramp, 0.0),
+            at(ramp + tip, island_half),
+            at(length_m - ramp - tip, island_half),
+            at(length_m - ramp, 0.0),
+            at(length_m - ramp - tip, -island_half),
+            at(ramp + tip, -island_half),
+        ]
+        for (ax, ay), (bx, by) in zip(island, island[1:] + island[:1]):
+            self._extra.append(Segment(ax, ay, bx, by))
+
+        self._x, self._y = at(length_m, 0.0)
+        self._add_centerline(x0, y0, self._x, self._y)
+        return self
+
+    def build(self, closed: bool = True) -> Course:
+        """
+        コースを生成
+
+        Args:
+            closed: 周回コースとして終点と始点の壁をつなぐか
+
+        Returns:
+            Course: 生成したコース
+        """
+        walls: List[Segment] = []
+        for pts in (self._left, self._right):
+            seq = list(pts)
+            if closed and math.hypot(seq[-1][0] - seq[0][0], seq[-1][1] - seq[0][1]) > 1e-6:
+                seq.append(seq[0])
+            for (ax, ay), (bx, by) in zip(seq, seq[1:]):
+                if (ax, ay) != (bx, by):
+                    walls.append(Segment(ax, ay, bx, by))
+        walls.extend(self._extra)
+
+        centerline = list(self._centerline)
+        if closed and len(centerline) > 1:
+            # 周回コースでは終点が始点と重なるので除く
+            if math.hypot(centerline[-1][0] - centerline[0][0], centerline[-1][1] - centerline[0][1]) < 1e-6:
+                centerline.pop()
+        return Course(walls, centerline, self._start_pose, closed=closed)
+
+
+def default_course(
+    width_m: float = sim.course.CORRIDOR_WIDTH_M,
+    radius_m: float = sim.course.CURVE_RADIUS_M,
+    with_fork: bool = False,
+) -> Course:
+    """
+    大会コース（map.png）を簡略化した時計回りの周回コース
+
+    ホームストレートから右カーブで周回し、with_fork=True の場合は向こう側の直線にY字分岐を置く。
+    既定は分岐なし: 現在の CorridorDecision は分岐を検知している間だけ固定方向に転舵するので、
+    島の先端が前方センサーから外れるとPD制御に戻って広がった分岐区間の中央（島の方向）へ切り返し、
+    既定の設定では1周目に島に衝突する（島の幅・先端の形・広がりの長さを変えても同じ）。
+
+    Args:
+        width_m: 通路幅（m）
+        radius_m: カーブの中心線半径（m）
+        with_fork: Y字分岐を含めるか（Falseの場合は同じ長さの直線）。分岐の対応を確かめるときだけ True にする
+
+    Returns:
+        Course: 周回コース
+    """
+    builder = (
+        CourseBuilder(width_m=width_m)
+        .straight(5.0)
+        .curve(radius_m, -90.0)
+        .straight(2.0)
+        .curve(radius_m, -90.0)
+    )
+    if with_fork:
+        builder.straight(1.0).fork(3.0).straight(1.0)
+    else:
+        builder.straight(5.0)
+    return (
+        builder
+        .curve(radius_m, -90.0)
+        .straight(2.0)
+        .curve(radius_m, -90.0)
+        .build(closed=True)
+    )
@@ -0,0 +1,167 @@
+# --------------------------------
+# sim/runner.py
+# Orchestratorを仮想時間で実行するシミュレーションランナー
+# --------------------------------
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from ..orchestrator import Orchestrator, PWMFrameScheduler
+from ..perception import CorridorPerception
+from ..decision import CorridorDecision
+from ..domain.actuation import ActuationCalibration
+from ..interfaces.protocols import Perception, Decision
+from ..clock import VirtualClock
+from ..config import hardware, orchestrator, sim
+from .geometry import Course, default_course
+from .world import SimWorld
+from .sensors import SimTOFSensor
+from .actuation import SimActuation
+
+
+@dataclass(frozen=True)
+class SimResult:
+    """1回の走行結果"""
+
+    laps: int                    # 完了した周回数
+    lap_times_sec: List[float]   # 各周回のラップタイム（仮想時間、秒）
+    collided: bool               # 壁に衝突したか
+    min_clearance_m: float       # 壁との最小距離（m、車体中心から）
+    sim_time_sec: float          # 経過した仮想時間（秒）
+    wall_time_sec: float         # 実際にかかった時間（秒）
+    frames: int                  # 制御サイクル数
+
+    @property
+    def total_time_sec(self) -> Optional[float]:
+        """全周回の合計タイム（完走していない場合はNone）"""
+        if not self.lap_times_sec:
+            return None
+        return sum(self.lap_times_sec)
+
+    @property
+    def realtime_factor(self) -> float:
+        """実時間に対する速度倍率（仮想時間 / 実時間）"""
+        if self.wall_time_sec <= 0.0:
+            return float("inf")
+        return self.sim_time_sec / self.wall_time_sec
+
+
+def default_calibration() -> ActuationCalibration:
+    """実機（run.py）と同じキャリブレーション"""
+    return ActuationCalibration(
+        steer_center_us=hardware.servo.US_CENTER,
+        steer_left_us=hardware.servo.US_LEFT,
+        steer_right_us=hardware.servo.US_RIGHT,
+        throttle_stop_us=hardware.esc.US_NEUTRAL,
+        throttle_max_us=hardware.esc.US_FORWARD_SLOW,
+    )
+
+
+class SimRunner:
+    """
+    Orchestrator.run_once() を制御周期ごとに呼び出し、その間に時計を進める
+
+    時計は仮想時間なので、実時間より速く（CPUが許す限り）決定的に走行を繰り返せる。
+    """
+
+    def __init__(
+        self,
+        world: SimWorld,
+        orch: Orchestrator,
+        control_period_sec: float = orchestrator.LOOP_INTERVAL_SEC,
+    ):
+        """
+        初期化
+
+        Args:
+            world: シミュレーション世界
+            orch: SimTOFSensor / SimActuation を接続したオーケストレーター
+            control_period_sec: 制御周期（秒）
+        """
+        self.world = world
+        self.orchestrator = orch
+        self.control_period_sec = control_period_sec
+
+    def run(
+        self,
+        laps: int = 3,
+        max_time_sec: float = sim.MAX_SIM_TIME_SEC,
+        stop_on_collision: bool = True,
+    ) -> SimResult:
+        """
+        指定周回数を走るまで（または時間切れ・衝突まで）実行
+
+        Args:
+            laps: 目標周回数
+            max_time_sec: 最大シミュレーション時間（秒）
+            stop_on_collision: 衝突したら終了するか
+
+        Returns:
+            SimResult: 走行結果
+        """
+        world = self.world
+        orch = self.orchestrator
+        period = self.control_period_sec
+        frames = 0
+        wall_start = time.perf_counter()
+        while world.laps < laps and world.time_sec < max_time_sec:
+            orch.run_once()
+            world.advance(period)
+            frames += 1
+            if stop_on_collision and world.collided:
+                break
+        orch.emergency_stop("sim_end")
+        return SimResult(
+            laps=world.laps,
+            lap_times_sec=list(world.lap_times_sec),
+            collided=world.collided,
+            min_clearance_m=world.min_clearance_m,
+            sim_time_sec=world.time_sec,
+            wall_time_sec=time.perf_counter() - wall_start,
+            frames=frames,
+        )
+
+
+def build_simulation(
+    course: Optional[Course] = None,
+    perception: Optional[Perception] = None,
+    decision: Optional[Decision] = None,
+    clock: Optional[VirtualClock] = None,
+    actuation_delay_sec: float = sim.vehicle.ACTUATION_DELAY_SEC,
+    pwm_frame_period_sec: float = sim.vehicle.PWM_FRAME_PERIOD_SEC,
+    pwm_frame: Optional[PWMFrameScheduler] = None,
+) -> Tuple[SimWorld, Orchestrator, SimRunner]:
+    """
+    シミュレーション一式（世界・オーケストレーター・ランナー）を組み立てる
+
+    decision を渡す場合は、同じ clock を渡して生成しておくこと（D制御の時間差分が仮想時間になる）。
+
+    Args:
+        course: コース（Noneの場合は default_course()）
+        perception: 知覚モジュール（Noneの場合は CorridorPerception()）
+        decision: 判断モジュール（Noneの場合は clock を使う CorridorDecision()）
+        clock: 仮想時間の時計（Noneの場合は0秒から始まる時計を生成）
+        actuation_delay_sec: 指令が車両に反映されるまでの無駄時間（秒）。デフォルトは設定ファイルの値
+        pwm_frame_period_sec: 指令をPWMフレームの先頭で反映する場合の周期（秒、0で無効）。デフォルトは設定ファイルの値
+        pwm_frame: オーケストレーターに渡すPWMフレームのスケジューラー（同じ clock を渡して生成しておくこと）。
+                   フレームに合わせた書き込みは run_loop() で行われる（SimRunner の run_once() では使われない）
+
+    Returns:
+        (world, orchestrator, runner)
+    """
+    clock = clock if clock is not None else VirtualClock()
+    world = SimWorld(course if course is not None else default_course(), clock=clock)
+    sensor = SimTOFSensor(world)
+    actuation = SimActuation(world, delay_sec=actuation_delay_sec, frame_period_sec=pwm_frame_period_sec)
+    actuation.configure(default_calibration())
+    orch = Orchestrator(
+        sensor,
+        perception if perception is not None else CorridorPerception(),
+        decision if decision is not None else CorridorDecision(clock=clock),
+        actuation,
+        clock=clock,
+        pwm_frame=pwm_frame,
+    )
+    return world, orch, SimRunner(world, orch)
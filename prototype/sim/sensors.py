@@ -0,0 +1,165 @@
+# --------------------------------
+# sim/sensors.py
+# レイキャストによるToFセンサーモデル（DistanceSensorModule実装）
+# --------------------------------
+from __future__ import annotations
+
+import math
+import random
+from typing import List, Optional, Tuple
+
+from ..domain.distance import DistanceData
+from ..config import sensors, sim
+from .world import SimWorld
+
+
+class SimTOFSensor:
+    """
+    シミュレーター用のToFセンサー
+
+    実機と同じ取り付け角度（前、右斜め前、左斜め前）でコースの壁へレイキャストし、
+    距離（mm）を返す。最大距離以内に壁がない場合は範囲外値を返す。
+    連続計測モードの計測周期（MEASUREMENT_TIMING_BUDGET）ごとに poll() が更新ありを返す。
+    3台は同時に計測するので、チャンネルごとの計測時刻とサンプル番号は全チャンネルで等しい。
+    """
+
+    def __init__(
+        self,
+        world: SimWorld,
+        mount_angles_deg: Tuple[float, float, float] = sensors.vl53l0x.MOUNT_ANGLES_DEG,
+        mount_offset_m: float = sensors.vl53l0x.MOUNT_OFFSET_M,
+        max_range_mm: int = sensors.vl53l0x.MAX_RANGE_MM,
+        measurement_period_sec: float = sensors.vl53l0x.MEASUREMENT_TIMING_BUDGET / 1e6,
+        noise_std_mm: float = sim.tof.NOISE_STD_MM,
+        seed: int = sim.tof.SEED,
+    ):
+        """
+        初期化
+
+        Args:
+            world: シミュレーション世界
+            mount_angles_deg: 取り付け角度（度、前方0・左が正）。前、右斜め前、左斜め前の順
+            mount_offset_m: 車体中心からセンサーまでの前方オフセット（m）
+            max_range_mm: 計測可能な最大距離（mm）
+            measurement_period_sec: 計測周期（秒）
+            noise_std_mm: 計測ノイズの標準偏差（mm）
+            seed: ノイズ用乱数シード
+        """
+        self.world = world
+        self.mount_angles = tuple(math.radians(a) for a in mount_angles_deg)
+        self.mount_offset_m = mount_offset_m
+        self.max_range_mm = max_range_mm
+        self.measurement_period_sec = measurement_period_sec
+        self.noise_std_mm = noise_std_mm
+        self._rng = random.Random(seed)
+        self._last_values: List[int] = [sensors.vl53l0x.OUT_OF_RANGE_MM] * len(self.mount_angles)
+        self._last_timestamp = 0.0
+        self._sequence = 0
+        self._next_measurement_sec: Optional[float] = None
+        self._continuous = False
+
+    def measure(self) -> List[int]:
+        """
+        現在の車両姿勢で全センサーを計測
+
+        Returns:
+            各センサーの距離（mm）。前、右斜め前、左斜め前の順
+        """
+        state = self.world.state
+        course = self.world.course
+        ox = state.x + math.cos(state.heading) * self.mount_offset_m
+        oy = state.y + math.sin(state.heading) * self.mount_offset_m
+        max_range_m = self.max_range_mm / 1000.0
+        values = []
+        for angle in self.mount_angles:
+            dist = course.cast_ray(ox, oy, state.heading + angle, max_range_m)
+            if dist is None:
+                values.append(sensors.vl53l0x.OUT_OF_RANGE_MM)
+                continue
+            mm = dist * 1000.0
+            if self.noise_std_mm > 0.0:
+                mm += self._rng.gauss(0.0, self.noise_std_mm)
+            values.append(int(max(0.0, min(mm, self.max_range_mm))))
+        return values
+
+    def read(self) -> DistanceData:
+        """
+        全センサーを計測して返す（DistanceSensorModuleプロトコルに適合）
+
+        Returns:
+            DistanceData: 前、右斜め前、左斜め前の距離データ（仮想時刻付き）
+        """
+        self.world.sync()
+        self._last_values = self.measure()
+        self._last_timestamp = self.world.time_sec
+        self._sequence += 1
+        return self._to_distance_data()
+
+    def poll(self) -> tuple[bool, DistanceData]:
+        """
+        計測周期が経過していれば計測し、更新有無とデータを返す
+
+        Returns:
+            (updated, distance_data)
+        """
+        self.world.sync()
+        now = self.world.time_sec
+        if self._next_measurement_sec is None:
+            self._next_measurement_sec = now
+        if now + 1e-12 < self._next_measurement_sec:
+            return False, self._to_distance_data()
+        self._last_values = self.measure()
+        self._last_timestamp = now
+        self._sequence += 1
+        # 連続計測の周期を維持（遅れた分は飛ばす）
+        period = self.measurement_period_sec
+        while self._next_measurement_sec <= now + 1e-12:
+            self._next_measurement_sec += period
+        return True, self._to_distance_data()
+
+    def wait_ready(self, timeout_sec: float) -> bool:
+        """
+        次の計測完了まで仮想時計を進める（実機の GPIO1 割り込み待ちに相当）
+
+        Args:
+            timeout_sec: タイムアウト（秒）
+
+        Returns:
+            bool: 計測完了時刻に達した場合True（タイムアウトした場合False）
+        """
+        self.world.sync()
+        now = self.world.time_sec
+        if self._next_measurement_sec is None or self._next_measurement_sec <= now + 1e-12:
+            return True
+        deadline = min(self._next_measurement_sec, now + timeout_sec)
+        self.world.clock.sleep_until_ns(int(round(deadline * 1e9)))
+        self.world.sync()
+        return deadline + 1e-12 >= self._next_measurement_sec
+
+    def start_continuous(self) -> None:
+        """連続計測モードを開始（計測周期の位相を現在時刻に合わせる）"""
+        self._continuous = True
+        self.world.sync()
+        self._next_measurement_sec = self.world.time_sec
+
+    def stop_continuous(self) -> None:
+        """連続計測モードを停止"""
+        self._continuous = False
+
+    def close(self) -> None:
+        """リソースを解放（シミュレーターでは何もしない）"""
+        self._continuous = False
+
+    def _to_distance_data(self) -> DistanceData:
+        """直近の計測値をDistanceDataに変換（timestamp は直近の計測時刻）"""
+        front, right_front, left_front = self._last_values
+        seq = self._sequence
+        return DistanceData(
+            front_mm=float(front),
+            right_front_mm=float(right_front),
+            left_front_mm=float(left_front),
+            timestamp=self._last_timestamp,
+            front_seq=seq,
+            right_front_seq=seq,
+            left_front_seq=seq,
+        )
@@ -0,0 +1,84 @@
+# --------------------------------
+# sim/vehicle.py
+# キネマティック自転車モデルの車両
+# --------------------------------
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+from ..config import sim
+
+
+@dataclass
+class VehicleState:
+    """車両の状態"""
+
+    x: float          # 位置 x（m）
+    y: float          # 位置 y（m）
+    heading: float    # 向き（rad、反時計回りが正）
+    speed: float = 0.0        # 速度（m/s）
+    steer_angle: float = 0.0  # 前輪切れ角（rad、左が正）
+
+
+class BicycleModel:
+    """
+    キネマティック自転車モデル
+
+    入力は正規化された steer [-1, +1]（+が左）と throttle [0, 1]。
+    サーボとESCの応答はそれぞれ一次遅れで近似する。
+    """
+
+    def __init__(
+        self,
+        wheelbase_m: float = sim.vehicle.WHEELBASE_M,
+        max_steer_angle_deg: float = sim.vehicle.MAX_STEER_ANGLE_DEG,
+        max_speed_mps: float = sim.vehicle.MAX_SPEED_MPS,
+        speed_time_constant_sec: float = sim.vehicle.SPEED_TIME_CONSTANT_SEC,
+        steer_time_constant_sec: float = sim.vehicle.STEER_TIME_CONSTANT_SEC,
+    ):
+        """
+        初期化
+
+        Args:
+            wheelbase_m: ホイールベース（m）
+            max_steer_angle_deg: steer=±1.0 に対応する前輪切れ角（度）
+            max_speed_mps: throttle=1.0 で到達する速度（m/s）
+            speed_time_constant_sec: 速度応答の時定数（秒）
+            steer_time_constant_sec: サーボ応答の時定数（秒）
+        """
+        self.wheelbase_m = wheelbase_m
+        self.max_steer_angle = math.radians(max_steer_angle_deg)
+        self.max_speed_mps = max_speed_mps
+        self.speed_time_constant_sec = speed_time_constant_sec
+        self.steer_time_constant_sec = steer_time_constant_sec
+
+    def step(self, state: VehicleState, steer: float, throttle: float, dt: float) -> None:
+        """
+        状態を dt 秒進める（state を直接更新）
+
+        Args:
+            state: 車両の状態
+            steer: ステアリング [-1, +1]（+が左）
+            throttle: スロットル [0, 1]
+            dt: 時間刻み（秒）
+        """
+        target_angle = max(-1.0, min(1.0, steer)) * self.max_steer_angle
+        target_speed = max(0.0, min(1.0, throttle)) * self.max_speed_mps
+
+        # 一次遅れ（時定数が0なら即時に追従）
+        if self.steer_time_constant_sec > 0.0:
+            a = min(1.0, dt / self.steer_time_constant_sec)
+            state.steer_angle += (target_angle - state.steer_angle) * a
+        else:
+            state.steer_angle = target_angle
+        if self.speed_time_constant_sec > 0.0:
+            a = min(1.0, dt / self.speed_time_constant_sec)
+            state.speed += (target_speed - state.speed) * a
+        else:
+            state.speed = target_speed
+
+        v = state.speed
+        state.x += v * math.cos(state.heading) * dt
+        state.y += v * math.sin(state.heading) * dt
+        state.heading += v / self.wheelbase_m * math.tan(state.steer_angle) * dt
@@ -0,0 +1,159 @@
+# --------------------------------
+# sim/world.py
+# コース上の車両を仮想時間で進めるシミュレーション世界
+# --------------------------------
+from __future__ import annotations
+
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+from ..clock import VirtualClock
+from ..config import sim
+from .geometry import Course
+from .vehicle import BicycleModel, VehicleState
+
+
+class SimWorld:
+    """
+    コースと車両を保持し、仮想時間で物理演算を進める
+
+    時刻は VirtualClock が持ち、センサー・アクチュエーターは使用前に sync() で
+    物理演算を時計の現在時刻まで進める。時計を進めるのは SimRunner か、
+    同じ時計を渡した Orchestrator.run_loop() のスケジューラー（sleep が時計を進める）。
+    周回数、ラップタイム、壁との最小距離、衝突を記録する。
+    """
+
+    def __init__(
+        self,
+        course: Course,
+        model: Optional[BicycleModel] = None,
+        physics_dt_sec: float = sim.PHYSICS_DT_SEC,
+        collision_radius_m: float = sim.vehicle.COLLISION_RADIUS_M,
+        clock: Optional[VirtualClock] = None,
+    ):
+        """
+        初期化
+
+        Args:
+            course: コース
+            model: 車両モデル（Noneの場合は設定ファイルの値で生成）
+            physics_dt_sec: 物理演算の刻み（秒）
+            collision_radius_m: 衝突判定用の車体半径（m）
+            clock: 仮想時間の時計（Noneの場合は0秒から始まる時計を生成）
+        """
+        self.course = course
+        self.clock = clock if clock is not None else VirtualClock()
+        self.model = model if model is not None else BicycleModel()
+        self.physics_dt_sec = physics_dt_sec
+        self.collision_radius_m = collision_radius_m
+        self.reset()
+
+    def reset(self) -> None:
+        """スタート位置に戻して記録を初期化"""
+        x, y, heading = self.course.start_pose
+        self.state = VehicleState(x=x, y=y, heading=heading)
+        self.time_sec = self.clock.now()
+        self.steer_input = 0.0
+        self.throttle_input = 0.0
+        self._pending_inputs: Deque[Tuple[float, float, float]] = deque()
+        self.collided = False
+        self.min_clearance_m = self.course.clearance(x, y)
+        self.laps = 0
+        self.lap_times_sec: List[float] = []
+        self._lap_start_sec = self.time_sec
+        self._center_index = self.course.project(x, y)
+        self._progress_m = 0.0
+
+    def set_inputs(self, steer: float, throttle: float, at_sec: Optional[float] = None) -> None:
+        """
+        アクチュエーターからの入力を設定
+
+        Args:
+            steer: ステアリング [-1, +1]（+が左）
+            throttle: スロットル [0, 1]
+            at_sec: 入力が車両に反映される時刻（秒）。Noneまたは現在以前の場合はすぐに反映する
+                    （それより前に予約した入力も含めて、予約は時刻順に反映する）
+        """
+        if at_sec is None or at_sec <= self.time_sec:
+            self._pending_inputs.clear()
+            self.steer_input = steer
+            self.throttle_input = throttle
+            return
+        self._pending_inputs.append((at_sec, steer, throttle))
+
+    def advance(self, duration_sec: float) -> None:
+        """
+        時計を duration_sec 秒進め、物理演算を追従させる
+
+        Args:
+            duration_sec: 進める時間（秒）
+        """
+        self.clock.advance(duration_sec)
+        self.sync()
+
+    def sync(self) -> None:
+        """物理演算を時計の現在時刻まで進める"""
+        self.advance_to(self.clock.now())
+
+    def advance_to(self, t_sec: float) -> None:
+        """
+        物理演算を t_sec まで physics_dt_sec 刻みで進める（衝突後は車両を停止したままにする）
+
+        Args:
+            t_sec: 目標時刻（秒）
+        """
+        pending = self._pending_inputs
+        while self.time_sec < t_sec - 1e-12:
+            # 予約した入力の反映時刻で刻みを区切る
+            while pending and pending[0][0] <= self.time_sec + 1e-12:
+                _, self.steer_input, self.throttle_input = pending.popleft()
+            end = min(t_sec, pending[0][0]) if pending else t_sec
+            dt = min(self.physics_dt_sec, end - self.time_sec)
+            if not self.collided:
+                self.model.step(self.state, self.steer_input, self.throttle_input, dt)
+            self.time_sec += dt
+            if not self.collided:
+                self._update_track_state()
+
+    @property
+    def progress_m(self) -> float:
+        """スタートからの累積走行距離（中心線上、m）"""
+        return self._progress_m
+
+    @property
+    def lap_progress(self) -> float:
+        """現在の周回の進捗 [0.0, 1.0)"""
+        length = self.course.length_m
+        if length <= 0.0:
+            return 0.0
+        return (self._progress_m % length) / length
+
+    def _update_track_state(self) -> None:
+        """衝突判定・最小距離・周回進捗を更新"""
+        state = self.state
+        clearance = self.course.clearance(state.x, state.y)
+        if clearance < self.min_clearance_m:
+            self.min_clearance_m = clearance
+        if clearance < self.collision_radius_m:
+            self.collided = True
+            state.speed = 0.0
+
+        course = self.course
+        prev = self._center_index
+        idx = course.project(state.x, state.y, hint=prev)
+        if idx != prev:
+            ds = course.centerline_s[idx] - course.centerline_s[prev]
+            if course.closed:
+                # 周回の継ぎ目をまたいだ場合を補正
+                half = course.length_m / 2.0
+                if ds > half:
+                    ds -= course.length_m
+                elif ds < -half:
+                    ds += course.length_m
+            self._progress_m += ds
+            self._center_index = idx
+
+        if course.closed and self._progress_m >= (self.laps + 1) * course.length_m:
+            self.laps += 1
+            self.lap_times_sec.append(self.time_sec - self._lap_start_sec)
+            self._lap_start_sec = self.time_sec
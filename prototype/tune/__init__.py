@@ -0,0 +1,22 @@
+# tune パッケージ
+# シミュレーター上で判断・知覚モジュールのパラメータを自動調整する
+
+from .space import DEFAULT_BOUNDS, Parameter, SearchSpace, config_values
+from .evaluate import Evaluation, EvaluationCache, ParallelEvaluator, evaluate_values
+from .search import NelderMead, TuneResult, autotune, latin_hypercube, write_override
+
+__all__ = [
+    "DEFAULT_BOUNDS",
+    "Parameter",
+    "SearchSpace",
+    "config_values",
+    "Evaluation",
+    "EvaluationCache",
+    "ParallelEvaluator",
+    "evaluate_values",
+    "NelderMead",
+    "TuneResult",
+    "autotune",
+    "latin_hypercube",
+    "write_override",
+]
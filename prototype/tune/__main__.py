@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+シミュレーター上で CorridorDecision / CorridorPerception のパラメータを自動調整するスクリプト
+
+ラテン超方格サンプリングで全体を探した後、上位の点から Nelder-Mead で詰める。
+評価は全CPUコアのプロセスプールで並列に行い、結果はキャッシュファイルに追記する。
+中断しても同じコマンドを再実行すれば、評価済みの点はキャッシュから読んで続きから探索する。
+
+使用例:
+    python -m prototype.tune                                   # 全フィールドを調整して ./log/tune_override.json に書き出す
+    python -m prototype.tune --params decision.KP decision.KD --samples 32
+    PROTOTYPE_CONFIG_OVERRIDE=./log/tune_override.json python -m prototype.sim --laps 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+
+from ..config import sim, tune
+from .evaluate import EvaluationCache, ParallelEvaluator
+from .search import autotune, write_override
+from .space import SearchSpace
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="シミュレーター上のパラメータ自動調整")
+    parser.add_argument("--params", nargs="+", help="調整するフィールド（decision.KP など。省略時は全フィールド）")
+    parser.add_argument("--laps", type=int, default=tune.LAPS, help="1回の評価で走らせる周回数")
+    fork = parser.add_mutually_exclusive_group()
+    fork.add_argument("--fork", action="store_true", help="Y字分岐のあるコースで評価（現状は既定の設定では分岐で衝突する）")
+    fork.add_argument("--no-fork", action="store_true", help="Y字分岐のないコースで評価（既定。以前のコマンドとの互換のため残す）")
+    parser.add_argument("--max-time", type=float, default=sim.MAX_SIM_TIME_SEC, help="1回の評価の最大シミュレーション時間（秒）")
+    parser.add_argument("--samples", type=int, default=tune.SAMPLES, help="ラテン超方格サンプリングの点数")
+    parser.add_argument("--starts", type=int, default=tune.REFINE_STARTS, help="Nelder-Mead の開始点の数")
+    parser.add_argument("--iterations", type=int, default=tune.REFINE_ITERATIONS, help="Nelder-Mead の最大反復回数")
+    parser.add_argument("--seed", type=int, default=tune.SEED, help="乱数シード")
+    parser.add_argument("--workers", type=int, default=tune.WORKERS, help="評価プロセス数（0でCPUコア数）")
+    parser.add_argument("--cache", default=tune.CACHE_PATH, help="評価結果のキャッシュファイル")
+    parser.add_argument("--output", default=tune.OVERRIDE_PATH, help="設定上書きファイルの書き出し先")
+    args = parser.parse_args()
+
+    try:
+        space = SearchSpace.from_configs(args.params)
+    except ValueError as e:
+        print(f"[TUNE] {e}", file=sys.stderr)
+        return 2
+
+    cache = EvaluationCache(args.cache)
+    print(f"[TUNE] {space.dim} parameter(s), {len(cache)} cached evaluation(s) in {args.cache}")
+    wall_start = time.perf_counter()
+    try:
+        with ParallelEvaluator(
+            cache, laps=args.laps, with_fork=args.fork, max_time_sec=args.max_time, workers=args.workers
+        ) as evaluator:
+            print(f"[TUNE] evaluating on {evaluator.workers} process(es)")
+            result = autotune(
+                evaluator,
+                space,
+                samples=args.samples,
+                starts=args.starts,
+                iterations=args.iterations,
+                seed=args.seed,
+                report=lambda line: print(f"[TUNE] {line}", flush=True),
+            )
+            runs, hits = evaluator.runs, evaluator.hits
+    except KeyboardInterrupt:
+        print(f"\n[TUNE] interrupted; rerun the same command to resume from {args.cache}")
+        return 130
+    finally:
+        cache.close()
+
+    wall = time.perf_counter() - wall_start
+    print(f"[TUNE] {result.evaluations} evaluations ({runs} simulated, {hits} cached) in {wall:.1f}s")
+    print(f"[TUNE] baseline: {result.baseline.summary()}")
+    print(f"[TUNE] best:     {result.evaluation.summary()}")
+    for key in space.keys:
+        print(f"[TUNE]   {key} = {result.values[key]:.6g}")
+    write_override(args.output, result)
+    print(f"[TUNE] wrote {args.output} (run with PROTOTYPE_CONFIG_OVERRIDE={args.output})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
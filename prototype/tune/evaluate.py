@@ -0,0 +1,300 @@
+# --------------------------------
+# tune/evaluate.py
+# パラメータ1組のシミュレーター評価、評価結果のディスクキャッシュ、プロセスプールでの並列評価
+# --------------------------------
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence
+
+from ..config import hardware, orchestrator, perception, sim, tune
+
+# 評価プロセスごとに作ったコース（分岐あり/なし）を使い回す
+_COURSES: Dict[bool, object] = {}
+
+
+@dataclass(frozen=True)
+class Evaluation:
+    """パラメータ1組の走行結果"""
+
+    laps: int                    # 完了した周回数
+    lap_times_sec: List[float]   # 各周回のラップタイム（仮想時間、秒）
+    collided: bool               # 壁に衝突したか
+    min_clearance_m: float       # 壁との最小距離（m、車体中心から）
+    progress_m: float            # 中心線上の累積走行距離（m）
+    target_m: float              # 目標周回数ぶんの走行距離（m）
+    sim_time_sec: float          # 経過した仮想時間（秒）
+
+    @property
+    def finished(self) -> bool:
+        """目標周回数を衝突せずに走り切ったか"""
+        return not self.collided and self.progress_m >= self.target_m
+
+    def cost(
+        self,
+        failure_cost_sec: float = tune.FAILURE_COST_SEC,
+        clearance_margin_m: float = tune.CLEARANCE_MARGIN_M,
+        clearance_penalty_sec_per_m: float = tune.CLEARANCE_PENALTY_SEC_PER_M,
+        collision_radius_m: float = sim.vehicle.COLLISION_RADIUS_M,
+    ) -> float:
+        """
+        探索で最小化するコスト（秒換算）
+
+        走り切った場合は合計ラップタイムに、壁との余裕が足りない分のペナルティを加える。
+        走り切れなかった場合は failure_cost_sec に、残りの距離の割合に比例した分を加える
+        （走り切れない点どうしでも、遠くまで進んだ方が良いと判定できるように）。
+
+        Args:
+            failure_cost_sec: 走り切れなかった場合の基本コスト（秒）。デフォルトは設定ファイルの値
+            clearance_margin_m: 車体半径に加えて確保したい壁との距離（m）。デフォルトは設定ファイルの値
+            clearance_penalty_sec_per_m: 余裕が足りない分に課すコスト（秒/m）。デフォルトは設定ファイルの値
+            collision_radius_m: 車体半径（m）。デフォルトは設定ファイルの値
+
+        Returns:
+            float: コスト（小さいほど良い）
+        """
+        if not self.finished:
+            remaining = 1.0 - min(max(self.progress_m / self.target_m, 0.0), 1.0) if self.target_m > 0 else 1.0
+            return failure_cost_sec * (1.0 + remaining)
+        shortfall = max(collision_radius_m + clearance_margin_m - self.min_clearance_m, 0.0)
+        return sum(self.lap_times_sec) + shortfall * clearance_penalty_sec_per_m
+
+    def summary(self) -> str:
+        """1行の要約"""
+        laps_str = ", ".join(f"{t:.2f}s" for t in self.lap_times_sec) or "-"
+        return (
+            f"cost={self.cost():.2f} laps={self.laps} lap_times=[{laps_str}] "
+            f"collided={'Y' if self.collided else 'N'} min_clearance={self.min_clearance_m * 1000.0:.0f}mm"
+        )
+
+
+def evaluate_values(
+    values: Dict[str, float],
+    laps: int = tune.LAPS,
+    with_fork: bool = False,
+    max_time_sec: float = sim.MAX_SIM_TIME_SEC,
+) -> Evaluation:
+    """
+    パラメータ1組でシミュレーターを走らせる
+
+    プロセスプールから呼び出せるよう、モジュールのトップレベルに置く。
+
+    Args:
+        values: "decision.KP" / "perception.FRONT_SLOW_THRESHOLD_MM" などのキーから値への対応
+                （含まれないフィールドは設定ファイルの値）
+        laps: 目標周回数
+        with_fork: Y字分岐のあるコースで走らせるか
+        max_time_sec: 最大シミュレーション時間（秒）
+
+    Returns:
+        Evaluation: 走行結果
+    """
+    from ..clock import VirtualClock
+    from ..decision import CorridorDecision
+    from ..perception import CorridorPerception
+    from ..sim import build_simulation, default_course
+
+    decision_kwargs = {}
+    perception_kwargs = {}
+    for key, value in values.items():
+        section, name = key.split(".", 1)
+        if section == "decision":
+            decision_kwargs[name.lower()] = value
+        elif section == "perception":
+            perception_kwargs[name.lower()] = value
+        else:
+            raise ValueError(f"Unknown parameter section: {key}")
+    # 前方減速の閾値は知覚の設定だが、判断モジュールも同じ値で速度を落とす
+    if "front_slow_threshold_mm" in perception_kwargs:
+        decision_kwargs["front_slow_threshold_mm"] = perception_kwargs["front_slow_threshold_mm"]
+
+    course = _COURSES.get(with_fork)
+    if course is None:
+        course = _COURSES[with_fork] = default_course(with_fork=with_fork)
+    clock = VirtualClock()
+    world, _, runner = build_simulation(
+        course=course,
+        perception=CorridorPerception(**perception_kwargs),
+        decision=CorridorDecision(clock=clock, **decision_kwargs),
+        clock=clock,
+    )
+    result = runner.run(laps=laps, max_time_sec=max_time_sec)
+    return Evaluation(
+        laps=result.laps,
+        lap_times_sec=list(result.lap_times_sec),
+        collided=result.collided,
+        min_clearance_m=result.min_clearance_m,
+        progress_m=world.progress_m,
+        target_m=laps * course.length_m,
+        sim_time_sec=result.sim_time_sec,
+    )
+
+
+class EvaluationCache:
+    """
+    評価結果のディスクキャッシュ
+
+    1評価を1行のJSONとして追記し、書き込むたびにフラッシュする。
+    途中で中断しても書き終えた行はそのまま使え、壊れた最終行は読み込み時に捨てる。
+    キーはパラメータの値と走行条件（周回数・コース・シミュレーターと制御周期の設定）のハッシュなので、
+    条件を変えた評価どうしが混ざることはない。
+    """
+
+    def __init__(self, path: Optional[str] = tune.CACHE_PATH):
+        """
+        初期化
+
+        Args:
+            path: キャッシュファイルのパス（Noneの場合はメモリ上だけに持つ）。デフォルトは設定ファイルの値
+        """
+        self.path = path
+        self._entries: Dict[str, Evaluation] = {}
+        self._file = None
+        if path is not None:
+            self._load(path)
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(path, "a", encoding="utf-8")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Evaluation]:
+        """キーの評価結果（なければNone）"""
+        return self._entries.get(key)
+
+    def put(self, key: str, values: Dict[str, float], evaluation: Evaluation) -> None:
+        """評価結果を追加してファイルに追記"""
+        self._entries[key] = evaluation
+        if self._file is not None:
+            record = {"key": key, "values": values, "result": asdict(evaluation)}
+            self._file.write(json.dumps(record, sort_keys=True) + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        """ファイルを閉じる"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _load(self, path: str) -> None:
+        """既存のキャッシュファイルを読み込む（壊れた行は捨てる）"""
+        if not os.path.exists(path):
+            return
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    self._entries[record["key"]] = Evaluation(**record["result"])
+                except (ValueError, KeyError, TypeError):
+                    continue
+
+
+class ParallelEvaluator:
+    """
+    パラメータの組をプロセスプールで並列に評価する
+
+    キャッシュにある組は走らせずに返し、ない組だけをプロセスに配る。
+    評価が終わった順にキャッシュへ書き込むので、途中で中断しても終わった分は失われない。
+    """
+
+    def __init__(
+        self,
+        cache: EvaluationCache,
+        laps: int = tune.LAPS,
+        with_fork: bool = False,
+        max_time_sec: float = sim.MAX_SIM_TIME_SEC,
+        workers: int = tune.WORKERS,
+        significant_digits: int = tune.CACHE_SIGNIFICANT_DIGITS,
+    ):
+        """
+        初期化
+
+        Args:
+            cache: 評価結果のキャッシュ
+            laps: 1回の評価で走らせる周回数。デフォルトは設定ファイルの値
+            with_fork: Y字分岐のあるコースで走らせるか
+            max_time_sec: 最大シミュレーション時間（秒）
+            workers: 評価プロセス数（0でCPUコア数）。デフォルトは設定ファイルの値
+            significant_digits: キャッシュのキーにするとき値を丸める有効桁数。デフォルトは設定ファイルの値
+        """
+        self.cache = cache
+        self.laps = laps
+        self.with_fork = with_fork
+        self.max_time_sec = max_time_sec
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.significant_digits = significant_digits
+        self._context = json.dumps(
+            {
+                "laps": laps,
+                "with_fork": with_fork,
+                "max_time_sec": max_time_sec,
+                "sim": repr(sim),
+                "loop_interval_sec": orchestrator.LOOP_INTERVAL_SEC,
+                "distance_filter": repr(perception.distance_filter),
+                "servo": repr(hardware.servo),
+                "esc": repr(hardware.esc),
+            },
+            sort_keys=True,
+        )
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.hits = 0
+        self.runs = 0
+
+    def __enter__(self) -> ParallelEvaluator:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def key(self, values: Dict[str, float]) -> str:
+        """パラメータの組と走行条件のキャッシュキー"""
+        rounded = {k: float(f"{v:.{self.significant_digits}g}") for k, v in values.items()}
+        payload = json.dumps({"context": self._context, "values": rounded}, sort_keys=True)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def evaluate(self, batch: Sequence[Dict[str, float]]) -> List[Evaluation]:
+        """
+        パラメータの組をまとめて評価する
+
+        Args:
+            batch: パラメータの組のリスト
+
+        Returns:
+            List[Evaluation]: batch と同じ順の走行結果
+        """
+        keys = [self.key(values) for values in batch]
+        pending: Dict[str, Dict[str, float]] = {}
+        for key, values in zip(keys, batch):
+            if self.cache.get(key) is None:
+                pending.setdefault(key, values)
+            else:
+                self.hits += 1
+        if pending:
+            pool = self._ensure_pool()
+            futures = {
+                pool.submit(evaluate_values, values, self.laps, self.with_fork, self.max_time_sec): key
+                for key, values in pending.items()
+            }
+            for future in as_completed(futures):
+                key = futures[future]
+                self.cache.put(key, pending[key], future.result())
+                self.runs += 1
+        return [self.cache.get(key) for key in keys]
+
+    def close(self) -> None:
+        """プロセスプールを止める（実行待ちの評価は取り消す）"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        """初回の評価でプロセスプールを作る（全てキャッシュにある場合はプロセスを起動しない）"""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
@@ -0,0 +1,276 @@
+# --------------------------------
+# tune/search.py
+# ラテン超方格サンプリングと Nelder-Mead による自動調整
+# 乱数はシードだけで決まり、Nelder-Mead も評価結果だけで次の点が決まるので、
+# 同じ条件で再実行すると中断前と同じ点を同じ順に辿る（評価済みの点はキャッシュから返る）
+# --------------------------------
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..config import tune
+from .evaluate import Evaluation, ParallelEvaluator
+from .space import SearchSpace, config_values
+
+# Nelder-Mead の係数（反射・拡大・収縮・縮小）
+_ALPHA: float = 1.0
+_GAMMA: float = 2.0
+_RHO: float = 0.5
+_SIGMA: float = 0.5
+
+
+def latin_hypercube(n: int, dim: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    単位超立方体のラテン超方格サンプル
+
+    各次元を n 等分し、どの区間にもちょうど1点が入るように並べる。
+
+    Args:
+        n: 点数
+        dim: 次元数
+        rng: 乱数生成器
+
+    Returns:
+        np.ndarray: [n, dim] の座標（各値は [0, 1)）
+    """
+    strata = np.column_stack([rng.permutation(n) for _ in range(dim)]) if n > 0 else np.empty((0, dim))
+    return (strata + rng.random((n, dim))) / max(n, 1)
+
+
+class NelderMead:
+    """
+    単位超立方体上の Nelder-Mead 法（範囲外の点は境界に丸める）
+
+    1反復で試す反射・拡大・外側収縮・内側収縮の4点を先にまとめて提案し（propose）、
+    評価結果を受け取ってから通常の手順どおりに1つを採用する（update）。
+    4点を同時に評価できるので、複数の開始点を並べて走らせればプロセスプールを埋められる。
+    """
+
+    def __init__(self, start: np.ndarray, initial_step: float = tune.REFINE_INITIAL_STEP):
+        """
+        初期化
+
+        Args:
+            start: 開始点（単位超立方体の座標）
+            initial_step: 初期単体の辺の長さ。デフォルトは設定ファイルの値
+        """
+        dim = len(start)
+        simplex = [np.clip(start, 0.0, 1.0)]
+        for i in range(dim):
+            vertex = simplex[0].copy()
+            # 上限側にはみ出す場合は反対側に取る
+            vertex[i] += initial_step if vertex[i] + initial_step <= 1.0 else -initial_step
+            simplex.append(vertex)
+        self.simplex = np.array(simplex)
+        self.costs = np.full(dim + 1, np.inf)
+        self.iterations = 0
+        self._phase = "init"
+        self._pending = self.simplex.copy()
+
+    @property
+    def best(self) -> Tuple[np.ndarray, float]:
+        """単体の最良の頂点とそのコスト"""
+        i = int(np.argmin(self.costs))
+        return self.simplex[i].copy(), float(self.costs[i])
+
+    @property
+    def spread(self) -> float:
+        """単体内のコストの最大と最小の差"""
+        return float(np.max(self.costs) - np.min(self.costs))
+
+    def propose(self) -> np.ndarray:
+        """
+        次に評価してほしい点
+
+        Returns:
+            np.ndarray: [k, dim] の座標（初回と縮小の後は頂点、それ以外は反射・拡大・外側収縮・内側収縮の4点）
+        """
+        return self._pending
+
+    def update(self, costs: np.ndarray) -> None:
+        """
+        propose() の点の評価結果を反映して次の点を用意する
+
+        Args:
+            costs: propose() と同じ順のコスト
+        """
+        costs = np.asarray(costs, dtype=float)
+        if self._phase == "init":
+            self.costs = costs.copy()
+            self._phase = "step"
+        elif self._phase == "shrink":
+            self.costs[1:] = costs
+            self._phase = "step"
+        else:
+            self._step(costs)
+        self.iterations += 1
+        self._prepare_step()
+
+    def _step(self, costs: np.ndarray) -> None:
+        """反射・拡大・収縮の中から1点を採用（どれも採用できなければ縮小を用意）"""
+        reflected, expanded, outside, inside = self._pending
+        f_r, f_e, f_oc, f_ic = costs
+        f_best = self.costs[0]
+        f_second = self.costs[-2]
+        f_worst = self.costs[-1]
+        if f_best <= f_r < f_second:
+            self._replace_worst(reflected, f_r)
+        elif f_r < f_best:
+            if f_e < f_r:
+                self._replace_worst(expanded, f_e)
+            else:
+                self._replace_worst(reflected, f_r)
+        elif f_r < f_worst:
+            if f_oc <= f_r:
+                self._replace_worst(outside, f_oc)
+            else:
+                self._shrink()
+        elif f_ic < f_worst:
+            self._replace_worst(inside, f_ic)
+        else:
+            self._shrink()
+
+    def _replace_worst(self, point: np.ndarray, cost: float) -> None:
+        self.simplex[-1] = point
+        self.costs[-1] = cost
+        self._phase = "step"
+
+    def _shrink(self) -> None:
+        """最良の頂点に向かって他の頂点を縮める（新しい頂点の評価を待つ）"""
+        self.simplex[1:] = self.simplex[0] + _SIGMA * (self.simplex[1:] - self.simplex[0])
+        self._phase = "shrink"
+
+    def _prepare_step(self) -> None:
+        """頂点をコスト順に並べ、次に評価する点を用意"""
+        if self._phase == "shrink":
+            self._pending = self.simplex[1:].copy()
+            return
+        order = np.argsort(self.costs, kind="stable")
+        self.simplex = self.simplex[order]
+        self.costs = self.costs[order]
+        centroid = self.simplex[:-1].mean(axis=0)
+        worst = self.simplex[-1]
+        self._pending = np.clip(
+            np.array([
+                centroid + _ALPHA * (centroid - worst),
+                centroid + _GAMMA * (centroid - worst),
+                centroid + _RHO * _ALPHA * (centroid - worst),
+                centroid - _RHO * (centroid - worst),
+            ]),
+            0.0,
+            1.0,
+        )
+        self._phase = "step"
+
+
+@dataclass(frozen=True)
+class TuneResult:
+    """自動調整の結果"""
+
+    values: Dict[str, float]     # 最良のパラメータ（探索対象の全フィールド）
+    evaluation: Evaluation       # 最良のパラメータの走行結果
+    baseline: Evaluation         # 設定ファイルの現在の値の走行結果
+    evaluations: int             # 評価した点の数（キャッシュから返したものを含む）
+
+
+def autotune(
+    evaluator: ParallelEvaluator,
+    space: SearchSpace,
+    samples: int = tune.SAMPLES,
+    starts: int = tune.REFINE_STARTS,
+    iterations: int = tune.REFINE_ITERATIONS,
+    initial_step: float = tune.REFINE_INITIAL_STEP,
+    tolerance: float = tune.REFINE_TOLERANCE,
+    seed: int = tune.SEED,
+    report: Optional[Callable[[str], None]] = None,
+) -> TuneResult:
+    """
+    ラテン超方格サンプリングで全体を探し、上位の点から Nelder-Mead で詰める
+
+    Args:
+        evaluator: 並列評価器（キャッシュ付き）
+        space: 探索空間
+        samples: ラテン超方格サンプリングの点数。デフォルトは設定ファイルの値
+        starts: Nelder-Mead の開始点の数。デフォルトは設定ファイルの値
+        iterations: Nelder-Mead の最大反復回数。デフォルトは設定ファイルの値
+        initial_step: 初期単体の辺の長さ。デフォルトは設定ファイルの値
+        tolerance: 単体内のコスト差がこれ未満になったら打ち切る（秒）。デフォルトは設定ファイルの値
+        seed: 乱数シード。デフォルトは設定ファイルの値
+        report: 進捗を1行ずつ受け取る関数（Noneの場合は何もしない）
+
+    Returns:
+        TuneResult: 最良のパラメータと走行結果
+    """
+    log = report if report is not None else (lambda line: None)
+    history: List[Tuple[Dict[str, float], Evaluation, float]] = []
+
+    def run(units: np.ndarray) -> np.ndarray:
+        batch = [space.to_values(u) for u in units]
+        results = evaluator.evaluate(batch)
+        costs = np.array([r.cost() for r in results])
+        history.extend(zip(batch, results, costs))
+        return costs
+
+    # 1. 現在の設定値（探索範囲の外でもそのまま）と、ラテン超方格サンプル
+    baseline_values = config_values()
+    baseline = evaluator.evaluate([baseline_values])[0]
+    history.append((baseline_values, baseline, baseline.cost()))
+    log(f"baseline: {baseline.summary()}")
+    rng = np.random.default_rng(seed)
+    points = np.vstack([space.default_unit()[None, :], latin_hypercube(samples, space.dim, rng)])
+    costs = run(points)
+    log(f"sampling: {len(points)} points, best cost={costs.min():.2f}, finished={int(np.sum(costs < tune.FAILURE_COST_SEC))}")
+
+    # 2. 上位の点から Nelder-Mead（全ての開始点の提案をまとめて評価する）
+    order = np.argsort(costs, kind="stable")[:max(starts, 0)]
+    searches = [NelderMead(points[i], initial_step) for i in order]
+    for iteration in range(iterations):
+        active = [s for s in searches if s.iterations == 0 or s.spread >= tolerance]
+        if not active:
+            break
+        proposals = [s.propose() for s in active]
+        flat = run(np.vstack(proposals))
+        offset = 0
+        for search, proposal in zip(active, proposals):
+            search.update(flat[offset:offset + len(proposal)])
+            offset += len(proposal)
+        best_cost = min(s.best[1] for s in searches)
+        log(f"refine: iteration {iteration + 1}/{iterations}, active={len(active)}, best cost={best_cost:.2f}")
+
+    values, evaluation, _ = min(history, key=lambda item: item[2])
+    return TuneResult(values=values, evaluation=evaluation, baseline=baseline, evaluations=len(history))
+
+
+def write_override(path: str, result: TuneResult) -> None:
+    """
+    最良のパラメータを設定上書きファイル（JSON）に書き出す
+
+    PROTOTYPE_CONFIG_OVERRIDE にこのファイルのパスを設定して実行すると、
+    CorridorDecision / CorridorPerception のデフォルト値がこの値になる。
+
+    Args:
+        path: 書き出すパス
+        result: 自動調整の結果
+    """
+    data: Dict[str, Dict] = {
+        "_tune": {
+            "cost": result.evaluation.cost(),
+            "lap_times_sec": result.evaluation.lap_times_sec,
+            "min_clearance_m": result.evaluation.min_clearance_m,
+            "baseline_cost": result.baseline.cost(),
+        },
+    }
+    for key, value in result.values.items():
+        section, name = key.split(".", 1)
+        data.setdefault(section, {}).setdefault("corridor", {})[name] = value
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
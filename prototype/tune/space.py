@@ -0,0 +1,171 @@
+# --------------------------------
+# tune/space.py
+# 自動調整の探索空間（CorridorDecisionConfig / CorridorPerceptionConfig の全フィールドと探索範囲）
+# --------------------------------
+from __future__ import annotations
+
+import dataclasses
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..config import decision, perception
+from ..config.decision import CorridorDecisionConfig
+from ..config.perception import CorridorPerceptionConfig
+
+# 探索するフィールドの範囲（下限, 上限）。キーは "decision.KP" のように「設定名.フィールド名」
+DEFAULT_BOUNDS: Dict[str, Tuple[float, float]] = {
+    "decision.KP": (0.0, 0.02),
+    "decision.KD": (0.0, 0.01),
+    "decision.DIFFERENTIAL_SMOOTHING_FACTOR": (0.0, 0.9),
+    "decision.BASE_SPEED": (0.15, 0.6),
+    "decision.HIGH_SPEED": (0.15, 0.8),
+    "decision.MAX_STEERING": (0.3, 1.0),
+    "decision.FRONT_BLOCKED_SPEED": (0.1, 0.5),
+    "decision.FRONT_BLOCKED_STEERING": (-1.0, -0.2),  # 回避方向は左右の空きで決まるので大きさだけ効く
+    "decision.FORK_SPEED": (0.1, 0.5),
+    "decision.FORK_STEERING": (-1.0, 1.0),  # 符号で分岐の回避方向が変わる
+    "perception.FRONT_BLOCKED_THRESHOLD_MM": (200.0, 900.0),
+    "perception.FRONT_SLOW_THRESHOLD_MM": (500.0, 2000.0),
+    "perception.WALL_DETECTION_THRESHOLD_MM": (800.0, 2000.0),
+    "perception.FORK_FRONT_THRESHOLD_MM": (300.0, 1200.0),
+    "perception.FORK_SIDE_OPEN_THRESHOLD_MM": (500.0, 1500.0),
+}
+
+# 設定名と、そのフィールドを持つ設定クラス・現在の値
+_SECTIONS = (
+    ("decision", CorridorDecisionConfig, decision.corridor),
+    ("perception", CorridorPerceptionConfig, perception.corridor),
+)
+
+
+def config_values() -> Dict[str, float]:
+    """
+    探索対象の全フィールドの設定ファイルの現在の値
+
+    Returns:
+        Dict[str, float]: キー（"decision.KP" など）から値への対応
+    """
+    return {
+        f"{section}.{field.name}": float(getattr(current, field.name))
+        for section, config_cls, current in _SECTIONS
+        for field in dataclasses.fields(config_cls)
+    }
+
+
+@dataclass(frozen=True)
+class Parameter:
+    """探索する1つのフィールド"""
+
+    section: str  # 設定名（"decision" / "perception"）
+    name: str  # フィールド名（"KP" など）
+    low: float  # 探索範囲の下限
+    high: float  # 探索範囲の上限
+    default: float  # 設定ファイルの現在の値
+
+    @property
+    def key(self) -> str:
+        """「設定名.フィールド名」"""
+        return f"{self.section}.{self.name}"
+
+
+class SearchSpace:
+    """
+    探索空間
+
+    探索は各パラメータを [0, 1] に正規化した単位超立方体の上で行い、評価時に実際の値に戻す。
+    """
+
+    def __init__(self, parameters: Sequence[Parameter]):
+        """
+        初期化
+
+        Args:
+            parameters: 探索するパラメータ（順番が座標の順番になる）
+        """
+        if not parameters:
+            raise ValueError("SearchSpace needs at least one parameter")
+        self.parameters: List[Parameter] = list(parameters)
+        self._low = np.array([p.low for p in self.parameters])
+        self._span = np.array([p.high - p.low for p in self.parameters])
+
+    @classmethod
+    def from_configs(
+        cls,
+        keys: Optional[Sequence[str]] = None,
+        bounds: Optional[Dict[str, Tuple[float, float]]] = None,
+    ) -> SearchSpace:
+        """
+        CorridorDecisionConfig / CorridorPerceptionConfig のフィールドから探索空間を作る
+
+        Args:
+            keys: 探索するフィールド（"decision.KP" など）。Noneの場合は両方の設定の全フィールド
+            bounds: 探索範囲（DEFAULT_BOUNDS を上書きする分だけでよい）
+
+        Returns:
+            SearchSpace: 探索空間
+
+        Raises:
+            ValueError: 存在しないフィールドや探索範囲のないフィールドを指定した場合
+        """
+        table = dict(DEFAULT_BOUNDS)
+        if bounds:
+            table.update(bounds)
+        available: Dict[str, Parameter] = {}
+        for key, default in config_values().items():
+            if key not in table:
+                raise ValueError(f"No search bounds for {key}")
+            low, high = table[key]
+            section, name = key.split(".", 1)
+            available[key] = Parameter(section, name, low, high, default)
+        if keys is None:
+            return cls(list(available.values()))
+        unknown = [k for k in keys if k not in available]
+        if unknown:
+            raise ValueError(f"Unknown parameter(s): {', '.join(unknown)} (expected one of {', '.join(available)})")
+        return cls([available[k] for k in keys])
+
+    @property
+    def dim(self) -> int:
+        """次元数"""
+        return len(self.parameters)
+
+    @property
+    def keys(self) -> List[str]:
+        """パラメータのキー（座標の順）"""
+        return [p.key for p in self.parameters]
+
+    def to_values(self, unit: np.ndarray) -> Dict[str, float]:
+        """
+        単位超立方体の点を実際の値に戻す（探索しないフィールドは設定ファイルの値）
+
+        Args:
+            unit: [0, 1] に正規化した座標（範囲外は丸める）
+
+        Returns:
+            Dict[str, float]: 探索対象の全フィールドのキーから値への対応
+        """
+        values = config_values()
+        raw = self._low + np.clip(unit, 0.0, 1.0) * self._span
+        for p, v in zip(self.parameters, raw):
+            values[p.key] = float(v)
+        return values
+
+    def to_unit(self, values: Dict[str, float]) -> np.ndarray:
+        """
+        実際の値を単位超立方体の点にする（値がないパラメータは設定ファイルの値）
+
+        Args:
+            values: キーから値への対応
+
+        Returns:
+            np.ndarray: [0, 1] に正規化した座標
+        """
+        raw = np.array([values.get(p.key, p.default) for p in self.parameters])
+        span = np.where(self._span > 0.0, self._span, 1.0)
+        return np.clip((raw - self._low) / span, 0.0, 1.0)
+
+    def default_unit(self) -> np.ndarray:
+        """設定ファイルの現在の値の座標"""
+        return self.to_unit({})
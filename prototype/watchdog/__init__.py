@@ -0,0 +1,15 @@
+# watchdog パッケージ
+# 制御ループの停止を別プロセスで検知し、ESCをニュートラルにするウォッチドッグ
+
+from .heartbeat import HeartbeatReader, HeartbeatSample, HeartbeatWriter
+from .watchdog import Watchdog
+from .measure import ReactionMeasurement, measure_reaction
+
+__all__ = [
+    "HeartbeatReader",
+    "HeartbeatSample",
+    "HeartbeatWriter",
+    "Watchdog",
+    "ReactionMeasurement",
+    "measure_reaction",
+]
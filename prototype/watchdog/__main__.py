@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+ウォッチドッグを実行するスクリプト（制御プロセスとは別に起動する）
+
+使用例:
+    python -m prototype.watchdog               # 実機: ハートビートを監視し、途絶えたらPCA9685にニュートラルを書く
+    python -m prototype.watchdog --measure     # 実機なし: 偽のPCA9685で最悪の反応遅延を計測
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+
+from ..config import hardware, watchdog
+from .heartbeat import HeartbeatReader
+from .measure import measure_reaction
+from .watchdog import Watchdog
+
+
+def _attach(name: str, timeout_sec: float) -> HeartbeatReader:
+    """制御プロセスが共有メモリを作るまで待って接続する"""
+    give_up = time.monotonic() + timeout_sec
+    while True:
+        try:
+            return HeartbeatReader(name)
+        except FileNotFoundError:
+            if time.monotonic() >= give_up:
+                raise
+            time.sleep(0.1)
+
+
+def _open_pca9685():
+    """PCA9685 のI2Cデバイスを開く（周波数などの設定は制御プロセスに任せ、チップはリセットしない）"""
+    # ハードウェアモジュールのインポート（ラズベリーパイ環境専用）
+    # --measure は実機なしで使えるよう、ここで遅延インポートする
+    import board
+    import busio
+    from adafruit_bus_device.i2c_device import I2CDevice
+
+    i2c = busio.I2C(board.SCL, board.SDA)
+    return I2CDevice(i2c, hardware.pca9685.I2C_ADDRESS)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="制御ループの停止を検知してESCをニュートラルにするウォッチドッグ")
+    parser.add_argument("--name", default=watchdog.SHM_NAME, help="ハートビートの共有メモリの名前")
+    parser.add_argument("--deadline", type=float, default=watchdog.DEADLINE_SEC, help="ハートビートの期限（秒）")
+    parser.add_argument("--poll", type=float, default=watchdog.POLL_INTERVAL_SEC, help="ハートビートを確認する間隔（秒）")
+    parser.add_argument("--measure", action="store_true", help="偽のPCA9685で反応遅延を計測して終わる")
+    parser.add_argument("--trials", type=int, default=watchdog.MEASURE_TRIALS, help="計測で制御ループを止める回数")
+    args = parser.parse_args()
+
+    if args.measure:
+        print(f"[WATCHDOG] measuring reaction: deadline={args.deadline * 1000:.1f}ms poll={args.poll * 1000:.1f}ms")
+        result = measure_reaction(trials=args.trials, deadline_sec=args.deadline, poll_interval_sec=args.poll)
+        print(f"[WATCHDOG] {result.summary()}")
+        if result.reaction.max_us is not None:
+            worst_ms = result.reaction.max_us / 1000.0
+            print(
+                f"[WATCHDOG] worst case: neutral written {worst_ms:.3f}ms after the deadline "
+                f"({args.deadline * 1000 + worst_ms:.1f}ms after the last heartbeat)"
+            )
+        return 0 if result.missed == 0 and result.false_trips == 0 and result.neutral_ok else 1
+
+    print(f"[WATCHDOG] waiting for heartbeat '{args.name}'...")
+    try:
+        reader = _attach(args.name, watchdog.ATTACH_TIMEOUT_SEC)
+    except FileNotFoundError:
+        print(f"[WATCHDOG] heartbeat '{args.name}' not found", file=sys.stderr)
+        return 2
+    dog = Watchdog(reader, _open_pca9685(), deadline_sec=args.deadline, poll_interval_sec=args.poll)
+    print(f"[WATCHDOG] monitoring: deadline={args.deadline * 1000:.1f}ms poll={args.poll * 1000:.1f}ms")
+    try:
+        dog.run()
+    except KeyboardInterrupt:
+        print("\n[WATCHDOG] Stopped by user")
+    finally:
+        print(f"[WATCHDOG] trips={dog.trips} reasserts={dog.reasserts} errors={dog.errors}")
+        reader.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,261 @@
+# --------------------------------
+# watchdog/heartbeat.py
+# 制御プロセスとウォッチドッグプロセスが共有するハートビート（共有メモリ上の固定長レコード）
+# --------------------------------
+from __future__ import annotations
+
+import os
+import struct
+import threading
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+from ..interfaces.protocols import Clock
+from ..clock import system_clock
+from ..config import watchdog
+
+MAGIC = b"MCHB"
+LAYOUT_VERSION = 2
+
+# 制御プロセスが書く部分: マジック, 版, フラグ, 書き手のPID, 予備, シーケンス番号, フレーム番号, 時刻（ns）
+# 64bitの値は8バイト境界に置く（1回のストアで書かれ、読み手が半分だけ新しい値を見ない）
+_HEADER = struct.Struct("<4sHHI4xQQq")
+# ウォッチドッグが書く部分: ウォッチドッグのPID, 予備, 発動回数, 最後に発動した時刻（ns）, 最後の反応遅延（ns）
+_WATCHDOG = struct.Struct("<IIQqq")
+_WATCHDOG_OFFSET = _HEADER.size
+SEGMENT_SIZE = _HEADER.size + _WATCHDOG.size
+
+# ヘッダーの中の、beat() ごとに書く部分
+_FLAGS_OFFSET = 6
+_FLAGS = struct.Struct("<HI")  # フラグ, 書き手のPID
+_SEQ_OFFSET = 16
+_SEQ = struct.Struct("<Q")
+_BEAT_OFFSET = 24
+_BEAT = struct.Struct("<Qq")  # フレーム番号, 時刻（ns）
+
+# 書き込み中（シーケンス番号が奇数）・読んでいる間に書き換わった場合に読み直す回数。
+# 書き手が書き込みの途中で止まっても、ウォッチドッグの確認は止めない
+READ_RETRIES = 8
+
+FLAG_ARMED = 0x01  # 制御ループが動いている（ウォッチドッグが監視する）
+
+
+def _track(shm: shared_memory.SharedMemory) -> None:
+    """resource_tracker の管理に戻す（unlink() の前に呼ぶ）"""
+    try:
+        from multiprocessing import resource_tracker
+
+        resource_tracker.register(shm._name, "shared_memory")
+    except Exception:
+        pass  # 管理の仕組みがない環境では何もしない
+
+
+def _untrack(shm: shared_memory.SharedMemory) -> None:
+    """プロセスの終了時に共有メモリを削除しないよう、resource_tracker の管理から外す"""
+    try:
+        from multiprocessing import resource_tracker
+
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass  # 管理の仕組みがない環境では何もしない
+
+
+@dataclass(frozen=True)
+class HeartbeatSample:
+    """ハートビートの読み出し結果"""
+
+    frame: int             # 最後に書き込んだフレーム番号
+    timestamp_ns: int      # 最後のハートビートの時刻（CLOCK_MONOTONIC、ns）
+    armed: bool            # 制御ループが動いているか（正常終了時は False）
+    writer_pid: int        # 制御プロセスのPID
+    trips: int             # ウォッチドッグが発動した回数
+    last_trip_ns: int      # 最後に発動した時刻（ns、未発動なら0）
+    last_reaction_ns: int  # 最後の発動の反応遅延（期限切れからニュートラルの書き込み完了まで、ns）
+
+
+class HeartbeatWriter:
+    """
+    制御プロセス側のハートビート（共有メモリを作って書き込む）
+
+    beat() はフレーム番号と単調時計の時刻をシーケンスロック（書き込み中は奇数）で書く。
+    CLOCK_MONOTONIC はプロセス間で同じ時間軸なので、ウォッチドッグは自分の時計と直接比べられる。
+    共有メモリは close() しても残し（削除は unlink()）、次に起動した制御プロセスが初期化して使う。
+    """
+
+    def __init__(self, name: str = watchdog.SHM_NAME, clock: Clock = system_clock):
+        """
+        初期化（共有メモリを作る）
+
+        Args:
+            name: 共有メモリの名前。デフォルトは設定ファイルの値
+            clock: 時計（ハートビートの時刻に使う。実時間の単調時計であること）。デフォルトは実時間の単調時計
+        """
+        self.name = name
+        self.clock = clock
+        try:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=SEGMENT_SIZE)
+        except FileExistsError:
+            self._shm = shared_memory.SharedMemory(name=name)
+        # 制御プロセスを再起動してもウォッチドッグが同じ共有メモリを監視し続けられるよう、終了時に削除させない
+        _untrack(self._shm)
+        self._buf = self._shm.buf
+        self._buf[:SEGMENT_SIZE] = bytes(SEGMENT_SIZE)
+        self._seq = 0
+        self._frame = 0
+        self._flags = 0
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        _HEADER.pack_into(self._buf, 0, MAGIC, LAYOUT_VERSION, 0, self._pid, 0, 0, 0)
+
+    def _write(self, frame: int, timestamp_ns: int, flags: int) -> None:
+        """
+        シーケンスロックでヘッダーを書く（ロック内で呼ぶ）
+
+        シーケンス番号を奇数にしてから中身を書き、最後に偶数のシーケンス番号を別のストアで書く。
+        """
+        buf = self._buf
+        self._seq += 1
+        _SEQ.pack_into(buf, _SEQ_OFFSET, self._seq)
+        _FLAGS.pack_into(buf, _FLAGS_OFFSET, flags, self._pid)
+        _BEAT.pack_into(buf, _BEAT_OFFSET, frame, timestamp_ns)
+        self._seq += 1
+        _SEQ.pack_into(buf, _SEQ_OFFSET, self._seq)
+
+    def beat(self, frame: int) -> None:
+        """
+        ハートビートを書き込む（監視を有効にする）
+
+        Args:
+            frame: フレーム番号
+        """
+        with self._lock:
+            self._frame = frame
+            self._flags = FLAG_ARMED
+            self._write(frame, self.clock.now_ns(), FLAG_ARMED)
+
+    def disarm(self) -> None:
+        """監視を止める（正常に止めるときに呼ぶ。次の beat() で再開する）"""
+        with self._lock:
+            self._flags = 0
+            self._write(self._frame, self.clock.now_ns(), 0)
+
+    @property
+    def watchdog_trips(self) -> int:
+        """ウォッチドッグが発動した回数"""
+        return _WATCHDOG.unpack_from(self._buf, _WATCHDOG_OFFSET)[2]
+
+    @property
+    def watchdog_reaction_ns(self) -> int:
+        """ウォッチドッグの最後の発動の反応遅延（ns、未発動なら0）"""
+        return _WATCHDOG.unpack_from(self._buf, _WATCHDOG_OFFSET)[4]
+
+    def close(self) -> None:
+        """
+        共有メモリから切断（共有メモリは残す）
+
+        監視の状態は変えない。監視中のまま切断すると、ハートビートが途絶えてウォッチドッグが発動する
+        （停止を書き込めなかった場合に、ウォッチドッグにニュートラルを書かせるため）。
+        """
+        if self._shm is None:
+            return
+        self._buf = None
+        self._shm.close()
+        self._shm = None
+
+    def unlink(self) -> None:
+        """監視を止めて共有メモリを削除（ウォッチドッグは以降の再起動を監視できない）"""
+        if self._shm is not None:
+            self.disarm()
+        self.close()
+        try:
+            shm = shared_memory.SharedMemory(name=self.name)
+        except FileNotFoundError:
+            return  # 既に削除されている
+        # unlink() は resource_tracker の管理から外す処理も行うので、管理に戻してから削除する
+        _track(shm)
+        shm.close()
+        shm.unlink()
+
+
+class HeartbeatReader:
+    """
+    ウォッチドッグ側のハートビート（既存の共有メモリに接続して読む）
+
+    発動の記録（record_trip()）だけはウォッチドッグが書く。
+    書き手が書き込みの途中で止まってシーケンス番号が奇数のままでも、read() は READ_RETRIES 回で諦めて
+    最後に読めたハートビートを返す（ウォッチドッグからは、その時刻から更新が止まったように見える）。
+    """
+
+    def __init__(self, name: str = watchdog.SHM_NAME):
+        """
+        初期化（共有メモリに接続する）
+
+        Args:
+            name: 共有メモリの名前。デフォルトは設定ファイルの値
+
+        Raises:
+            FileNotFoundError: 共有メモリがない場合（制御プロセスが起動していない）
+            ValueError: 共有メモリの中身がハートビートでない場合
+        """
+        self.name = name
+        self._shm = shared_memory.SharedMemory(name=name)
+        _untrack(self._shm)
+        self._buf = self._shm.buf
+        magic, version = _HEADER.unpack_from(self._buf, 0)[:2]
+        if magic != MAGIC or version != LAYOUT_VERSION:
+            self._shm.close()
+            raise ValueError(f"Not a heartbeat segment: {name} (magic={magic!r}, version={version})")
+        self._pid = os.getpid()
+        # 最後に読めたハートビート（フレーム番号, 時刻, 監視中か, 書き手のPID）
+        self._last = (0, 0, False, 0)
+        self.torn_reads = 0  # 読み直しても読めず、最後に読めたハートビートを返した回数
+
+    def read(self) -> HeartbeatSample:
+        """
+        ハートビートを読む（書き込み中なら READ_RETRIES 回まで読み直し、読めなければ最後に読めた値を返す）
+
+        Returns:
+            HeartbeatSample: 読み出し結果
+        """
+        buf = self._buf
+        for _ in range(READ_RETRIES):
+            seq_before = _SEQ.unpack_from(buf, _SEQ_OFFSET)[0]
+            if seq_before & 1:
+                continue
+            flags, writer_pid = _FLAGS.unpack_from(buf, _FLAGS_OFFSET)
+            frame, timestamp_ns = _BEAT.unpack_from(buf, _BEAT_OFFSET)
+            if _SEQ.unpack_from(buf, _SEQ_OFFSET)[0] == seq_before:
+                self._last = (frame, timestamp_ns, bool(flags & FLAG_ARMED), writer_pid)
+                break
+        else:
+            self.torn_reads += 1
+        frame, timestamp_ns, armed, writer_pid = self._last
+        _, _, trips, last_trip_ns, last_reaction_ns = _WATCHDOG.unpack_from(buf, _WATCHDOG_OFFSET)
+        return HeartbeatSample(
+            frame=frame,
+            timestamp_ns=timestamp_ns,
+            armed=armed,
+            writer_pid=writer_pid,
+            trips=trips,
+            last_trip_ns=last_trip_ns,
+            last_reaction_ns=last_reaction_ns,
+        )
+
+    def record_trip(self, trip_ns: int, reaction_ns: int) -> None:
+        """
+        発動を記録（制御プロセスと計測用の親プロセスが読む）
+
+        Args:
+            trip_ns: ニュートラルの書き込みを終えた時刻（ns）
+            reaction_ns: 期限切れから書き込み完了までの時間（ns）
+        """
+        trips = _WATCHDOG.unpack_from(self._buf, _WATCHDOG_OFFSET)[2]
+        _WATCHDOG.pack_into(self._buf, _WATCHDOG_OFFSET, self._pid, 0, trips + 1, trip_ns, reaction_ns)
+
+    def close(self) -> None:
+        """共有メモリから切断（削除はしない）"""
+        if self._shm is None:
+            return
+        self._buf = None
+        self._shm.close()
+        self._shm = None
@@ -0,0 +1,170 @@
+# --------------------------------
+# watchdog/measure.py
+# 偽のPCA9685でウォッチドッグを別プロセスで動かし、最悪の反応遅延を計測する
+# --------------------------------
+from __future__ import annotations
+
+import multiprocessing
+import os
+import queue
+import random
+from dataclasses import dataclass
+from typing import Optional
+
+from ..actuation.pwm import LED_REGISTER_STRIDE, duty_to_registers, registers_to_duty
+from ..clock import MonotonicClock
+from ..config import hardware, us_to_duty, watchdog
+from ..orchestrator.latency import LatencyHistogram, LatencyStats
+from .heartbeat import HeartbeatReader, HeartbeatWriter
+from .watchdog import Watchdog
+
+# 制御ループの代わりにハートビートを書く周期（秒）。制御周期と同じ
+BEAT_PERIOD_SEC = 0.02
+
+
+@dataclass(frozen=True)
+class ReactionMeasurement:
+    """反応遅延の計測結果"""
+
+    trials: int            # 制御ループを止めた回数
+    reaction: LatencyStats  # 期限切れからニュートラルの書き込み完了までの遅延
+    missed: int            # 期限から deadline_sec 待っても発動しなかった回数
+    false_trips: int       # ハートビートが期限内なのに発動した回数
+    neutral_ok: bool       # 偽のPCA9685に書かれた値がニュートラルだったか
+    esc_duty: Optional[int]    # ESCチャンネルに最後に書かれたduty_cycle値
+    servo_duty: Optional[int]  # サーボチャンネルに最後に書かれたduty_cycle値
+
+    def summary(self) -> str:
+        """1行の要約文字列"""
+        return (
+            f"trials={self.trials} missed={self.missed} false_trips={self.false_trips} "
+            f"neutral_ok={self.neutral_ok} reaction: {self.reaction.summary()}"
+        )
+
+
+def _run_fake_watchdog(name: str, deadline_sec: float, poll_interval_sec: float, stop_event, results) -> None:
+    """子プロセス: 偽のPCA9685に書き込むウォッチドッグを動かし、最後に書かれた値を返す"""
+    from ..actuation.fake import FakePCA9685
+
+    pca = FakePCA9685()
+    reader = HeartbeatReader(name)
+    try:
+        Watchdog(
+            reader,
+            pca.i2c_device,
+            deadline_sec=deadline_sec,
+            poll_interval_sec=poll_interval_sec,
+            verbose=False,
+        ).run(stop_event)
+    finally:
+        esc = pca.channels[hardware.pca9685.CH_ESC].writes
+        servo = pca.channels[hardware.pca9685.CH_SERVO].writes
+        results.put((esc[-1] if esc else None, servo[-1] if servo else None))
+        reader.close()
+
+
+def measure_reaction(
+    trials: int = watchdog.MEASURE_TRIALS,
+    deadline_sec: float = watchdog.DEADLINE_SEC,
+    poll_interval_sec: float = watchdog.POLL_INTERVAL_SEC,
+    beat_period_sec: float = BEAT_PERIOD_SEC,
+    seed: int = 0,
+) -> ReactionMeasurement:
+    """
+    ウォッチドッグの反応遅延を計測（実機なし）
+
+    このプロセスが制御ループの代わりに beat_period_sec ごとにハートビートを書き、止める時刻をランダムにずらして
+    trials 回止める。子プロセスのウォッチドッグは偽のPCA9685（FakePCA9685）のレジスタに書き込み、
+    期限切れから書き込み完了までの遅延を共有メモリに記録する。
+
+    Args:
+        trials: 制御ループを止める回数。デフォルトは設定ファイルの値
+        deadline_sec: ハートビートの期限（秒）。デフォルトは設定ファイルの値
+        poll_interval_sec: ウォッチドッグの確認間隔（秒）。デフォルトは設定ファイルの値
+        beat_period_sec: ハートビートの周期（秒）
+        seed: 止める時刻のずらし方の乱数シード
+
+    Returns:
+        ReactionMeasurement: 計測結果
+
+    Raises:
+        RuntimeError: ウォッチドッグのプロセスが計測の途中で終了した場合
+    """
+    clock = MonotonicClock()
+    rng = random.Random(seed)
+    name = f"{watchdog.SHM_NAME}_measure_{os.getpid()}"
+    writer = HeartbeatWriter(name, clock=clock)
+    stop_event = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=_run_fake_watchdog,
+        args=(name, deadline_sec, poll_interval_sec, stop_event, results),
+        name="watchdog-measure",
+        daemon=True,
+    )
+    histogram = LatencyHistogram()
+    missed = 0
+    false_trips = 0
+    frame = 0
+    deadline_ns = int(deadline_sec * 1e9)
+    beat_ns = int(beat_period_sec * 1e9)
+    try:
+        process.start()
+        for _ in range(trials):
+            # 数回ハートビートを書いてから、確認の周期に対してランダムな位相で止める
+            trips = writer.watchdog_trips
+            next_ns = clock.now_ns()
+            for _ in range(rng.randint(3, 6)):
+                frame += 1
+                writer.beat(frame)
+                next_ns += beat_ns
+                clock.sleep_until_ns(next_ns)
+            clock.sleep(rng.uniform(0.0, poll_interval_sec))
+            frame += 1
+            writer.beat(frame)
+            if writer.watchdog_trips != trips:
+                false_trips += writer.watchdog_trips - trips
+                trips = writer.watchdog_trips
+            if not process.is_alive():
+                raise RuntimeError(f"Watchdog process exited (exitcode={process.exitcode})")
+
+            # 期限からさらに deadline_sec 待っても発動しなければ取りこぼし
+            give_up_ns = clock.now_ns() + 2 * deadline_ns
+            while writer.watchdog_trips == trips and clock.now_ns() < give_up_ns:
+                clock.sleep(poll_interval_sec / 4)
+            if writer.watchdog_trips == trips:
+                missed += 1
+                continue
+            histogram.record(writer.watchdog_reaction_ns // 1000)
+    finally:
+        writer.disarm()
+        stop_event.set()
+        # キューに書いた子プロセスは読み出されるまで終われないので、先に受け取ってから待つ
+        try:
+            duties = results.get(timeout=5.0)
+        except queue.Empty:
+            duties = (None, None)
+        process.join(5.0)
+        writer.unlink()
+
+    esc_duty, servo_duty = duties
+    expected = (
+        _register_roundtrip(us_to_duty(hardware.esc.US_NEUTRAL)),
+        _register_roundtrip(us_to_duty(hardware.servo.US_CENTER)),
+    )
+    return ReactionMeasurement(
+        trials=trials,
+        reaction=histogram.stats(),
+        missed=missed,
+        false_trips=false_trips,
+        neutral_ok=(esc_duty, servo_duty) == expected,
+        esc_duty=esc_duty,
+        servo_duty=servo_duty,
+    )
+
+
+def _register_roundtrip(duty: int) -> int:
+    """duty_cycle値をレジスタに書いて読み戻した値（12bitに丸めて16bitに戻す）"""
+    registers = bytearray(LED_REGISTER_STRIDE)
+    duty_to_registers(duty, registers)
+    return registers_to_duty(registers)
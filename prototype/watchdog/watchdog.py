@@ -0,0 +1,182 @@
+# --------------------------------
+# watchdog/watchdog.py
+# ハートビートが途絶えたらPCA9685のレジスタに直接ニュートラルを書き込むウォッチドッグ
+# --------------------------------
+from __future__ import annotations
+
+import sys
+from typing import Optional
+
+from ..interfaces.protocols import Clock
+from ..clock import MonotonicClock
+from ..actuation.pwm import LED0_ON_L, LED_REGISTER_STRIDE, duty_to_registers
+from ..config import hardware, us_to_duty, watchdog
+from .heartbeat import HeartbeatReader
+
+
+class Watchdog:
+    """
+    制御プロセスのハートビートを監視し、deadline_sec より古くなったらESCを停止・サーボを中央にするウォッチドッグ
+
+    制御プロセス（Orchestrator）とは別のプロセスで動かす。制御ループがGC・I2Cの詰まり・例外などで止まっても、
+    ウォッチドッグは自分のI2Cデバイス（I2CDevice 互換、with で開いて write() する）からPCA9685のレジスタを直接書く。
+    書き込みは1回のI2Cトランザクション（ESCとサーボのチャンネルが隣り合う場合）なので、制御プロセスの書き込みとは混ざらない。
+
+    発動は停止1回につき1回数えて共有メモリに記録し（制御プロセスは PWMActuation の書き込み済みの値を忘れる）、
+    ハートビートが古いままなら deadline_sec ごとにニュートラルを書き直す。新しいハートビートが来たら監視に戻る。
+    ハートビートが止める状態（armed=False）の間は何もしない。
+    """
+
+    def __init__(
+        self,
+        reader: HeartbeatReader,
+        device,
+        throttle_stop_us: int = hardware.esc.US_NEUTRAL,
+        steer_center_us: int = hardware.servo.US_CENTER,
+        deadline_sec: float = watchdog.DEADLINE_SEC,
+        poll_interval_sec: float = watchdog.POLL_INTERVAL_SEC,
+        clock: Optional[Clock] = None,
+        verbose: bool = True,
+    ):
+        """
+        初期化
+
+        Args:
+            reader: ハートビートの読み出し
+            device: PCA9685 のI2Cデバイス（I2CDevice 互換。実機なしでは FakePCA9685().i2c_device）
+            throttle_stop_us: ESCの停止のパルス幅（μs）。デフォルトは設定ファイルの値
+            steer_center_us: サーボの中央のパルス幅（μs）。デフォルトは設定ファイルの値
+            deadline_sec: ハートビートの期限（秒）。デフォルトは設定ファイルの値
+            poll_interval_sec: ハートビートを確認する間隔（秒）。デフォルトは設定ファイルの値
+            clock: 時計（ハートビートと同じ CLOCK_MONOTONIC であること）。
+                   Noneの場合はビジーウェイトしない実時間の単調時計（ウォッチドッグがCPUを使い続けないように）
+            verbose: 発動したときに標準エラーに出すか
+        """
+        self.reader = reader
+        self.device = device
+        self.throttle_stop_us = throttle_stop_us
+        self.steer_center_us = steer_center_us
+        self.deadline_sec = deadline_sec
+        self.poll_interval_sec = poll_interval_sec
+        self.clock = clock if clock is not None else MonotonicClock(spin_threshold_sec=0.0)
+        self.verbose = verbose
+        self._deadline_ns = int(deadline_sec * 1e9)
+        self._poll_ns = max(int(poll_interval_sec * 1e9), 1)
+        self._buffers = self._neutral_buffers()
+        self._beat_ns: Optional[int] = None  # 監視中のハートビートの時刻
+        self._tripped = False
+        self._reassert_ns = 0
+        self.trips = 0       # 発動回数（停止1回につき1回）
+        self.reasserts = 0   # 停止中にニュートラルを書き直した回数
+        self.errors = 0      # 書き込みに失敗した回数（次の確認で書き直す）
+        self.last_reaction_ns: Optional[int] = None  # 最後の発動の反応遅延（期限切れから書き込み完了まで）
+
+    def _neutral_buffers(self) -> tuple:
+        """ニュートラルのレジスタ書き込み（先頭バイトがレジスタアドレス）を作る"""
+        esc, servo = hardware.pca9685.CH_ESC, hardware.pca9685.CH_SERVO
+        duties = {esc: us_to_duty(self.throttle_stop_us), servo: us_to_duty(self.steer_center_us)}
+        if abs(esc - servo) == 1:
+            # 隣り合う2チャンネルは1回で書く（ESCとサーボが別々の時刻に切り替わらない）
+            low = min(esc, servo)
+            buf = bytearray(1 + 2 * LED_REGISTER_STRIDE)
+            buf[0] = LED0_ON_L + LED_REGISTER_STRIDE * low
+            duty_to_registers(duties[low], buf, 1)
+            duty_to_registers(duties[low + 1], buf, 1 + LED_REGISTER_STRIDE)
+            return (bytes(buf),)
+        buffers = []
+        for channel in (esc, servo):  # ESCを先に止める
+            buf = bytearray(1 + LED_REGISTER_STRIDE)
+            buf[0] = LED0_ON_L + LED_REGISTER_STRIDE * channel
+            duty_to_registers(duties[channel], buf, 1)
+            buffers.append(bytes(buf))
+        return tuple(buffers)
+
+    def write_neutral(self) -> bool:
+        """
+        ESCを停止・サーボを中央にする（レジスタに直接書く）
+
+        Returns:
+            bool: 書き込めたか（失敗は errors に数えて標準エラーに出す）
+        """
+        try:
+            for buf in self._buffers:
+                with self.device as i2c:
+                    i2c.write(buf)
+        except Exception as e:
+            self.errors += 1
+            print(f"[WATCHDOG] neutral write failed: {e}", file=sys.stderr)
+            return False
+        return True
+
+    def check(self, now_ns: Optional[int] = None) -> bool:
+        """
+        ハートビートを1回確認し、期限切れならニュートラルを書き込む
+
+        Args:
+            now_ns: 現在時刻（ナノ秒）。Noneの場合は時計から読む
+
+        Returns:
+            bool: ニュートラルを書き込んだか
+        """
+        sample = self.reader.read()
+        if not sample.armed:
+            self._beat_ns = None
+            self._tripped = False
+            return False
+        if sample.timestamp_ns != self._beat_ns:
+            # 新しいハートビート（停止から復帰した場合も監視に戻る）
+            self._beat_ns = sample.timestamp_ns
+            self._tripped = False
+        expire_ns = sample.timestamp_ns + self._deadline_ns
+        if now_ns is None:
+            now_ns = self.clock.now_ns()
+        if now_ns < expire_ns:
+            return False
+
+        if self._tripped:
+            if now_ns < self._reassert_ns:
+                return False
+            if self.write_neutral():
+                self.reasserts += 1
+                self._reassert_ns = self.clock.now_ns() + self._deadline_ns
+                return True
+            return False
+
+        if not self.write_neutral():
+            return False
+        done_ns = self.clock.now_ns()
+        self._tripped = True
+        self._reassert_ns = done_ns + self._deadline_ns
+        self.trips += 1
+        self.last_reaction_ns = done_ns - expire_ns
+        self.reader.record_trip(done_ns, self.last_reaction_ns)
+        if self.verbose:
+            print(
+                f"[WATCHDOG] heartbeat stale (frame={sample.frame}, "
+                f"age={(done_ns - sample.timestamp_ns) / 1e6:.1f}ms): neutral written "
+                f"{self.last_reaction_ns / 1e6:.2f}ms after deadline",
+                file=sys.stderr,
+            )
+        return True
+
+    def run(self, stop_event=None, max_polls: Optional[int] = None) -> None:
+        """
+        poll_interval_sec ごとにハートビートを確認し続ける（絶対時刻で待つので確認の間隔はずれない）
+
+        Args:
+            stop_event: is_set() が True になったら終わる（threading.Event / multiprocessing.Event）
+            max_polls: 確認する回数の上限（Noneで無制限）
+        """
+        next_ns = self.clock.now_ns()
+        polls = 0
+        while stop_event is None or not stop_event.is_set():
+            if max_polls is not None and polls >= max_polls:
+                break
+            now_ns = self.clock.now_ns()
+            self.check(now_ns)
+            polls += 1
+            next_ns += self._poll_ns
+            if next_ns <= now_ns:
+                # 確認が遅れた分は取り戻さず、今から数え直す
+                next_ns = now_ns + self._poll_ns
+            self.clock.sleep_until_ns(next_ns)